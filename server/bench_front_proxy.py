@@ -0,0 +1,174 @@
+"""Throughput/latency of the front proxy against a local stub backend
+
+    python bench_front_proxy.py                      # direct vs proxied, 2 stub workers
+    python bench_front_proxy.py --concurrency 64 --duration 10 --body 4096 --json
+
+스텁 백엔드와 부하 발생기는 별도 프로세스 - 프록시(모니터 프로세스 안에서 도는 것과
+같은 구조)와 GIL 을 나눠 쓰지 않도록 한다. 같은 부하를 스텁에 직접 한 번, 프록시를
+거쳐 한 번 보내고 req/s 와 지연 분위수를 비교한다.
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import socket
+import sys
+import time
+
+from front_proxy import FrontProxy
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def run_stub(ports, body_size, delay, ready):
+    """Keep-alive HTTP/1.1 stub answering every request with a fixed body"""
+    body = b'x' * body_size
+    response = (b"HTTP/1.1 200 OK\r\nContent-Type: text/plain\r\nContent-Length: "
+                + str(len(body)).encode() + b"\r\n\r\n" + body)
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                await reader.readuntil(b'\r\n\r\n')
+                if delay:
+                    await asyncio.sleep(delay)
+                writer.write(response)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def main():
+        for port in ports:
+            await asyncio.start_server(handle, '127.0.0.1', port, backlog=1024)
+        ready.set()
+        await asyncio.Event().wait()
+
+    asyncio.run(main())
+
+
+def run_load(port, concurrency, duration, results):
+    """Closed-loop load: each connection sends the next request as soon as the previous answer is read"""
+    request = f"GET /health HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\n\r\n".encode()
+
+    async def client(deadline, latencies, errors):
+        try:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        except OSError:
+            errors.append(1)
+            return
+        try:
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                writer.write(request)
+                head = await reader.readuntil(b'\r\n\r\n')
+                length = 0
+                for line in head.split(b'\r\n'):
+                    if line.lower().startswith(b'content-length:'):
+                        length = int(line.split(b':', 1)[1])
+                await reader.readexactly(length)
+                if not head.startswith(b'HTTP/1.1 200'):
+                    errors.append(1)
+                latencies.append(time.perf_counter() - start)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            errors.append(1)
+        finally:
+            writer.close()
+
+    async def main():
+        latencies, errors = [], []
+        start = time.perf_counter()
+        await asyncio.gather(*(client(start + duration, latencies, errors) for _ in range(concurrency)))
+        return latencies, len(errors), time.perf_counter() - start
+
+    latencies, errors, elapsed = asyncio.run(main())
+    results.put((latencies, errors, elapsed))
+
+
+def summarize(latencies, errors, elapsed):
+    latencies.sort()
+
+    def pct(p):
+        if not latencies:
+            return None
+        return latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))]
+
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'seconds': elapsed,
+        'rps': len(latencies) / elapsed if elapsed else 0.0,
+        'p50': pct(50),
+        'p90': pct(90),
+        'p99': pct(99),
+        'max': latencies[-1] if latencies else None
+    }
+
+
+def measure(port, args):
+    results = multiprocessing.Queue()
+    load = multiprocessing.Process(target=run_load, args=(port, args.concurrency, args.duration, results))
+    load.start()
+    latencies, errors, elapsed = results.get()
+    load.join()
+    return summarize(latencies, errors, elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=2, help='stub backends behind the proxy')
+    parser.add_argument('--concurrency', type=int, default=32, help='keep-alive client connections')
+    parser.add_argument('--duration', type=float, default=5.0, help='seconds per run')
+    parser.add_argument('--body', type=int, default=512, help='response body bytes')
+    parser.add_argument('--delay', type=float, default=0.0, help='stub think time per request (s)')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    ports = [free_port() for _ in range(args.workers)]
+    ready = multiprocessing.Event()
+    stub = multiprocessing.Process(target=run_stub, args=(ports, args.body, args.delay, ready), daemon=True)
+    stub.start()
+    ready.wait(10)
+
+    proxy = FrontProxy(host='127.0.0.1', port=0)
+    for i, port in enumerate(ports):
+        proxy.add_backend(f"worker{i}", '127.0.0.1', port)
+    proxy.start()
+
+    try:
+        # 직접 측정은 스텁 하나 - 프록시 쪽은 같은 부하를 워커 수만큼 분산
+        direct = measure(ports[0], args)
+        proxied = measure(proxy.port, args)
+    finally:
+        proxy.stop()
+        stub.terminate()
+
+    report = {
+        'config': vars(args),
+        'direct': direct,
+        'proxied': proxied,
+        'proxy': proxy.snapshot(),
+        'overhead_p50_ms': (proxied['p50'] - direct['p50']) * 1000 if direct['p50'] and proxied['p50'] else None
+    }
+    if args.json:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+        return
+
+    def ms(value):
+        return f"{value * 1000:.2f}" if value is not None else "-"
+
+    print(f"{'run':<8} {'req/s':>10} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8} {'errors':>7}")
+    for name, row in (('direct', direct), ('proxied', proxied)):
+        print(f"{name:<8} {row['rps']:>10.0f} {ms(row['p50']):>8} {ms(row['p90']):>8} "
+              f"{ms(row['p99']):>8} {ms(row['max']):>8} {row['errors']:>7}")
+    print(f"routed: " + ", ".join(f"{name} {b['requests']}" for name, b in report['proxy']['backends'].items()))
+
+
+if __name__ == "__main__":
+    main()
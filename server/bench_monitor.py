@@ -0,0 +1,375 @@
+"""Self-overhead of the monitor's hot loop against the local stand-in server
+
+    python bench_monitor.py --json > bench.json            # 전체 (약 1분)
+    python bench_monitor.py --quick --only check,formatters
+    python bench_monitor.py --compare bench.json           # 이전 커밋 결과와 비교, 회귀 시 exit 1
+
+실제 SmartMonitoringSystem 을 standin_server.py 로 향하게 하고 (scenario_runner 와 같은 구성)
+모니터가 도는 동안 쓰는 자원만 잰다. 결과 키는 단위 접미사로 끝나며 (_ms, _us, _bytes,
+_mb, _per_sec ...) --compare 는 _per_sec 만 클수록 좋고 나머지는 작을수록 좋다고 본다.
+
+    check       comprehensive_server_check() / monitor_tick() 한 번의 wall·CPU 시간
+                (CPU = 프로세스 전체 - 엔진 루프, 로그 리스너, executor 스레드 포함)
+    alloc       tracemalloc 기준 체크 한 번의 순간 최대 할당량, 남는 블록 수, gen0 GC 횟수,
+                가장 많이 늘어난 할당 위치 (CPython 에는 할당 횟수 카운터가 없어 블록 수로 대신)
+    formatters  콘솔/파일 포맷터, build_metrics(), 상태 보고서, 요약 로그 호출당 시간
+    logging     setup_logging() 큐 → 리스너 → 회전 파일 처리량과 큐가 넘쳐 버린 레코드 수
+    day         가상 시계로 24시간 (check_interval 간격) - SLO/지연/히스토리/롤업 창이 실제처럼
+                넘어가고, RSS 최대치와 시간당 증가량을 본다
+"""
+import argparse
+import atexit
+import contextlib
+import gc
+import json
+import logging
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import psutil
+
+from monitor_logging import ColoredFormatter, ConsoleColoredFormatter, LOG_FORMAT, setup_logging
+from scenario_runner import SERVER_DIR, build_monitor, free_port, launch_standin
+
+BENCHES = ('check', 'alloc', 'formatters', 'logging', 'day')
+
+SAMPLE_MESSAGES = (
+    (logging.INFO, "✅ External access OK (200, 0.012s) | health: healthy"),
+    (logging.WARNING, "⚠️ 연속 실패 2/3 - 재시작 대기 중"),
+    (logging.ERROR, "🚨 재시작 조건 충족! (3 consecutive failures)"),
+    (logging.INFO, "📊 Monitoring summary: 1440 checks, 99.93% success, p95 0.034s")
+)
+
+
+class SimulatedClock:
+    """Patches time.time() so wall-clock windows advance faster than real time
+
+    monotonic/perf_counter 는 그대로 두므로 응답 시간·타임아웃은 실제 값이다.
+    """
+
+    def __init__(self):
+        self.offset = 0.0
+        self._real = time.time
+
+    def time(self):
+        return self._real() + self.offset
+
+    def advance(self, seconds):
+        self.offset += seconds
+
+    def __enter__(self):
+        time.time = self.time
+        return self
+
+    def __exit__(self, *exc):
+        time.time = self._real
+
+
+def rss_mb():
+    return psutil.Process().memory_info().rss / (1024 * 1024)
+
+
+def git_revision():
+    with contextlib.suppress(OSError, subprocess.SubprocessError):
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=SERVER_DIR,
+                                capture_output=True, text=True, timeout=10).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--', '.'], cwd=SERVER_DIR,
+                               capture_output=True, text=True, timeout=10).stdout.strip()
+        return {'commit': commit or None, 'dirty': bool(dirty)}
+    return {'commit': None, 'dirty': None}
+
+
+def run_ticks(monitor, count):
+    for _ in range(count):
+        monitor.probe_engine.submit(monitor.monitor_tick()).result()
+
+
+def bench_check(monitor, args):
+    """Wall/CPU time per sync check and per full monitor tick"""
+    results = {}
+    for name, step in (('check', monitor.comprehensive_server_check),
+                       ('tick', lambda: run_ticks(monitor, 1))):
+        for _ in range(args.warmup):
+            step()
+        wall, cpu = time.perf_counter(), time.process_time()
+        for _ in range(args.checks):
+            step()
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+        results[f'{name}_wall_ms'] = wall / args.checks * 1000
+        results[f'{name}_cpu_ms'] = cpu / args.checks * 1000
+        results[f'{name}_per_sec'] = args.checks / wall
+    return results
+
+
+def bench_alloc(monitor, args):
+    """tracemalloc: transient peak and retained memory per check"""
+    for _ in range(args.warmup):
+        monitor.comprehensive_server_check()
+    gc.collect()
+    tracemalloc.start(10)
+    try:
+        before = tracemalloc.take_snapshot()
+        blocks = sys.getallocatedblocks()
+        gen0 = gc.get_stats()[0]['collections']
+        peaks = []
+        for _ in range(args.checks):
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            monitor.comprehensive_server_check()
+            peaks.append(tracemalloc.get_traced_memory()[1] - current)
+        gen0 = gc.get_stats()[0]['collections'] - gen0
+        gc.collect()
+        blocks = sys.getallocatedblocks() - blocks
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    # tracemalloc 자체와 이 파일의 할당은 제외
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+    growth = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), 'lineno')
+    peaks.sort()
+    return {
+        'peak_bytes_per_check': sum(peaks) / len(peaks),
+        'peak_bytes_p95': peaks[int(len(peaks) * 0.95) - 1] if len(peaks) >= 20 else peaks[-1],
+        'retained_blocks_per_check': blocks / args.checks,
+        'retained_bytes_per_check': sum(stat.size_diff for stat in growth) / args.checks,
+        'gen0_collections_per_check': gen0 / args.checks,
+        'top_growth': [f"{stat.traceback[0].filename.replace(SERVER_DIR + os.sep, '')}:"
+                       f"{stat.traceback[0].lineno} {stat.size_diff:+d}B {stat.count_diff:+d}"
+                       for stat in growth[:5]]
+    }
+
+
+def time_call(function, count):
+    function()  # 첫 호출의 캐시/지연 import 는 제외
+    started = time.perf_counter()
+    for _ in range(count):
+        function()
+    return (time.perf_counter() - started) / count * 1e6
+
+
+def bench_formatters(monitor, args):
+    """µs per call of the formatters and report builders on the hot path"""
+    run_ticks(monitor, max(30, args.warmup))  # --only formatters 여도 보고서에 채울 통계가 있도록
+    records = [logging.LogRecord('woopang.monitor', level, __file__, 0, message, None, None)
+               for level, message in SAMPLE_MESSAGES]
+    results = {}
+    for name, formatter in (('console_format', ConsoleColoredFormatter()),
+                            ('colored_format', ColoredFormatter(LOG_FORMAT)),
+                            ('file_format', logging.Formatter(LOG_FORMAT))):
+        results[f'{name}_us'] = time_call(lambda: [formatter.format(record) for record in records],
+                                          args.calls) / len(records)
+    results['build_metrics_us'] = time_call(monitor.build_metrics, max(1, args.calls // 10))
+    results['log_summary_us'] = time_call(monitor.log_monitoring_summary, args.calls)
+    # 보고서는 엔진 루프 밖(executor)에서 출력 - stdout 은 main() 에서 devnull
+    results['status_report_us'] = time_call(monitor.print_comprehensive_status, max(1, args.calls // 100))
+    return results
+
+
+def bench_logging(monitor, args):
+    """Records/s through setup_logging(): enqueue on the caller, end-to-end through the listener"""
+    directory = tempfile.mkdtemp(prefix='woopang-bench-log-')
+    log_file = os.path.join(directory, 'bench.log')
+    bench_logger = logging.getLogger('woopang.bench.logging')
+    # 콘솔 핸들러는 생성 시점의 sys.stderr 를 잡는다 - 콘솔 포맷 비용은 남기고 출력만 버림
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stderr(devnull):
+        listener, queue_handler = setup_logging(bench_logger, log_file, max_bytes=4 * 1024 * 1024, backup_count=3)
+        try:
+            started = time.perf_counter()
+            for i in range(args.records):
+                level, message = SAMPLE_MESSAGES[i % len(SAMPLE_MESSAGES)]
+                bench_logger.log(level, message)
+            enqueued = time.perf_counter() - started
+        finally:
+            listener.stop()  # 큐에 남은 레코드까지 처리
+            atexit.unregister(listener.stop)
+            for handler in listener.handlers:
+                handler.close()
+        elapsed = time.perf_counter() - started
+    written = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+    shutil.rmtree(directory, ignore_errors=True)
+    return {
+        'enqueue_records_per_sec': args.records / enqueued,
+        'enqueue_us': enqueued / args.records * 1e6,
+        'written_records_per_sec': (args.records - queue_handler.dropped) / elapsed,
+        'written_bytes_per_sec': written / elapsed,
+        'dropped_records': queue_handler.dropped
+    }
+
+
+def bench_day(monitor, args):
+    """Simulated day of monitor ticks - RSS peak/growth while every time window rotates"""
+    interval = monitor.check_interval
+    ticks = args.day_checks or int(86400 / interval)
+    hour_ticks = max(1, int(3600 / interval))
+    samples = []
+    gc.collect()
+    started, cpu = time.perf_counter(), time.process_time()
+    with SimulatedClock() as clock:
+        for tick in range(1, ticks + 1):
+            clock.advance(interval)
+            run_ticks(monitor, 1)
+            # 운영에서는 history/rollup 스레드가 몇 초마다, retention 은 매시간
+            if tick % 30 == 0:
+                monitor.history.flush()
+            if tick % max(1, int(60 / interval)) == 0:
+                monitor.rollups.flush()
+            if tick % hour_ticks == 0:
+                monitor.apply_retention()
+            if tick % args.rss_every == 0 or tick == ticks:
+                samples.append((tick * interval / 3600, rss_mb()))
+        monitor.history.flush()
+        monitor.rollups.flush()
+    elapsed, cpu = time.perf_counter() - started, time.process_time() - cpu
+
+    # 증가량은 첫 1시간(캐시·창 채우기) 이후부터
+    settled = [sample for sample in samples if sample[0] >= 1.0] or samples
+    hours = settled[-1][0] - settled[0][0]
+    return {
+        'simulated_hours': ticks * interval / 3600,
+        'ticks_per_sec': ticks / elapsed,
+        'tick_cpu_ms': cpu / ticks * 1000,
+        'rss_start_mb': samples[0][1],
+        'rss_peak_mb': max(rss for _, rss in samples),
+        'rss_end_mb': samples[-1][1],
+        'rss_growth_mb_per_hour': (settled[-1][1] - settled[0][1]) / hours if hours > 0 else 0.0
+    }
+
+
+def flatten(results, prefix=''):
+    flat = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def compare(report, baseline, threshold):
+    """→ rows of (metric, baseline, current, change %, regressed)"""
+    current, previous = flatten(report['results']), flatten(baseline['results'])
+    rows = []
+    for key in sorted(current.keys() & previous.keys()):
+        if key.endswith('simulated_hours') or not previous[key]:
+            continue
+        change = (current[key] - previous[key]) / abs(previous[key]) * 100
+        worse = -change if key.endswith('_per_sec') else change
+        rows.append((key, previous[key], current[key], change, worse > threshold))
+    return rows
+
+
+def print_results(report):
+    meta = report['meta']
+    print(f"📊 Monitor self-overhead @ {meta['git']['commit'] or '?'}{' (dirty)' if meta['git']['dirty'] else ''} "
+          f"- Python {meta['python']}, {meta['cpus']} CPUs")
+    for bench, results in report['results'].items():
+        print(f"\n[{bench}]")
+        for key, value in results.items():
+            if isinstance(value, list):
+                for line in value:
+                    print(f"  {key:<30} {line}")
+            else:
+                print(f"  {key:<30} {value:>14,.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--only', default=','.join(BENCHES), help=f"comma separated subset of {','.join(BENCHES)}")
+    parser.add_argument('--checks', type=int, default=500, help='checks per check/alloc bench')
+    parser.add_argument('--warmup', type=int, default=20, help='untimed checks before each measurement')
+    parser.add_argument('--calls', type=int, default=5000, help='calls per formatter measurement')
+    parser.add_argument('--records', type=int, default=50000, help='log records for the logging bench')
+    parser.add_argument('--check-interval', type=float, default=10, help='simulated monitor check_interval (s)')
+    parser.add_argument('--day-checks', type=int, default=0, help='ticks in the day bench (기본 24h / check_interval)')
+    parser.add_argument('--rss-every', type=int, default=300, help='ticks between RSS samples in the day bench')
+    parser.add_argument('--quick', action='store_true', help='about 10x fewer iterations (smoke run)')
+    parser.add_argument('--compare', metavar='BASELINE', help='earlier --json output to compare against')
+    parser.add_argument('--threshold', type=float, default=10.0, help='regression threshold in percent')
+    parser.add_argument('--workdir', help='keep monitor.log/history here (기본 임시 디렉터리, 끝나면 삭제)')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+    benches = [name.strip() for name in args.only.split(',') if name.strip()]
+    unknown = set(benches) - set(BENCHES)
+    if unknown:
+        parser.error(f"unknown bench: {', '.join(sorted(unknown))}")
+    if args.quick:
+        args.checks, args.warmup = max(20, args.checks // 10), max(2, args.warmup // 10)
+        args.calls, args.records = max(100, args.calls // 10), max(1000, args.records // 10)
+        args.day_checks = args.day_checks or max(1, int(8640 / args.check_interval))
+
+    workdir = os.path.abspath(args.workdir or tempfile.mkdtemp(prefix='woopang-bench-'))
+    os.makedirs(workdir, exist_ok=True)
+    port = free_port()
+    faults_path = os.path.join(workdir, 'faults.json')
+    with open(faults_path, 'w', encoding='utf-8') as f:
+        json.dump({'faults': []}, f)
+    command = [sys.executable, os.path.join(SERVER_DIR, 'standin_server.py'), '--port', str(port),
+               '--faults', faults_path, '--log-level', 'warning']
+    standin = launch_standin(command, port)
+
+    results = {}
+    monitor = None
+    try:
+        monitor = build_monitor(workdir, f"http://127.0.0.1:{port}", port, command)
+        monitor.check_interval = args.check_interval
+        monitor.probe_engine.start()
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            for name in BENCHES:
+                if name in benches:
+                    results[name] = globals()[f'bench_{name}'](monitor, args)
+    finally:
+        if monitor is not None:
+            monitor.probe_engine.stop()
+            monitor.rollups.close()
+        standin.terminate()
+        with contextlib.suppress(subprocess.TimeoutExpired):
+            standin.wait(10)
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        'meta': {
+            'git': git_revision(),
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'config': {key: value for key, value in vars(args).items() if key not in ('compare', 'json', 'workdir')}
+        },
+        'results': results
+    }
+    if args.json:
+        json.dump(report, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+    else:
+        print_results(report)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        rows = compare(report, baseline, args.threshold)
+        regressions = [row for row in rows if row[4]]
+        # --json 일 때 stdout 은 결과 JSON 만 - 비교표는 stderr
+        out = sys.stderr if args.json else sys.stdout
+        print(f"\n🔍 vs {baseline['meta']['git'].get('commit') or args.compare} "
+              f"(threshold {args.threshold:g}%, _per_sec higher is better)", file=out)
+        for key, before, after, change, regressed in rows:
+            print(f"  {'❌' if regressed else '  '} {key:<42} {before:>14,.3f} → {after:>14,.3f} {change:+7.1f}%",
+                  file=out)
+        if regressions:
+            print(f"❌ {len(regressions)} regression(s) over {args.threshold:g}%", file=out)
+            sys.exit(1)
+        print("✅ No regressions", file=out)
+
+
+if __name__ == "__main__":
+    main()
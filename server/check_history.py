@@ -0,0 +1,449 @@
+"""Append-only binary check history + query CLI
+
+    python check_history.py targets
+    python check_history.py summary --since 30d
+    python check_history.py latency --target health --day 2026-10-13
+    python check_history.py errors --status ssl_error --since 2026-10-01 --limit 50
+    python check_history.py latency --since 7d --json
+    python check_history.py rollups --resolution day --since 90d --target main
+
+모든 프로브 결과를 44바이트 고정 폭 레코드로 날짜별 세그먼트 파일(YYYY-MM-DD.chk)에
+덧붙인다. 조회는 세그먼트를 mmap 으로 열어 NumPy 구조체 배열로 한 번에 거르므로
+(NumPy 가 없으면 struct.iter_unpack) 텍스트 로그를 파싱하지 않고 몇 달 치를 훑는다.
+"""
+import argparse
+import json
+import logging
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+
+try:
+    import numpy as np
+except ImportError:  # 선택 의존성 - 없으면 느린 struct 경로로 조회
+    np = None
+
+from rollup_store import RESOLUTIONS, RollupStore
+
+
+logger = logging.getLogger('woopang.monitor.history')
+
+DEFAULT_HISTORY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'check_history')
+
+MAGIC = b'WPCHK\x00'
+VERSION = 1
+HEADER = struct.Struct('<6sHH6x')     # magic, version, record size - 16 bytes
+
+# timestamp, target id, HTTP status (0 = 없음), status id, flags, bytes,
+# response_time, dns, connect, tls, ttfb, download (초, 없으면 NaN)
+RECORD = struct.Struct('<dHHBB2xIffffff')
+TIMING_FIELDS = ('response_time', 'dns', 'connect', 'tls', 'ttfb', 'download')
+
+# 상태 id 는 파일에 저장되므로 새 상태는 뒤에만 추가
+STATUSES = ('unknown', 'healthy', 'unhealthy', 'timeout', 'ssl_error', 'connection_error', 'dns_error',
+            'unknown_error', 'invalid_content')
+STATUS_IDS = {status: index for index, status in enumerate(STATUSES)}
+
+FLAG_HEALTHY = 1
+FLAG_REUSED = 2
+
+if np is not None:
+    RECORD_DTYPE = np.dtype([
+        ('time', '<f8'), ('target', '<u2'), ('status_code', '<u2'), ('status', 'u1'), ('flags', 'u1'),
+        ('_pad', 'V2'), ('bytes', '<u4')
+    ] + [(field, '<f4') for field in TIMING_FIELDS])
+    assert RECORD_DTYPE.itemsize == RECORD.size
+
+
+def segment_name(timestamp):
+    return time.strftime('%Y-%m-%d', time.localtime(timestamp)) + '.chk'
+
+
+def pack_result(target_id, result):
+    timings = result.timings or {}
+    nan = float('nan')
+    flags = (FLAG_HEALTHY if result.healthy else 0) | (FLAG_REUSED if timings.get('reused') else 0)
+    return RECORD.pack(
+        result.started_at or time.time(), target_id, result.status_code or 0,
+        STATUS_IDS.get(result.status, 0), flags, min(result.bytes or 0, 0xFFFFFFFF),
+        result.response_time if result.response_time is not None else nan,
+        *(timings.get(field, nan) for field in TIMING_FIELDS[1:])
+    )
+
+
+class TargetIndex:
+    """name ↔ id map persisted next to the segments (ids are never reused)"""
+
+    def __init__(self, directory):
+        self.path = os.path.join(directory, 'targets.json')
+        self.ids = {}
+        if os.path.exists(self.path):
+            with open(self.path, encoding='utf-8') as f:
+                self.ids = json.load(f)
+        self.names = {target_id: name for name, target_id in self.ids.items()}
+
+    def get(self, name, create=True):
+        target_id = self.ids.get(name)
+        if target_id is None and create:
+            target_id = self.ids[name] = len(self.ids)
+            self.names[target_id] = name
+            tmp = self.path + '.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(self.ids, f, indent=2)
+            os.replace(tmp, self.path)
+        return target_id
+
+
+class CheckHistory:
+    """Probe results → daily append-only segments, flushed on its own thread
+
+    record() 는 프로브 엔진 루프에서 불리므로 메모리 버퍼에 pack 만 하고,
+    파일 쓰기는 flush_interval 마다 백그라운드 스레드가 한다.
+    """
+
+    def __init__(self, directory=DEFAULT_HISTORY_DIR, flush_interval=5.0):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        os.makedirs(directory, exist_ok=True)
+        self.targets = TargetIndex(directory)
+        self._pending = {}          # segment name → bytearray
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.records = 0
+        self.bytes_written = 0
+
+    def record(self, name, result):
+        with self._lock:
+            packed = pack_result(self.targets.get(name), result)
+            segment = segment_name(result.started_at or time.time())
+            buffer = self._pending.get(segment)
+            if buffer is None:
+                buffer = self._pending[segment] = bytearray()
+            buffer += packed
+            self.records += 1
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for segment, data in pending.items():
+            path = os.path.join(self.directory, segment)
+            with open(path, 'ab') as f:
+                if f.tell() == 0:
+                    f.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+                f.write(data)
+            self.bytes_written += len(data)
+
+    def prune(self, keep_seconds, now=None):
+        """Delete segments whose whole day is older than keep_seconds → removed file names"""
+        cutoff = segment_name((now or time.time()) - keep_seconds)
+        removed = []
+        for name in sorted(os.listdir(self.directory)):
+            if re.fullmatch(r'\d{4}-\d{2}-\d{2}\.chk', name) and name < cutoff:
+                os.remove(os.path.join(self.directory, name))
+                removed.append(name)
+        return removed
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='check-history', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        self.flush()
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except OSError as e:
+                logger.warning(f"⚠️ Check history flush failed: {e}")
+
+
+class HistoryReader:
+    """Memory-mapped scans over the segments covering [since, until)"""
+
+    def __init__(self, directory=DEFAULT_HISTORY_DIR):
+        self.directory = directory
+        self.targets = TargetIndex(directory)
+
+    def segments(self, since=None, until=None):
+        first = segment_name(since) if since is not None else ''
+        last = segment_name(until) if until is not None else '~'
+        names = sorted(name for name in os.listdir(self.directory) if re.fullmatch(r'\d{4}-\d{2}-\d{2}\.chk', name))
+        return [os.path.join(self.directory, name) for name in names if first <= name <= last]
+
+    def scan(self, since=None, until=None, target=None, status=None, healthy=None):
+        """→ NumPy structured array (or list of RECORD tuples without NumPy), oldest first
+
+        healthy=True/False 는 프로브 판정 플래그로 거른다 (status 와 별개 - 예: 429 허용 타깃).
+        """
+        target_id = self.targets.get(target, create=False) if target else None
+        if target and target_id is None:
+            raise KeyError(f"unknown target {target!r} (see `targets`)")
+        status_id = STATUS_IDS[status] if status else None
+        chunks = []
+        for path in self.segments(since, until):
+            with open(path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                if size <= HEADER.size:
+                    continue
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    magic, version, record_size = HEADER.unpack_from(mm)
+                    if magic != MAGIC or record_size != RECORD.size:
+                        raise ValueError(f"{path}: not a version {VERSION} check history segment")
+                    # 쓰기 도중 잘린 마지막 레코드는 무시
+                    count = (size - HEADER.size) // RECORD.size
+                    chunks.append(self._filter(mm, count, since, until, target_id, status_id, healthy))
+        if np is not None:
+            return np.concatenate(chunks) if chunks else np.empty(0, dtype=RECORD_DTYPE)
+        return [row for chunk in chunks for row in chunk]
+
+    @staticmethod
+    def _filter(mm, count, since, until, target_id, status_id, healthy):
+        if np is not None:
+            rows = np.frombuffer(mm, dtype=RECORD_DTYPE, count=count, offset=HEADER.size)
+            mask = np.ones(count, dtype=bool)
+            if since is not None:
+                mask &= rows['time'] >= since
+            if until is not None:
+                mask &= rows['time'] < until
+            if target_id is not None:
+                mask &= rows['target'] == target_id
+            if status_id is not None:
+                mask &= rows['status'] == status_id
+            if healthy is not None:
+                mask &= ((rows['flags'] & FLAG_HEALTHY) != 0) == healthy
+            selected = rows[mask]   # 불리언 인덱싱은 복사본 - mmap 을 닫아도 안전
+            del rows
+            return selected
+        view = memoryview(mm)[HEADER.size:HEADER.size + count * RECORD.size]
+        selected = [row for row in RECORD.iter_unpack(view)
+                    if (since is None or row[0] >= since) and (until is None or row[0] < until)
+                    and (target_id is None or row[1] == target_id) and (status_id is None or row[3] == status_id)
+                    and (healthy is None or bool(row[4] & FLAG_HEALTHY) == healthy)]
+        view.release()
+        return selected
+
+
+def columns(rows):
+    """Uniform column access for both scan() return types"""
+    if np is not None:
+        return {name: rows[name] for name in ('time', 'target', 'status_code', 'status', 'flags', 'bytes')
+                + TIMING_FIELDS}
+    names = ('time', 'target', 'status_code', 'status', 'flags', 'bytes') + TIMING_FIELDS
+    return {name: [row[index] for row in rows] for index, name in enumerate(names)}
+
+
+def percentile(values, q):
+    """Nearest-rank percentile ignoring NaN"""
+    if np is not None:
+        values = np.asarray(values, dtype=np.float64)
+        values = np.sort(values[np.isfinite(values)])
+    else:
+        values = sorted(v for v in values if v == v)
+    if not len(values):
+        return None
+    return float(values[min(len(values) - 1, max(0, int(q / 100 * len(values) + 0.5) - 1))])
+
+
+def parse_time(text, now=None):
+    """'7d' / '24h' / '30m' ago, or an ISO date/datetime → epoch seconds"""
+    now = now or time.time()
+    match = re.fullmatch(r'(\d+(?:\.\d+)?)([dhm])', text)
+    if match:
+        return now - float(match.group(1)) * {'d': 86400, 'h': 3600, 'm': 60}[match.group(2)]
+    return datetime.fromisoformat(text).timestamp()
+
+
+def time_range(args):
+    if args.day:
+        start = datetime.fromisoformat(args.day)
+        return start.timestamp(), (start + timedelta(days=1)).timestamp()
+    since = parse_time(args.since) if args.since else None
+    until = parse_time(args.until) if args.until else None
+    return since, until
+
+
+def group_by_target(reader, rows):
+    """(target name, columns) per target present in rows"""
+    cols = columns(rows)
+    if np is not None:
+        for target_id in np.unique(cols['target']):
+            mask = cols['target'] == target_id
+            yield (reader.targets.names.get(int(target_id), f"#{target_id}"),
+                   {field: values[mask] for field, values in cols.items()})
+        return
+    groups = {}
+    for index, target_id in enumerate(cols['target']):
+        groups.setdefault(target_id, []).append(index)
+    for target_id, indexes in sorted(groups.items()):
+        yield (reader.targets.names.get(target_id, f"#{target_id}"),
+               {field: [values[i] for i in indexes] for field, values in cols.items()})
+
+
+def status_counts(statuses):
+    if np is not None:
+        return np.bincount(statuses, minlength=len(STATUSES)).tolist()
+    counts = [0] * len(STATUSES)
+    for status in statuses:
+        counts[status] += 1
+    return counts
+
+
+def command_targets(reader, args):
+    return [{'id': target_id, 'name': name} for name, target_id in sorted(reader.targets.ids.items(), key=lambda x: x[1])]
+
+
+def command_summary(reader, args):
+    since, until = time_range(args)
+    report = []
+    for name, cols in group_by_target(reader, reader.scan(since, until, args.target)):
+        checks = len(cols['time'])
+        counts = status_counts(cols['status'])
+        healthy = counts[STATUS_IDS['healthy']]
+        errors = {status: count for status, count in zip(STATUSES, counts) if count and status != 'healthy'}
+        report.append({'target': name, 'checks': checks, 'availability': healthy / checks if checks else None,
+                       'errors': errors})
+    return report
+
+
+def command_latency(reader, args):
+    since, until = time_range(args)
+    rows = reader.scan(since, until, args.target, healthy=True)
+    report = []
+    for name, cols in group_by_target(reader, rows):
+        row = {'target': name, 'samples': len(cols['time'])}
+        for q in args.percentiles:
+            row[f"p{q:g}"] = percentile(cols[args.field], q)
+        row['max'] = percentile(cols[args.field], 100)
+        report.append(row)
+    return report
+
+
+def command_errors(reader, args):
+    since, until = time_range(args)
+    rows = reader.scan(since, until, args.target, args.status, healthy=False)
+    if args.limit:
+        rows = rows[-args.limit:]
+    cols = columns(rows)
+    report = []
+    for index in range(len(cols['time'])):
+        response_time = float(cols['response_time'][index])
+        report.append({
+            'time': datetime.fromtimestamp(float(cols['time'][index])).isoformat(timespec='seconds'),
+            'target': reader.targets.names.get(int(cols['target'][index]), '?'),
+            'status': STATUSES[cols['status'][index]],
+            'status_code': int(cols['status_code'][index]) or None,
+            'response_time': response_time if response_time == response_time else None
+        })
+    return report
+
+
+def command_rollups(reader, args):
+    """Minute/hour/day rollups kept after raw segments age out"""
+    path = os.path.join(reader.directory, 'rollups.sqlite3')
+    if not os.path.exists(path):
+        return []
+    since, until = time_range(args)
+    store = RollupStore(path)
+    try:
+        rows = store.query(RESOLUTIONS[args.resolution], args.target, since, until)
+    finally:
+        store.close()
+    report = []
+    for target, bucket, rollup in rows:
+        summary = rollup.as_dict()
+        report.append({
+            'bucket': datetime.fromtimestamp(bucket).isoformat(timespec='minutes'),
+            'target': target,
+            'checks': summary['count'],
+            'errors': summary['errors'],
+            'min': summary['latency_min'],
+            'avg': summary['latency_avg'],
+            'p95': summary['latency_p95'],
+            'max': summary['latency_max']
+        })
+    return report
+
+
+def print_table(report):
+    if not report:
+        print("(no records)")
+        return
+    keys = list(report[0])
+    cells = [[key for key in keys]]
+    for row in report:
+        line = []
+        for key in keys:
+            value = row.get(key)
+            if isinstance(value, float):
+                value = f"{value * 1000:.1f}ms" if key.startswith('p') or key in ('min', 'avg', 'max', 'response_time') \
+                    else f"{value * 100:.3f}%" if key == 'availability' else f"{value:.3f}"
+            elif isinstance(value, dict):
+                value = ", ".join(f"{k} {v}" for k, v in value.items()) or "-"
+            line.append("-" if value is None else str(value))
+        cells.append(line)
+    widths = [max(len(line[i]) for line in cells) for i in range(len(keys))]
+    for line in cells:
+        print("  ".join(cell.ljust(width) for cell, width in zip(line, widths)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--dir', default=DEFAULT_HISTORY_DIR, help='history directory')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    # 하위 명령 뒤에도 같은 옵션 (latency --since 7d --json) - SUPPRESS 라야 앞에 준 값을 덮어쓰지 않는다
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--dir', default=argparse.SUPPRESS, help='history directory')
+    common.add_argument('--json', action='store_true', default=argparse.SUPPRESS, help='print results as JSON')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    def add_range(sub):
+        sub.add_argument('--since', help="start: '7d', '24h', '30m' ago or ISO date/datetime")
+        sub.add_argument('--until', help='end (exclusive), same formats')
+        sub.add_argument('--day', help='whole local day YYYY-MM-DD (overrides --since/--until)')
+        sub.add_argument('--target', help='probe name (main, health, locations, worker0, ...)')
+
+    commands.add_parser('targets', parents=[common], help='list recorded probe names')
+    add_range(commands.add_parser('summary', parents=[common], help='checks, availability and error counts per target'))
+    latency = commands.add_parser('latency', parents=[common], help='latency percentiles of successful probes')
+    add_range(latency)
+    latency.add_argument('--field', default='response_time', choices=TIMING_FIELDS, help='timing phase')
+    latency.add_argument('--percentiles', type=lambda text: [float(q) for q in text.split(',')],
+                         default=[50, 90, 99], help='comma separated, e.g. 50,99,99.9')
+    errors = commands.add_parser('errors', parents=[common], help='failed probes')
+    add_range(errors)
+    errors.add_argument('--status', choices=[status for status in STATUSES if status != 'healthy'])
+    errors.add_argument('--limit', type=int, default=100, help='last N records (0 = all)')
+    rollups = commands.add_parser('rollups', parents=[common], help='per-minute/hour/day rollups (kept after raw data ages out)')
+    add_range(rollups)
+    rollups.add_argument('--resolution', default='hour', choices=list(RESOLUTIONS), help='bucket size')
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.dir):
+        parser.error(f"no history at {args.dir}")
+    reader = HistoryReader(args.dir)
+    start = time.perf_counter()
+    report = {'targets': command_targets, 'summary': command_summary, 'latency': command_latency,
+              'errors': command_errors, 'rollups': command_rollups}[args.command](reader, args)
+    if args.json:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+        return
+    print_table(report)
+    print(f"({time.perf_counter() - start:.2f}s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,470 @@
+import asyncio
+import itertools
+import logging
+import threading
+import time
+
+
+logger = logging.getLogger('woopang.monitor.proxy')
+
+HOP_BY_HOP = {'connection', 'keep-alive', 'proxy-connection', 'te', 'trailer', 'upgrade', 'transfer-encoding'}
+NO_BODY_STATUS = (204, 304)
+COPY_CHUNK = 64 * 1024
+
+ACTIVE = 'active'
+EJECTED = 'ejected'
+DRAINING = 'draining'
+
+
+class _BackendUnavailable(ConnectionError):
+    """Could not get a response head from the backend (nothing sent to the client yet)"""
+
+
+class Backend:
+    """One upstream worker with its outstanding-request count and idle keep-alive connections"""
+
+    def __init__(self, name, host, port):
+        self.name = name
+        self.host = host
+        self.port = port
+        self.state = ACTIVE
+        self.reason = ''
+        self.outstanding = 0
+        self.requests = 0
+        self.errors = 0
+        self.idle = []
+        self.idle_event = None
+
+    def as_dict(self):
+        return {
+            'host': self.host,
+            'port': self.port,
+            'state': self.state,
+            'reason': self.reason,
+            'outstanding': self.outstanding,
+            'requests': self.requests,
+            'errors': self.errors,
+            'idle_connections': len(self.idle)
+        }
+
+
+class _Head:
+    """Parsed request/response head - 원본 헤더 순서/대소문자 유지"""
+
+    __slots__ = ('start_line', 'headers', 'names')
+
+    def __init__(self, raw):
+        lines = raw.decode('latin-1').split('\r\n')
+        self.start_line = lines[0]
+        self.headers = []
+        for line in lines[1:]:
+            if not line:
+                continue
+            name, sep, value = line.partition(':')
+            if not sep:
+                raise ValueError(f"malformed header line {line[:40]!r}")
+            self.headers.append((name.strip(), value.strip()))
+        self.names = {}
+        for name, value in self.headers:
+            key = name.lower()
+            self.names[key] = f"{self.names[key]}, {value}" if key in self.names else value
+
+    def get(self, name, default=None):
+        return self.names.get(name, default)
+
+    def tokens(self, name):
+        return {t.strip().lower() for t in self.names.get(name, '').split(',') if t.strip()}
+
+    def chunked(self):
+        return 'chunked' in self.tokens('transfer-encoding')
+
+    def content_length(self):
+        value = self.names.get('content-length')
+        return int(value) if value is not None else None
+
+    def encode(self, start_line=None, drop=(), extra=()):
+        lines = [start_line or self.start_line]
+        lines.extend(f"{name}: {value}" for name, value in self.headers if name.lower() not in drop)
+        lines.extend(f"{name}: {value}" for name, value in extra)
+        return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+
+
+async def _read_head(reader, timeout):
+    # 헤더 크기 상한은 StreamReader limit (64 KiB) - 넘으면 LimitOverrunError
+    return await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), timeout=timeout)
+
+
+async def _copy_exact(reader, writer, length):
+    while length > 0:
+        data = await reader.read(min(COPY_CHUNK, length))
+        if not data:
+            raise ConnectionError("peer closed mid-body")
+        writer.write(data)
+        length -= len(data)
+        await writer.drain()
+
+
+async def _copy_chunked(reader, writer):
+    """Relay a chunked body as-is, including the last-chunk and trailers"""
+    while True:
+        size_line = await reader.readuntil(b'\r\n')
+        writer.write(size_line)
+        size = int(size_line.split(b';', 1)[0].strip(), 16)
+        if size == 0:
+            while True:
+                trailer = await reader.readuntil(b'\r\n')
+                writer.write(trailer)
+                if trailer == b'\r\n':
+                    await writer.drain()
+                    return
+        await _copy_exact(reader, writer, size + 2)
+
+
+async def _copy_until_eof(reader, writer):
+    while True:
+        data = await reader.read(COPY_CHUNK)
+        if not data:
+            return
+        writer.write(data)
+        await writer.drain()
+
+
+async def _pump(reader, writer):
+    try:
+        await _copy_until_eof(reader, writer)
+    except (ConnectionError, OSError):
+        pass
+    finally:
+        writer.close()
+
+
+class FrontProxy:
+    """Asyncio HTTP/1.1 reverse proxy in front of the workers
+
+    요청 단위로 outstanding 이 가장 적은 ACTIVE 백엔드를 고른다 (동률은 라운드 로빈).
+    클라이언트 keep-alive 연결이 백엔드에 고정되지 않으므로, 드레인 중인 워커에는
+    진행 중인 요청만 끝까지 보내고 같은 연결의 다음 요청은 다른 워커로 간다.
+    이벤트 루프는 전용 스레드 - 프로브 엔진 루프와 데이터 경로를 섞지 않는다.
+    """
+
+    def __init__(self, host='0.0.0.0', port=443, ssl_context=None, connect_timeout=2.0,
+                 response_timeout=60.0, keepalive_timeout=75.0, max_idle_per_backend=32):
+        self.host = host
+        self.port = port
+        self.ssl_context = ssl_context
+        self.connect_timeout = connect_timeout
+        self.response_timeout = response_timeout
+        self.keepalive_timeout = keepalive_timeout
+        self.max_idle_per_backend = max_idle_per_backend
+        self.backends = {}
+        self.stats = {'requests': 0, 'errors': 0, 'no_backend': 0, 'retries': 0, 'client_connections': 0}
+        self.loop = None
+        self.server = None
+        self._thread = None
+        self._started = threading.Event()
+        self._start_error = None
+        self._rr = itertools.count()
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self.loop = asyncio.new_event_loop()
+        self._started.clear()
+        self._thread = threading.Thread(target=self._run_loop, name='front-proxy', daemon=True)
+        self._thread.start()
+        self._started.wait()
+        if self._start_error:
+            error, self._start_error = self._start_error, None
+            raise error
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.server = self.loop.run_until_complete(asyncio.start_server(
+                self._handle_client, self.host, self.port, ssl=self.ssl_context, backlog=1024, reuse_address=True
+            ))
+        except OSError as e:
+            self._start_error = e
+            self._started.set()
+            self.loop.close()
+            return
+        self.port = self.server.sockets[0].getsockname()[1]
+        self._started.set()
+        self.loop.run_forever()
+        self.server.close()
+        for backend in self.backends.values():
+            self._close_idle(backend)
+        self.loop.close()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def stop(self):
+        if self.running:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout=5)
+
+    def _call(self, func, *args):
+        """Run on the proxy loop (thread-safe); direct call before start()"""
+        if self.running:
+            self.loop.call_soon_threadsafe(func, *args)
+        else:
+            func(*args)
+
+    def add_backend(self, name, host, port, state=ACTIVE):
+        self._call(self._add_backend, name, host, port, state)
+
+    def _add_backend(self, name, host, port, state):
+        backend = Backend(name, host, port)
+        backend.state = state
+        self.backends[name] = backend
+
+    def eject(self, name, reason=''):
+        """Stop routing new requests to the backend immediately"""
+        self._call(self._set_state, name, EJECTED, reason)
+
+    def admit(self, name):
+        self._call(self._set_state, name, ACTIVE, '')
+
+    def _set_state(self, name, state, reason):
+        backend = self.backends.get(name)
+        if backend is None or backend.state == state:
+            return
+        # 드레인 중인 백엔드는 admit 로만 복귀 (eject 가 드레인을 덮어쓰지 않도록)
+        if backend.state == DRAINING and state == EJECTED:
+            return
+        logger.info(f"{'🔌' if state == EJECTED else '✅'} Proxy backend {name} {backend.state} → {state}"
+                    f"{' - ' + reason if reason else ''}")
+        backend.state = state
+        backend.reason = reason
+        if state != ACTIVE:
+            self._close_idle(backend)
+
+    def drain(self, name, timeout=30.0):
+        """Block until the backend has no outstanding requests → (drained, seconds, still_outstanding)"""
+        if not self.running:
+            return True, 0.0, 0
+        future = asyncio.run_coroutine_threadsafe(self._drain(name, timeout), self.loop)
+        return future.result(timeout=timeout + 5)
+
+    async def _drain(self, name, timeout):
+        start = time.perf_counter()
+        backend = self.backends.get(name)
+        if backend is None:
+            return True, 0.0, 0
+        backend.state = DRAINING
+        backend.reason = 'draining for restart'
+        self._close_idle(backend)
+        deadline = start + timeout
+        while backend.outstanding and time.perf_counter() < deadline:
+            backend.idle_event = asyncio.Event()
+            try:
+                await asyncio.wait_for(backend.idle_event.wait(), timeout=deadline - time.perf_counter())
+            except asyncio.TimeoutError:
+                break
+        backend.idle_event = None
+        return backend.outstanding == 0, time.perf_counter() - start, backend.outstanding
+
+    def snapshot(self):
+        """Thread-safe copy of proxy and backend counters"""
+        backends = {name: backend.as_dict() for name, backend in list(self.backends.items())}
+        return dict(self.stats, backends=backends)
+
+    def _pick(self, exclude=()):
+        candidates = [b for b in self.backends.values() if b.state == ACTIVE and b not in exclude]
+        if not candidates:
+            return None
+        least = min(b.outstanding for b in candidates)
+        tied = [b for b in candidates if b.outstanding == least]
+        return tied[next(self._rr) % len(tied)]
+
+    def _close_idle(self, backend):
+        for _, writer, _ in backend.idle:
+            writer.close()
+        backend.idle.clear()
+
+    async def _checkout(self, backend):
+        """Reuse an idle keep-alive connection or open a new one → (reader, writer, reused)"""
+        now = time.monotonic()
+        while backend.idle:
+            reader, writer, idle_since = backend.idle.pop()
+            if reader.at_eof() or writer.is_closing() or now - idle_since > self.keepalive_timeout:
+                writer.close()
+                continue
+            return reader, writer, True
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(backend.host, backend.port), timeout=self.connect_timeout
+        )
+        return reader, writer, False
+
+    def _checkin(self, backend, reader, writer):
+        if backend.state != ACTIVE or len(backend.idle) >= self.max_idle_per_backend:
+            writer.close()
+            return
+        backend.idle.append((reader, writer, time.monotonic()))
+
+    def _release(self, backend):
+        backend.outstanding -= 1
+        if backend.outstanding == 0 and backend.idle_event is not None:
+            backend.idle_event.set()
+
+    async def _handle_client(self, client_reader, client_writer):
+        self.stats['client_connections'] += 1
+        peer = client_writer.get_extra_info('peername')
+        client_ip = peer[0] if peer else ''
+        try:
+            while True:
+                try:
+                    raw = await _read_head(client_reader, self.keepalive_timeout)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, asyncio.LimitOverrunError, ConnectionError):
+                    return
+                try:
+                    request = _Head(raw)
+                    method, _, version = request.start_line.split(' ', 2)
+                except ValueError:
+                    await self._send_error(client_writer, 400, 'Bad Request')
+                    return
+                keep_alive = await self._proxy_request(request, method, version, client_ip, client_reader, client_writer)
+                if not keep_alive:
+                    return
+        except (ConnectionError, OSError, ValueError, asyncio.IncompleteReadError,
+                asyncio.LimitOverrunError, asyncio.TimeoutError) as e:
+            # 응답 도중 백엔드/클라이언트가 끊긴 경우 - 연결만 닫는다
+            self.stats['errors'] += 1
+            logger.debug(f"Proxy connection from {client_ip} aborted: {e!r}")
+        finally:
+            self.stats['client_connections'] -= 1
+            client_writer.close()
+
+    async def _proxy_request(self, request, method, version, client_ip, client_reader, client_writer):
+        """Forward one request → whether the client connection can carry another one"""
+        self.stats['requests'] += 1
+        connection = request.tokens('connection')
+        client_keep_alive = ('close' not in connection) if version == 'HTTP/1.1' else ('keep-alive' in connection)
+        upgrade = 'upgrade' in connection and request.get('upgrade')
+        has_body = request.chunked() or (request.content_length() or 0) > 0
+
+        forwarded = request.get('x-forwarded-for')
+        extra = [
+            ('X-Forwarded-For', f"{forwarded}, {client_ip}" if forwarded else client_ip),
+            ('X-Forwarded-Proto', 'https' if self.ssl_context else 'http'),
+        ]
+        if request.chunked():
+            extra.append(('Transfer-Encoding', 'chunked'))
+        if upgrade:
+            extra.extend([('Connection', 'Upgrade'), ('Upgrade', request.get('upgrade'))])
+        else:
+            extra.append(('Connection', 'keep-alive'))
+        head = request.encode(drop=HOP_BY_HOP | {'x-forwarded-for', 'x-forwarded-proto'}, extra=extra)
+
+        tried = []
+        while True:
+            backend = self._pick(exclude=tried)
+            if backend is None:
+                self.stats['no_backend'] += 1
+                self.stats['errors'] += 1
+                await self._send_error(client_writer, 503, 'Service Unavailable')
+                return False
+            backend.outstanding += 1
+            backend.requests += 1
+            try:
+                return await self._exchange(backend, head, request, method, has_body, upgrade,
+                                            client_keep_alive, client_reader, client_writer)
+            except _BackendUnavailable as e:
+                backend.errors += 1
+                tried.append(backend)
+                # 본문이 이미 소비됐으면 다른 워커로 재전송할 수 없음
+                if has_body:
+                    self.stats['errors'] += 1
+                    await self._send_error(client_writer, 502, 'Bad Gateway')
+                    return False
+                self.stats['retries'] += 1
+                logger.debug(f"Proxy retrying on another backend after {backend.name}: {e}")
+            finally:
+                self._release(backend)
+
+    async def _exchange(self, backend, head, request, method, has_body, upgrade,
+                        client_keep_alive, client_reader, client_writer):
+        for attempt in range(2):
+            try:
+                reader, writer, reused = await self._checkout(backend)
+            except (OSError, asyncio.TimeoutError) as e:
+                raise _BackendUnavailable(f"connect failed: {e}")
+            try:
+                writer.write(head)
+                if request.chunked():
+                    await _copy_chunked(client_reader, writer)
+                elif has_body:
+                    await _copy_exact(client_reader, writer, request.content_length())
+                await writer.drain()
+                raw = await _read_head(reader, self.response_timeout)
+                break
+            except asyncio.TimeoutError:
+                writer.close()
+                backend.errors += 1
+                self.stats['errors'] += 1
+                await self._send_error(client_writer, 504, 'Gateway Timeout')
+                return False
+            except (asyncio.IncompleteReadError, ConnectionError, OSError) as e:
+                writer.close()
+                # 재사용 연결이 응답 전에 닫힌 경우 - 본문 없는 요청만 새 연결로 한 번 더
+                if reused and not has_body and attempt == 0:
+                    continue
+                raise _BackendUnavailable(f"no response: {e}")
+
+        # 🔧 수정: 응답 처리 중 어떤 예외(잘못된 상태 줄, 1xx 대기 타임아웃, 본문 복사 중 끊김)에도
+        # 풀로 돌려보내지 않은 백엔드 연결은 닫는다
+        checked_in = False
+        try:
+            response = _Head(raw)
+            status = int(response.start_line.split(' ', 2)[1])
+            while 100 <= status < 200 and status != 101:
+                client_writer.write(raw)
+                raw = await _read_head(reader, self.response_timeout)
+                response = _Head(raw)
+                status = int(response.start_line.split(' ', 2)[1])
+
+            if status == 101 and upgrade:
+                client_writer.write(raw)
+                await client_writer.drain()
+                await asyncio.gather(_pump(client_reader, writer), _pump(reader, client_writer))
+                return False
+
+            backend_keep_alive = 'close' not in response.tokens('connection')
+            length = response.content_length()
+            delimited = method == 'HEAD' or status in NO_BODY_STATUS or response.chunked() or length is not None
+            keep_alive = client_keep_alive and delimited
+
+            extra = [('Connection', 'keep-alive' if keep_alive else 'close')]
+            if response.chunked():
+                extra.append(('Transfer-Encoding', 'chunked'))
+            client_writer.write(response.encode(drop=HOP_BY_HOP, extra=extra))
+
+            if method == 'HEAD' or status in NO_BODY_STATUS:
+                pass
+            elif response.chunked():
+                await _copy_chunked(reader, client_writer)
+            elif length is not None:
+                await _copy_exact(reader, client_writer, length)
+            else:
+                await _copy_until_eof(reader, client_writer)
+                backend_keep_alive = False
+            await client_writer.drain()
+
+            if backend_keep_alive and delimited:
+                self._checkin(backend, reader, writer)
+                checked_in = True
+            return keep_alive
+        finally:
+            if not checked_in:
+                writer.close()
+
+    async def _send_error(self, writer, status, reason):
+        body = f"{status} {reason}\n".encode()
+        writer.write(f"HTTP/1.1 {status} {reason}\r\nContent-Type: text/plain\r\n"
+                     f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+        try:
+            await writer.drain()
+        except (ConnectionError, OSError):
+            pass
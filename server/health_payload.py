@@ -0,0 +1,286 @@
+import json
+import logging
+import re
+import time
+
+from latency_stats import RingBuffer
+from probe_engine import ProbeResult
+
+
+logger = logging.getLogger('woopang.monitor.health')
+
+# 추세가 의미 없는 필드 (단조 증가, 식별자) - 마지막 이름 조각 기준
+IGNORED_FIELDS = frozenset(('pid', 'id', 'name', 'uptime', 'timestamp', 'time', 'started', 'start_time',
+                            'version', 'port'))
+
+# 문자열 값이 이 중 하나면 해당 구성 요소가 나쁘다고 본다 (status, database: "error" ...)
+BAD_STATUSES = frozenset(('error', 'fail', 'failed', 'failure', 'down', 'unhealthy', 'degraded', 'timeout',
+                          'unavailable', 'critical', 'disconnected'))
+
+# JSON 이 깨졌을 때 (잘림, HTML 에 감싸짐, 끝에 쓰레기) 잎 필드만이라도 건지는 정규식
+_NUMBER_FIELD = re.compile(rb'"([A-Za-z0-9_\-.]{1,64})"\s*:\s*(-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?|true|false)\b')
+_STRING_FIELD = re.compile(rb'"([A-Za-z0-9_\-.]{1,64})"\s*:\s*"([^"\\]{0,32})"')
+
+
+def _flatten(value, prefix, numbers, strings, depth, max_fields):
+    if len(numbers) + len(strings) >= max_fields:
+        return
+    if isinstance(value, bool):
+        numbers[prefix] = float(value)
+    elif isinstance(value, (int, float)):
+        numbers[prefix] = float(value)
+    elif isinstance(value, str):
+        if len(value) <= 32:
+            strings[prefix] = value
+    elif depth >= 4:
+        return
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            _flatten(item, f"{prefix}.{key}" if prefix else str(key), numbers, strings, depth + 1, max_fields)
+    elif isinstance(value, list):
+        for index, item in enumerate(value[:max_fields]):
+            # [{"name": "db", ...}] 는 이름으로, 나머지는 위치로
+            key = item.get('name', index) if isinstance(item, dict) else index
+            _flatten(item, f"{prefix}.{key}" if prefix else str(key), numbers, strings, depth + 1, max_fields)
+
+
+def parse_health(body, max_fields=100):
+    """Tolerant /health parse → (numbers {dotted field: float}, strings {dotted field: str}, exact)
+
+    보통은 json.loads 한 번 (C 구현). 실패하면 정규식으로 잎 필드만 건지고 exact=False -
+    이때 필드 이름은 경로 없는 잎 이름이다. 아무것도 못 건지면 ValueError.
+    """
+    if body[:3] == b'\xef\xbb\xbf':
+        body = body[3:]
+    try:
+        data = json.loads(body)
+    except ValueError:
+        data = None
+    numbers, strings = {}, {}
+    if isinstance(data, dict):
+        _flatten(data, '', numbers, strings, 0, max_fields)
+        return numbers, strings, True
+    for key, value in _NUMBER_FIELD.findall(body)[:max_fields]:
+        key = key.decode()
+        numbers[key] = 1.0 if value == b'true' else 0.0 if value == b'false' else float(value)
+    for key, value in _STRING_FIELD.findall(body)[:max_fields]:
+        strings[key.decode()] = value.decode(errors='replace')
+    if not numbers and not strings:
+        raise ValueError(f"no fields in /health payload ({len(body)} bytes)")
+    return numbers, strings, False
+
+
+class FieldSeries:
+    """Recent values of one numeric field with a cached robust baseline"""
+
+    __slots__ = ('values', 'baseline', 'scale', 'since_baseline', 'counter', 'previous', 'flag', 'flag_since',
+                 'last', 'updated')
+
+    def __init__(self, capacity, counter=False):
+        self.values = RingBuffer(capacity)
+        self.baseline = None        # 중앙값
+        self.scale = None           # 1.4826 × MAD (하한 있음)
+        self.since_baseline = 0
+        self.counter = counter      # *_total / *_count → 초당 증가율로 추적
+        self.previous = None        # counter: (value, time)
+        self.flag = None            # None / 'spike' / 'drift'
+        self.flag_since = None
+        self.last = None
+        self.updated = None
+
+    def percentiles(self, qs=(0.5, 0.9, 0.99)):
+        values = sorted(self.values.values())
+        if not values:
+            return {f"p{int(q * 100)}": None for q in qs}
+        return {f"p{int(q * 100)}": values[min(len(values) - 1, int(q * len(values)))] for q in qs}
+
+
+class TrendTracker:
+    """Numeric fields tracked as separate bounded series with spike/drift flags
+
+    필드마다 최근 capacity 개 값을 링 버퍼에 두고, 기준선(중앙값, MAD)은 rebaseline 개 샘플마다
+    한 번만 다시 계산한다 - 관측마다 하는 일은 값 추가와 비교 몇 번뿐.
+        spike   최신 값이 기준선에서 spike_z × scale 이상
+        drift   최근 recent 개의 중앙값이 drift_z × scale 이상 그리고 min_change 비율 이상 벗어남
+    *_total / *_count 필드는 초당 증가율로 추적한다. 이상 징후가 생기거나 풀릴 때 한 번씩
+    label ("🩺 /health" 등) 을 붙여 로그를 남긴다. 엔진 루프에서만 관측, 읽기는 어느 스레드에서나.
+    """
+
+    def __init__(self, label, capacity=360, min_samples=30, rebaseline=30, recent=6, spike_z=6.0, drift_z=3.0,
+                 min_change=0.25, max_fields=100):
+        self.label = label
+        self.capacity = capacity
+        self.min_samples = min_samples
+        self.rebaseline = rebaseline
+        self.recent = recent
+        self.spike_z = spike_z
+        self.drift_z = drift_z
+        self.min_change = min_change
+        self.max_fields = max_fields
+        self.series = {}
+
+    def observe(self, numbers, now=None):
+        """numbers: {field: value} from one sample"""
+        now = now or time.time()
+        for field, value in numbers.items():
+            self._observe(field, value, now)
+
+    def _observe(self, field, value, now):
+        series = self.series.get(field)
+        if series is None:
+            if len(self.series) >= self.max_fields:
+                return
+            leaf = field.rsplit('.', 1)[-1]
+            series = self.series[field] = FieldSeries(self.capacity, leaf.endswith(('_total', '_count')))
+        if series.counter:
+            previous, series.previous = series.previous, (value, now)
+            if previous is None or value < previous[0] or now <= previous[1]:
+                return      # 첫 값 또는 재시작으로 리셋
+            value = (value - previous[0]) / (now - previous[1])
+        series.values.append(value)
+        series.last = value
+        series.updated = now
+        series.since_baseline += 1
+        count = len(series.values)
+        if count < self.min_samples:
+            return
+        # 이상 징후 중에는 기준선을 고정 - 천천히 나빠지는 값이 기준선에 흡수되지 않도록.
+        # 창 하나(capacity)가 지나도 계속이면 새 정상으로 받아들인다
+        if series.baseline is None or (series.since_baseline >= self.rebaseline
+                                       and (series.flag is None or series.since_baseline >= self.capacity)):
+            self._rebaseline(series)
+        self._evaluate(field, series, value, now)
+
+    def _rebaseline(self, series):
+        values = sorted(series.values.values())
+        median = values[len(values) // 2]
+        deviations = sorted(abs(v - median) for v in values)
+        mad = deviations[len(deviations) // 2]
+        series.baseline = median
+        # 거의 일정한 필드(캐시 크기 등)가 작은 흔들림에 울리지 않도록 하한
+        series.scale = max(1.4826 * mad, abs(median) * 0.05, 1e-9)
+        series.since_baseline = 0
+
+    def _evaluate(self, field, series, value, now):
+        deviation = abs(value - series.baseline) / series.scale
+        flag = None
+        if deviation >= self.spike_z:
+            flag = 'spike'
+        recent = series.values.values()[-self.recent:]
+        recent_median = sorted(recent)[len(recent) // 2]
+        shift = abs(recent_median - series.baseline)
+        if (shift / series.scale >= self.drift_z
+                and shift >= self.min_change * max(abs(series.baseline), 1e-9)):
+            flag = 'drift'
+        if flag == series.flag:
+            return
+        previous, series.flag = series.flag, flag
+        if flag is None:
+            logger.info(f"{self.label} {field} back to normal ({value:g}, baseline {series.baseline:g})")
+            series.flag_since = None
+            return
+        if previous is None:
+            series.flag_since = now
+        logger.warning(f"{self.label} {field} {flag}: {value:g} (recent median {recent_median:g}) "
+                       f"vs baseline {series.baseline:g} ±{series.scale:g}")
+
+    def anomalies(self):
+        """→ [(field, kind, detail)] currently flagged"""
+        # 보고서 스레드에서도 읽으므로 list() 로 한 번에 복사 (엔진 루프가 필드를 추가할 수 있음)
+        return [(field, series.flag, f"{series.last:g} vs {series.baseline:g}")
+                for field, series in list(self.series.items()) if series.flag]
+
+    def fields(self):
+        """→ {field: {p50, p90, p99, last, baseline, samples, rate, anomaly, anomaly_since}}"""
+        fields = {}
+        for field, series in list(self.series.items()):
+            row = series.percentiles()
+            row.update({'last': series.last, 'baseline': series.baseline, 'samples': len(series.values),
+                        'rate': series.counter, 'anomaly': series.flag, 'anomaly_since': series.flag_since})
+            fields[field] = row
+        return fields
+
+
+class HealthPayloadTracker(TrendTracker):
+    """Parse every /health body and track each numeric field as its own series
+
+    숫자 필드는 TrendTracker 로 (spike / drift), 문자열 필드는 상태로 본다:
+        status  문자열 필드가 BAD_STATUSES (components.database.status = "degraded" 등)
+    """
+
+    def __init__(self, ignored=IGNORED_FIELDS, **kwargs):
+        super().__init__('🩺 /health', **kwargs)
+        self.ignored = ignored
+        self.statuses = {}          # field → 최신 문자열 값
+        self.bad_statuses = {}      # field → since (wall time)
+        self.payloads = 0
+        self.parse_errors = 0
+        self.inexact = 0            # 정규식 대체 경로로 파싱한 횟수
+        self.parse_seconds = 0.0
+        self.last_error = None
+        self.last_payload_at = None
+
+    async def probe(self, engine, name, url, timeout, headers=None, verify=True, expected_status=(200,)):
+        """/health probe coroutine for engine.run_probe() - 건강 판정은 상태 코드 그대로, 본문은 기록만"""
+        response = await engine.http.request('GET', url, headers=headers, verify=verify)
+        healthy = response.status_code in expected_status
+        # 503 이어도 JSON 이면 어느 구성 요소가 나쁜지 알 수 있다
+        if response.body:
+            self.record(response.body)
+        return ProbeResult(name, healthy=healthy,
+                           status="healthy" if healthy else "unhealthy",
+                           status_code=response.status_code,
+                           response_time=response.timings.total,
+                           timings=response.timings.as_dict(),
+                           bytes=response.wire_bytes)
+
+    def record(self, body, now=None):
+        now = now or time.time()
+        started = time.perf_counter()
+        try:
+            numbers, strings, exact = parse_health(body, self.max_fields)
+        except ValueError as e:
+            self.parse_errors += 1
+            self.last_error = str(e)
+            return False
+        finally:
+            self.parse_seconds += time.perf_counter() - started
+        self.payloads += 1
+        self.last_payload_at = now
+        if not exact:
+            self.inexact += 1
+        for field, value in numbers.items():
+            if field.rsplit('.', 1)[-1] not in self.ignored:
+                self._observe(field, value, now)
+        for field, value in strings.items():
+            if field.rsplit('.', 1)[-1] not in self.ignored:
+                self._observe_status(field, value, now)
+        return True
+
+    def _observe_status(self, field, value, now):
+        if field not in self.statuses and len(self.statuses) >= self.max_fields:
+            return
+        self.statuses[field] = value
+        bad = value.strip().lower() in BAD_STATUSES
+        if bad and field not in self.bad_statuses:
+            self.bad_statuses[field] = now
+            logger.warning(f"🩺 /health {field} = {value!r}")
+        elif not bad and field in self.bad_statuses:
+            del self.bad_statuses[field]
+            logger.info(f"🩺 /health {field} = {value!r} - recovered")
+
+    def anomalies(self):
+        return [(field, 'status', self.statuses.get(field)) for field in list(self.bad_statuses)] + super().anomalies()
+
+    def snapshot(self):
+        return {
+            'payloads': self.payloads,
+            'parse_errors': self.parse_errors,
+            'inexact': self.inexact,
+            'parse_us': self.parse_seconds / (self.payloads + self.parse_errors) * 1e6
+            if self.payloads + self.parse_errors else None,
+            'last_error': self.last_error,
+            'fields': self.fields(),
+            'statuses': dict(self.statuses),
+            'anomalies': self.anomalies()
+        }
@@ -0,0 +1,235 @@
+import asyncio
+import ipaddress
+import logging
+import random
+import socket
+import struct
+import time
+from urllib.parse import urlsplit
+
+from probe_engine import ProbeResult
+
+
+logger = logging.getLogger('woopang.monitor.confirm')
+
+QTYPE_A = 1
+QTYPE_AAAA = 28
+
+
+RCODE_SERVFAIL = 2
+RCODE_REFUSED = 5
+
+
+class DnsError(Exception):
+    """Resolver answered, but without a usable address (NXDOMAIN, SERVFAIL, empty answer)"""
+
+    def __init__(self, message, rcode=None):
+        super().__init__(message)
+        self.rcode = rcode
+
+
+class _DnsProtocol(asyncio.DatagramProtocol):
+    def __init__(self, query_id):
+        self.query_id = query_id
+        self.answer = asyncio.get_running_loop().create_future()
+
+    def datagram_received(self, data, addr):
+        if len(data) >= 2 and struct.unpack('!H', data[:2])[0] == self.query_id and not self.answer.done():
+            self.answer.set_result(data)
+
+    def error_received(self, exc):
+        if not self.answer.done():
+            self.answer.set_exception(exc)
+
+
+def _build_query(query_id, host, qtype):
+    question = b''.join(bytes([len(label)]) + label.encode('idna') for label in host.rstrip('.').split('.'))
+    return struct.pack('!HHHHHH', query_id, 0x0100, 1, 0, 0, 0) + question + b'\x00' + struct.pack('!HH', qtype, 1)
+
+
+def _skip_name(data, offset):
+    while True:
+        length = data[offset]
+        if length & 0xC0 == 0xC0:
+            return offset + 2
+        if length == 0:
+            return offset + 1
+        offset += length + 1
+
+
+def _parse_answer(data, qtype):
+    _, flags, qdcount, ancount, _, _ = struct.unpack('!HHHHHH', data[:12])
+    rcode = flags & 0x000F
+    if rcode:
+        raise DnsError(f"rcode {rcode}", rcode)
+    offset = 12
+    for _ in range(qdcount):
+        offset = _skip_name(data, offset) + 4
+    addresses = []
+    for _ in range(ancount):
+        offset = _skip_name(data, offset)
+        rtype, _, _, rdlength = struct.unpack('!HHIH', data[offset:offset + 10])
+        offset += 10
+        rdata = data[offset:offset + rdlength]
+        offset += rdlength
+        # CNAME 체인은 건너뛰고 요청한 타입의 레코드만 모은다
+        if rtype == qtype == QTYPE_A and rdlength == 4:
+            addresses.append((socket.AF_INET, socket.inet_ntop(socket.AF_INET, rdata)))
+        elif rtype == qtype == QTYPE_AAAA and rdlength == 16:
+            addresses.append((socket.AF_INET6, socket.inet_ntop(socket.AF_INET6, rdata)))
+    return addresses
+
+
+async def query_dns(server, host, qtype=QTYPE_A, timeout=1.0):
+    """Single UDP query straight to a resolver, bypassing the OS resolver and its cache"""
+    loop = asyncio.get_running_loop()
+    query_id = random.getrandbits(16)
+    transport, protocol = await loop.create_datagram_endpoint(
+        lambda: _DnsProtocol(query_id), remote_addr=(server, 53)
+    )
+    try:
+        transport.sendto(_build_query(query_id, host, qtype))
+        data = await asyncio.wait_for(protocol.answer, timeout=timeout)
+    finally:
+        transport.close()
+    return _parse_answer(data, qtype)
+
+
+class ConfirmPath:
+    """One independent way of reaching the site
+
+    resolver=None 은 OS 리졸버, 아니면 해당 DNS 서버에 직접 질의한다.
+    address_index 로 같은 이름의 다른 A/AAAA 레코드(다른 엣지/경로)를 고른다.
+    """
+
+    __slots__ = ('name', 'resolver', 'family', 'address_index')
+
+    def __init__(self, name, resolver=None, family=socket.AF_UNSPEC, address_index=0):
+        self.name = name
+        self.resolver = resolver
+        self.family = family
+        self.address_index = address_index
+
+
+DEFAULT_PATHS = (
+    ConfirmPath('system'),
+    ConfirmPath('cloudflare_dns', resolver='1.1.1.1'),
+    ConfirmPath('google_dns', resolver='8.8.8.8'),
+    ConfirmPath('system_alt', address_index=1),
+)
+
+
+class QuorumResult:
+    """Outcome of one hedged confirmation round"""
+
+    __slots__ = ('healthy', 'failures', 'successes', 'quorum', 'elapsed', 'votes')
+
+    def __init__(self, quorum):
+        self.healthy = None
+        self.failures = 0
+        self.successes = 0
+        self.quorum = quorum
+        self.elapsed = 0.0
+        self.votes = []     # (path name, address, ProbeResult, seconds since round start)
+
+    def describe(self):
+        verdict = "UP" if self.healthy else "DOWN"
+        return (f"{verdict} by quorum ({self.failures} failed / {self.successes} ok, "
+                f"need {self.quorum} failures) in {self.elapsed:.2f}s")
+
+
+class HedgedConfirmer:
+    """Staggered parallel probes over fresh connections, decided by quorum
+
+    경로마다 stagger 간격으로 시작하고 (동시에 쏘아 같은 순간의 일시 장애에 모두
+    걸리지 않도록), 각 경로는 자기 DNS 해석 + 새 연결을 쓴다. quorum 개가 실패하면
+    DOWN, 남은 경로로는 quorum 에 도달할 수 없게 되면 UP - 결론이 나는 즉시 나머지는 취소.
+    전체 시간은 대략 stagger * (경로 수 - 1) + timeout.
+    """
+
+    def __init__(self, engine, url, paths=DEFAULT_PATHS, quorum=3, stagger=0.25, timeout=3.0,
+                 dns_timeout=1.0, headers=None, verify=True):
+        self.engine = engine
+        self.url = url
+        self.paths = paths
+        self.quorum = min(quorum, len(paths))
+        self.stagger = stagger
+        self.timeout = timeout
+        self.dns_timeout = dns_timeout
+        self.headers = headers
+        self.verify = verify
+
+    async def resolve(self, path, host, port):
+        """→ (addresses or None for the OS default, resolver note)"""
+        try:
+            literal = ipaddress.ip_address(host)
+        except ValueError:
+            literal = None
+        if literal is not None:
+            # 🔧 수정: IP 리터럴(로컬 스탠드인 등)은 조회할 이름이 없다 - 공용 리졸버에 물으면 NXDOMAIN 을 장애 표로 셈
+            return [(socket.AF_INET6 if literal.version == 6 else socket.AF_INET, host)], 'literal'
+        if path.resolver is None:
+            if not path.address_index and path.family == socket.AF_UNSPEC:
+                return None, 'system'
+            loop = asyncio.get_running_loop()
+            infos = await loop.getaddrinfo(host, port, family=path.family, type=socket.SOCK_STREAM)
+            addresses = list(dict.fromkeys((family, sockaddr[0]) for family, _, _, _, sockaddr in infos))
+            return [addresses[path.address_index % len(addresses)]], 'system'
+        try:
+            qtype = QTYPE_AAAA if path.family == socket.AF_INET6 else QTYPE_A
+            addresses = await query_dns(path.resolver, host, qtype, self.dns_timeout)
+        except (OSError, asyncio.TimeoutError):
+            # 리졸버에 닿지 않는 것은 모니터 쪽 문제 - 사이트 장애 표로 세지 않고 OS 리졸버로 대체
+            return None, f"{path.resolver} unreachable → system"
+        except DnsError as e:
+            # SERVFAIL/REFUSED 는 리졸버 사정, NXDOMAIN 과 빈 응답은 사이트 쪽 장애로 센다
+            if e.rcode not in (RCODE_SERVFAIL, RCODE_REFUSED):
+                raise
+            return None, f"{path.resolver} {e} → system"
+        if not addresses:
+            raise DnsError(f"no {'AAAA' if qtype == QTYPE_AAAA else 'A'} record from {path.resolver}")
+        return [addresses[path.address_index % len(addresses)]], path.resolver
+
+    async def _probe_path(self, index, path, round_start):
+        await asyncio.sleep(index * self.stagger)
+        parts = urlsplit(self.url)
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        name = f"confirm_{path.name}"
+        started = time.perf_counter()
+        try:
+            addresses, via = await asyncio.wait_for(self.resolve(path, parts.hostname, port), timeout=self.timeout)
+        except (DnsError, OSError, asyncio.TimeoutError) as e:
+            result = ProbeResult(name, status='dns_error', error=e, response_time=time.perf_counter() - started)
+            return path, path.resolver or 'system', result, time.perf_counter() - round_start
+
+        remaining = max(0.1, self.timeout - (time.perf_counter() - started))
+        result = await self.engine.run_probe(name, self.engine.http_get(
+            name, self.url, remaining, headers=self.headers, verify=self.verify, fresh=True, addresses=addresses
+        ), remaining)
+        address = addresses[0][1] if addresses else via
+        return path, address, result, time.perf_counter() - round_start
+
+    async def confirm(self):
+        """Run one round → QuorumResult (call inside the engine loop)"""
+        outcome = QuorumResult(self.quorum)
+        round_start = time.perf_counter()
+        tasks = [asyncio.ensure_future(self._probe_path(i, path, round_start)) for i, path in enumerate(self.paths)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                path, address, result, at = await next_done
+                outcome.votes.append((path.name, address, result, at))
+                if result.healthy:
+                    outcome.successes += 1
+                else:
+                    outcome.failures += 1
+                if outcome.failures >= self.quorum:
+                    outcome.healthy = False
+                    break
+                if outcome.successes > len(self.paths) - self.quorum:
+                    outcome.healthy = True
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+        outcome.elapsed = time.perf_counter() - round_start
+        return outcome
@@ -0,0 +1,354 @@
+import asyncio
+import socket
+import ssl
+import time
+import zlib
+from urllib.parse import urlsplit, urljoin
+
+
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+
+
+class HttpProtocolError(ConnectionError):
+    """Malformed or truncated HTTP response"""
+
+
+class _StaleConnection(ConnectionError):
+    """Pooled connection was closed by the peer before any response byte"""
+
+
+class PhaseTimings:
+    """Per-request phase breakdown (seconds) - 재사용 연결은 dns/connect/tls 가 0"""
+
+    __slots__ = ('dns', 'connect', 'tls', 'ttfb', 'download', 'total', 'reused')
+
+    def __init__(self):
+        self.dns = 0.0
+        self.connect = 0.0
+        self.tls = 0.0
+        self.ttfb = 0.0
+        self.download = 0.0
+        self.total = 0.0
+        self.reused = False
+
+    def add(self, other):
+        """Accumulate another hop (redirects)"""
+        self.dns += other.dns
+        self.connect += other.connect
+        self.tls += other.tls
+        self.ttfb += other.ttfb
+        self.download += other.download
+        self.total += other.total
+        self.reused = self.reused and other.reused
+
+    def as_dict(self):
+        return {
+            'dns': self.dns,
+            'connect': self.connect,
+            'tls': self.tls,
+            'ttfb': self.ttfb,
+            'download': self.download,
+            'total': self.total,
+            'reused': self.reused
+        }
+
+
+class HttpResponse:
+    __slots__ = ('url', 'status_code', 'headers', 'body', 'wire_bytes', 'header_bytes', 'timings')
+
+    def __init__(self, url, status_code, headers, body, wire_bytes, timings, header_bytes=0):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.body = body
+        self.wire_bytes = wire_bytes        # 본문 (압축된 그대로)
+        self.header_bytes = header_bytes    # 상태 줄 + 헤더
+        self.timings = timings
+
+
+class _Connection:
+    __slots__ = ('reader', 'writer', 'idle_since', 'opened')
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.idle_since = self.opened = time.monotonic()
+
+    def usable(self, idle_timeout, max_age=None):
+        if self.reader.at_eof() or self.writer.is_closing():
+            return False
+        now = time.monotonic()
+        if max_age is not None and now - self.opened >= max_age:
+            return False
+        return now - self.idle_since < idle_timeout
+
+    def close(self):
+        try:
+            self.writer.close()
+        except Exception:
+            pass
+
+
+class PooledHttpClient:
+    """Keep-alive HTTP/1.1 client for monitor probes
+
+    엔진 이벤트 루프 안에서만 사용한다. 호스트별 유휴 연결을 재사용해서
+    매 체크마다 TCP+TLS 핸드셰이크를 반복하지 않고, 요청마다
+    DNS / connect / TLS / TTFB / download 시간을 따로 기록한다.
+    🔧 수정: max_age 가 지난 연결은 재사용하지 않는다 - 체크 간격이 idle_timeout 보다 짧으면
+    연결 하나가 끝없이 재사용되어 새 방문자가 겪는 핸드셰이크 장애(인증서, TLS 설정)를 못 본다.
+    """
+
+    def __init__(self, max_idle_per_host=4, idle_timeout=55.0, max_age=60.0, max_redirects=5):
+        self.max_idle_per_host = max_idle_per_host
+        self.idle_timeout = idle_timeout
+        self.max_age = max_age
+        self.max_redirects = max_redirects
+        self._idle = {}
+        self._ssl_contexts = {}
+        self.stats = {
+            'requests': 0,
+            'connections_opened': 0,
+            'connections_reused': 0
+        }
+
+    def _ssl_context(self, verify):
+        ctx = self._ssl_contexts.get(verify)
+        if ctx is None:
+            ctx = ssl.create_default_context()
+            if not verify:
+                ctx.check_hostname = False
+                ctx.verify_mode = ssl.CERT_NONE
+            self._ssl_contexts[verify] = ctx
+        return ctx
+
+    async def _open(self, scheme, host, port, verify, timings, addresses=None):
+        loop = asyncio.get_running_loop()
+
+        t0 = time.perf_counter()
+        if addresses is None:
+            infos = await loop.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        else:
+            # 호출측이 직접 해석한 주소 (독립 DNS 경로 등) - SNI/Host 는 그대로 host
+            infos = [(family, None, None, None, (address, port)) for family, address in addresses]
+        t1 = time.perf_counter()
+        timings.dns = t1 - t0
+
+        last_error = None
+        for family, _, _, _, sockaddr in infos:
+            try:
+                if scheme == 'https' and not hasattr(asyncio.StreamWriter, 'start_tls'):
+                    # Python < 3.11: TLS 를 connect 와 분리할 수 없으므로 connect 에 합산
+                    reader, writer = await asyncio.open_connection(
+                        sockaddr[0], port, family=family,
+                        ssl=self._ssl_context(verify), server_hostname=host)
+                    timings.connect = time.perf_counter() - t1
+                    return _Connection(reader, writer)
+                reader, writer = await asyncio.open_connection(sockaddr[0], port, family=family)
+                break
+            except ssl.SSLError:
+                raise
+            except OSError as e:
+                last_error = e
+                t1 = time.perf_counter()
+        else:
+            raise last_error or ConnectionError(f"no address for {host}")
+
+        t2 = time.perf_counter()
+        timings.connect = t2 - t1
+        if scheme == 'https':
+            await writer.start_tls(self._ssl_context(verify), server_hostname=host)
+            timings.tls = time.perf_counter() - t2
+        return _Connection(reader, writer)
+
+    def _checkout(self, key):
+        idle = self._idle.get(key)
+        while idle:
+            conn = idle.pop()
+            if conn.usable(self.idle_timeout, self.max_age):
+                return conn
+            conn.close()
+        return None
+
+    def _drop_idle(self, url):
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        port = parts.port or (443 if scheme == 'https' else 80)
+        for key in [k for k in self._idle if k[:3] == (scheme, parts.hostname, port)]:
+            for conn in self._idle.pop(key):
+                conn.close()
+
+    def _checkin(self, key, conn):
+        idle = self._idle.setdefault(key, [])
+        if len(idle) >= self.max_idle_per_host:
+            conn.close()
+            return
+        conn.idle_since = time.monotonic()
+        idle.append(conn)
+
+    async def _read_headers(self, reader):
+        status_line = await reader.readline()
+        if not status_line:
+            raise HttpProtocolError("connection closed before response")
+        first_byte = time.perf_counter()
+        parts = status_line.decode('latin-1').split(None, 2)
+        if len(parts) < 2 or not parts[0].startswith('HTTP/') or not parts[1].isdigit():
+            raise HttpProtocolError(f"bad status line: {status_line[:60]!r}")
+        version, status_code = parts[0], int(parts[1])
+
+        headers = {}
+        size = len(status_line)
+        while True:
+            line = await reader.readline()
+            if not line:
+                raise HttpProtocolError("connection closed in headers")
+            size += len(line)
+            if line in (b'\r\n', b'\n'):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        return version, status_code, headers, first_byte, size
+
+    async def _read_body(self, reader, method, status_code, headers):
+        """Returns (raw_body, keep_alive_possible)"""
+        if method == 'HEAD' or status_code in (204, 304) or 100 <= status_code < 200:
+            return b'', True
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size_line = await reader.readline()
+                if not size_line:
+                    raise HttpProtocolError("truncated chunked body")
+                try:
+                    size = int(size_line.split(b';', 1)[0].strip(), 16)
+                except ValueError:
+                    raise HttpProtocolError(f"bad chunk size line: {size_line[:40]!r}")
+                if size == 0:
+                    # trailers
+                    while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                        pass
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            return b''.join(chunks), True
+        if 'content-length' in headers:
+            return await reader.readexactly(int(headers['content-length'])), True
+        return await reader.read(), False
+
+    @staticmethod
+    def _decode(body, headers):
+        encoding = headers.get('content-encoding', '').lower()
+        if not body or encoding in ('', 'identity'):
+            return body
+        if encoding == 'gzip':
+            return zlib.decompress(body, 16 + zlib.MAX_WBITS)
+        if encoding == 'deflate':
+            try:
+                return zlib.decompress(body)
+            except zlib.error:
+                return zlib.decompress(body, -zlib.MAX_WBITS)
+        return body
+
+    async def _request_once(self, method, url, headers, verify, fresh, addresses=None):
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        host = parts.hostname
+        port = parts.port or (443 if scheme == 'https' else 80)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+        key = (scheme, host, port, verify)
+
+        timings = PhaseTimings()
+        start = time.perf_counter()
+
+        conn = None if fresh else self._checkout(key)
+        if conn is not None:
+            timings.reused = True
+            self.stats['connections_reused'] += 1
+        else:
+            conn = await self._open(scheme, host, port, verify, timings, addresses)
+            self.stats['connections_opened'] += 1
+
+        host_header = host if port in (80, 443) else f"{host}:{port}"
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {host_header}"]
+        for name, value in (headers or {}).items():
+            if name.lower() not in ('host', 'connection'):
+                lines.append(f"{name}: {value}")
+        lines.append("Connection: close" if fresh else "Connection: keep-alive")
+        request = ("\r\n".join(lines) + "\r\n\r\n").encode('latin-1')
+
+        done = False
+        try:
+            try:
+                conn.writer.write(request)
+                await conn.writer.drain()
+                sent = time.perf_counter()
+                version, status_code, resp_headers, first_byte, header_bytes = await self._read_headers(conn.reader)
+            except (HttpProtocolError, ConnectionResetError, BrokenPipeError) as e:
+                if timings.reused:
+                    raise _StaleConnection(str(e)) from e
+                raise
+            timings.ttfb = first_byte - sent
+            raw, reusable = await self._read_body(conn.reader, method, status_code, resp_headers)
+            end = time.perf_counter()
+            timings.download = end - first_byte
+            timings.total = end - start
+
+            connection_header = resp_headers.get('connection', '').lower()
+            if version == 'HTTP/1.0' and connection_header != 'keep-alive':
+                reusable = False
+            if connection_header == 'close' or fresh:
+                reusable = False
+            done = True
+        finally:
+            if done and reusable:
+                self._checkin(key, conn)
+            else:
+                conn.close()
+
+        body = self._decode(raw, resp_headers)
+        return HttpResponse(url, status_code, resp_headers, body, len(raw), timings, header_bytes)
+
+    async def request(self, method, url, headers=None, verify=True, allow_redirects=True, fresh=False,
+                      addresses=None):
+        """Send a request, following redirects; phase timings are summed over hops
+
+        fresh=True 이면 풀을 건너뛰고 새 연결을 연 뒤 닫는다.
+        addresses=[(family, ip), ...] 는 첫 요청 호스트에만 적용되며 항상 새 연결을 쓴다.
+        """
+        self.stats['requests'] += 1
+        total = None
+        pinned_host = urlsplit(url).hostname if addresses is not None else None
+        for _ in range(self.max_redirects + 1):
+            hop_addresses = addresses if pinned_host and urlsplit(url).hostname == pinned_host else None
+            hop_fresh = fresh or hop_addresses is not None
+            try:
+                response = await self._request_once(method, url, headers, verify, hop_fresh, hop_addresses)
+            except _StaleConnection:
+                # 서버가 유휴 keep-alive 연결을 먼저 닫은 경우 - 풀을 비우고 새 연결로 재시도
+                self._drop_idle(url)
+                response = await self._request_once(method, url, headers, verify, hop_fresh, hop_addresses)
+
+            if total is None:
+                total = response.timings
+            else:
+                total.add(response.timings)
+            response.timings = total
+
+            location = response.headers.get('location')
+            if not (allow_redirects and response.status_code in REDIRECT_CODES and location):
+                return response
+            url = urljoin(url, location)
+            if response.status_code == 303:
+                method = 'GET'
+        return response
+
+    async def get(self, url, **kwargs):
+        return await self.request('GET', url, **kwargs)
+
+    def close(self):
+        for idle in self._idle.values():
+            for conn in idle:
+                conn.close()
+        self._idle.clear()
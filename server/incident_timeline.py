@@ -0,0 +1,154 @@
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+
+# 장애 하나가 지나가는 순서 - first_failure 기준 초 단위로 기록
+MILESTONES = ('first_failure', 'confirmed', 'restart_started', 'port_open', 'healthy')
+
+# (이름, 시작 마일스톤, 끝 마일스톤)
+INTERVALS = (
+    ('mttd', 'first_failure', 'confirmed'),
+    ('mttr', 'first_failure', 'healthy'),
+    ('confirm_to_restart', 'confirmed', 'restart_started'),
+    ('restart_to_port_open', 'restart_started', 'port_open'),
+    ('port_open_to_healthy', 'port_open', 'healthy')
+)
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+class Incident:
+    """Timeline of one outage, wall-clock timestamps per milestone"""
+
+    __slots__ = ('id', 'marks', 'restarts', 'outcome')
+
+    def __init__(self, incident_id, first_failure):
+        self.id = incident_id
+        self.marks = {'first_failure': first_failure}
+        self.restarts = 0
+        self.outcome = None
+
+    @property
+    def confirmed(self):
+        return 'confirmed' in self.marks
+
+    def interval(self, start, end):
+        if start not in self.marks or end not in self.marks:
+            return None
+        return max(0.0, self.marks[end] - self.marks[start])
+
+    def as_dict(self):
+        origin = self.marks['first_failure']
+        return {
+            'id': self.id,
+            'started': datetime.fromtimestamp(origin).isoformat(timespec='seconds'),
+            'outcome': self.outcome,
+            'restarts': self.restarts,
+            'offsets': {stage: self.marks[stage] - origin for stage in MILESTONES if stage in self.marks},
+            'intervals': {name: self.interval(start, end) for name, start, end in INTERVALS}
+        }
+
+    def describe(self):
+        origin = self.marks['first_failure']
+        steps = " → ".join(f"{stage} +{self.marks[stage] - origin:.1f}s" for stage in MILESTONES[1:]
+                           if stage in self.marks)
+        return f"#{self.id} {self.outcome or 'open'}: first failure{' → ' + steps if steps else ''}"
+
+
+def nearest_rank(sorted_values, q):
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, max(0, int(q * len(sorted_values) + 0.5) - 1))]
+
+
+class IncidentLog:
+    """Open incident + rolling window of closed ones with MTTD/MTTR percentiles
+
+    마일스톤은 프로브 엔진 루프(첫 실패, 확인, 복구)와 재시작 스레드(포트 오픈)
+    양쪽에서 찍히므로 락으로 보호한다. 확인되지 않고 회복된 장애(일시적 실패,
+    fast check 중 회복)는 transient 로 세고 MTTD/MTTR 분포에는 넣지 않는다.
+    """
+
+    def __init__(self, window=50):
+        self.window = window
+        self.closed = deque(maxlen=window)
+        self.current = None
+        self.total = 0
+        self.transient = 0
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def open(self, at=None):
+        """First failed probe - starts a timeline unless one is already open"""
+        with self._lock:
+            if self.current is None:
+                self.current = Incident(self._next_id, at or time.time())
+                self._next_id += 1
+            return self.current
+
+    def restore(self, total, transient):
+        """Add counts saved by a previous run - 일시적 장애도 ID 를 썼으므로 ID 는 둘의 합만큼 건너뛴다"""
+        with self._lock:
+            self.total += total
+            self.transient += transient
+            self._next_id += total + transient
+
+    def mark(self, stage, at=None, overwrite=False):
+        """Record a milestone on the open incident (first occurrence wins unless overwrite)"""
+        with self._lock:
+            incident = self.current
+            if incident is None:
+                return None
+            if stage == 'restart_started':
+                incident.restarts += 1
+            if overwrite or stage not in incident.marks:
+                incident.marks[stage] = at or time.time()
+            return incident.interval('first_failure', stage)
+
+    def resolve(self, at=None):
+        """Externally healthy again - closes the open incident and returns it"""
+        with self._lock:
+            incident = self.current
+            if incident is None:
+                return None
+            self.current = None
+            incident.marks['healthy'] = at or time.time()
+            if not incident.confirmed:
+                incident.outcome = 'transient'
+                self.transient += 1
+            else:
+                incident.outcome = 'restored' if incident.restarts else 'recovered'
+                self.closed.append(incident)
+                self.total += 1
+            return incident
+
+    def percentiles(self):
+        """{interval: {'count', 'mean', 'p50', 'p90', 'p99', 'max'}} over the closed window"""
+        with self._lock:
+            incidents = list(self.closed)
+        summary = {}
+        for name, start, end in INTERVALS:
+            values = sorted(v for v in (incident.interval(start, end) for incident in incidents) if v is not None)
+            row = {'count': len(values), 'mean': sum(values) / len(values) if values else None}
+            for q in QUANTILES:
+                row[f"p{int(q * 100)}"] = nearest_rank(values, q)
+            row['max'] = values[-1] if values else None
+            summary[name] = row
+        return summary
+
+    def last(self):
+        with self._lock:
+            return self.closed[-1] if self.closed else None
+
+    def as_dict(self):
+        last = self.last()
+        current = self.current
+        return {
+            'total': self.total,
+            'transient': self.transient,
+            'open': current.as_dict() if current is not None else None,
+            'last': last.as_dict() if last is not None else None,
+            'percentiles': self.percentiles()
+        }
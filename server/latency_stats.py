@@ -0,0 +1,229 @@
+import math
+import threading
+import time
+from array import array
+
+
+class RingBuffer:
+    """Fixed-size array-backed ring buffer - 오래된 값부터 덮어씀"""
+
+    __slots__ = ('capacity', '_data', '_next', '_count')
+
+    def __init__(self, capacity, typecode='d'):
+        self.capacity = capacity
+        self._data = array(typecode, [0]) * capacity
+        self._next = 0
+        self._count = 0
+
+    def append(self, value):
+        self._data[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def __len__(self):
+        return self._count
+
+    def values(self):
+        """Oldest → newest"""
+        if self._count < self.capacity:
+            return self._data[:self._count]
+        return self._data[self._next:] + self._data[:self._next]
+
+    def latest(self):
+        if not self._count:
+            return None
+        return self._data[self._next - 1]
+
+
+class LogHistogram:
+    """HDR-style log-bucketed histogram with bounded relative error
+
+    버킷 i 는 [min_value * growth^i, min_value * growth^(i+1)) 구간이고 분위수는
+    버킷 기하 중간값으로 보고하므로 상대 오차는 약 (growth - 1) / 2 이하이다.
+    """
+
+    MIN_VALUE = 0.0001   # 0.1 ms
+    MAX_VALUE = 120.0    # 2 min - 타임아웃보다 충분히 큼
+    GROWTH = 1.05
+
+    BUCKETS = int(math.ceil(math.log(MAX_VALUE / MIN_VALUE) / math.log(GROWTH))) + 1
+    _LOG_GROWTH = math.log(GROWTH)
+
+    @classmethod
+    def bucket_of(cls, value):
+        if value <= cls.MIN_VALUE:
+            return 0
+        return min(int(math.log(value / cls.MIN_VALUE) / cls._LOG_GROWTH), cls.BUCKETS - 1)
+
+    @classmethod
+    def bucket_value(cls, index):
+        return cls.MIN_VALUE * cls.GROWTH ** (index + 0.5)
+
+    @classmethod
+    def new_counts(cls):
+        return array('I', [0]) * cls.BUCKETS
+
+    @classmethod
+    def quantiles(cls, counts, qs):
+        total = sum(counts)
+        if not total:
+            return [None] * len(qs)
+        targets = [max(1, math.ceil(q * total)) for q in qs]
+        results = [None] * len(qs)
+        cumulative = 0
+        pending = 0
+        for index, count in enumerate(counts):
+            if not count:
+                continue
+            cumulative += count
+            while pending < len(targets) and cumulative >= targets[pending]:
+                results[pending] = cls.bucket_value(index)
+                pending += 1
+            if pending == len(targets):
+                break
+        return results
+
+
+class CumulativeHistogram:
+    """Lifetime histogram with fixed upper bounds (Prometheus/OpenMetrics style)"""
+
+    __slots__ = ('bounds', 'counts', 'sum', 'count')
+
+    def __init__(self, bounds):
+        self.bounds = tuple(bounds)
+        self.counts = array('Q', [0]) * (len(self.bounds) + 1)  # 마지막 칸 = +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        index = 0
+        for bound in self.bounds:
+            if value <= bound:
+                break
+            index += 1
+        self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+    def snapshot(self):
+        """(cumulative [(le, count), ...], sum, count) - le 마지막은 '+Inf'"""
+        cumulative = []
+        running = 0
+        for bound, count in zip(self.bounds + ('+Inf',), self.counts):
+            running += count
+            cumulative.append((bound, running))
+        return cumulative, self.sum, self.count
+
+
+class SlidingHistogram:
+    """Time window made of rotating per-slot histograms (constant memory)"""
+
+    __slots__ = ('slot_seconds', 'slots', '_epochs', '_counts', '_max', '_zero')
+
+    def __init__(self, window_seconds, slots):
+        self.slot_seconds = window_seconds / slots
+        self.slots = slots
+        self._epochs = array('q', [-1]) * slots
+        self._counts = [LogHistogram.new_counts() for _ in range(slots)]
+        self._max = array('d', [0.0]) * slots
+        self._zero = LogHistogram.new_counts()
+
+    def record(self, value, bucket, now, count=1):
+        epoch = int(now // self.slot_seconds)
+        pos = epoch % self.slots
+        if self._epochs[pos] != epoch:
+            self._counts[pos][:] = self._zero
+            self._max[pos] = 0.0
+            self._epochs[pos] = epoch
+        self._counts[pos][bucket] += count
+        if value > self._max[pos]:
+            self._max[pos] = value
+
+    def summary(self, now, qs=(0.5, 0.9, 0.99)):
+        current = int(now // self.slot_seconds)
+        merged = LogHistogram.new_counts()
+        peak = 0.0
+        for pos in range(self.slots):
+            if current - self._epochs[pos] >= self.slots:
+                continue
+            counts = self._counts[pos]
+            for index in range(LogHistogram.BUCKETS):
+                if counts[index]:
+                    merged[index] += counts[index]
+            peak = max(peak, self._max[pos])
+        count = sum(merged)
+        values = LogHistogram.quantiles(merged, qs)
+        result = {'count': count, 'max': peak if count else None}
+        for q, value in zip(qs, values):
+            # 버킷 중간값이 실제 최댓값을 넘지 않도록 보정
+            result[f"p{int(q * 100)}"] = min(value, peak) if value is not None else None
+        return result
+
+
+class EndpointLatency:
+    """Per-endpoint latency: 1m / 1h / 24h windows + lifetime histogram"""
+
+    # (label, window seconds, slots) - 1분=5초×12, 1시간=5분×12, 24시간=1시간×24
+    WINDOWS = (
+        ('1m', 60, 12),
+        ('1h', 3600, 12),
+        ('24h', 86400, 24)
+    )
+
+    LIFETIME_BOUNDS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self):
+        self.windows = [(label, SlidingHistogram(seconds, slots)) for label, seconds, slots in self.WINDOWS]
+        self.lifetime = CumulativeHistogram(self.LIFETIME_BOUNDS)
+
+    def record(self, value, now):
+        self.lifetime.observe(value)
+        bucket = LogHistogram.bucket_of(value)
+        for _, window in self.windows:
+            window.record(value, bucket, now)
+
+    def restore(self, buckets, peak, now):
+        """Refill the sliding windows from stored bucket counts (재실행 후 복구)"""
+        for bucket, count in buckets.items():
+            for _, window in self.windows:
+                window.record(min(peak, LogHistogram.bucket_value(bucket)), bucket, now, count)
+
+    def summary(self, now):
+        return {label: window.summary(now) for label, window in self.windows}
+
+
+class LatencyTracker:
+    """Thread-safe registry of EndpointLatency keyed by endpoint name"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.endpoints = {}
+
+    def record(self, name, seconds, now=None):
+        if seconds is None:
+            return
+        now = time.time() if now is None else now
+        with self._lock:
+            endpoint = self.endpoints.get(name)
+            if endpoint is None:
+                endpoint = self.endpoints[name] = EndpointLatency()
+            endpoint.record(seconds, now)
+
+    def restore(self, name, buckets, peak, now):
+        with self._lock:
+            endpoint = self.endpoints.get(name)
+            if endpoint is None:
+                endpoint = self.endpoints[name] = EndpointLatency()
+            endpoint.restore(buckets, peak, now)
+
+    def histograms(self):
+        """{endpoint: CumulativeHistogram.snapshot()} for exporters"""
+        with self._lock:
+            return {name: endpoint.lifetime.snapshot() for name, endpoint in self.endpoints.items()}
+
+    def summary(self, now=None):
+        """{endpoint: {'1m': {'count', 'p50', 'p90', 'p99', 'max'}, '1h': ..., '24h': ...}}"""
+        now = time.time() if now is None else now
+        with self._lock:
+            return {name: endpoint.summary(now) for name, endpoint in self.endpoints.items()}
@@ -0,0 +1,147 @@
+from datetime import datetime, timedelta
+
+try:
+    import numpy as np
+except ImportError:  # 선택 의존성 - 없으면 누수 추세 감지만 비활성
+    np = None
+
+
+MB = 1024 * 1024
+
+
+class LeakTrend:
+    """Least-squares RSS trend for one process over the detector window"""
+
+    __slots__ = ('name', 'pid', 'slope', 'r2', 'samples', 'span', 'rss', 'limit', 'eta', 'leaking')
+
+    def __init__(self, name, pid, slope, r2, samples, span, rss, limit, eta, leaking):
+        self.name = name
+        self.pid = pid
+        self.slope = slope          # bytes/s
+        self.r2 = r2
+        self.samples = samples
+        self.span = span            # s covered by the fit
+        self.rss = rss              # fitted RSS at the latest sample
+        self.limit = limit          # RSS at which memory is exhausted
+        self.eta = eta              # s until the fit reaches limit (None = not growing)
+        self.leaking = leaking
+
+    def as_dict(self):
+        return {
+            'pid': self.pid,
+            'slope_mb_per_hour': self.slope * 3600 / MB,
+            'r2': self.r2,
+            'samples': self.samples,
+            'span': self.span,
+            'rss': self.rss,
+            'limit': self.limit,
+            'eta': self.eta,
+            'leaking': self.leaking
+        }
+
+    def describe(self):
+        if self.eta is None:
+            eta = "never"
+        else:
+            eta = f"{self.eta / 3600:.1f}h" if self.eta >= 3600 else f"{self.eta / 60:.0f}min"
+        return (f"{self.slope * 3600 / MB:+.1f}MB/h (r²={self.r2:.2f}, n={self.samples} over {self.span / 60:.0f}min), "
+                f"rss {self.rss / MB:.0f}MB, limit {self.limit / MB:.0f}MB → exhaustion in {eta}")
+
+
+class LeakDetector:
+    """Fit RSS growth per process and decide when a pre-emptive restart is due
+
+    샘플 버퍼(array)를 그대로 NumPy 로 받아 최근 window 초 구간에 1차 회귀를 한다.
+    기울기·설명력(r²)·관측 구간이 모두 기준을 넘고 예상 소진 시각이 horizon 안이면
+    누수로 판정한다. 재시작 시점은 decide() 가 고른다 - 급하면 즉시, 아니면 조용한
+    시간대(quiet_hours), 그 전에 소진될 것 같으면 트래픽이 낮은 순간.
+    """
+
+    def __init__(self, window=3600, min_samples=60, min_span=900, min_r2=0.8, min_slope_mb_per_hour=1.0,
+                 horizon=24 * 3600, urgent_eta=1800, quiet_hours=(3, 5), low_traffic_percentile=25):
+        self.window = window
+        self.min_samples = min_samples
+        self.min_span = min_span
+        self.min_r2 = min_r2
+        self.min_slope = min_slope_mb_per_hour * MB / 3600
+        self.horizon = horizon
+        self.urgent_eta = urgent_eta
+        self.quiet_hours = quiet_hours
+        self.low_traffic_percentile = low_traffic_percentile
+
+    @staticmethod
+    def available():
+        return np is not None
+
+    def fit(self, name, times, rss, headroom, limit=None, pid=None, now=None):
+        """times/rss: sample buffers oldest → newest; headroom: bytes this process may still grow"""
+        t = np.frombuffer(times, dtype=np.float64)
+        y = np.frombuffer(rss, dtype=np.float64)
+        now = t[-1] if now is None and len(t) else now
+        if now is None:
+            return None
+        mask = np.isfinite(y) & (t >= now - self.window)
+        samples = int(mask.sum())
+        if samples < max(self.min_samples, 2):
+            return None
+
+        # x 를 마지막 샘플 기준으로 두면 절편 = 현재 시점 적합값
+        x = t[mask] - t[mask][-1]
+        y = y[mask]
+        dx = x - x.mean()
+        dy = y - y.mean()
+        sxx = dx @ dx
+        if sxx <= 0:
+            return None
+        slope = float(dx @ dy / sxx)
+        current = float(y.mean() - slope * x.mean())
+        ss_tot = float(dy @ dy)
+        residual = dy - slope * dx
+        r2 = 1.0 - float(residual @ residual) / ss_tot if ss_tot > 0 else 0.0
+        span = float(-x[0])
+
+        limit = limit if limit is not None else current + headroom
+        eta = (limit - current) / slope if slope > 0 else None
+        if eta is not None:
+            eta = max(0.0, eta)
+        leaking = (slope >= self.min_slope and r2 >= self.min_r2 and span >= self.min_span
+                   and eta is not None and eta <= self.horizon)
+        return LeakTrend(name, pid, slope, r2, samples, span, current, limit, eta, leaking)
+
+    def in_quiet_window(self, when):
+        start, end = self.quiet_hours
+        hour = when.hour + when.minute / 60
+        return start <= hour < end if start <= end else (hour >= start or hour < end)
+
+    def until_quiet_window(self, when):
+        """Seconds until the next quiet window starts (0 inside it)"""
+        if self.in_quiet_window(when):
+            return 0.0
+        start = when.replace(hour=self.quiet_hours[0], minute=0, second=0, microsecond=0)
+        if start <= when:
+            start += timedelta(days=1)
+        return (start - when).total_seconds()
+
+    def decide(self, trend, traffic=None, traffic_history=None, when=None):
+        """→ (restart_now, reason) for a leaking trend"""
+        when = when or datetime.now()
+        if trend.eta <= self.urgent_eta:
+            return True, f"exhaustion in {trend.eta / 60:.0f}min (urgent < {self.urgent_eta / 60:.0f}min)"
+        if self.in_quiet_window(when):
+            return True, f"quiet window {self.quiet_hours[0]:02d}:00-{self.quiet_hours[1]:02d}:00"
+
+        wait = self.until_quiet_window(when)
+        if trend.eta > wait + 3600:
+            return False, f"waiting for quiet window {self.quiet_hours[0]:02d}:00 (in {wait / 3600:.1f}h)"
+
+        # 조용한 시간대 전에 소진 예상 - 지금 트래픽이 최근 분포 하위 구간이면 재시작
+        if traffic is not None and traffic_history is not None:
+            history = np.frombuffer(traffic_history, dtype=np.float64)
+            history = history[np.isfinite(history)]
+            if len(history) >= 10:
+                threshold = float(np.percentile(history, self.low_traffic_percentile))
+                if traffic <= threshold:
+                    return True, (f"low traffic now ({traffic:.0f} conns ≤ p{self.low_traffic_percentile} "
+                                  f"{threshold:.0f}) before exhaustion")
+        return False, "exhaustion expected before quiet window - waiting for a low-traffic moment"
+
@@ -0,0 +1,205 @@
+import logging
+
+from probe_engine import ProbeResult
+
+
+logger = logging.getLogger('woopang.monitor.probe')
+
+MODES = ('full', 'conditional', 'range', 'head')
+
+# 서버가 가벼운 요청을 무시하면(매번 전체 본문) 다음 방식으로
+FALLBACK = {'conditional': 'range', 'range': 'head', 'head': 'full'}
+
+# 가벼운 요청 자체를 서버가 거부한 응답 - 장애가 아니므로 같은 프로브 안에서 전체 GET 으로 다시
+REJECTED_STATUS = (405, 412, 416, 501)
+
+
+class LightProbe:
+    """Main page probe that usually avoids downloading (and rendering) the full page
+
+    mode:
+        full         매번 전체 GET (기존 동작)
+        conditional  If-None-Match / If-Modified-Since → 304 (검증자는 전체 GET 에서 얻는다)
+        range        Range: bytes=0-(range_bytes-1) → 206
+        head         HEAD
+    deep_every 번에 한 번(과 deep=True 호출)은 전체 GET 으로 본문까지 검증하고, 그 크기와
+    TTFB 를 가벼운 프로브가 아낀 바이트/서버 시간의 기준으로 쓴다. 서버 시간 절약은 304 만
+    (head / range 는 서버가 여전히 렌더링하므로 바이트 절약만). 엔진 루프에서만 호출.
+    """
+
+    def __init__(self, mode='conditional', deep_every=20, range_bytes=512, min_body=512,
+                 marker=b'</html>', fallback_after=3):
+        if mode not in MODES:
+            raise ValueError(f"unknown probe mode {mode!r} (one of {', '.join(MODES)})")
+        self.mode = mode
+        self.active_mode = mode
+        self.deep_every = deep_every
+        self.range_bytes = range_bytes
+        self.min_body = min_body
+        self.marker = marker
+        self.fallback_after = fallback_after
+        self.validators = {}        # url → {'etag': .., 'last_modified': ..}
+        self.ignored = 0            # 연속으로 전체 본문이 돌아온 가벼운 프로브 수
+        self.probes = 0
+        self.counts = {kind: 0 for kind in ('deep',) + MODES[1:]}
+        self.ttfb = {}              # 종류별 TTFB EWMA (s) - 서버 처리(렌더링) 시간 추정
+        self.full_bytes = None      # 마지막 전체 GET 의 응답 바이트 (헤더 + 본문)
+        self.bytes_total = 0
+        self.bytes_saved = 0
+        self.server_time_saved = 0.0
+        self.not_modified = 0       # 304 - 서버가 렌더링을 건너뛴 프로브
+        self.invalid = 0
+        self.fallbacks = []
+        self.last_kind = None
+
+    def plan(self, url, deep=False):
+        """→ 'deep' or the light request kind for this probe"""
+        mode = self.active_mode
+        if deep or mode == 'full' or self.full_bytes is None:
+            return 'deep'
+        if self.deep_every and self.probes % self.deep_every == 0:
+            return 'deep'
+        if mode == 'conditional' and not self.validators.get(url):
+            return 'deep'
+        return mode
+
+    def request_for(self, kind, url, headers):
+        """→ (method, headers)"""
+        headers = dict(headers or {})
+        if kind == 'head':
+            return 'HEAD', headers
+        if kind == 'range':
+            # 압축된 표현의 일부는 쓸모가 없으므로 원본 바이트 범위를 요청
+            headers['Accept-Encoding'] = 'identity'
+            headers['Range'] = f"bytes=0-{self.range_bytes - 1}"
+        elif kind == 'conditional':
+            validators = self.validators.get(url, {})
+            if validators.get('etag'):
+                headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified'):
+                headers['If-Modified-Since'] = validators['last_modified']
+        return 'GET', headers
+
+    async def probe(self, engine, name, url, timeout, headers=None, verify=True, deep=False,
+                    expected_status=(200,)):
+        """Probe coroutine for engine.run_probe() → ProbeResult"""
+        kind = self.plan(url, deep)
+        self.probes += 1
+        response = await self._request(engine, kind, url, headers, verify)
+        if kind != 'deep' and response.status_code in REJECTED_STATUS:
+            self._fall_back(f"{kind} request answered {response.status_code}")
+            kind = 'deep'
+            response = await self._request(engine, kind, url, headers, verify)
+        self.last_kind = kind
+        self.counts[kind] += 1
+
+        size = response.header_bytes + response.wire_bytes
+        self.bytes_total += size
+        self._ewma(kind, response.timings.ttfb)
+        error = None
+        if kind == 'deep':
+            healthy = response.status_code in expected_status
+            if healthy:
+                error = self._validate(response)
+                self._learn(url, response, size)
+        else:
+            healthy = self._light_ok(kind, url, response, expected_status)
+            if healthy and self.full_bytes is not None:
+                self.bytes_saved += max(0, self.full_bytes - size)
+                # 🔧 수정: 렌더링을 실제로 건너뛴 경우(304)만 서버 시간 절약으로 센다 - HEAD/Range 도
+                # Flask 는 템플릿을 렌더링하므로 그 TTFB 차이는 잡음일 뿐 (바이트 절약만 집계)
+                if response.status_code == 304:
+                    self.not_modified += 1
+                    if 'deep' in self.ttfb:
+                        self.server_time_saved += max(0.0, self.ttfb['deep'] - response.timings.ttfb)
+
+        if error is not None:
+            self.invalid += 1
+            status = "invalid_content"
+        else:
+            status = "healthy" if healthy else "unhealthy"
+        return ProbeResult(name, healthy=healthy and error is None, status=status,
+                           status_code=response.status_code,
+                           response_time=response.timings.total,
+                           error=error,
+                           timings=response.timings.as_dict(),
+                           bytes=response.wire_bytes)
+
+    async def _request(self, engine, kind, url, headers, verify):
+        method, request_headers = self.request_for(kind, url, headers)
+        return await engine.http.request(method, url, headers=request_headers, verify=verify)
+
+    def _validate(self, response):
+        """Full page sanity check → error or None (200 이지만 빈/깨진 페이지)"""
+        body = response.body
+        if len(body) < self.min_body:
+            return ValueError(f"page body only {len(body)} bytes (< {self.min_body})")
+        if self.marker and self.marker not in body[-4096:].lower():
+            return ValueError(f"page body missing {self.marker.decode(errors='replace')}")
+        return None
+
+    def _learn(self, url, response, size):
+        self.full_bytes = size
+        validators = {'etag': response.headers.get('etag'),
+                      'last_modified': response.headers.get('last-modified')}
+        if validators['etag'] or validators['last_modified']:
+            self.validators[url] = validators
+        else:
+            self.validators.pop(url, None)
+            if self.active_mode == 'conditional':
+                self._fall_back("page has no ETag/Last-Modified")
+
+    def _light_ok(self, kind, url, response, expected_status):
+        """Light response → healthy; 전체 본문이 돌아오면 무시된 것으로 세고 연속이면 다음 방식으로"""
+        code = response.status_code
+        if kind == 'conditional' and code == 304:
+            self.ignored = 0
+            return True
+        if kind == 'range' and code == 206:
+            self.ignored = 0
+            return True
+        if code not in expected_status:
+            return False
+        if kind == 'conditional':
+            etag = response.headers.get('etag')
+            if etag and etag != self.validators.get(url, {}).get('etag'):
+                # 페이지가 바뀜 (배포) - 새 검증자로 계속, 무시된 것이 아님
+                self.validators[url] = {'etag': etag, 'last_modified': response.headers.get('last-modified')}
+                self.full_bytes = response.header_bytes + response.wire_bytes
+                return True
+        if kind != 'head':
+            self.ignored += 1
+            if self.ignored >= self.fallback_after:
+                self._fall_back(f"server ignored {self.ignored} {kind} requests")
+        return True
+
+    def _fall_back(self, reason):
+        previous = self.active_mode
+        self.active_mode = FALLBACK.get(previous, 'full')
+        self.ignored = 0
+        self.fallbacks.append((previous, self.active_mode, reason))
+        logger.warning(f"🪶 Main probe: {reason} - switching {previous} → {self.active_mode}")
+
+    def _ewma(self, kind, value, alpha=0.2):
+        previous = self.ttfb.get(kind)
+        self.ttfb[kind] = value if previous is None else previous + alpha * (value - previous)
+
+    def snapshot(self):
+        probes = sum(self.counts.values())
+        return {
+            'mode': self.mode,
+            'active_mode': self.active_mode,
+            'deep_every': self.deep_every,
+            'counts': dict(self.counts),
+            'bytes_total': self.bytes_total,
+            'bytes_per_probe': self.bytes_total / probes if probes else None,
+            'full_bytes': self.full_bytes,
+            'bytes_saved': self.bytes_saved,
+            'saved_ratio': self.bytes_saved / (self.bytes_saved + self.bytes_total) if self.bytes_total else 0.0,
+            'server_time_saved': self.server_time_saved,
+            'not_modified': self.not_modified,
+            'server_time_saved_per_probe': self.server_time_saved / self.not_modified if self.not_modified else None,
+            'ttfb': dict(self.ttfb),
+            'invalid': self.invalid,
+            'fallbacks': list(self.fallbacks)
+        }
@@ -0,0 +1,184 @@
+import asyncio
+import json
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from health_payload import TrendTracker
+from probe_engine import ProbeResult
+
+
+# 지점마다 추적하는 값 - 필드 이름은 "{지점}.{값}"
+METRICS = ('ttfb_ms', 'download_ms', 'compressed_bytes', 'uncompressed_bytes', 'records', 'bytes_per_record',
+           'parse_ms')
+
+
+def point_key(point):
+    """Stable label for a probe point - name 이 없으면 좌표와 반경"""
+    if point.get('name'):
+        return str(point['name'])
+    return f"{float(point['lat']):.4f},{float(point['lon']):.4f}@{float(point.get('radius', 1000)):g}m"
+
+
+class ProbePoint:
+    """One coordinate/radius of a /locations target"""
+
+    __slots__ = ('key', 'url', 'min_records', 'probes', 'failures', 'last', 'last_status', 'last_error')
+
+    def __init__(self, key, url, min_records=0):
+        self.key = key
+        self.url = url
+        self.min_records = min_records
+        self.probes = 0
+        self.failures = 0
+        self.last = {}              # metric → 최신 값
+        self.last_status = None
+        self.last_error = None
+
+
+class LocationsProbe:
+    """Synthetic /locations probe - the geo query DataManager.FetchDataFromServer runs
+
+    타깃의 points (lat, lon, radius, name?, min_records?) 를 한 번에 하나씩 돌아가며 요청한다.
+    앱처럼 gzip 으로 받아 지점마다
+        ttfb_ms / download_ms           서버 지연 (지오 쿼리) 과 전송 시간
+        compressed_bytes                모바일 망이 실제로 받는 바이트
+        uncompressed_bytes / records    응답 크기와 장소 수, bytes_per_record (레코드 비대화)
+        parse_ms                        json.loads 시간 (클라이언트 파싱 비용의 근사)
+    를 TrendTracker 로 추적한다 - 느려지는 쿼리나 커지는 응답은 spike / drift 로 잡힌다.
+    JSON 배열이 아니거나 min_records 보다 적으면 invalid_content. 엔진 루프에서만 호출.
+    """
+
+    def __init__(self, target, capacity=120, min_samples=10, rebaseline=10, recent=3, **kwargs):
+        self.name = target.name
+        self.points = self._build_points(target)
+        self.trends = TrendTracker(f"📍 {target.name}", capacity=capacity, min_samples=min_samples,
+                                   rebaseline=rebaseline, recent=recent,
+                                   max_fields=len(self.points) * len(METRICS), **kwargs)
+        self.next_point = 0
+        self.probes = 0
+        self.invalid = 0
+        self.compressed_total = 0
+        self.uncompressed_total = 0
+        self.parse_seconds = 0.0
+
+    @staticmethod
+    def _build_points(target):
+        if not target.points:
+            # points 없는 예전 설정 - URL 그대로 한 지점
+            query = dict(parse_qsl(urlsplit(target.url).query))
+            key = point_key(query) if 'lat' in query and 'lon' in query else 'default'
+            return [ProbePoint(key, target.url)]
+        points = []
+        separator = '&' if '?' in target.url else '?'
+        for point in target.points:
+            try:
+                params = {'lat': float(point['lat']), 'lon': float(point['lon']),
+                          'radius': float(point.get('radius', 1000))}
+            except (KeyError, TypeError, ValueError):
+                raise ValueError(f"{target.name}: point needs numeric lat/lon (got {point!r})")
+            params['radius'] = f"{params['radius']:g}"
+            points.append(ProbePoint(point_key(point), target.url + separator + urlencode(params),
+                                     int(point.get('min_records', 0))))
+        keys = [point.key for point in points]
+        if len(keys) != len(set(keys)):
+            raise ValueError(f"{target.name}: duplicate point names")
+        return points
+
+    async def probe(self, engine, name, url, timeout, headers=None, verify=True, expected_status=(200,)):
+        """Probe coroutine for engine.run_probe() → ProbeResult (url 은 지점 URL 로 대체)"""
+        point = self.points[self.next_point]
+        self.next_point = (self.next_point + 1) % len(self.points)
+        self.probes += 1
+        point.probes += 1
+        headers = dict(headers or {})
+        headers['Accept'] = 'application/json'
+        headers['Accept-Encoding'] = 'gzip'
+        try:
+            response = await engine.http.request('GET', point.url, headers=headers, verify=verify)
+        except (Exception, asyncio.CancelledError) as e:
+            # 타임아웃은 run_probe 의 wait_for 가 취소로 끝낸다
+            point.failures += 1
+            point.last_status = 'timeout' if isinstance(e, asyncio.CancelledError) else 'error'
+            point.last_error = str(e) or e.__class__.__name__
+            raise
+        healthy = response.status_code in expected_status
+        error = None
+        if healthy:
+            error = self._measure(point, response)
+        if error is not None:
+            self.invalid += 1
+            status = "invalid_content"
+            point.last_error = str(error)
+        else:
+            status = "healthy" if healthy else "unhealthy"
+        if status != "healthy":
+            point.failures += 1
+        point.last_status = status
+        return ProbeResult(name, healthy=healthy and error is None, status=status,
+                           status_code=response.status_code,
+                           response_time=response.timings.total,
+                           error=error,
+                           timings=response.timings.as_dict(),
+                           bytes=response.wire_bytes)
+
+    def _measure(self, point, response):
+        """Record one 200 response → error or None"""
+        body = response.body
+        # 파싱을 여기서 직접 재는 것이 목적이라 엔진 루프에서 그대로 (수백 KB 에 수 ms)
+        started = time.perf_counter()
+        try:
+            places = json.loads(body)
+        except ValueError as e:
+            return ValueError(f"{point.key}: invalid JSON ({e})")
+        finally:
+            parse = time.perf_counter() - started
+            self.parse_seconds += parse
+        if not isinstance(places, list):
+            return ValueError(f"{point.key}: expected a JSON array, got {type(places).__name__}")
+        records = len(places)
+        timings = response.timings
+        values = {
+            'ttfb_ms': timings.ttfb * 1000,
+            'download_ms': timings.download * 1000,
+            'compressed_bytes': response.wire_bytes,
+            'uncompressed_bytes': len(body),
+            'records': records,
+            'bytes_per_record': len(body) / records if records else 0.0,
+            'parse_ms': parse * 1000
+        }
+        self.compressed_total += response.wire_bytes
+        self.uncompressed_total += len(body)
+        point.last = values
+        point.last_error = None
+        self.trends.observe({f"{point.key}.{metric}": value for metric, value in values.items()})
+        if records < point.min_records:
+            return ValueError(f"{point.key}: only {records} places (expected ≥ {point.min_records})")
+        return None
+
+    def anomalies(self):
+        """→ [(field, kind, detail)] - field 는 "{지점}.{값}" """
+        return self.trends.anomalies()
+
+    def snapshot(self):
+        fields = self.trends.fields()
+        points = {}
+        for point in self.points:
+            points[point.key] = {
+                'url': point.url,
+                'probes': point.probes,
+                'failures': point.failures,
+                'status': point.last_status,
+                'error': point.last_error,
+                'last': dict(point.last),
+                'p50': {metric: fields.get(f"{point.key}.{metric}", {}).get('p50') for metric in METRICS},
+                'p90': {metric: fields.get(f"{point.key}.{metric}", {}).get('p90') for metric in METRICS}
+            }
+        return {
+            'probes': self.probes,
+            'invalid': self.invalid,
+            'compressed_bytes': self.compressed_total,
+            'uncompressed_bytes': self.uncompressed_total,
+            'parse_ms_per_probe': self.parse_seconds / self.probes * 1000 if self.probes else None,
+            'points': points,
+            'anomalies': self.anomalies()
+        }
@@ -0,0 +1,135 @@
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+
+OPENMETRICS_CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + '}'
+
+
+def _number(value):
+    if value is None:
+        return 'NaN'
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return f"{value:.1f}"
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class MetricsWriter:
+    """OpenMetrics / Prometheus text builder - family 단위로 TYPE/HELP 한 번씩 출력
+
+    두 형식은 counter 선언만 다르다: OpenMetrics 는 family 이름 (샘플은 _total) 에 TYPE 을 달고
+    # EOF 로 끝나며, Prometheus 0.0.4 는 샘플 이름 그대로 (_total) 선언하고 EOF 가 없다.
+    """
+
+    def __init__(self, prefix='woopang_monitor'):
+        self.prefix = prefix
+        self._families = {}         # family → (kind, help, sample lines) - 삽입 순서대로 출력
+
+    def _family(self, name, kind, help_text):
+        family = f"{self.prefix}_{name}"
+        if family not in self._families:
+            self._families[family] = (kind, help_text, [])
+        return family, self._families[family][2]
+
+    def counter(self, name, value, help_text='', labels=None):
+        family, lines = self._family(name, 'counter', help_text)
+        lines.append(f"{family}_total{_labels(labels)} {_number(value)}")
+
+    def gauge(self, name, value, help_text='', labels=None):
+        family, lines = self._family(name, 'gauge', help_text)
+        lines.append(f"{family}{_labels(labels)} {_number(value)}")
+
+    def histogram(self, name, snapshot, help_text='', labels=None):
+        """snapshot = CumulativeHistogram.snapshot()"""
+        family, lines = self._family(name, 'histogram', help_text)
+        cumulative, total, count = snapshot
+        labels = dict(labels or {})
+        for bound, running in cumulative:
+            le = bound if bound == '+Inf' else _number(float(bound))
+            lines.append(f"{family}_bucket{_labels(dict(labels, le=le))} {running}")
+        lines.append(f"{family}_sum{_labels(labels)} {_number(float(total))}")
+        lines.append(f"{family}_count{_labels(labels)} {count}")
+
+    def render(self):
+        """→ (OpenMetrics payload, Prometheus 0.0.4 text payload)"""
+        openmetrics, text = [], []
+        for family, (kind, help_text, lines) in self._families.items():
+            openmetrics.append(f"# TYPE {family} {kind}")
+            declared = f"{family}_total" if kind == 'counter' else family
+            text.append(f"# TYPE {declared} {kind}")
+            if help_text:
+                openmetrics.append(f"# HELP {family} {help_text}")
+                text.append(f"# HELP {declared} {help_text}")
+            openmetrics.extend(lines)
+            text.extend(lines)
+        openmetrics.append('# EOF')
+        return ('\n'.join(openmetrics) + '\n').encode('utf-8'), ''.join(line + '\n' for line in text).encode('utf-8')
+
+
+class MetricsExporter:
+    """Built-in /metrics endpoint
+
+    모니터 루프가 렌더링한 bytes 스냅샷을 publish() 로 참조 교체만 하고,
+    스크레이프 핸들러는 그 참조를 읽기만 한다 - 락이 없으므로 스크레이프가
+    프로브 루프를 막는 일은 없다.
+    """
+
+    def __init__(self, host='127.0.0.1', port=9108):
+        self.host = host
+        self.port = port
+        self.snapshot = (b'# EOF\n', b'')
+        self.scrapes = 0
+        self._server = None
+        self._thread = None
+
+    def publish(self, payloads):
+        """payloads = MetricsWriter.render() - (OpenMetrics, Prometheus text)"""
+        self.snapshot = payloads
+
+    def start(self):
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?', 1)[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                openmetrics, text = exporter.snapshot
+                exporter.scrapes += 1
+                # 🔧 수정: # EOF 와 family 이름 counter 선언은 OpenMetrics 에서만
+                if 'openmetrics' in self.headers.get('Accept', ''):
+                    content_type, payload = OPENMETRICS_CONTENT_TYPE, openmetrics
+                else:
+                    content_type, payload = PROMETHEUS_CONTENT_TYPE, text
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name='metrics-exporter', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
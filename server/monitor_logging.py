@@ -0,0 +1,150 @@
+import atexit
+import logging
+import os
+import queue
+import time
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+from colorama import Fore, Back, Style
+
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+INFO_FORMAT = '%(asctime)s - %(message)s'
+
+
+class ColoredFormatter(logging.Formatter):
+    """Colored log formatter (리스너 스레드에서 실행)"""
+
+    COLORS = {
+        'DEBUG': Fore.CYAN,
+        'INFO': Fore.GREEN,
+        'WARNING': Fore.YELLOW,
+        'ERROR': Fore.RED,
+        'CRITICAL': Fore.RED + Back.YELLOW
+    }
+
+    KEYWORD_COLORS = {
+        '✅': Fore.GREEN,
+        '❌': Fore.RED,
+        '⚠️': Fore.YELLOW,
+        '🚨': Fore.RED + Style.BRIGHT,
+        '🎉': Fore.GREEN + Style.BRIGHT,
+        '🔄': Fore.CYAN,
+        '🚀': Fore.BLUE + Style.BRIGHT,
+        '⏰': Fore.YELLOW,
+        '🔧': Fore.MAGENTA,
+        '📊': Fore.BLUE,
+        '🎯': Fore.GREEN + Style.BRIGHT,
+        '💤': Fore.BLUE,
+        '⏳': Fore.CYAN,
+        '🔒': Fore.MAGENTA,
+        '🌐': Fore.CYAN
+    }
+
+    # 치환 문자열은 클래스 생성 시 한 번만 만든다. 단일 정규식 치환(re.sub)도 측정해 봤지만
+    # CPython 에서는 키워드별 `in` 검사(C 수준 부분 문자열 탐색)보다 2~3배 느려서 쓰지 않음
+    _KEYWORD_REPLACEMENTS = tuple((keyword, f"{color}{keyword}{Style.RESET_ALL}")
+                                  for keyword, color in KEYWORD_COLORS.items())
+
+    def colorize(self, record, log_message):
+        level_color = self.COLORS.get(record.levelname, '')
+        if level_color:
+            log_message = f"{level_color}{log_message}{Style.RESET_ALL}"
+        for keyword, replacement in self._KEYWORD_REPLACEMENTS:
+            if keyword in log_message:
+                log_message = log_message.replace(keyword, replacement)
+        return log_message
+
+    def format(self, record):
+        return self.colorize(record, super().format(record))
+
+
+class ConsoleColoredFormatter(ColoredFormatter):
+    """INFO lines without the level name
+
+    🔧 수정: 레코드마다 공유 _style._fmt 를 바꿔 끼우지 않고 INFO 전용 스타일을 따로 둔다
+    (여러 스레드가 동시에 포맷해도 안전).
+    """
+
+    def __init__(self, fmt=LOG_FORMAT, info_fmt=INFO_FORMAT, datefmt=None):
+        super().__init__(fmt, datefmt)
+        self._info_style = logging.PercentStyle(info_fmt)
+
+    def formatMessage(self, record):
+        if record.levelno == logging.INFO:
+            return self._info_style.format(record)
+        return self._style.format(record)
+
+
+class SizeTimedRotatingFileHandler(RotatingFileHandler):
+    """Numbered rotation when the file exceeds max_bytes or an interval boundary passes
+
+    interval 경계는 로컬 자정 기준 (86400 = 매일 자정, 3600 = 매시 정각). 시작 시
+    기존 파일의 수정 시각으로 경계를 잡으므로 재실행해도 지난 날짜 로그에 이어 쓰지 않는다.
+    """
+
+    def __init__(self, filename, max_bytes=10 * 1024 * 1024, backup_count=7, interval=86400, encoding='utf-8'):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding=encoding, delay=True)
+        self.interval = interval
+        started = os.path.getmtime(self.baseFilename) if os.path.exists(self.baseFilename) else time.time()
+        self.rollover_at = self.next_boundary(started)
+
+    def next_boundary(self, after):
+        midnight = datetime.fromtimestamp(after).replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
+        return midnight + (int((after - midnight) // self.interval) + 1) * self.interval
+
+    def shouldRollover(self, record):
+        if self.interval and time.time() >= self.rollover_at:
+            return True
+        return super().shouldRollover(record)
+
+    def doRollover(self):
+        super().doRollover()
+        if self.interval:
+            self.rollover_at = self.next_boundary(time.time())
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that drops records instead of blocking when the queue is full"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # 디스크/콘솔이 막혀도 프로브 루프는 기다리지 않는다
+            self.dropped += 1
+
+
+def setup_logging(logger, log_file='monitor.log', level=logging.INFO, max_bytes=10 * 1024 * 1024,
+                  backup_count=7, interval=86400, queue_size=10000):
+    """Attach a queue handler to logger; console + rotating file output run on a listener thread
+
+    로거를 호출하는 스레드(프로브 루프, 재시작 스레드)는 큐에 넣기만 하고,
+    포맷·색칠·콘솔/파일 I/O 는 모두 리스너 스레드에서 한다. → (listener, queue handler)
+    """
+    for handler in logger.handlers[:]:
+        logger.removeHandler(handler)
+    logger.setLevel(level)
+
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(level)
+    console_handler.setFormatter(ConsoleColoredFormatter())
+
+    file_handler = SizeTimedRotatingFileHandler(log_file, max_bytes=max_bytes, backup_count=backup_count,
+                                                interval=interval)
+    file_handler.setLevel(level)
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    queue_handler = DroppingQueueHandler(queue.Queue(maxsize=queue_size))
+    listener = QueueListener(queue_handler.queue, console_handler, file_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)  # 종료 시 큐에 남은 레코드까지 출력
+
+    logger.addHandler(queue_handler)
+    logger.propagate = False
+    return listener, queue_handler
@@ -0,0 +1,83 @@
+import logging
+import time
+from collections import deque
+from datetime import datetime
+
+
+logger = logging.getLogger('woopang.monitor.state')
+
+HEALTHY = 'healthy'
+SUSPECT = 'suspect'
+CONFIRMING = 'confirming'
+RESTARTING = 'restarting'
+COOLING_DOWN = 'cooling_down'
+
+STATES = (HEALTHY, SUSPECT, CONFIRMING, RESTARTING, COOLING_DOWN)
+
+# healthy → suspect → confirming → restarting → cooling-down 순서 외의 전이 방지
+# (healthy → restarting 은 장애 없는 계획 재시작 - 누수 선제 재시작)
+ALLOWED_TRANSITIONS = {
+    HEALTHY: (SUSPECT, RESTARTING),
+    SUSPECT: (HEALTHY, CONFIRMING),
+    CONFIRMING: (HEALTHY, SUSPECT, RESTARTING),
+    RESTARTING: (COOLING_DOWN,),
+    COOLING_DOWN: (HEALTHY, SUSPECT)
+}
+
+STATE_ICONS = {
+    HEALTHY: '✅',
+    SUSPECT: '⚠️',
+    CONFIRMING: '🔄',
+    RESTARTING: '🚀',
+    COOLING_DOWN: '💤'
+}
+
+
+class MonitorStateMachine:
+    """Explicit monitor state with per-state time accounting
+
+    상태 변경은 프로브 엔진 루프에서만 일어나도록 호출측이 보장한다
+    (재시작 스레드는 call_soon_threadsafe 로 전이를 넘긴다).
+    """
+
+    def __init__(self, initial=HEALTHY, history=50):
+        self.state = initial
+        self.entered_at = time.monotonic()
+        self.entered_wall = datetime.now()
+        self.deadline = None
+        self.time_in_state = {state: 0.0 for state in STATES}
+        self.entries = {state: 0 for state in STATES}
+        self.entries[initial] = 1
+        self.history = deque(maxlen=history)
+
+    def transition(self, new_state, reason='', deadline=None):
+        if new_state == self.state:
+            return False
+        if new_state not in ALLOWED_TRANSITIONS[self.state]:
+            raise ValueError(f"invalid monitor transition {self.state} → {new_state}")
+
+        now = time.monotonic()
+        spent = now - self.entered_at
+        self.time_in_state[self.state] += spent
+        self.history.append((datetime.now(), self.state, new_state, spent, reason))
+        logger.info(f"{STATE_ICONS[new_state]} State {self.state.upper()} → {new_state.upper()} "
+                    f"({spent:.1f}s in {self.state}){' - ' + reason if reason else ''}")
+
+        self.state = new_state
+        self.entered_at = now
+        self.entered_wall = datetime.now()
+        self.entries[new_state] += 1
+        self.deadline = now + deadline if deadline is not None else None
+        return True
+
+    def elapsed(self):
+        return time.monotonic() - self.entered_at
+
+    def deadline_passed(self):
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def durations(self):
+        """Total seconds per state including the current one"""
+        totals = dict(self.time_in_state)
+        totals[self.state] += self.elapsed()
+        return totals
@@ -0,0 +1,140 @@
+import asyncio
+import ssl
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from http_pool import HttpProtocolError, PooledHttpClient
+
+
+class ProbeResult:
+    """Single probe outcome"""
+
+    __slots__ = ('name', 'healthy', 'status', 'status_code', 'response_time', 'error', 'started_at',
+                 'timings', 'bytes')
+
+    def __init__(self, name, healthy=False, status="unknown", status_code=None,
+                 response_time=None, error=None, started_at=None, timings=None, bytes=0):
+        self.name = name
+        self.healthy = healthy
+        self.status = status
+        self.status_code = status_code
+        self.response_time = response_time
+        self.error = error
+        self.started_at = started_at
+        self.timings = timings
+        self.bytes = bytes
+
+    def __repr__(self):
+        return (f"ProbeResult({self.name!r}, healthy={self.healthy}, status={self.status!r}, "
+                f"status_code={self.status_code}, response_time={self.response_time})")
+
+
+def classify_error(exc):
+    """프로브 예외를 모니터 상태 문자열로 변환
+
+    SSLError 는 OSError 의 하위 클래스이고 TimeoutError 도 OSError 라서
+    ssl → timeout → connection 순서로 검사한다. HttpProtocolError (잘못된 응답) 는 연결 오류로 본다.
+    """
+    if isinstance(exc, (ssl.SSLError, ssl.CertificateError)):
+        return "ssl_error"
+    if isinstance(exc, (asyncio.TimeoutError, TimeoutError)):
+        return "timeout"
+    if isinstance(exc, (HttpProtocolError, asyncio.IncompleteReadError, OSError)):
+        return "connection_error"
+    return "unknown_error"
+
+
+class AsyncProbeEngine:
+    """Asyncio probe engine - 한 사이클의 모든 프로브를 하나의 이벤트 루프에서 동시에 실행
+
+    이벤트 루프는 전용 데몬 스레드에서 돌고, 모니터 스레드는 run_cycle() 로
+    프로브 묶음을 넘긴 뒤 결과를 기다린다. 사이클 시간은 프로브 합이 아니라
+    가장 느린 프로브(최대 per-probe timeout)로 제한된다.
+    """
+
+    def __init__(self, max_workers=8):
+        self.loop = asyncio.new_event_loop()
+        self.http = PooledHttpClient()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='probe')
+        self._thread = None
+        self._started = threading.Event()
+        self.result_hook = None     # 모든 프로브 결과를 받는 콜백 (엔진 루프에서 호출, 블로킹 금지)
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run_loop, name='probe-engine', daemon=True)
+        self._thread.start()
+        self._started.wait()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.set_default_executor(self._executor)
+        self.loop.call_soon(self._started.set)
+        self.loop.run_forever()
+
+    def stop(self):
+        if self._thread and self._thread.is_alive():
+            self.loop.call_soon_threadsafe(self.http.close)
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout=5)
+        self._executor.shutdown(wait=False)
+
+    def submit(self, coro):
+        """코루틴을 엔진 루프에 올리고 concurrent.futures.Future 반환"""
+        self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    async def run_probe(self, name, coro, timeout):
+        """단일 프로브를 per-probe timeout 안에서 실행 - 예외는 ProbeResult 로 흡수"""
+        started_at = time.time()
+        start = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(coro, timeout=timeout)
+        except Exception as e:
+            result = ProbeResult(name, healthy=False, status=classify_error(e),
+                                 response_time=None, error=e, started_at=started_at)
+        else:
+            if result.response_time is None:
+                result.response_time = time.perf_counter() - start
+            result.started_at = started_at
+        if self.result_hook is not None:
+            self.result_hook(result)
+        return result
+
+    async def gather(self, probes):
+        """Await all probes concurrently from inside the engine loop"""
+        tasks = [self.run_probe(name, coro, timeout) for name, coro, timeout in probes]
+        results = await asyncio.gather(*tasks)
+        return {r.name: r for r in results}
+
+    def run_cycle(self, probes):
+        """probes: [(name, coroutine, timeout), ...] → {name: ProbeResult}
+
+        모든 프로브가 동시에 시작되므로 호출은 가장 긴 timeout 을 넘기지 않는다.
+        엔진 루프 밖의 스레드에서만 호출할 것 (루프 안에서는 await gather()).
+        """
+        if not probes:
+            return {}
+        deadline = max(timeout for _, _, timeout in probes) + 1.0
+        return self.submit(self.gather(probes)).result(timeout=deadline)
+
+    def run_one(self, name, coro, timeout):
+        return self.run_cycle([(name, coro, timeout)])[name]
+
+    async def http_get(self, name, url, timeout, headers=None, verify=True, allow_redirects=True, fresh=False,
+                       expected_status=(200,), addresses=None):
+        """HTTP GET 프로브 - keep-alive 풀 사용, 단계별 시간(dns/connect/tls/ttfb/download) 포함
+
+        timeout 은 run_probe() 의 wait_for 가 전체 데드라인으로 강제한다.
+        """
+        response = await self.http.get(url, headers=headers, verify=verify,
+                                       allow_redirects=allow_redirects, fresh=fresh, addresses=addresses)
+        healthy = response.status_code in expected_status
+        return ProbeResult(name, healthy=healthy,
+                           status="healthy" if healthy else "unhealthy",
+                           status_code=response.status_code,
+                           response_time=response.timings.total,
+                           timings=response.timings.as_dict(),
+                           bytes=response.wire_bytes)
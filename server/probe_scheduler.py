@@ -0,0 +1,222 @@
+import asyncio
+import heapq
+import json
+import logging
+import os
+import random
+
+
+logger = logging.getLogger('woopang.monitor.scheduler')
+
+DEFAULT_TARGETS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'monitor_targets.json')
+
+# http       단순 GET (상태 코드만 판정)
+# locations  /locations 합성 프로브 - points 의 좌표/반경을 돌아가며 (locations_probe.py)
+TARGET_KINDS = ('http', 'locations')
+
+
+class ProbeTarget:
+    """One endpoint from monitor_targets.json
+
+    probe 가 있으면 (name, url, timeout, headers, verify, expected_status) → 코루틴 으로
+    http_get 대신 쓴다 - kind 별 프로브는 모니터가 붙인다.
+    """
+
+    __slots__ = ('name', 'url', 'interval', 'timeout', 'expected_status', 'headers',
+                 'verify', 'jitter', 'critical', 'kind', 'points', 'probe')
+
+    def __init__(self, name, url, interval=10, timeout=8, expected_status=(200,), headers=None,
+                 verify=True, jitter=None, critical=False, kind='http', points=None):
+        if kind not in TARGET_KINDS:
+            raise ValueError(f"unknown probe target kind {kind!r} for {name} (one of {', '.join(TARGET_KINDS)})")
+        self.name = name
+        self.url = url
+        self.interval = float(interval)
+        self.timeout = float(timeout)
+        if isinstance(expected_status, int):
+            expected_status = (expected_status,)
+        self.expected_status = tuple(expected_status)
+        self.headers = headers or {'User-Agent': 'WoopangMonitor/Probe'}
+        self.verify = verify
+        # 시작 지터 기본값 = interval (모든 타깃이 같은 순간 몰리지 않도록)
+        self.jitter = self.interval if jitter is None else float(jitter)
+        self.critical = critical
+        self.kind = kind
+        self.points = list(points or [])
+        self.probe = None
+
+    @classmethod
+    def from_dict(cls, data, base_url=''):
+        url = data['url']
+        if url.startswith('/'):
+            url = base_url.rstrip('/') + url
+        return cls(
+            data['name'], url,
+            interval=data.get('interval', 10),
+            timeout=data.get('timeout', 8),
+            expected_status=data.get('expected_status', 200),
+            headers=data.get('headers'),
+            verify=data.get('verify', True),
+            jitter=data.get('jitter'),
+            critical=data.get('critical', False),
+            kind=data.get('kind', 'http'),
+            points=data.get('points')
+        )
+
+
+class ScheduledJob:
+    """Periodic coroutine (e.g. the monitor tick) sharing the probe run queue"""
+
+    __slots__ = ('name', 'interval', 'jitter', 'func')
+
+    def __init__(self, name, interval, func, jitter=0.0):
+        self.name = name
+        self.interval = float(interval)
+        self.jitter = float(jitter)
+        self.func = func
+
+
+def load_targets(path=DEFAULT_TARGETS_PATH):
+    """Load probe targets from a JSON config - 파일이 없으면 빈 목록"""
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as f:
+        config = json.load(f)
+    base_url = config.get('base_url', '')
+    targets = [ProbeTarget.from_dict(t, base_url) for t in config.get('targets', []) if t.get('enabled', True)]
+    names = [t.name for t in targets]
+    if len(names) != len(set(names)):
+        raise ValueError(f"duplicate probe target names in {path}")
+    return targets
+
+
+class ProbeScheduler:
+    """Heap-based run queue on the probe engine loop
+
+    타깃 수와 상관없이 스레드 하나(엔진 루프)와 태스크 하나로 다음 실행 시각이
+    가장 이른 타깃(또는 ScheduledJob)부터 꺼내 실행한다. 같은 타깃의 이전 프로브가 아직 진행 중이면
+    그 회차는 건너뛰고, 동시에 진행되는 프로브 수는 max_concurrency 로 제한한다.
+    """
+
+    def __init__(self, engine, on_result, max_concurrency=32):
+        self.engine = engine
+        self.on_result = on_result
+        self.max_concurrency = max_concurrency
+        self.targets = {}
+        self._heap = []
+        self._seq = 0
+        self._in_flight = set()
+        self._wake = None
+        self._slots = None
+        self._task = None
+        self.running = False
+        self.stats = {
+            'fired': 0,
+            'skipped_overlap': 0
+        }
+
+    def _push(self, due, target):
+        self._seq += 1
+        heapq.heappush(self._heap, (due, self._seq, target))
+
+    def _add(self, target):
+        if target.name in self.targets:
+            self._remove(target.name)
+        self.targets[target.name] = target
+        self._push(self.engine.loop.time() + random.uniform(0, target.jitter), target)
+        if self._wake:
+            self._wake.set()
+
+    def _remove(self, name):
+        self.targets.pop(name, None)
+        self._heap = [entry for entry in self._heap if entry[2].name != name]
+        heapq.heapify(self._heap)
+
+    def add_target(self, target):
+        self.engine.start()
+        self.engine.loop.call_soon_threadsafe(self._add, target)
+
+    def add_job(self, name, interval, func, jitter=0.0):
+        """Run coroutine function func every interval seconds on the engine loop"""
+        self.add_target(ScheduledJob(name, interval, func, jitter))
+
+    def remove_target(self, name):
+        self.engine.loop.call_soon_threadsafe(self._remove, name)
+
+    def start(self, targets=()):
+        if self.running:
+            return
+        self.running = True
+        for target in targets:
+            self.add_target(target)
+        self._task = self.engine.submit(self._run())
+
+    def stop(self):
+        self.running = False
+        if self._wake:
+            self.engine.loop.call_soon_threadsafe(self._wake.set)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+
+        while self.running:
+            if not self._heap:
+                await self._wake.wait()
+                self._wake.clear()
+                continue
+
+            due, _, target = self._heap[0]
+            delay = due - loop.time()
+            if delay > 0:
+                # 새 타깃 추가/정지 시 깨어나서 힙 맨 앞을 다시 확인
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+                continue
+
+            heapq.heappop(self._heap)
+            if target.name not in self.targets:
+                continue
+
+            if target.name in self._in_flight:
+                self.stats['skipped_overlap'] += 1
+            else:
+                self._in_flight.add(target.name)
+                loop.create_task(self._fire(target))
+                self.stats['fired'] += 1
+
+            # 드리프트 없는 다음 실행 시각 - 밀린 회차는 따라잡지 않고 건너뜀
+            next_due = due + target.interval
+            now = loop.time()
+            if next_due <= now:
+                next_due = now + target.interval
+            self._push(next_due, target)
+
+    async def _fire(self, target):
+        if isinstance(target, ScheduledJob):
+            try:
+                await target.func()
+            except Exception as e:
+                logger.error(f"❌ Scheduled job {target.name} failed: {e}")
+            finally:
+                self._in_flight.discard(target.name)
+            return
+        try:
+            probe = target.probe or self.engine.http_get
+            async with self._slots:
+                result = await self.engine.run_probe(
+                    target.name,
+                    probe(target.name, target.url, target.timeout,
+                          headers=target.headers, verify=target.verify,
+                          expected_status=target.expected_status),
+                    target.timeout
+                )
+            self.on_result(target, result)
+        except Exception as e:
+            logger.error(f"❌ Scheduled probe {target.name} failed: {e}")
+        finally:
+            self._in_flight.discard(target.name)
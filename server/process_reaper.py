@@ -0,0 +1,145 @@
+import os
+import socket
+import time
+
+import psutil
+
+
+class ReapReport:
+    """Outcome of one reap() call"""
+
+    __slots__ = ('targets', 'terminated', 'killed', 'survivors', 'port_free', 'elapsed', 'port_free_after')
+
+    def __init__(self):
+        self.targets = []
+        self.terminated = []
+        self.killed = []
+        self.survivors = []
+        self.port_free = False
+        self.elapsed = 0.0
+        self.port_free_after = None
+
+    def as_dict(self):
+        return {
+            'targets': list(self.targets),
+            'terminated': list(self.terminated),
+            'killed': list(self.killed),
+            'survivors': list(self.survivors),
+            'port_free': self.port_free,
+            'elapsed': self.elapsed,
+            'port_free_after': self.port_free_after
+        }
+
+
+class ProcessReaper:
+    """Find the listening-socket owner and app processes, stop them, return when the port is free
+
+    netstat 출력 파싱 대신 psutil 로 소켓 소유자를 직접 찾고, terminate →
+    wait_procs(데드라인) → 남은 프로세스만 kill 순서로 진행한다. 고정 sleep 없이
+    포트가 실제로 비는 순간 반환한다.
+    """
+
+    def __init__(self, port=443, cmdline_marker='app_improved.py', host='127.0.0.1',
+                 terminate_timeout=5.0, kill_timeout=3.0, port_free_timeout=5.0):
+        self.port = port
+        self.cmdline_marker = cmdline_marker
+        self.host = host
+        self.terminate_timeout = terminate_timeout
+        self.kill_timeout = kill_timeout
+        self.port_free_timeout = port_free_timeout
+
+    def listening_pids(self):
+        """PIDs owning a LISTEN socket on the port"""
+        pids = set()
+        try:
+            connections = psutil.net_connections(kind='tcp')
+        except psutil.AccessDenied:
+            # macOS 등 비root 환경 - 프로세스별 조회로 대체
+            connections = []
+            for proc in psutil.process_iter(['pid']):
+                try:
+                    getter = getattr(proc, 'net_connections', None) or proc.connections
+                    for conn in getter(kind='tcp'):
+                        if conn.status == psutil.CONN_LISTEN and conn.laddr and conn.laddr.port == self.port:
+                            pids.add(proc.pid)
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    pass
+            return pids
+        for conn in connections:
+            if conn.status == psutil.CONN_LISTEN and conn.laddr and conn.laddr.port == self.port and conn.pid:
+                pids.add(conn.pid)
+        return pids
+
+    def app_pids(self):
+        """PIDs running the app script (single process scan)
+
+        인자 중 하나의 파일명이 정확히 cmdline_marker 인 프로세스만 대상으로 한다 -
+        단순 부분 문자열 비교는 그 이름을 포함한 셸/에디터 명령까지 잡는다.
+        """
+        pids = set()
+        for proc in psutil.process_iter(['pid', 'cmdline']):
+            cmdline = proc.info.get('cmdline')
+            if cmdline and any(os.path.basename(str(part)) == self.cmdline_marker for part in cmdline[1:]):
+                pids.add(proc.info['pid'])
+        return pids
+
+    def find_targets(self):
+        pids = self.listening_pids() | self.app_pids()
+        pids.discard(os.getpid())
+        processes = []
+        for pid in sorted(pids):
+            try:
+                processes.append(psutil.Process(pid))
+            except psutil.NoSuchProcess:
+                pass
+        return processes
+
+    def port_is_free(self):
+        """No listener accepts on the port (connect refused)"""
+        try:
+            with socket.create_connection((self.host, self.port), timeout=0.2):
+                return False
+        except OSError:
+            return True
+
+    def wait_port_free(self, timeout):
+        deadline = time.perf_counter() + timeout
+        delay = 0.005
+        while True:
+            if self.port_is_free():
+                return True
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return False
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, 0.2)
+
+    def reap(self):
+        start = time.perf_counter()
+        report = ReapReport()
+        processes = self.find_targets()
+        report.targets = [p.pid for p in processes]
+
+        for proc in processes:
+            try:
+                proc.terminate()
+            except psutil.NoSuchProcess:
+                pass
+        gone, alive = psutil.wait_procs(processes, timeout=self.terminate_timeout)
+        report.terminated = [p.pid for p in gone]
+
+        if alive:
+            for proc in alive:
+                try:
+                    proc.kill()
+                except psutil.NoSuchProcess:
+                    pass
+            gone, alive = psutil.wait_procs(alive, timeout=self.kill_timeout)
+            report.killed = [p.pid for p in gone]
+            report.survivors = [p.pid for p in alive]
+
+        report.port_free = self.wait_port_free(self.port_free_timeout)
+        report.elapsed = time.perf_counter() - start
+        if report.port_free:
+            report.port_free_after = report.elapsed
+        return report
@@ -0,0 +1,144 @@
+import asyncio
+import time
+
+
+STAGES = ('port_open', 'local_ready', 'external_ready')
+
+
+class ReadinessReport:
+    """Seconds from spawn to each readiness stage (None = not reached)"""
+
+    __slots__ = ('port_open', 'local_ready', 'external_ready', 'failed_stage', 'reason', 'attempts',
+                 'external_result')
+
+    def __init__(self):
+        self.port_open = None
+        self.local_ready = None
+        self.external_ready = None
+        self.failed_stage = None
+        self.reason = None
+        self.attempts = {stage: 0 for stage in STAGES}
+        self.external_result = None
+
+    @property
+    def ready(self):
+        return self.external_ready is not None
+
+    def as_dict(self):
+        return {
+            'port_open': self.port_open,
+            'local_ready': self.local_ready,
+            'external_ready': self.external_ready,
+            'failed_stage': self.failed_stage,
+            'reason': self.reason,
+            'attempts': dict(self.attempts)
+        }
+
+    def describe(self):
+        def fmt(value):
+            return f"{value:.2f}s" if value is not None else "-"
+        return (f"port open {fmt(self.port_open)} → local ready {fmt(self.local_ready)} "
+                f"→ externally ready {fmt(self.external_ready)}")
+
+
+class _ProcessExited(Exception):
+    pass
+
+
+class ReadinessDetector:
+    """Staged readiness check for a freshly spawned app_improved.py
+
+    1) 로컬 TCP connect (ms 단위 백오프) - 포트가 열리는 순간 감지
+    2) 로컬 HTTP /health - 앱이 요청을 처리할 수 있는지
+    3) 외부 체크 - 실제 woopang.com 접속 복구 확인
+    앞 단계가 통과해야 다음 단계로 넘어가므로 느린 외부 체크가
+    서버가 아직 뜨지도 않은 구간을 잡아먹지 않는다.
+    """
+
+    def __init__(self, engine, host, port, local_health_url, external_probe, external_timeout=8.0,
+                 connect_backoff=(0.005, 0.2), http_backoff=(0.05, 0.5), external_backoff=(0.25, 1.0)):
+        self.engine = engine
+        self.host = host
+        self.port = port
+        self.local_health_url = local_health_url
+        self.external_probe = external_probe
+        self.external_timeout = external_timeout
+        self.connect_backoff = connect_backoff
+        self.http_backoff = http_backoff
+        self.external_backoff = external_backoff
+
+    @staticmethod
+    def _check_process(process):
+        if process is not None and process.poll() is not None:
+            raise _ProcessExited(f"process exited with code {process.returncode}")
+
+    async def _retry(self, attempt, backoff, deadline, process, report, stage):
+        delay, max_delay = backoff
+        loop = asyncio.get_running_loop()
+        while True:
+            self._check_process(process)
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise asyncio.TimeoutError(f"{stage} deadline exceeded")
+            report.attempts[stage] += 1
+            if await attempt(remaining):
+                return
+            await asyncio.sleep(min(delay, max(0.0, deadline - loop.time())))
+            delay = min(delay * 2, max_delay)
+
+    async def _port_open(self, remaining):
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection(self.host, self.port),
+                                               timeout=min(1.0, remaining))
+        except (OSError, asyncio.TimeoutError):
+            return False
+        writer.close()
+        return True
+
+    async def _local_ready(self, remaining):
+        timeout = min(2.0, remaining)
+        result = await self.engine.run_probe(
+            'local_health',
+            self.engine.http_get('local_health', self.local_health_url, timeout,
+                                 headers={'User-Agent': 'WoopangMonitor/Readiness'},
+                                 verify=False, fresh=True),
+            timeout
+        )
+        return result.healthy
+
+    async def wait_ready(self, process=None, started=None, timeout=90, skip_local=False):
+        """Run the stages in order; returns ReadinessReport (never raises)
+
+        skip_local=True 는 로컬 단계를 호출측이 이미 판정한 경우 (소켓 핸드오프 등)
+        외부 단계만 실행한다.
+        """
+        loop = asyncio.get_running_loop()
+        report = ReadinessReport()
+        started = time.perf_counter() if started is None else started
+        deadline = loop.time() + timeout
+
+        async def external_ready(remaining):
+            name, coro, probe_timeout = self.external_probe(min(remaining, self.external_timeout))
+            report.external_result = await self.engine.run_probe(name, coro, probe_timeout)
+            return report.external_result.healthy
+
+        stage = 'port_open'
+        try:
+            if not skip_local:
+                await self._retry(self._port_open, self.connect_backoff, deadline, process, report, stage)
+                report.port_open = time.perf_counter() - started
+
+                stage = 'local_ready'
+                await self._retry(self._local_ready, self.http_backoff, deadline, process, report, stage)
+                report.local_ready = time.perf_counter() - started
+
+            stage = 'external_ready'
+            await self._retry(external_ready, self.external_backoff, deadline, process, report, stage)
+            report.external_ready = time.perf_counter() - started
+        except _ProcessExited as e:
+            report.failed_stage = stage
+            report.reason = str(e)
+        except asyncio.TimeoutError:
+            report.failed_stage = stage
+            report.reason = f"timeout after {timeout}s"
+        return report
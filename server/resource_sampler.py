@@ -0,0 +1,172 @@
+import logging
+import os
+import threading
+import time
+from array import array
+
+import psutil
+
+from latency_stats import RingBuffer
+
+
+logger = logging.getLogger('woopang.monitor.sampler')
+
+SYSTEM_FIELDS = ('cpu_percent', 'memory_percent', 'memory_used', 'memory_available', 'swap_percent', 'load1')
+PROCESS_FIELDS = ('rss', 'cpu_percent', 'threads', 'fds', 'connections')
+
+
+class SampleSeries:
+    """Column-wise ring buffers (one array per field) sharing a timestamp ring"""
+
+    __slots__ = ('times', 'columns', 'pid')
+
+    def __init__(self, fields, capacity, pid=None):
+        self.pid = pid
+        self.times = RingBuffer(capacity)
+        self.columns = {field: RingBuffer(capacity) for field in fields}
+
+    def append(self, timestamp, values):
+        self.times.append(timestamp)
+        for field, ring in self.columns.items():
+            value = values.get(field)
+            ring.append(float('nan') if value is None else value)
+
+    def __len__(self):
+        return len(self.times)
+
+    def values(self, field):
+        return self.columns[field].values()
+
+
+class ResourceSampler:
+    """Machine + per-process resource sampling on its own thread
+
+    프로브 경로에서는 psutil 을 호출하지 않고 latest() 스냅샷만 읽는다. 스냅샷은
+    샘플마다 새 dict 로 만들어 참조만 교체하므로 읽는 쪽에 락이 필요 없다.
+    process_provider() 는 {이름: pid} 를 돌려주는 함수 (메인/워커/스탠바이).
+    """
+
+    def __init__(self, process_provider, interval=5.0, capacity=720):
+        self.process_provider = process_provider
+        self.interval = interval
+        self.capacity = capacity
+        self.system = SampleSeries(SYSTEM_FIELDS, capacity)
+        self.processes = {}
+        self._handles = {}
+        self._snapshot = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.sample_seconds = 0.0
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        psutil.cpu_percent(interval=None)  # prime non-blocking CPU sampling
+        self.sample()
+        self._thread = threading.Thread(target=self._run, name='resource-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def _run(self):
+        next_run = time.monotonic() + self.interval
+        while not self._stop.wait(max(0.0, next_run - time.monotonic())):
+            try:
+                self.sample()
+            except Exception as e:
+                logger.warning(f"⚠️ Resource sample failed: {e}")
+            next_run += self.interval
+            if next_run < time.monotonic():
+                next_run = time.monotonic() + self.interval
+
+    def latest(self):
+        """Most recent snapshot {'time', 'system', 'processes'} or None before the first sample"""
+        return self._snapshot
+
+    def series(self, name, field):
+        """(times, values) arrays oldest → newest for a process name ('system' for machine metrics)"""
+        with self._lock:
+            series = self.system if name == 'system' else self.processes.get(name)
+            if series is None:
+                return array('d'), array('d')
+            return series.times.values(), series.values(field)
+
+    def process_names(self):
+        with self._lock:
+            return list(self.processes)
+
+    def sample(self):
+        start = time.perf_counter()
+        now = time.time()
+        memory = psutil.virtual_memory()
+        system = {
+            'cpu_percent': psutil.cpu_percent(interval=None),
+            'memory_percent': memory.percent,
+            'memory_used': memory.used,
+            'memory_available': memory.available,
+            'swap_percent': psutil.swap_memory().percent,
+            'load1': os.getloadavg()[0] if hasattr(os, 'getloadavg') else None
+        }
+
+        processes = {}
+        wanted = self.process_provider()
+        for name, pid in wanted.items():
+            values = self._sample_process(name, pid)
+            if values is not None:
+                processes[name] = values
+
+        with self._lock:
+            self.system.append(now, system)
+            for name, values in processes.items():
+                series = self.processes.get(name)
+                # 재시작으로 pid 가 바뀌면 이전 프로세스 추세와 섞이지 않도록 새 버퍼
+                if series is None or series.pid != values['pid']:
+                    series = self.processes[name] = SampleSeries(PROCESS_FIELDS, self.capacity, values['pid'])
+                series.append(now, values)
+            # 더 이상 감독하지 않는 이름은 버퍼째 정리
+            for name in list(self.processes):
+                if name not in wanted:
+                    del self.processes[name]
+        for name in list(self._handles):
+            if name not in wanted:
+                del self._handles[name]
+
+        self.sample_seconds = time.perf_counter() - start
+        self._snapshot = {'time': now, 'system': system, 'processes': processes}
+        return self._snapshot
+
+    def _sample_process(self, name, pid):
+        """One oneshot() read per process; the Process handle is kept so cpu_percent spans samples"""
+        handle = self._handles.get(name)
+        if handle is None or handle.pid != pid:
+            try:
+                handle = self._handles[name] = psutil.Process(pid)
+                handle.cpu_percent(interval=None)
+            except psutil.Error:
+                self._handles.pop(name, None)
+                return None
+        try:
+            with handle.oneshot():
+                values = {
+                    'pid': pid,
+                    'rss': handle.memory_info().rss,
+                    'cpu_percent': handle.cpu_percent(interval=None),
+                    'threads': handle.num_threads(),
+                    'fds': handle.num_fds() if hasattr(handle, 'num_fds') else handle.num_handles()
+                }
+            try:
+                getter = getattr(handle, 'net_connections', None) or handle.connections
+                values['connections'] = len(getter(kind='tcp'))
+            except psutil.AccessDenied:
+                values['connections'] = None
+        except psutil.NoSuchProcess:
+            self._handles.pop(name, None)
+            return None
+        except psutil.AccessDenied:
+            return None
+        return values
@@ -0,0 +1,290 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from array import array
+
+from latency_stats import LogHistogram
+
+
+logger = logging.getLogger('woopang.monitor.rollups')
+
+MINUTE = 60
+HOUR = 3600
+DAY = 86400
+RESOLUTIONS = {'minute': MINUTE, 'hour': HOUR, 'day': DAY}
+
+# 해상도별 보존 기간 (s) - None 은 영구
+DEFAULT_RETENTION = {MINUTE: 7 * DAY, HOUR: 180 * DAY, DAY: None}
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS rollups (
+    resolution INTEGER NOT NULL,
+    target TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    errors INTEGER NOT NULL,
+    latency_count INTEGER NOT NULL,
+    latency_sum REAL NOT NULL,
+    latency_min REAL,
+    latency_max REAL,
+    latency_p95 REAL,
+    histogram BLOB NOT NULL,
+    PRIMARY KEY (resolution, target, bucket)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS rollups_by_time ON rollups (resolution, bucket);
+CREATE TABLE IF NOT EXISTS state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    updated REAL NOT NULL
+);
+'''
+
+COLUMNS = ('count', 'errors', 'latency_count', 'latency_sum', 'latency_min', 'latency_max', 'latency_p95', 'histogram')
+
+
+class Rollup:
+    """Count, errors and a sparse log histogram of successful latencies for one bucket
+
+    분위수는 합칠 수 없으므로 LogHistogram 버킷 카운트를 (index, count) 쌍으로 같이
+    저장하고, 분→시→일 로 합칠 때 버킷 카운트를 더한 뒤 p95 를 다시 계산한다.
+    """
+
+    __slots__ = ('count', 'errors', 'latency_count', 'latency_sum', 'latency_min', 'latency_max', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.latency_count = 0
+        self.latency_sum = 0.0
+        self.latency_min = None
+        self.latency_max = None
+        self.buckets = {}
+
+    def add(self, healthy, latency):
+        self.count += 1
+        if not healthy:
+            self.errors += 1
+            return
+        if latency is None:
+            return
+        self.latency_count += 1
+        self.latency_sum += latency
+        self.latency_min = latency if self.latency_min is None else min(self.latency_min, latency)
+        self.latency_max = latency if self.latency_max is None else max(self.latency_max, latency)
+        bucket = LogHistogram.bucket_of(latency)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def merge(self, other):
+        self.count += other.count
+        self.errors += other.errors
+        self.latency_count += other.latency_count
+        self.latency_sum += other.latency_sum
+        for attr, pick in (('latency_min', min), ('latency_max', max)):
+            mine, theirs = getattr(self, attr), getattr(other, attr)
+            setattr(self, attr, theirs if mine is None else mine if theirs is None else pick(mine, theirs))
+        for bucket, count in other.buckets.items():
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+
+    def quantile(self, q):
+        if not self.buckets:
+            return None
+        counts = LogHistogram.new_counts()
+        for bucket, count in self.buckets.items():
+            counts[bucket] = count
+        value = LogHistogram.quantiles(counts, (q,))[0]
+        # 버킷 대표값은 ~5% 오차가 있으므로 실측 최소/최대 안으로 자른다
+        return min(max(value, self.latency_min), self.latency_max) if value is not None else None
+
+    def count_at_most(self, seconds):
+        """Successful probes at or under seconds (버킷 해상도 ~5%)"""
+        limit = LogHistogram.bucket_of(seconds)
+        return sum(count for bucket, count in self.buckets.items() if bucket < limit or
+                   (bucket == limit and LogHistogram.bucket_value(bucket) <= seconds))
+
+    def to_row(self):
+        pairs = array('I')
+        for bucket in sorted(self.buckets):
+            pairs.extend((bucket, self.buckets[bucket]))
+        return (self.count, self.errors, self.latency_count, self.latency_sum, self.latency_min,
+                self.latency_max, self.quantile(0.95), pairs.tobytes())
+
+    @classmethod
+    def from_row(cls, row):
+        rollup = cls()
+        (rollup.count, rollup.errors, rollup.latency_count, rollup.latency_sum,
+         rollup.latency_min, rollup.latency_max, _, blob) = row
+        pairs = array('I')
+        pairs.frombytes(blob)
+        rollup.buckets = dict(zip(pairs[0::2], pairs[1::2]))
+        return rollup
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'latency_min': self.latency_min,
+            'latency_avg': self.latency_sum / self.latency_count if self.latency_count else None,
+            'latency_p95': self.quantile(0.95),
+            'latency_max': self.latency_max
+        }
+
+
+class RollupStore:
+    """Per-minute/hour/day rollups in SQLite (WAL), written in batches from its own thread
+
+    record() 는 프로브 엔진 루프에서 메모리 누적만 하고, flush_interval 마다 스레드가
+    누적분을 한 트랜잭션으로 분/시/일 행에 병합(upsert)한다. 같은 스레드가
+    state_provider() 스냅샷(모니터 카운터)도 저장해 재실행 시 load_state() 로 복구한다.
+    """
+
+    def __init__(self, path, state_provider=None, flush_interval=30.0, retention=None):
+        self.path = path
+        self.state_provider = state_provider
+        self.flush_interval = flush_interval
+        self.retention = dict(DEFAULT_RETENTION, **(retention or {}))
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.executescript(SCHEMA)
+        self._db_lock = threading.Lock()
+        self._pending = {}          # (target, minute) → Rollup
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.flush_seconds = 0.0
+        self.rows_written = 0
+
+    def record(self, name, result):
+        minute = int((result.started_at or time.time()) // MINUTE) * MINUTE
+        with self._lock:
+            rollup = self._pending.get((name, minute))
+            if rollup is None:
+                rollup = self._pending[(name, minute)] = Rollup()
+            rollup.add(result.healthy, result.response_time)
+
+    def flush(self):
+        start = time.perf_counter()
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        state = self.state_provider() if self.state_provider else None
+        if not pending and state is None:
+            return
+
+        # 분 누적분을 분/시/일 버킷으로 먼저 모은 뒤 키마다 한 번씩만 읽고 쓴다
+        merged = {}
+        for (target, minute), rollup in pending.items():
+            for resolution in (MINUTE, HOUR, DAY):
+                key = (resolution, target, self.bucket_start(minute, resolution))
+                existing = merged.get(key)
+                if existing is None:
+                    existing = merged[key] = Rollup()
+                existing.merge(rollup)
+
+        with self._db_lock:
+            self.db.execute('BEGIN IMMEDIATE')
+            try:
+                rows = []
+                for (resolution, target, bucket), rollup in merged.items():
+                    row = self.db.execute(
+                        f"SELECT {', '.join(COLUMNS)} FROM rollups WHERE resolution=? AND target=? AND bucket=?",
+                        (resolution, target, bucket)
+                    ).fetchone()
+                    if row is not None:
+                        stored = Rollup.from_row(row)
+                        stored.merge(rollup)
+                        rollup = stored
+                    rows.append((resolution, target, bucket) + rollup.to_row())
+                self.db.executemany(
+                    f"INSERT OR REPLACE INTO rollups (resolution, target, bucket, {', '.join(COLUMNS)}) "
+                    f"VALUES ({', '.join('?' * (3 + len(COLUMNS)))})", rows
+                )
+                if state is not None:
+                    self.db.execute('INSERT OR REPLACE INTO state (key, value, updated) VALUES (?, ?, ?)',
+                                    ('monitor', json.dumps(state, default=str), time.time()))
+                self.db.execute('COMMIT')
+            except Exception:
+                self.db.execute('ROLLBACK')
+                with self._lock:
+                    # 다음 flush 에서 다시 시도
+                    for key, rollup in pending.items():
+                        existing = self._pending.setdefault(key, Rollup())
+                        existing.merge(rollup)
+                raise
+        self.rows_written += len(rows)
+        self.flush_seconds = time.perf_counter() - start
+
+    @staticmethod
+    def bucket_start(timestamp, resolution):
+        if resolution == DAY:
+            # 일 단위는 로컬 자정 기준 (check_history 세그먼트와 같은 날짜 경계)
+            local = time.localtime(timestamp)
+            return int(time.mktime((local.tm_year, local.tm_mon, local.tm_mday, 0, 0, 0, 0, 0, -1)))
+        return int(timestamp // resolution) * resolution
+
+    def prune(self, now=None):
+        """Drop rollups past their resolution's retention → rows deleted"""
+        now = now or time.time()
+        deleted = 0
+        with self._db_lock:
+            for resolution, keep in self.retention.items():
+                if keep is None:
+                    continue
+                deleted += self.db.execute('DELETE FROM rollups WHERE resolution=? AND bucket<?',
+                                           (resolution, now - keep)).rowcount
+        return deleted
+
+    def query(self, resolution, target=None, since=None, until=None):
+        """→ [(target, bucket, Rollup)] oldest first"""
+        sql = f"SELECT target, bucket, {', '.join(COLUMNS)} FROM rollups WHERE resolution=?"
+        params = [resolution]
+        if target is not None:
+            sql += " AND target=?"
+            params.append(target)
+        if since is not None:
+            sql += " AND bucket>=?"
+            params.append(int(since))
+        if until is not None:
+            sql += " AND bucket<?"
+            params.append(int(until))
+        with self._db_lock:
+            rows = self.db.execute(sql + " ORDER BY bucket, target", params).fetchall()
+        return [(row[0], row[1], Rollup.from_row(row[2:])) for row in rows]
+
+    def load_state(self, key='monitor'):
+        with self._db_lock:
+            row = self.db.execute('SELECT value, updated FROM state WHERE key=?', (key,)).fetchone()
+        if row is None:
+            return None, None
+        return json.loads(row[0]), row[1]
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='rollup-store', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=10)
+        try:
+            self.flush()
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Final rollup flush failed: {e}")
+        self.close()
+
+    def close(self):
+        with self._db_lock:
+            self.db.close()
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.warning(f"⚠️ Rollup flush failed: {e}")
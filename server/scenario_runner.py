@@ -0,0 +1,476 @@
+"""Repeatable monitor benchmarks against the local stand-in server
+
+    python scenario_runner.py                                  # 기본 시나리오 전부
+    python scenario_runner.py --scenario process_exit --repeat 3
+    python scenario_runner.py --scenarios my_scenarios.json --json > report.json
+    python scenario_runner.py --check-interval 5 --tls --verbose
+
+standin_server.py 를 한 번 직접 띄우고 (운영에서 외부로 실행된 앱과 같은 위치), 실제
+SmartMonitoringSystem 을 그 주소로 향하게 해서 돌린다. 재시작은 모니터가 평소 경로
+(핸드오프/스탠바이/콜드)로 stand-in 을 다시 띄우는 것이므로 재시작 시간도 실제 코드 경로다.
+시나리오마다 장애 계획 파일을 쓰고, 모니터와 별개인 관찰 프로브가 사용자 입장의 가용성을 잰다.
+
+시나리오 파일 (at/for 는 시나리오 시작 기준 초, for 생략 시 끝까지):
+    [{"name": "process_exit", "duration": 60, "expect_restart": true,
+      "faults": [{"kind": "exit", "at": 5, "for": 1}]}]
+
+지표 (시나리오 × 반복마다):
+    detect      첫 장애 → 장애 확정 (incident confirmed)
+    restart     첫 장애 → 재시작 시작
+    recover     첫 장애 → 외부 정상 복귀 (incident 해제)
+    downtime    관찰 프로브가 실패한 시간 합계, restart_downtime 은 그 중 재시작 시작 이후
+    restarts    시나리오 중 재시작 수 - expect_restart 가 아니면 모두 false restart
+모니터 로그와 상태 보고서는 작업 디렉터리(--workdir, 기본 임시 디렉터리)에 남는다.
+"""
+import argparse
+import contextlib
+import http.client
+import json
+import logging
+import os
+import shutil
+import socket
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from standin_server import FAULTS_ENV
+
+
+SERVER_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SCENARIOS = [
+    {'name': 'baseline', 'duration': 60, 'expect_restart': False, 'faults': []},
+    {'name': 'latency_spike', 'duration': 60, 'expect_restart': False, 'faults': [
+        {'kind': 'latency', 'at': 5, 'for': 40, 'paths': ['/'], 'distribution': 'lognormal',
+         'median': 1.5, 'sigma': 0.4, 'max': 6}]},
+    {'name': 'reset_blips', 'duration': 90, 'expect_restart': False, 'faults': [
+        {'kind': 'reset', 'at': 5, 'for': 80, 'probability': 0.1}]},
+    {'name': 'error_burst', 'duration': 45, 'expect_restart': False, 'faults': [
+        {'kind': 'status', 'at': 5, 'for': 6, 'status': 503}]},
+    {'name': 'periodic_5xx', 'duration': 90, 'expect_restart': False, 'faults': [
+        {'kind': 'status', 'at': 5, 'for': 80, 'status': 502, 'every': 30, 'length': 3}]},
+    {'name': 'process_exit', 'duration': 60, 'expect_restart': True, 'faults': [
+        {'kind': 'exit', 'at': 5, 'for': 1}]},
+    {'name': 'slowloris_hang', 'duration': 90, 'expect_restart': True, 'faults': [
+        {'kind': 'slowloris', 'at': 5, 'for': 85, 'interval': 2.0, 'chunk': 64, 'until_restart': True}]},
+    {'name': 'tls_failure', 'duration': 90, 'expect_restart': True, 'tls': True, 'faults': [
+        {'kind': 'tls', 'at': 5, 'for': 85, 'until_restart': True}]}
+]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def make_certificate(directory):
+    """Self-signed cert for 127.0.0.1 via the openssl CLI → (certfile, keyfile) or None"""
+    certfile = os.path.join(directory, 'standin-cert.pem')
+    keyfile = os.path.join(directory, 'standin-key.pem')
+    if shutil.which('openssl') is None:
+        return None
+    result = subprocess.run(
+        ['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '2', '-subj', '/CN=127.0.0.1',
+         '-addext', 'subjectAltName=IP:127.0.0.1,DNS:localhost', '-keyout', keyfile, '-out', certfile],
+        capture_output=True
+    )
+    return (certfile, keyfile) if result.returncode == 0 else None
+
+
+def write_faults(path, faults, start):
+    """Scenario-relative faults → absolute plan file (atomic replace, stand-in 이 mtime 으로 다시 읽음)"""
+    plan = []
+    for fault in faults:
+        spec = {key: value for key, value in fault.items() if key not in ('at', 'for')}
+        spec['start'] = start + fault.get('at', 0)
+        if 'for' in fault:
+            spec['end'] = spec['start'] + fault['for']
+        plan.append(spec)
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({'faults': plan}, f)
+    os.replace(tmp, path)
+
+
+def launch_standin(command, port, timeout=10.0):
+    """Start standin_server.py outside the monitor and wait until the port accepts"""
+    process = subprocess.Popen(command, cwd=SERVER_DIR, start_new_session=True)
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        with contextlib.suppress(OSError), socket.create_connection(('127.0.0.1', port), timeout=0.5):
+            return process
+        if process.poll() is not None:
+            break
+        time.sleep(0.05)
+    process.kill()
+    raise RuntimeError(f"stand-in did not open :{port}")
+
+
+def build_monitor(workdir, base_url, port, app_command, verbose=False):
+    """SmartMonitoringSystem pointed at a stand-in on port (포트에 묶인 보조 객체는 다시 만든다)
+
+    모니터 모듈은 import 시 monitor.log 를 현재 디렉터리에 만들므로 workdir 로 옮긴 뒤 import 한다.
+    """
+    os.chdir(workdir)
+    import smart_monitoring_system as module
+    from front_proxy import FrontProxy
+    from metrics_exporter import MetricsExporter
+    from probe_scheduler import load_targets
+    from process_reaper import ProcessReaper
+    from readiness import ReadinessDetector
+    from socket_handoff import SocketHandoff
+    from standby import WarmStandby
+
+    # 운영 히스토리/롤업과 섞이지 않도록 작업 디렉터리에 (복구할 이전 상태도 없음)
+    monitor = module.SmartMonitoringSystem(history_dir=os.path.join(workdir, 'check_history'))
+    monitor.main_url = f"{base_url}/"
+    monitor.health_url = f"{base_url}/health"
+    monitor.server_dir = SERVER_DIR
+    monitor.app_command = app_command
+
+    monitor.local_port = port
+    monitor.local_health_url = f"{base_url}/health"
+    monitor.readiness = ReadinessDetector(
+        monitor.probe_engine, monitor.local_host, port, monitor.local_health_url,
+        external_probe=lambda timeout: monitor.main_probe(timeout=timeout, deep=True),
+        external_timeout=monitor.http_timeout
+    )
+    # cmdline_marker: 같은 호스트의 실제 app_improved.py 는 절대 건드리지 않도록
+    monitor.reaper = ProcessReaper(port=port, cmdline_marker='standin_server.py', host=monitor.local_host)
+    monitor.handoff = SocketHandoff(host=monitor.local_host, port=port)
+    monitor.standby = WarmStandby(monitor.handoff, port=free_port())
+    monitor.proxy = FrontProxy(port=port)
+    monitor.metrics_port = free_port()
+    monitor.metrics_exporter = MetricsExporter(monitor.metrics_host, monitor.metrics_port)
+
+    targets_path = os.path.join(workdir, 'targets.json')
+    with open(targets_path, 'w', encoding='utf-8') as f:
+        json.dump({'base_url': base_url, 'targets': [
+            {'name': 'locations', 'kind': 'locations', 'url': '/locations?status=approved',
+             'points': [{'name': 'center_1km', 'lat': 36.636, 'lon': 126.828, 'radius': 1000, 'min_records': 1},
+                        {'name': 'center_5km', 'lat': 36.636, 'lon': 126.828, 'radius': 5000}],
+             'interval': 30, 'timeout': 8, 'expected_status': 200, 'critical': True},
+            {'name': 'tourapi_proxy', 'url': '/proxy/locationBasedList?mapX=126.828&mapY=36.636&radius=25',
+             'interval': 300, 'timeout': 10, 'expected_status': [200, 429]}
+        ]}, f, indent=2)
+    monitor.set_targets(load_targets(targets_path))
+
+    # 콘솔 출력은 --verbose 일 때만 (monitor.log 파일에는 모두 남는다)
+    for handler in module.log_listener.handlers:
+        if not isinstance(handler, logging.FileHandler):
+            handler.setLevel(logging.INFO if verbose else logging.CRITICAL)
+    return monitor
+
+
+class Observer:
+    """Independent user-side probe of the main page on fresh connections"""
+
+    def __init__(self, host, port, tls_context=None, interval=0.25, timeout=2.0):
+        self.host = host
+        self.port = port
+        self.tls_context = tls_context
+        self.interval = interval
+        self.timeout = timeout
+        self.samples = []       # (wall time, ok)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def probe(self):
+        if self.tls_context is not None:
+            conn = http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout, context=self.tls_context)
+        else:
+            conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        deadline = time.monotonic() + self.timeout
+        try:
+            conn.request('GET', '/')
+            response = conn.getresponse()
+            # 소켓 timeout 은 recv 마다라서 조금씩 흘리는 본문(slowloris)은 전체 마감으로 끊는다
+            while response.read(8192):
+                if time.monotonic() > deadline:
+                    return False
+            return response.status == 200
+        except (OSError, http.client.HTTPException):
+            return False
+        finally:
+            conn.close()
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='observer', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.timeout + 1)
+
+    def _run(self):
+        while not self._stop.is_set():
+            started = time.time()
+            self.samples.append((started, self.probe()))
+            self._stop.wait(max(0.0, self.interval - (time.time() - started)))
+
+    def downtime(self, since, until=None):
+        """Seconds between a failed sample and the next sample, within [since, until)"""
+        until = until or time.time()
+        window = [(at, ok) for at, ok in self.samples if since <= at < until]
+        total = 0.0
+        for (at, ok), (next_at, _) in zip(window, window[1:] + [(until, True)]):
+            if not ok:
+                total += next_at - at
+        return total
+
+
+class ScenarioRunner:
+    """Owns the stand-in, the monitor under test and the observer for one run of scenarios"""
+
+    def __init__(self, workdir, check_interval=10, tls=False, settle_timeout=180, verbose=False, restart_mode='handoff'):
+        self.workdir = workdir
+        self.check_interval = check_interval
+        self.restart_mode = restart_mode
+        self.settle_timeout = settle_timeout
+        self.verbose = verbose
+        self.port = free_port()
+        self.faults_path = os.path.join(workdir, 'faults.json')
+        self.certificate = make_certificate(workdir) if tls else None
+        if tls and self.certificate is None:
+            raise RuntimeError("TLS requested but a certificate could not be generated (openssl missing?)")
+        scheme = 'https' if self.certificate else 'http'
+        self.base_url = f"{scheme}://127.0.0.1:{self.port}"
+        self.monitor = None
+        self.monitor_thread = None
+        self.initial_process = None
+        self.observer = None
+
+    @property
+    def tls(self):
+        return self.certificate is not None
+
+    def standin_command(self):
+        command = [sys.executable, os.path.join(SERVER_DIR, 'standin_server.py'), '--port', str(self.port),
+                   '--faults', self.faults_path, '--log-level', 'info' if self.verbose else 'warning']
+        if self.certificate:
+            command += ['--certfile', self.certificate[0], '--keyfile', self.certificate[1]]
+        return command
+
+    def log(self, message):
+        print(f"{datetime.now().strftime('%H:%M:%S')} {message}", file=sys.stderr, flush=True)
+
+    def start(self):
+        write_faults(self.faults_path, [], time.time())
+        if self.certificate:
+            # 모니터(ssl.create_default_context)와 관찰 프로브가 자체 서명 인증서를 신뢰하도록
+            os.environ['SSL_CERT_FILE'] = self.certificate[0]
+        os.environ[FAULTS_ENV] = self.faults_path
+
+        # 운영과 같이 첫 세대는 모니터 밖에서 실행 - 직접 bind (첫 재시작 때 모니터가 정리 후 소켓 인수)
+        self.initial_process = launch_standin(self.standin_command(), self.port)
+        self.monitor = build_monitor(self.workdir, self.base_url, self.port, self.standin_command(), self.verbose)
+        self.monitor.check_interval = self.check_interval
+        # 스탠드인은 WOOPANG_LISTEN_FD 계약을 구현하므로 핸드오프 경로도 시험할 수 있다 (모니터 기본은 cold)
+        self.monitor.set_restart_mode(self.restart_mode)
+        tls_context = ssl.create_default_context(cafile=self.certificate[0]) if self.certificate else None
+        self.observer = Observer('127.0.0.1', self.port, tls_context)
+
+        stdout_log = open(os.path.join(self.workdir, 'monitor_stdout.log'), 'a', encoding='utf-8')
+        self.monitor_thread = threading.Thread(target=self._run_monitor, args=(stdout_log,), name='monitor', daemon=True)
+        self.monitor_thread.start()
+        self.observer.start()
+        self.log(f"🧪 Stand-in {self.base_url} (PID {self.initial_process.pid}), monitor every {self.check_interval}s, "
+                 f"restart mode {self.monitor.restart_mode}{' + standby' if self.monitor.standby_enabled else ''}")
+        if not self.wait_settled(self.settle_timeout):
+            raise RuntimeError("monitor never saw the stand-in healthy")
+
+    def _run_monitor(self, stdout_log):
+        # 상태 보고서(print)는 작업 디렉터리 파일로 - 러너의 stdout 은 결과 전용
+        with contextlib.redirect_stdout(stdout_log):
+            self.monitor.run_monitoring()
+
+    def restart_count(self):
+        return sum(histogram.count for histogram in self.monitor.restart_durations.values())
+
+    def settled(self):
+        monitor = self.monitor
+        return (monitor.state.state == 'healthy' and monitor.main_server_status == 'healthy'
+                and not monitor.restart_in_progress and monitor.incidents.current is None)
+
+    def wait_settled(self, timeout, quiet=None):
+        """Monitor healthy with no open incident for `quiet` seconds in a row"""
+        quiet = quiet if quiet is not None else 2 * self.check_interval
+        deadline = time.time() + timeout
+        healthy_since = None
+        while time.time() < deadline:
+            if self.settled():
+                healthy_since = healthy_since or time.time()
+                if time.time() - healthy_since >= quiet:
+                    return True
+            else:
+                healthy_since = None
+            time.sleep(0.2)
+        return False
+
+    def run_scenario(self, scenario, run=1):
+        monitor = self.monitor
+        restarts_before = self.restart_count()
+        incidents_before = monitor.incidents.total + monitor.incidents.transient
+        start = time.time() + 0.5
+        write_faults(self.faults_path, scenario.get('faults', []), start)
+        self.log(f"▶️ {scenario['name']} (run {run}, {scenario['duration']}s, "
+                 f"{', '.join(f['kind'] for f in scenario.get('faults', [])) or 'no faults'})")
+        time.sleep(max(0.0, start - time.time()) + scenario['duration'])
+        end = time.time()
+        write_faults(self.faults_path, [], end)
+        settled = self.wait_settled(self.settle_timeout)
+
+        fault_start = start + min((f.get('at', 0) for f in scenario.get('faults', [])), default=0)
+        incident = next((i for i in reversed(list(monitor.incidents.closed))
+                         if i.marks['first_failure'] >= start), None)
+        restarts = self.restart_count() - restarts_before
+        marks = incident.marks if incident is not None else {}
+
+        def since_fault(stage):
+            return marks[stage] - fault_start if stage in marks else None
+
+        restart_at = marks.get('restart_started')
+        result = {
+            'scenario': scenario['name'],
+            'run': run,
+            'expect_restart': scenario.get('expect_restart', False),
+            'restarts': restarts,
+            'false_restarts': 0 if scenario.get('expect_restart') else restarts,
+            'incidents': monitor.incidents.total + monitor.incidents.transient - incidents_before,
+            'detect': since_fault('confirmed'),
+            'restart': since_fault('restart_started'),
+            'recover': since_fault('healthy'),
+            'downtime': self.observer.downtime(start, end),
+            'restart_downtime': self.observer.downtime(restart_at, time.time()) if restart_at else None,
+            'settled': settled
+        }
+        result['passed'] = settled and (restarts > 0) == result['expect_restart']
+        self.log(f"{'✅' if result['passed'] else '❌'} {scenario['name']}: {restarts} restarts, "
+                 f"detect {format_seconds(result['detect'])}, recover {format_seconds(result['recover'])}, "
+                 f"downtime {result['downtime']:.1f}s")
+        return result
+
+    def stop(self):
+        if self.observer:
+            self.observer.stop()
+        if self.monitor is not None:
+            self.monitor.monitoring_active = False
+            self.monitor.stop_event.set()
+            if self.monitor_thread:
+                self.monitor_thread.join(timeout=30)
+            # 모니터가 띄운 세대와 처음 띄운 세대 모두 정리 (포트 소유자 기준)
+            self.monitor.reaper.reap()
+            process = self.monitor.main_process
+            if process is not None and process.poll() is None:
+                process.kill()
+        if self.initial_process is not None and self.initial_process.poll() is None:
+            self.initial_process.kill()
+
+
+def format_seconds(value):
+    return "-" if value is None else f"{value:.1f}s"
+
+
+def summarize(results):
+    """Per-scenario aggregates + overall false-restart rate"""
+    scenarios = {}
+    for result in results:
+        scenarios.setdefault(result['scenario'], []).append(result)
+    summary = []
+    for name, runs in scenarios.items():
+        row = {'scenario': name, 'runs': len(runs), 'passed': sum(r['passed'] for r in runs),
+               'restarts': sum(r['restarts'] for r in runs), 'false_restarts': sum(r['false_restarts'] for r in runs)}
+        for key in ('detect', 'restart', 'recover', 'downtime', 'restart_downtime'):
+            values = [r[key] for r in runs if r[key] is not None]
+            row[f"{key}_mean"] = sum(values) / len(values) if values else None
+            row[f"{key}_max"] = max(values) if values else None
+        summary.append(row)
+    quiet_runs = [r for r in results if not r['expect_restart']]
+    return {
+        'scenarios': summary,
+        'false_restart_rate': (sum(1 for r in quiet_runs if r['false_restarts']) / len(quiet_runs)
+                               if quiet_runs else None),
+        'missed_restart_rate': (sum(1 for r in results if r['expect_restart'] and not r['restarts'])
+                                / max(1, sum(1 for r in results if r['expect_restart'])))
+    }
+
+
+def print_report(results, summary):
+    keys = ('scenario', 'run', 'restarts', 'false_restarts', 'detect', 'restart', 'recover', 'downtime',
+            'restart_downtime', 'passed')
+    cells = [list(keys)]
+    for result in results:
+        cells.append([format_seconds(result[key]) if key in ('detect', 'restart', 'recover', 'downtime',
+                                                             'restart_downtime') else str(result[key])
+                      for key in keys])
+    widths = [max(len(line[i]) for line in cells) for i in range(len(keys))]
+    for line in cells:
+        print("  ".join(cell.ljust(width) for cell, width in zip(line, widths)))
+    rate = summary['false_restart_rate']
+    print(f"\nfalse restart rate: {'-' if rate is None else f'{rate * 100:.0f}%'}   "
+          f"missed restart rate: {summary['missed_restart_rate'] * 100:.0f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scenarios', help='scenario JSON file (default: built-in set)')
+    parser.add_argument('--scenario', action='append', help='run only these names (repeatable)')
+    parser.add_argument('--repeat', type=int, default=1, help='runs per scenario')
+    parser.add_argument('--check-interval', type=float, default=10, help="monitor check_interval (운영 기본 10s)")
+    parser.add_argument('--tls', action='store_true', help='serve the stand-in over TLS (self-signed, needs openssl)')
+    parser.add_argument('--restart-mode', choices=('handoff', 'cold'), default='handoff',
+                        help='monitor restart mode (handoff falls back to cold where unsupported)')
+    parser.add_argument('--settle-timeout', type=float, default=180, help='max wait for recovery after a scenario')
+    parser.add_argument('--workdir', help='keep logs, history and fault plans here (default: temp dir)')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    parser.add_argument('--verbose', action='store_true', help='show monitor and stand-in logs')
+    args = parser.parse_args()
+
+    scenarios = SCENARIOS
+    if args.scenarios:
+        with open(args.scenarios, encoding='utf-8') as f:
+            scenarios = json.load(f)
+    if args.scenario:
+        unknown = set(args.scenario) - {s['name'] for s in scenarios}
+        if unknown:
+            parser.error(f"unknown scenario(s): {', '.join(sorted(unknown))}")
+        scenarios = [s for s in scenarios if s['name'] in args.scenario]
+    skipped = [s['name'] for s in scenarios if s.get('tls') and not args.tls]
+    scenarios = [s for s in scenarios if not s.get('tls') or args.tls]
+    if skipped:
+        print(f"(skipping {', '.join(skipped)} - needs --tls)", file=sys.stderr)
+
+    workdir = os.path.abspath(args.workdir) if args.workdir else tempfile.mkdtemp(prefix='woopang-scenarios-')
+    os.makedirs(workdir, exist_ok=True)
+    runner = ScenarioRunner(workdir, args.check_interval, args.tls, args.settle_timeout, args.verbose,
+                            args.restart_mode)
+    results = []
+    try:
+        runner.start()
+        for run in range(1, args.repeat + 1):
+            for scenario in scenarios:
+                results.append(runner.run_scenario(scenario, run))
+    except KeyboardInterrupt:
+        print("(interrupted - partial results)", file=sys.stderr)
+    finally:
+        runner.stop()
+    summary = summarize(results)
+    if args.json:
+        json.dump({'check_interval': args.check_interval, 'tls': args.tls, 'workdir': workdir,
+                   'results': results, 'summary': summary}, sys.stdout, indent=2)
+        print()
+    else:
+        print_report(results, summary)
+        print(f"(logs: {workdir})", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
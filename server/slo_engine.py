@@ -0,0 +1,252 @@
+import threading
+import time
+from array import array
+
+
+class WindowCounter:
+    """Good/total event counts over a sliding window of rotating time slots
+
+    슬롯이 넘어갈 때 만료된 슬롯 값만 합계에서 빼므로 기록·조회 모두 O(1)
+    (긴 공백 뒤 첫 기록만 최대 슬롯 수만큼).
+    """
+
+    __slots__ = ('window', 'slot_seconds', 'slots', '_epochs', '_good', '_total', '_head', 'good', 'total')
+
+    def __init__(self, window, slots=60):
+        self.window = window
+        self.slot_seconds = window / slots
+        self.slots = slots
+        self._epochs = array('q', [-1]) * slots
+        self._good = array('Q', [0]) * slots
+        self._total = array('Q', [0]) * slots
+        self._head = None
+        self.good = 0
+        self.total = 0
+
+    def advance(self, now):
+        epoch = int(now // self.slot_seconds)
+        if self._head is None:
+            self._head = epoch
+        if epoch <= self._head:
+            return
+        for expired in range(max(self._head + 1, epoch - self.slots + 1), epoch + 1):
+            pos = expired % self.slots
+            if self._epochs[pos] != -1:
+                self.good -= self._good[pos]
+                self.total -= self._total[pos]
+                self._good[pos] = 0
+                self._total[pos] = 0
+                self._epochs[pos] = -1
+        self._head = epoch
+
+    def record(self, good, now, total=1):
+        """good: 성공 여부 또는 (total 과 함께) 성공 건수"""
+        self.advance(now)
+        epoch = int(now // self.slot_seconds)
+        if epoch <= self._head - self.slots:
+            return
+        good = int(good)
+        pos = epoch % self.slots
+        self._epochs[pos] = epoch
+        self._total[pos] += total
+        self.total += total
+        self._good[pos] += good
+        self.good += good
+
+    @property
+    def bad(self):
+        return self.total - self.good
+
+    def since(self, start, now):
+        """(good, total) in slots after the one containing start - 창 안의 일부만 (재기준 이후)"""
+        self.advance(now)
+        first = int(start // self.slot_seconds) + 1
+        good = total = 0
+        for pos in range(self.slots):
+            if self._epochs[pos] >= first:
+                good += self._good[pos]
+                total += self._total[pos]
+        return good, total
+
+
+class Objective:
+    """Availability (latency_threshold=None) or latency SLO over the main probe stream"""
+
+    __slots__ = ('name', 'target', 'latency_threshold')
+
+    def __init__(self, name, target, latency_threshold=None):
+        self.name = name
+        self.target = target
+        self.latency_threshold = latency_threshold
+
+    @property
+    def budget(self):
+        return 1.0 - self.target
+
+    def is_good(self, healthy, response_time):
+        if not healthy:
+            return False
+        if self.latency_threshold is None:
+            return True
+        return response_time is not None and response_time <= self.latency_threshold
+
+    def describe(self):
+        if self.latency_threshold is None:
+            return f"{self.target * 100:g}% of probes succeed"
+        return f"{self.target * 100:g}% of probes under {self.latency_threshold:g}s"
+
+
+class BurnRateRule:
+    """Fires while both windows burn the error budget faster than burn_rate
+
+    action: 'restart' (재시작 판정), 'page', 'ticket' (알림 등급)
+    min_bad: 긴 창의 최소 실패 수 - 표본이 적을 때 한두 번의 실패로 발동하지 않도록
+    """
+
+    __slots__ = ('name', 'objective', 'long_window', 'short_window', 'burn_rate', 'action', 'min_bad')
+
+    def __init__(self, name, objective, long_window, short_window, burn_rate, action='page', min_bad=1):
+        self.name = name
+        self.objective = objective
+        self.long_window = long_window
+        self.short_window = short_window
+        self.burn_rate = burn_rate
+        self.action = action
+        self.min_bad = min_bad
+
+
+def format_window(seconds):
+    if seconds >= 86400 and seconds % 86400 == 0:
+        return f"{seconds // 86400:.0f}d"
+    if seconds >= 3600 and seconds % 3600 == 0:
+        return f"{seconds // 3600:.0f}h"
+    if seconds >= 60 and seconds % 60 == 0:
+        return f"{seconds // 60:.0f}m"
+    return f"{seconds:g}s"
+
+
+class SLOEngine:
+    """Multi-window burn rates evaluated incrementally from the probe stream
+
+    objective 마다 규칙이 쓰는 창 길이별로 WindowCounter 하나씩만 두고, 프로브 결과가
+    들어올 때 모든 창에 한 번씩 더한다. burn rate = 창의 실패율 / 오류 예산.
+    evaluate() 는 규칙별 발동 상태를 갱신하고 새로 발동/해제된 규칙을 돌려준다.
+    """
+
+    def __init__(self, objectives, rules, compliance_window=30 * 86400):
+        self.objectives = {objective.name: objective for objective in objectives}
+        self.rules = rules
+        self.compliance_window = compliance_window
+        self.counters = {name: {} for name in self.objectives}
+        for rule in rules:
+            for window in (rule.long_window, rule.short_window):
+                self.counters[rule.objective].setdefault(window, WindowCounter(window))
+        for windows in self.counters.values():
+            windows.setdefault(compliance_window, WindowCounter(compliance_window))
+        self.firing = {}        # rule name → firing since (wall time)
+        self.rebased = {}       # rule name → 이 시각 이전 표본은 무시 (rebase)
+        self._lock = threading.Lock()
+
+    def record(self, healthy, response_time, now=None):
+        now = now or time.time()
+        with self._lock:
+            for name, objective in self.objectives.items():
+                good = objective.is_good(healthy, response_time)
+                for counter in self.counters[name].values():
+                    counter.record(good, now)
+
+    def restore(self, objective, good, total, now):
+        """Replay stored counts (rollups) into every window of one objective"""
+        with self._lock:
+            for counter in self.counters[objective].values():
+                counter.record(good, now, total)
+
+    def burn_rate(self, objective, window, now=None):
+        counter = self.counters[objective][window]
+        counter.advance(now or time.time())
+        if not counter.total:
+            return 0.0
+        return (counter.bad / counter.total) / self.objectives[objective].budget
+
+    def rule_counts(self, rule, window, now):
+        """(bad, total) of one rule window - rebase() 이후 표본만 (창보다 오래되면 전체)"""
+        counter = self.counters[rule.objective][window]
+        start = self.rebased.get(rule.name)
+        if start is None or now - start >= window:
+            counter.advance(now)
+            return counter.bad, counter.total
+        good, total = counter.since(start, now)
+        return total - good, total
+
+    def _rule_burn(self, rule, window, now):
+        bad, total = self.rule_counts(rule, window, now)
+        if not total:
+            return 0.0
+        return (bad / total) / self.objectives[rule.objective].budget
+
+    def rebase(self, action, now=None):
+        """Forget samples before now for rules with this action
+
+        재시작 성공 후 호출 - 장애와 재시작 중의 실패가 5분 창에 남아 있으면 회복 직후 한 번의
+        실패로도 재시작 규칙이 다시 발동한다. 창(counters)은 다른 규칙과 공유하므로 지우지 않고
+        규칙별 시작 시각만 둔다.
+        """
+        now = now or time.time()
+        with self._lock:
+            for rule in self.rules:
+                if rule.action == action:
+                    self.rebased[rule.name] = now
+                    self.firing.pop(rule.name, None)
+
+    def evaluate(self, now=None):
+        """→ (started, resolved) lists of (rule, long burn, short burn)"""
+        now = now or time.time()
+        started, resolved = [], []
+        with self._lock:
+            for rule in self.rules:
+                long_burn = self._rule_burn(rule, rule.long_window, now)
+                short_burn = self._rule_burn(rule, rule.short_window, now)
+                bad = self.rule_counts(rule, rule.long_window, now)[0]
+                firing = long_burn >= rule.burn_rate and short_burn >= rule.burn_rate and bad >= rule.min_bad
+                if firing and rule.name not in self.firing:
+                    self.firing[rule.name] = now
+                    started.append((rule, long_burn, short_burn))
+                elif not firing and rule.name in self.firing:
+                    del self.firing[rule.name]
+                    resolved.append((rule, long_burn, short_burn))
+        return started, resolved
+
+    def rule_burn_rates(self, rule, now=None):
+        """(long burn, short burn) for one rule"""
+        now = now or time.time()
+        with self._lock:
+            return (self._rule_burn(rule, rule.long_window, now),
+                    self._rule_burn(rule, rule.short_window, now))
+
+    def restart_reason(self):
+        """Reason string if a restart rule is firing, else None"""
+        for rule in self.rules:
+            if rule.action == 'restart' and rule.name in self.firing:
+                return (f"SLO {rule.objective} burning ≥{rule.burn_rate:g}× over "
+                        f"{format_window(rule.long_window)}/{format_window(rule.short_window)} ({rule.name})")
+        return None
+
+    def snapshot(self, now=None):
+        now = now or time.time()
+        with self._lock:
+            objectives = {}
+            for name, objective in self.objectives.items():
+                compliance = self.counters[name][self.compliance_window]
+                objectives[name] = {
+                    'target': objective.target,
+                    'latency_threshold': objective.latency_threshold,
+                    'burn_rates': {format_window(window): self.burn_rate(name, window, now)
+                                   for window in sorted(self.counters[name])},
+                    'good': compliance.good,
+                    'total': compliance.total,
+                    # 음수 = 컴플라이언스 창의 오류 예산 소진
+                    'budget_remaining': 1.0 - self.burn_rate(name, self.compliance_window, now)
+                }
+            rules = {rule.name: {'objective': rule.objective, 'action': rule.action,
+                                 'firing_since': self.firing.get(rule.name)} for rule in self.rules}
+        return {'objectives': objectives, 'rules': rules}
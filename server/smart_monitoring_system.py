@@ -1,8 +1,7 @@
-import requests
 import time
+import asyncio
 import logging
 import os
-import psutil
 import subprocess
 import smtplib
 from email.mime.text import MIMEText
@@ -10,104 +9,61 @@ from datetime import datetime, timedelta
 import json
 import threading
 import sys
-import urllib3
+import ssl
+import functools
 from single_server_restart import SingleServerRestart
+from probe_engine import AsyncProbeEngine, ProbeResult
+from probe_scheduler import ProbeScheduler, load_targets
+from latency_stats import LatencyTracker, CumulativeHistogram
+from metrics_exporter import MetricsExporter, MetricsWriter
+import monitor_state
+from monitor_state import MonitorStateMachine
+from readiness import ReadinessDetector, STAGES as READINESS_STAGES
+from process_reaper import ProcessReaper
+from socket_handoff import SocketHandoff
+from standby import WarmStandby
+from worker_pool import WorkerPool
+from front_proxy import FrontProxy
+import front_proxy
+from resource_sampler import ResourceSampler
+from leak_detector import LeakDetector
+from hedged_check import HedgedConfirmer
+from light_probe import LightProbe
+from health_payload import HealthPayloadTracker
+from locations_probe import LocationsProbe
+from incident_timeline import IncidentLog
+from slo_engine import SLOEngine, Objective, BurnRateRule, format_window
+from monitor_logging import setup_logging
+from check_history import CheckHistory, DEFAULT_HISTORY_DIR
+from rollup_store import RollupStore, MINUTE, HOUR
 import colorama
-from colorama import Fore, Back, Style, init
+from colorama import Fore, Style, init
 
 # Color initialization
 init(autoreset=True)
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-class ColoredFormatter(logging.Formatter):
-    """Colored log formatter"""
-    
-    COLORS = {
-        'DEBUG': Fore.CYAN,
-        'INFO': Fore.GREEN,
-        'WARNING': Fore.YELLOW,
-        'ERROR': Fore.RED,
-        'CRITICAL': Fore.RED + Back.YELLOW
-    }
-    
-    KEYWORD_COLORS = {
-        '✅': Fore.GREEN,
-        '❌': Fore.RED,
-        '⚠️': Fore.YELLOW,
-        '🚨': Fore.RED + Style.BRIGHT,
-        '🎉': Fore.GREEN + Style.BRIGHT,
-        '🔄': Fore.CYAN,
-        '🚀': Fore.BLUE + Style.BRIGHT,
-        '⏰': Fore.YELLOW,
-        '🔧': Fore.MAGENTA,
-        '📊': Fore.BLUE,
-        '🎯': Fore.GREEN + Style.BRIGHT,
-        '💤': Fore.BLUE,
-        '⏳': Fore.CYAN,
-        '🔒': Fore.MAGENTA,
-        '🌐': Fore.CYAN
-    }
-    
-    def format(self, record):
-        log_message = super().format(record)
-        level_color = self.COLORS.get(record.levelname, '')
-        if level_color:
-            log_message = f"{level_color}{log_message}{Style.RESET_ALL}"
-        
-        for keyword, color in self.KEYWORD_COLORS.items():
-            if keyword in log_message:
-                log_message = log_message.replace(keyword, f"{color}{keyword}{Style.RESET_ALL}")
-        
-        return log_message
-
-# Logging setup - prevent duplicates
-logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
-
-# Remove existing handlers
-for handler in logger.handlers[:]:
-    logger.removeHandler(handler)
-
-# Custom formatter that removes INFO level from console
-class ConsoleColoredFormatter(ColoredFormatter):
-    def format(self, record):
-        # INFO 레벨일 때는 levelname 제거
-        if record.levelname == 'INFO':
-            original_fmt = self._style._fmt
-            self._style._fmt = '%(asctime)s - %(message)s'
-            result = super().format(record)
-            self._style._fmt = original_fmt
-            return result
-        else:
-            # ERROR, WARNING 등은 levelname 포함
-            return super().format(record)
-
-# Console handler
-console_handler = logging.StreamHandler()
-console_handler.setLevel(logging.INFO)
-console_formatter = ConsoleColoredFormatter('%(asctime)s - %(levelname)s - %(message)s')
-console_handler.setFormatter(console_formatter)
-
-# File handler
-file_handler = logging.FileHandler('monitor.log', encoding='utf-8')
-file_handler.setLevel(logging.INFO)
-file_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-file_handler.setFormatter(file_formatter)
-
-logger.addHandler(console_handler)
-logger.addHandler(file_handler)
-
-# Prevent logger propagation
-logger.propagate = False
+# Logging setup - prevent duplicates (고정 이름: 보조 모듈은 woopang.monitor.* 자식 로거 사용)
+# 🔧 수정: 큐 핸들러 + 리스너 스레드 - 프로브 루프는 콘솔/파일 I/O 를 기다리지 않음, monitor.log 는 크기/날짜로 회전
+logger = logging.getLogger('woopang.monitor')
+log_listener, log_queue_handler = setup_logging(logger, 'monitor.log')
 
 class SmartMonitoringSystem:
-    def __init__(self):
+    def __init__(self, history_dir=DEFAULT_HISTORY_DIR):
         # Basic settings - 외부 접속 체크로 변경
         self.main_url = "https://woopang.com"
         self.health_url = "https://woopang.com/health"
         self.check_interval = 10
         self.fast_check_interval = 2
         self.fast_check_attempts = 3
+        self.fast_check_mode = "hedged"     # hedged: 병렬 quorum 확인, sequential: 기존 3회 순차
+        
+        # 🔧 수정: 메인 페이지를 매번 전체로 받지 않는다 - 조건부 GET(304) 위주, deep_every 번에 한 번만
+        # 전체 페이지(~38KB 렌더링)를 받아 내용까지 검증. 모드: full / conditional / range / head
+        self.light_probe = LightProbe(mode="conditional", deep_every=20)
+        
+        # /health 본문의 숫자 필드(구성 요소 지연, 캐시 크기, DB 풀 ...)를 필드별 시계열로 - 앱 내부 의존성이
+        # 나빠지는 것을 메인 페이지가 실패하기 전에 본다 (판정은 여전히 상태 코드)
+        self.health_payload = HealthPayloadTracker()
         
         # Timeout settings
         self.http_timeout = 8
@@ -125,6 +81,23 @@ class SmartMonitoringSystem:
         self.main_consecutive_failures = 0
         self.max_consecutive_failures = 2  # 🔧 3에서 2로 변경
         
+        # SLO burn-rate 판정 - 🔧 수정: 재시작/알림을 연속 실패 횟수 대신 오류 예산 소진 속도로
+        # (restart_trigger = "consecutive" 는 기존 max_consecutive_failures 기준)
+        self.restart_trigger = "slo"
+        self.slo = SLOEngine(
+            (Objective('availability', 0.995), Objective('latency', 0.995, latency_threshold=1.0)),
+            (
+                # 재시작: 5분 창 예산을 14.4배로 태우는 중이고 최근 1분에도 실패 - 5분 안의 실패 2번으로는 발동 안 함
+                BurnRateRule('restart', 'availability', 300, 60, 14.4, action='restart', min_bad=2),
+                BurnRateRule('availability_fast', 'availability', 3600, 300, 14.4, action='page'),
+                BurnRateRule('availability_slow', 'availability', 6 * 3600, 1800, 6, action='page'),
+                BurnRateRule('availability_budget', 'availability', 3 * 86400, 6 * 3600, 1, action='ticket'),
+                BurnRateRule('latency_fast', 'latency', 3600, 300, 14.4, action='page'),
+                BurnRateRule('latency_slow', 'latency', 6 * 3600, 1800, 6, action='page'),
+                BurnRateRule('latency_budget', 'latency', 3 * 86400, 6 * 3600, 1, action='ticket')
+            )
+        )
+        
         # Status tracking
         self.last_success_time = datetime.now()
         self.last_health_data = None
@@ -137,106 +110,409 @@ class SmartMonitoringSystem:
             'successful_restarts': 0,
             'failed_restarts': 0,
             'uptime_start': datetime.now(),
+            'first_start': datetime.now(),
             'connection_errors': 0,
             'timeout_errors': 0,
-            'ssl_errors': 0
+            'ssl_errors': 0,
+            'target_checks': 0,
+            'failovers': 0,
+            'worker_restarts': 0,
+            'leak_restarts': 0,
+            'slo_alerts': 0
         }
         
         # Restart manager
         self.restart_manager = SingleServerRestart()
         
+        # Probe engine - 사이클 내 프로브 동시 실행
+        self.probe_engine = AsyncProbeEngine()
+        self.probe_engine.start()
+        
+        # Hedged outage confirmation - 독립 DNS/연결 경로로 병렬 확인, quorum 으로 판정
+        self.confirm_quorum = 3
+        self.confirm_stagger = 0.25
+        self.confirm_timeout = 3
+        self.last_confirm = None
+        self.time_to_confirm = CumulativeHistogram((2, 5, 10, 15, 20, 30, 45, 60, 90, 120))
+        self.confirm_durations = {
+            'down': CumulativeHistogram((0.5, 1, 2, 3, 4, 5, 8, 13, 20)),
+            'up': CumulativeHistogram((0.5, 1, 2, 3, 4, 5, 8, 13, 20))
+        }
+        
+        # Incident timelines - 첫 실패 → 확인 → 재시작 → 포트 오픈 → 외부 정상, MTTD/MTTR 분위수
+        self.incidents = IncidentLog(window=50)
+        
+        # Latency percentiles per endpoint (bounded memory)
+        self.latency = LatencyTracker()
+        
+        # OpenMetrics /metrics exporter
+        self.metrics_host = "127.0.0.1"
+        self.metrics_port = 9108
+        self.metrics_exporter = MetricsExporter(self.metrics_host, self.metrics_port)
+        self.restart_durations = {
+            'success': CumulativeHistogram((5, 10, 20, 30, 60, 90, 120, 300)),
+            'failure': CumulativeHistogram((5, 10, 20, 30, 60, 90, 120, 300))
+        }
+        
+        # Scheduled endpoint probes (monitor_targets.json)
+        self.stats_lock = threading.Lock()
+        self.set_targets(load_targets())
+        self.scheduler = ProbeScheduler(self.probe_engine, self.record_target_result)
+        
+        # Staged readiness detection after restart (local port → local /health → external)
+        self.local_host = "127.0.0.1"
+        self.local_port = 443
+        self.local_health_url = "https://127.0.0.1/health"
+        self.startup_timeout = 90
+        self.readiness = ReadinessDetector(
+            self.probe_engine, self.local_host, self.local_port, self.local_health_url,
+            external_probe=lambda timeout: self.main_probe(timeout=timeout, deep=True),
+            external_timeout=self.http_timeout
+        )
+        self.readiness_durations = {
+            stage: CumulativeHistogram((0.25, 0.5, 1, 2, 5, 10, 20, 30, 60, 90)) for stage in READINESS_STAGES
+        }
+        self.last_readiness = None
+        
+        # App process launch settings
+        self.server_dir = "C:/woopang/server"
+        self.app_command = ["python", "app_improved.py"]
+        
+        # Restart mode - handoff: 리스닝 소켓을 모니터가 잡고 새 프로세스에 넘김 (무중단, POSIX)
+        # 🔧 수정: 기본은 cold - 앱이 WOOPANG_LISTEN_FD 계약을 구현한 뒤 set_restart_mode("handoff") 로 켠다
+        # (직접 bind 하는 앱에 핸드오프하면 EADDRINUSE 로 죽고 모니터가 포트를 쥔 채 남는다)
+        self.handoff = SocketHandoff(port=self.local_port)
+        self.drain_timeout = 30
+        
+        # Blue/green warm standby - 대체 포트에서 미리 떠 있다가 장애 시 공유 소켓으로 승격 (handoff 모드 전용)
+        self.standby = WarmStandby(self.handoff, port=8443)
+        self.set_restart_mode("cold")
+        self.standby_lock = threading.Lock()
+        self.switch_durations = CumulativeHistogram((0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2, 5))
+        self.last_switch = None
+        
+        # Multi-worker supervisor mode - 0 이면 단일 프로세스(main_process) 감독
+        self.worker_count = 0
+        self.worker_base_port = 5001
+        self.worker_check_interval = 5
+        self.worker_probe_timeout = 3
+        self.workers = WorkerPool(count=self.worker_count, base_port=self.worker_base_port, host=self.local_host)
+        self.worker_restart_lock = threading.Lock()
+        self.worker_restart_durations = CumulativeHistogram((1, 2, 5, 10, 20, 30, 60, 90))
+        
+        # Front proxy (supervisor mode) - local_port 에서 받아 워커들로 분산, 실패 워커 즉시 제외
+        # 443 에서는 proxy_certfile/proxy_keyfile 필수 (없으면 평문 HTTP 대신 프록시를 켜지 않는다)
+        self.proxy_enabled = True
+        self.proxy_certfile = None
+        self.proxy_keyfile = None
+        self.proxy = FrontProxy(port=self.local_port)
+        self.drain_durations = CumulativeHistogram((0.01, 0.1, 0.5, 1, 2, 5, 10, 30))
+        
+        # Background resource sampler - 프로브 경로는 최신 스냅샷만 읽는다
+        self.sample_interval = 5
+        self.sampler = ResourceSampler(self.supervised_processes, interval=self.sample_interval)
+        
+        # Check history - 모든 프로브 결과를 고정 폭 바이너리 레코드로 (조회: python check_history.py)
+        # history_dir: 시나리오/벤치마크는 작업 디렉터리를 넘겨 운영 히스토리를 열지 않는다
+        self.history_dir = history_dir
+        self.history = CheckHistory(history_dir)
+        self.history_retention = 30 * 86400    # 원시 세그먼트 보존 (s) - 롤업은 rollup_store 보존 기간
+        self.rollups = RollupStore(os.path.join(history_dir, 'rollups.sqlite3'),
+                                   state_provider=self.persistent_state)
+        self.retention_interval = 3600
+        self.probe_engine.result_hook = self.record_history
+        
+        # RSS leak trend → pre-emptive restart (조용한 시간대 / 저트래픽 순간 / 긴급)
+        self.leak_check_interval = 60
+        self.leak_rss_limit = None          # 프로세스별 RSS 상한 (bytes) - None 이면 현재 RSS + 가용 메모리 몫
+        self.leak_detector = LeakDetector()
+        self.leak_trends = {}
+        self.leak_logged = {}
+        self.leak_restart_thread = None
+        
+        # Process/port reaper used before every restart
+        self.reaper = ProcessReaper(port=self.local_port, host=self.local_host)
+        self.reap_durations = CumulativeHistogram((0.1, 0.25, 0.5, 1, 2, 5, 10))
+        self.last_reap = None
+        
+        # Monitor state machine (healthy → suspect → confirming → restarting → cooling-down)
+        self.state = MonitorStateMachine()
+        self.restart_cooldown = 30          # 재시작 직후 재판정 유예 (s)
+        self.restart_limit_cooldown = 300   # 최대 재시작 횟수 초과 시 대기 (s)
+        self.confirm_task = None
+        self.restart_thread = None
+        self.stop_event = threading.Event()
+        
         # Thread control
         self.monitoring_active = True
         self.restart_in_progress = False
+        self.restart_lock = threading.Lock()    # 장애 재시작과 누수 선제 재시작이 동시에 돌지 않도록
+        
+    # 🔧 수정: 더 현실적인 User-Agent와 헤더 추가
+    MAIN_HEADERS = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+        'Accept-Language': 'ko-KR,ko;q=0.8,en-US;q=0.5,en;q=0.3',
+        'Accept-Encoding': 'gzip, deflate',
+        'Connection': 'keep-alive'
+    }
+    
+    def set_targets(self, targets):
+        """Replace the scheduled probe targets (before run_monitoring)"""
+        self.targets = targets
+        # kind=locations 타깃은 좌표/반경을 돌아가며 /locations 응답 크기·레코드 수·파싱 시간까지 추적
+        self.synthetic = {}
+        for target in self.targets:
+            if target.kind == 'locations':
+                probe = self.synthetic[target.name] = LocationsProbe(target)
+                target.probe = functools.partial(probe.probe, self.probe_engine)
+        self.target_status = {
+            t.name: {'status': 'unknown', 'consecutive_failures': 0, 'failures': 0, 'checks': 0,
+                     'status_code': None, 'response_time': None, 'critical': t.critical}
+            for t in self.targets
+        }
+    
+    def main_probe(self, timeout=None, headers=None, deep=False):
+        """(name, coroutine, timeout) tuple for the main page probe
+
+        deep=True 는 가벼운 모드와 상관없이 전체 페이지를 받아 검증 (재시작 후 외부 준비 확인)
+        """
+        timeout = timeout or self.http_timeout
+        coro = self.light_probe.probe(
+            self.probe_engine, 'main', self.main_url, timeout,
+            headers=headers or self.MAIN_HEADERS,
+            verify=True,  # SSL 검증 활성화 (실제 환경과 동일)
+            deep=deep
+        )
+        return ('main', coro, timeout)
+    
+    def health_probe(self):
+        """(name, coroutine, timeout) tuple for the /health probe"""
+        coro = self.health_payload.probe(
+            self.probe_engine, 'health', self.health_url, 5,
+            headers={'User-Agent': 'WoopangMonitor/Health'},
+            verify=True
+        )
+        return ('health', coro, 5)
+    
+    def apply_main_result(self, result):
+        """Apply a main probe result to status, counters and stats"""
+        self.slo.record(result.healthy, result.response_time, result.started_at)
+        if result.healthy:
+            self.main_server_status = "healthy"
+            self.main_consecutive_failures = 0
+            self.resolve_incident((result.started_at or time.time()) + (result.response_time or 0))
+            return True, result.response_time
+        
+        if self.main_consecutive_failures == 0:
+            # 장애 타임라인의 기준점 - 첫 실패 프로브의 시작 시각
+            self.incidents.open(result.started_at)
+        self.main_consecutive_failures += 1
+        self.main_server_status = result.status
+        self.count_probe_error(result)
+        error = str(result.error)[:100] if result.error else ''
+        
+        if result.status == "unhealthy":
+            logger.warning(f"⚠️ HTTP Status {result.status_code} from {self.main_url}")
+            return False, result.response_time
+        elif result.status == "ssl_error":
+            logger.error(f"🔒 SSL Error: {error}...")
+        elif result.status == "timeout":
+            logger.warning(f"⏰ Timeout accessing {self.main_url}")
+        elif result.status == "connection_error":
+            logger.warning(f"🔌 Connection Error: {error}...")
+        elif result.status == "invalid_content":
+            logger.warning(f"⚠️ Broken page from {self.main_url}: {error}")
+            return False, result.response_time
+        else:
+            logger.error(f"❌ Unknown Error: {error}...")
+        return False, None
+    
+    def evaluate_slo(self):
+        """Update burn-rate rule states and log alerts that started or cleared"""
+        started, resolved = self.slo.evaluate()
+        for rule, long_burn, short_burn in started:
+            objective = self.slo.objectives[rule.objective]
+            windows = f"{format_window(rule.long_window)}/{format_window(rule.short_window)}"
+            message = (f"SLO {rule.name} ({objective.describe()}): burn {long_burn:.1f}×/{short_burn:.1f}× "
+                       f"over {windows} ≥ {rule.burn_rate:g}×")
+            if rule.action == 'page':
+                logger.error(f"🚨 {message}")
+            elif rule.action == 'ticket':
+                logger.warning(f"📉 {message}")
+            else:
+                logger.warning(f"🔥 {message} - restart condition")
+            with self.stats_lock:
+                self.stats['slo_alerts'] += 1
+        for rule, long_burn, short_burn in resolved:
+            logger.info(f"✅ SLO {rule.name} cleared (burn {long_burn:.1f}×/{short_burn:.1f}×)")
+    
+    def restart_trigger_reason(self):
+        """Why a restart is due, or None - SLO burn rate or the legacy consecutive-failure count"""
+        if self.restart_trigger == "slo":
+            return self.slo.restart_reason()
+        if self.main_consecutive_failures >= self.max_consecutive_failures:
+            return f"{self.main_consecutive_failures} consecutive failures"
+        return None
+    
+    def resolve_incident(self, at=None):
+        """External access is back - close the open incident timeline"""
+        incident = self.incidents.resolve(at)
+        if incident is None or incident.outcome == 'transient':
+            return
+        self.stats['last_incident'] = incident.as_dict()
+        self.stats['incidents'] = self.incidents.as_dict()
+        mttd = incident.interval('first_failure', 'confirmed')
+        mttr = incident.interval('first_failure', 'healthy')
+        logger.info(f"🧭 Incident {incident.describe()} (detect {mttd:.1f}s, recover {mttr:.1f}s)")
+    
+    def record_history(self, result):
+        """Probe engine result hook - 버퍼에 넣기만 하고 파일 쓰기는 history 스레드"""
+        try:
+            self.history.record(result.name, result)
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Check history record failed: {e}")
+        self.rollups.record(result.name, result)
+    
+    def persistent_state(self):
+        """Counters saved with each rollup flush (rollup thread)"""
+        return {
+            'stats': {key: self.stats[key] for key, _, _ in self.STAT_COUNTERS},
+            'first_start': self.stats['first_start'].isoformat(),
+            'incidents': {'total': self.incidents.total, 'transient': self.incidents.transient}
+        }
+    
+    def restore_state(self):
+        """Relaunch: counters from the last saved state, SLO/latency windows from rollups"""
+        state, updated = self.rollups.load_state()
+        if state:
+            with self.stats_lock:
+                for key, value in state['stats'].items():
+                    if key in self.stats:
+                        self.stats[key] += value
+                self.stats['first_start'] = datetime.fromisoformat(state['first_start'])
+            self.incidents.restore(state['incidents']['total'], state['incidents']['transient'])
+            logger.info(f"♻️ Restored counters from {datetime.fromtimestamp(updated).strftime('%Y-%m-%d %H:%M:%S')} "
+                        f"({self.stats['total_checks']} checks, {self.stats['successful_restarts']} restarts so far)")
+        
+        now = time.time()
+        # SLO 창: 분 롤업이 남아 있는 구간은 분 단위, 그 이전(컴플라이언스 창)은 시간 롤업으로
+        longest = max(self.slo.compliance_window, *(rule.long_window for rule in self.slo.rules))
+        split = (int((now - self.rollups.retention[MINUTE]) // HOUR) + 1) * HOUR
+        rows = self.rollups.query(HOUR, 'main', now - longest, split) + self.rollups.query(MINUTE, 'main', split)
+        for _, bucket, rollup in rows:
+            for objective in self.slo.objectives.values():
+                good = (rollup.count - rollup.errors if objective.latency_threshold is None
+                        else rollup.count_at_most(objective.latency_threshold))
+                self.slo.restore(objective.name, good, rollup.count, bucket)
+        
+        # 지연 분위수 창 (1m/1h/24h) - 모니터가 직접 추적하는 엔드포인트만
+        tracked = {'main', 'health'} | {target.name for target in self.targets} | {slot.name for slot in self.workers.slots}
+        restored = 0
+        for name, bucket, rollup in self.rollups.query(MINUTE, since=now - 86400):
+            if name in tracked and rollup.buckets:
+                self.latency.restore(name, rollup.buckets, rollup.latency_max, bucket)
+                restored += 1
+        if rows or restored:
+            logger.info(f"♻️ Restored trend windows from rollups ({len(rows)} SLO buckets, {restored} latency buckets)")
+    
+    def apply_retention(self):
+        """Age out raw segments and fine-grained rollups (executor thread)"""
+        removed = self.history.prune(self.history_retention)
+        deleted = self.rollups.prune()
+        if removed or deleted:
+            logger.info(f"🧹 Retention: {len(removed)} raw history segments, {deleted} rollup rows removed")
+    
+    async def retention_tick(self):
+        await asyncio.get_running_loop().run_in_executor(None, self.apply_retention)
+    
+    def count_probe_error(self, result):
+        """Shared error counters - 메인 프로브와 스케줄된 타깃 모두 여기로 집계"""
+        key = {'ssl_error': 'ssl_errors', 'timeout': 'timeout_errors',
+               'connection_error': 'connection_errors'}.get(result.status)
+        if key:
+            with self.stats_lock:
+                self.stats[key] += 1
+    
+    def record_target_result(self, target, result):
+        """Scheduler callback (probe engine thread) - 타깃별 연속 실패/통계 갱신"""
+        self.count_probe_error(result)
+        if result.healthy:
+            self.latency.record(target.name, result.response_time)
+        with self.stats_lock:
+            self.stats['target_checks'] += 1
+            status = self.target_status[target.name]
+            status['checks'] += 1
+            status['status'] = result.status
+            status['status_code'] = result.status_code
+            status['response_time'] = result.response_time
+            if result.healthy:
+                if status['consecutive_failures'] >= self.max_consecutive_failures:
+                    logger.info(f"✅ {target.name} recovered ({result.response_time:.2f}s)")
+                status['consecutive_failures'] = 0
+                return
+            status['failures'] += 1
+            status['consecutive_failures'] += 1
+            failures = status['consecutive_failures']
         
+        detail = f"HTTP {result.status_code}" if result.status == "unhealthy" else result.status.upper().replace('_', ' ')
+        if failures == self.max_consecutive_failures:
+            logger.error(f"🚨 {target.name} DOWN - {detail} ({failures} consecutive failures)")
+        else:
+            logger.warning(f"⚠️ {target.name} probe failed - {detail} [{failures}]")
+    
     def check_main_server(self):
         """Check main server status - 외부 접속 체크"""
         try:
-            start_time = time.time()
-            
-            # 🔧 수정: 더 현실적인 User-Agent와 헤더 추가
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                'Accept-Language': 'ko-KR,ko;q=0.8,en-US;q=0.5,en;q=0.3',
-                'Accept-Encoding': 'gzip, deflate',
-                'Connection': 'keep-alive'
-            }
-            
-            response = requests.get(
-                self.main_url, 
-                timeout=self.http_timeout,
-                verify=True,  # SSL 검증 활성화 (실제 환경과 동일)
-                headers=headers,  # 🔧 수정: 개선된 헤더 사용
-                allow_redirects=True
-            )
-            response_time = time.time() - start_time
-            
-            if response.status_code == 200:
-                self.main_server_status = "healthy"
-                self.main_consecutive_failures = 0
-                return True, response_time
-            else:
-                self.main_server_status = "unhealthy"
-                self.main_consecutive_failures += 1
-                logger.warning(f"⚠️ HTTP Status {response.status_code} from {self.main_url}")
-                return False, response_time
-                
-        except requests.exceptions.SSLError as e:
-            self.main_server_status = "ssl_error"
-            self.main_consecutive_failures += 1
-            self.stats['ssl_errors'] += 1
-            logger.error(f"🔒 SSL Error: {str(e)[:100]}...")
-            return False, None
-            
-        except requests.exceptions.Timeout:
-            self.main_server_status = "timeout"
-            self.main_consecutive_failures += 1
-            self.stats['timeout_errors'] += 1
-            logger.warning(f"⏰ Timeout accessing {self.main_url}")
-            return False, None
-            
-        except requests.exceptions.ConnectionError as e:
-            self.main_server_status = "connection_error"
-            self.main_consecutive_failures += 1
-            self.stats['connection_errors'] += 1
-            logger.warning(f"🔌 Connection Error: {str(e)[:100]}...")
-            return False, None
-            
+            result = self.probe_engine.run_one(*self.main_probe())
         except Exception as e:
-            self.main_server_status = "unknown_error"
-            self.main_consecutive_failures += 1
-            logger.error(f"❌ Unknown Error: {str(e)[:100]}...")
-            return False, None
+            result = ProbeResult('main', status="unknown_error", error=e)
+        return self.apply_main_result(result)
     
     def check_health_endpoint(self):
         """헬스체크 엔드포인트 추가 확인"""
         try:
-            response = requests.get(
-                self.health_url,
-                timeout=5,
-                verify=True,
-                headers={'User-Agent': 'WoopangMonitor/Health'}
-            )
-            return response.status_code == 200, response.status_code
+            result = self.probe_engine.run_one(*self.health_probe())
         except Exception:
             return False, None
+        return result.healthy, result.status_code
     
     def comprehensive_server_check(self):
-        """Comprehensive server status check"""
-        main_healthy, main_time = self.check_main_server()
-        health_healthy, health_status = self.check_health_endpoint()
+        """Comprehensive server status check (엔진 루프 밖의 스레드용)"""
+        # 🔧 수정: 메인/헬스 프로브를 동시에 실행 - 사이클 시간 = 가장 느린 프로브
+        try:
+            results = self.probe_engine.run_cycle([self.main_probe(), self.health_probe()])
+        except Exception as e:
+            results = {'main': ProbeResult('main', status="unknown_error", error=e),
+                       'health': ProbeResult('health', status="unknown_error", error=e)}
+        return self.build_health_data(results)
+    
+    async def comprehensive_server_check_async(self):
+        """Comprehensive server status check from inside the probe engine loop"""
+        results = await self.probe_engine.gather([self.main_probe(), self.health_probe()])
+        return self.build_health_data(results)
+    
+    def build_health_data(self, results):
+        """Apply a cycle's probe results and build last_health_data"""
+        main_healthy, main_time = self.apply_main_result(results['main'])
+        health_healthy, health_status = results['health'].healthy, results['health'].status_code
+        if main_healthy:
+            self.latency.record('main', main_time)
+        if health_healthy:
+            self.latency.record('health', results['health'].response_time)
         
         health_data = {
             'main_server': {
                 'status': self.main_server_status,
                 'healthy': main_healthy,
                 'response_time': main_time,
-                'consecutive_failures': self.main_consecutive_failures
+                'consecutive_failures': self.main_consecutive_failures,
+                'timings': results['main'].timings
             },
             'health_endpoint': {
                 'healthy': health_healthy,
-                'status_code': health_status
+                'status_code': health_status,
+                'timings': results['health'].timings
             },
             'overall_status': 'healthy' if main_healthy else 'unhealthy',
             'issues': [],
@@ -255,23 +531,43 @@ class SmartMonitoringSystem:
         if self.main_consecutive_failures >= self.max_consecutive_failures:
             health_data['issues'].append(f'CONSECUTIVE_FAILURES({self.main_consecutive_failures})')
         
-        # System resource check
-        try:
-            memory_usage = psutil.virtual_memory().percent
-            cpu_usage = psutil.cpu_percent(interval=0.1)
+        for rule in self.slo.rules:
+            if rule.action != 'restart' and rule.name in self.slo.firing:
+                health_data['issues'].append(f'SLO_BURN({rule.name})')
+        
+        # Critical scheduled targets
+        for name, status in self.target_status.items():
+            if status['critical'] and status['consecutive_failures'] >= self.max_consecutive_failures:
+                health_data['issues'].append(f'TARGET_DOWN({name})')
+        
+        # /health 본문의 구성 요소 이상 징후 (spike / drift / 나쁜 상태 문자열)
+        for field, kind, _ in self.health_payload.anomalies():
+            health_data['issues'].append(f'HEALTH_{kind.upper()}({field})')
+        
+        # /locations 합성 프로브의 지점별 지연/크기/파싱 시간 이상 징후
+        for name, probe in list(self.synthetic.items()):
+            for field, kind, _ in probe.anomalies():
+                health_data['issues'].append(f'LOCATIONS_{kind.upper()}({name}.{field})')
+        
+        # System resource check - 🔧 수정: psutil 직접 호출 대신 샘플러 최신 스냅샷 사용
+        snapshot = self.sampler.latest()
+        if snapshot:
+            memory_usage = snapshot['system']['memory_percent']
+            cpu_usage = snapshot['system']['cpu_percent']
             
             health_data['system'] = {
                 'memory_usage': memory_usage,
-                'cpu_usage': cpu_usage
+                'cpu_usage': cpu_usage,
+                'sampled_at': snapshot['time'],
+                'processes': snapshot['processes']
             }
             
             if memory_usage > 90:
                 health_data['issues'].append(f'HIGH_MEMORY({memory_usage:.1f}%)')
             if cpu_usage > 95:
                 health_data['issues'].append(f'HIGH_CPU({cpu_usage:.1f}%)')
-                
-        except Exception:
-            health_data['issues'].append('SYSTEM_CHECK_FAILED')
+            if time.time() - snapshot['time'] > 3 * self.sample_interval:
+                health_data['issues'].append('SYSTEM_CHECK_FAILED')
         
         self.last_health_data = health_data
         return health_data
@@ -303,47 +599,91 @@ class SmartMonitoringSystem:
                     logger.error("⏰ Server response timeout")
     
     def fast_main_server_check(self):
-        """Fast main server check"""
+        """Fast main server check (엔진 루프 밖의 스레드용)"""
+        return self.probe_engine.submit(self.fast_main_server_check_async()).result()
+    
+    async def fast_main_server_check_async(self):
+        """Fast main server check - confirmation mode per fast_check_mode"""
+        if self.fast_check_mode == "hedged":
+            recovered = await self.hedged_main_server_check_async()
+        else:
+            recovered = await self.sequential_main_server_check_async()
+        if not recovered:
+            elapsed = self.incidents.mark('confirmed')
+            if elapsed is not None:
+                self.time_to_confirm.observe(elapsed)
+                self.stats['last_time_to_confirm'] = elapsed
+                logger.error(f"⏱️ Time from first failure to confirmed down: {elapsed:.1f}s")
+        return recovered
+    
+    async def hedged_main_server_check_async(self):
+        """Staggered parallel probes over independent DNS/connection paths, decided by quorum"""
+        confirmer = HedgedConfirmer(
+            self.probe_engine, self.main_url, quorum=self.confirm_quorum, stagger=self.confirm_stagger,
+            timeout=self.confirm_timeout,
+            headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+                     'Accept': 'text/html,application/xhtml+xml'}
+        )
+        logger.warning(f"🚨 External access issue detected! Hedged check over {len(confirmer.paths)} paths "
+                       f"(quorum {confirmer.quorum}, stagger {self.confirm_stagger}s, timeout {self.confirm_timeout}s)...")
+        outcome = await confirmer.confirm()
+        self.last_confirm = outcome
+        self.confirm_durations['up' if outcome.healthy else 'down'].observe(outcome.elapsed)
+        self.stats['last_confirm'] = {
+            'healthy': outcome.healthy, 'failures': outcome.failures, 'successes': outcome.successes,
+            'elapsed': outcome.elapsed,
+            'votes': [{'path': path, 'address': address, 'status': result.status, 'at': at}
+                      for path, address, result, at in outcome.votes]
+        }
+        for path, address, result, at in outcome.votes:
+            detail = f"HTTP {result.status_code}" if result.status_code else result.status.upper().replace('_', ' ')
+            icon = "✅" if result.healthy else "❌"
+            logger.info(f"   {icon} {path} via {address}: {detail} (+{at:.2f}s)")
+        
+        if outcome.healthy:
+            logger.info(f"✅ External access recovered! {outcome.describe()}")
+            self.main_server_status = "healthy"
+            self.main_consecutive_failures = 0
+            self.resolve_incident()
+            return True
+        logger.error(f"🚨 External access confirmed down! {outcome.describe()}")
+        return False
+    
+    async def sequential_main_server_check_async(self):
+        """Fast main server check - 3 sequential attempts"""
         logger.warning(f"🚨 External access issue detected! Fast checking ({self.fast_check_interval}s × {self.fast_check_attempts} attempts)...")
         
+        # 🔧 수정: 빠른 체크에서도 개선된 헤더 사용
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+            'Accept': 'text/html,application/xhtml+xml'
+        }
+        
         for attempt in range(self.fast_check_attempts):
-            try:
-                start_time = time.time()
-                
-                # 🔧 수정: 빠른 체크에서도 개선된 헤더 사용
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-                    'Accept': 'text/html,application/xhtml+xml'
-                }
-                
-                response = requests.get(
-                    self.main_url, 
-                    timeout=3,  # 빠른 체크용 짧은 타임아웃
-                    verify=True,
-                    headers=headers
-                )
-                response_time = time.time() - start_time
-                
-                if response.status_code == 200:
-                    logger.info(f"✅ External access recovered! (attempt {attempt+1}/{self.fast_check_attempts}, {response_time:.2f}s)")
-                    self.main_server_status = "healthy"
-                    self.main_consecutive_failures = 0
-                    return True
-                else:
-                    logger.warning(f"⚠️ Status {response.status_code} (attempt {attempt+1}/{self.fast_check_attempts})")
-                    
-            except requests.exceptions.SSLError as e:
-                logger.warning(f"🔒 SSL Error (attempt {attempt+1}/{self.fast_check_attempts}): {str(e)[:50]}...")
-            except requests.exceptions.ConnectionError as e:
-                logger.warning(f"🔌 Connection Error (attempt {attempt+1}/{self.fast_check_attempts}): {str(e)[:50]}...")
-            except requests.exceptions.Timeout:
+            # 빠른 체크용 짧은 타임아웃 (엔진이 전체 데드라인으로 강제)
+            result = await self.probe_engine.run_probe(*self.main_probe(timeout=3, headers=headers))
+            
+            error = str(result.error) if result.error else ''
+            if result.healthy:
+                logger.info(f"✅ External access recovered! (attempt {attempt+1}/{self.fast_check_attempts}, {result.response_time:.2f}s)")
+                self.main_server_status = "healthy"
+                self.main_consecutive_failures = 0
+                self.resolve_incident()
+                return True
+            elif result.status == "unhealthy":
+                logger.warning(f"⚠️ Status {result.status_code} (attempt {attempt+1}/{self.fast_check_attempts})")
+            elif result.status == "ssl_error":
+                logger.warning(f"🔒 SSL Error (attempt {attempt+1}/{self.fast_check_attempts}): {error[:50]}...")
+            elif result.status == "connection_error":
+                logger.warning(f"🔌 Connection Error (attempt {attempt+1}/{self.fast_check_attempts}): {error[:50]}...")
+            elif result.status == "timeout":
                 logger.warning(f"⏰ Timeout (attempt {attempt+1}/{self.fast_check_attempts})")
-            except Exception as e:
-                error_msg = str(e)[:50] + "..." if len(str(e)) > 50 else str(e)
+            else:
+                error_msg = error[:50] + "..." if len(error) > 50 else error
                 logger.warning(f"❌ Fast check failed (attempt {attempt+1}/{self.fast_check_attempts}): {error_msg}")
             
             if attempt < self.fast_check_attempts - 1:
-                time.sleep(self.fast_check_interval)
+                await asyncio.sleep(self.fast_check_interval)
         
         logger.error(f"🚨 External access confirmed down! ({self.fast_check_attempts} fast checks completed)")
         return False
@@ -353,104 +693,550 @@ class SmartMonitoringSystem:
         try:
             logger.info("🔧 모든 서버 프로세스 정리 시작...")
             
-            # 1. 포트 443을 사용하는 모든 프로세스 종료
-            try:
-                result = subprocess.run(['netstat', '-ano'], capture_output=True, text=True)
-                for line in result.stdout.split('\n'):
-                    if ':443 ' in line and 'LISTENING' in line:
-                        pid = line.strip().split()[-1]
-                        try:
-                            subprocess.run(['taskkill', '/F', '/PID', pid], check=True, capture_output=True)
-                            logger.info(f"✅ 포트 443 점유 프로세스 종료: PID {pid}")
-                        except:
-                            pass
-            except Exception as e:
-                logger.warning(f"⚠️ 포트 정리 실패: {e}")
+            # 🔧 수정: 소켓 소유자 직접 조회 → terminate → wait_procs → 남은 것만 kill, 포트가 비면 즉시 반환
+            report = self.reaper.reap()
+            self.last_reap = report
+            self.stats['last_reap'] = report.as_dict()
+            self.reap_durations.observe(report.elapsed)
             
-            # 2. Python 프로세스 중 app_improved.py 실행 중인 것 모두 종료
-            for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-                try:
-                    cmdline = proc.info['cmdline']
-                    if cmdline and any('app_improved.py' in str(cmd) for cmd in cmdline):
-                        psutil.Process(proc.info['pid']).terminate()
-                        logger.info(f"✅ app_improved.py 프로세스 종료: PID {proc.info['pid']}")
-                except:
-                    pass
-            
-            # 3. 잠시 대기 후 강제 종료
-            time.sleep(3)
-            for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-                try:
-                    cmdline = proc.info['cmdline']
-                    if cmdline and any('app_improved.py' in str(cmd) for cmd in cmdline):
-                        psutil.Process(proc.info['pid']).kill()
-                        logger.info(f"🔥 app_improved.py 프로세스 강제 종료: PID {proc.info['pid']}")
-                except:
-                    pass
-                    
-            logger.info("✅ 서버 프로세스 정리 완료")
-            time.sleep(5)  # 포트 해제 대기
+            for pid in report.terminated:
+                logger.info(f"✅ 서버 프로세스 종료: PID {pid}")
+            for pid in report.killed:
+                logger.info(f"🔥 서버 프로세스 강제 종료: PID {pid}")
+            for pid in report.survivors:
+                logger.error(f"❌ 종료되지 않은 프로세스: PID {pid}")
+            
+            if report.port_free:
+                logger.info(f"✅ 서버 프로세스 정리 완료 - 포트 {self.local_port} 해제 ({report.elapsed:.2f}s)")
+            else:
+                logger.warning(f"⚠️ 포트 {self.local_port} 가 아직 사용 중 ({report.elapsed:.2f}s)")
+            return report.port_free
             
         except Exception as e:
             logger.error(f"❌ 프로세스 정리 실패: {e}")
+            return False
+    
+    def set_restart_mode(self, mode):
+        """cold / handoff (handoff 를 지원하지 않는 플랫폼에서는 cold), standby 는 handoff 와 함께"""
+        if mode not in ("cold", "handoff"):
+            raise ValueError(f"unknown restart mode {mode!r}")
+        if mode == "handoff" and not SocketHandoff.supported():
+            logger.warning("⚠️ Socket handoff not supported on this platform - using cold restarts")
+            mode = "cold"
+        self.restart_mode = mode
+        self.standby_enabled = mode == "handoff" and WarmStandby.supported()
     
-    def restart_main_server(self):
-        """Restart main server - 🔧 수정: 프로세스 정리 강화"""
+    def restart_main_server(self, graceful=False):
+        """Restart main server - 🔧 수정: 프로세스 정리 강화
+
+        graceful=True 는 정상 동작 중인 서버의 계획된 교체 (누수 선제 재시작 등) -
+        스탠바이 승격 시에도 기존 프로세스를 drain_timeout 만큼 drain 한다.
+        """
+        if self.workers.enabled:
+            return self.supervisor_restart_main_server()
+        if self.restart_mode == "handoff":
+            return self.handoff_restart_main_server(graceful)
+        
         try:
             logger.info("🚀 Attempting to restart main server...")
             
             # 🔧 수정: 기존 restart_manager.kill_port_processes 대신 강화된 프로세스 정리 사용
             self.kill_all_server_processes()
             
-            # Set environment variables (normal mode)
-            env = os.environ.copy()
-            env.pop('BACKUP_MODE', None)
-            env.pop('FORCE_HTTP_PORT', None)
-            
-            logger.info("🔧 Main server environment cleared")
-            
             # Start main server
-            self.main_process = subprocess.Popen([
-                "python", "app_improved.py"
-            ], cwd="C:/woopang/server", 
-            env=env,
-            creationflags=subprocess.CREATE_NEW_CONSOLE)
+            spawn_time = time.perf_counter()
+            self.main_process = subprocess.Popen(
+                self.app_command, cwd=self.server_dir,
+                env=self.main_server_env(),
+                **self.spawn_options()
+            )
             
             logger.info(f"📋 Main server process started - PID: {self.main_process.pid}")
             
-            # Wait for main server startup (90 seconds for external access)
-            for i in range(90):
-                main_healthy, _ = self.check_main_server()
-                if main_healthy:
-                    logger.info(f"🎉 Main server restarted successfully - External access restored ({i+1}s)")
-                    logger.info(f"🌐 External access: https://woopang.com")
-                    self.stats['successful_restarts'] += 1
-                    self.restart_attempts = 0
-                    self.main_consecutive_failures = 0
-                    self.last_restart_time = datetime.now()
-                    return True
-                    
-                # Check if process died
-                if self.main_process.poll() is not None:
-                    logger.error("❌ Main server process terminated during startup")
-                    break
-                    
-                time.sleep(1)
-                if i % 15 == 14:
-                    logger.info(f"⏳ Waiting for external access... ({i+1}/90)")
-                    
-            logger.error("❌ Main server restart failed (90s timeout)")
+            # 🔧 수정: 단계별 준비 감지 (외부 체크를 1초마다 반복하지 않음)
+            return self.wait_for_main_server(spawn_time)
+            
+        except Exception as e:
+            logger.error(f"❌ Failed to restart main server: {e}")
+            self.stats['failed_restarts'] += 1
+            return False
+    
+    def main_server_env(self):
+        """Set environment variables (normal mode)"""
+        env = os.environ.copy()
+        env.pop('BACKUP_MODE', None)
+        env.pop('FORCE_HTTP_PORT', None)
+        logger.info("🔧 Main server environment cleared")
+        return env
+    
+    @staticmethod
+    def spawn_options():
+        if os.name == 'nt':
+            return {'creationflags': subprocess.CREATE_NEW_CONSOLE}
+        return {'start_new_session': True}
+    
+    def handoff_restart_main_server(self, graceful=False):
+        """Zero-downtime restart: new process inherits the listening socket, old one drains afterwards"""
+        if self.standby_enabled and self.standby.warm:
+            result = self.failover_to_standby(self.drain_timeout if graceful else 0.5)
+            if result is not None:
+                return result
+        
+        try:
+            logger.info("🚀 Attempting zero-downtime restart (socket handoff)...")
+            old_process = self.main_process
+            
+            if not self.handoff.bound:
+                # 첫 전환: 기존 프로세스가 포트를 직접 잡고 있으므로 한 번은 정리 후 모니터가 bind
+                logger.info("🔧 Listening socket not owned by monitor yet - reaping and binding once")
+                self.kill_all_server_processes()
+                self.handoff.bind()
+                old_process = None
+                logger.info(f"🔒 Monitor now owns listening socket :{self.handoff.port}")
+            
+            spawn_time = time.perf_counter()
+            new_process, ready_fd = self.handoff.spawn(self.app_command, cwd=self.server_dir, env=self.main_server_env())
+            logger.info(f"📋 New server generation started - PID: {new_process.pid} (sharing socket)")
+            
+            ready, reason = self.handoff.wait_ready(new_process, ready_fd, self.startup_timeout)
+            if not ready:
+                logger.error(f"❌ New server generation not ready: {reason}")
+                if new_process.poll() is None:
+                    self.handoff.retire(new_process, drain_timeout=5)
+                if old_process is None or old_process.poll() is not None:
+                    # 🔧 수정: 아무도 accept 하지 않는 소켓을 쥐고 있으면 클라이언트가 타임아웃까지 매달린다 -
+                    # 소켓을 놓고 cold 모드로 전환해 앱이 직접 bind 하게 한다
+                    return self.fall_back_to_cold_restart(reason)
+                self.stats['failed_restarts'] += 1
+                return False
+            local_ready = time.perf_counter() - spawn_time
+            self.main_process = new_process
+            logger.info(f"✅ New generation accepting connections ({local_ready:.2f}s)")
+            
+            # 새 프로세스가 accept 중이므로 이전 세대는 천천히 drain 후 종료
+            if old_process is not None and old_process.poll() is None:
+                drained = self.handoff.retire(old_process, drain_timeout=self.drain_timeout)
+                logger.info(f"💤 Previous generation PID {old_process.pid} drained ({drained:.1f}s)")
+            
+            restarted = self.wait_for_main_server(spawn_time, port_open=0.0, local_ready=local_ready)
+            self.rebuild_standby_async()
+            return restarted
+            
+        except Exception as e:
+            logger.error(f"❌ Zero-downtime restart failed: {e}")
             self.stats['failed_restarts'] += 1
             return False
+    
+    def fall_back_to_cold_restart(self, reason):
+        """Release the handed-off socket and restart the app binding the port itself"""
+        logger.warning(f"⚠️ Socket handoff failed ({reason}) - releasing :{self.handoff.port} and switching to cold restarts")
+        with self.standby_lock:
+            self.standby.discard()
+        self.handoff.close()
+        self.set_restart_mode("cold")
+        return self.restart_main_server()
+    
+    def failover_to_standby(self, drain_timeout=0.5):
+        """Promote the warm standby onto the shared socket, then remove the failed instance
+
+        Returns True/False like restart_main_server, or None if promotion failed
+        (호출측이 일반 핸드오프 재시작으로 대체).
+        """
+        with self.standby_lock:
+            start = time.perf_counter()
+            failed_process = self.main_process
+            logger.info(f"🔀 Switching traffic to warm standby PID {self.standby.process.pid}...")
             
+            ok, promote_time, reason = self.standby.promote()
+            if not ok:
+                logger.error(f"❌ Standby promotion failed: {reason} - falling back to restart")
+                self.standby.discard()
+                return None
+            self.main_process = self.standby.detach()
+            
+            # 실패한 인스턴스는 drain 없이 바로 내려서 공유 소켓에서 더 이상 accept 하지 않도록
+            if failed_process is not None and failed_process.poll() is None:
+                SocketHandoff.retire(failed_process, drain_timeout=drain_timeout)
+            switch_time = time.perf_counter() - start
+        
+        self.switch_durations.observe(switch_time)
+        self.stats['failovers'] += 1
+        self.last_switch = {'promote': promote_time, 'switch': switch_time, 'time': datetime.now()}
+        logger.info(f"🔀 Traffic switched to standby PID {self.main_process.pid} "
+                    f"(promote {promote_time*1000:.0f}ms, total switch {switch_time*1000:.0f}ms)")
+        
+        restored = self.wait_for_main_server(start, port_open=0.0, local_ready=promote_time)
+        self.rebuild_standby_async()
+        return restored
+    
+    def local_health_ok(self, url, name='local_health'):
+        """Blocking local /health check for warm-up loops (standby, workers)"""
+        result = self.probe_engine.run_one(
+            name,
+            self.probe_engine.http_get(name, url, 2, headers={'User-Agent': 'WoopangMonitor/Local'}, fresh=True),
+            2
+        )
+        return result.healthy
+    
+    def ensure_standby(self):
+        """Launch and warm a standby if none is running (blocking - use rebuild_standby_async)"""
+        if not self.standby_enabled or not self.handoff.bound:
+            return False
+        with self.standby_lock:
+            if self.standby.warm or self.standby.state == 'warming':
+                return True
+            self.standby.discard()
+            try:
+                process = self.standby.launch(self.app_command, self.server_dir, self.main_server_env())
+            except Exception as e:
+                logger.error(f"❌ Standby launch failed: {e}")
+                return False
+            logger.info(f"🔧 Warming standby PID {process.pid} on port {self.standby.port}...")
+        
+        if self.standby.wait_warm(lambda url: self.local_health_ok(url, 'standby_health'), timeout=self.startup_timeout):
+            logger.info(f"✅ Standby warm on port {self.standby.port} ({self.standby.warm_after:.1f}s)")
+            return True
+        logger.error("❌ Standby failed to warm up")
+        with self.standby_lock:
+            self.standby.discard()
+        return False
+    
+    def rebuild_standby_async(self):
+        if self.standby_enabled and self.handoff.bound:
+            threading.Thread(target=self.ensure_standby, name='standby-builder', daemon=True).start()
+    
+    async def leak_check(self):
+        try:
+            self.leak_tick()
         except Exception as e:
-            logger.error(f"❌ Failed to restart main server: {e}")
+            logger.warning(f"⚠️ Leak trend check failed: {e}")
+    
+    def leak_tick(self):
+        """Fit RSS trends from the sampler buffers and trigger a pre-emptive restart when due"""
+        snapshot = self.sampler.latest()
+        if not snapshot:
+            return
+        names = [name for name in self.sampler.process_names() if name != 'standby']
+        # 가용 메모리는 감독 중인 프로세스들이 나눠 쓴다고 보고 균등 분배
+        headroom = snapshot['system']['memory_available'] / max(1, len(names))
+        
+        for name in names:
+            times, rss = self.sampler.series(name, 'rss')
+            pid = snapshot['processes'].get(name, {}).get('pid')
+            trend = self.leak_detector.fit(name, times, rss, headroom, limit=self.leak_rss_limit, pid=pid)
+            if trend is None:
+                continue
+            self.leak_trends[name] = trend
+            self.stats.setdefault('leak_trends', {})[name] = trend.as_dict()
+            if not trend.leaking:
+                self.leak_logged.pop(name, None)
+                continue
+            
+            _, connections = self.sampler.series(name, 'connections')
+            traffic = snapshot['processes'].get(name, {}).get('connections')
+            restart_now, reason = self.leak_detector.decide(trend, traffic, connections)
+            if restart_now and not self.can_restart_without_downtime(name):
+                # 🔧 수정: cold 재시작은 전체 중단 - 선제 재시작으로 장애를 만들지 않고 실제 장애 때 재시작에 맡긴다
+                restart_now, reason = False, f"no zero-downtime restart path in {self.restart_mode} mode ({reason})"
+            
+            # 같은 판단은 한 시간에 한 번만 기록
+            last = self.leak_logged.get(name)
+            if restart_now or last is None or last[1] != reason.split(' (')[0] or time.time() - last[0] > 3600:
+                logger.warning(f"📈 Memory leak trend {name} PID {pid}: {trend.describe()} - "
+                               f"{'restart now' if restart_now else 'restart deferred'}: {reason}")
+                self.leak_logged[name] = (time.time(), reason.split(' (')[0])
+            
+            if restart_now:
+                self.start_leak_restart(name, trend, reason)
+                return
+    
+    def worker_slot(self, name):
+        return next((slot for slot in self.workers.slots if slot.name == name), None)
+    
+    def can_restart_without_downtime(self, name):
+        """Worker rolling restart, or socket handoff (+ standby) once the monitor owns the socket"""
+        if self.worker_slot(name) is not None:
+            return True
+        # 첫 핸드오프는 기존 프로세스를 정리한 뒤 bind 하므로 아직 소켓이 없으면 중단이 생긴다
+        return self.restart_mode == "handoff" and self.handoff.bound
+    
+    def start_leak_restart(self, name, trend, reason):
+        """Start a pre-emptive restart from the engine loop"""
+        if self.leak_restart_thread and self.leak_restart_thread.is_alive():
+            return
+        if self.restart_in_progress or self.state.state != monitor_state.HEALTHY:
+            logger.info(f"⏳ Pre-emptive restart of {name} postponed - monitor is {self.state.state}")
+            return
+        slot = self.worker_slot(name)
+        if slot is None:
+            # 🔧 수정: 메인 프로세스 교체는 장애 재시작처럼 RESTARTING 상태에서 - monitor_tick 은 관찰만 하고
+            # 교체 중의 실패로 SUSPECT/CONFIRMING 에 들어가거나 두 번째 재시작을 시작하지 않는다
+            self.state.transition(monitor_state.RESTARTING, f"pre-emptive restart of {name}")
+        self.leak_restart_thread = threading.Thread(
+            target=self.preemptive_restart, args=(name, slot, trend, reason, asyncio.get_running_loop()),
+            name='leak-restart', daemon=True
+        )
+        self.leak_restart_thread.start()
+    
+    def preemptive_restart(self, name, slot, trend, reason, loop):
+        """Controlled restart of a leaking process before memory runs out (leak-restart thread)"""
+        logger.warning(f"🧹 Pre-emptive restart of {name} (PID {trend.pid}) - {reason}; "
+                       f"inputs: {trend.describe()}")
+        with self.stats_lock:
+            self.stats['leak_restarts'] += 1
+        self.leak_logged.pop(name, None)
+        
+        if slot is not None:
+            # 누수 워커만 교체 - 나머지 워커는 계속 서빙
+            with self.worker_restart_lock:
+                success = self.replace_worker(slot, f"memory leak: {reason}")
+        else:
+            success = False
+            try:
+                if not self.restart_lock.acquire(blocking=False):
+                    logger.warning("🔄 Restart already in progress, skipping...")
+                    return
+                self.restart_in_progress = True
+                try:
+                    success = self.restart_main_server(graceful=True)
+                finally:
+                    self.restart_in_progress = False
+                    self.restart_lock.release()
+            finally:
+                loop.call_soon_threadsafe(self.finish_restart, success)
+        
+        if success:
+            logger.info(f"🧹 Pre-emptive restart of {name} completed")
+        else:
+            logger.error(f"❌ Pre-emptive restart of {name} failed")
+    
+    def supervised_processes(self):
+        """{name: pid} of app processes for the resource sampler"""
+        processes = {}
+        if self.workers.enabled:
+            for slot in self.workers.slots:
+                if slot.alive():
+                    processes[slot.name] = slot.pid
+        elif self.main_process is not None and self.main_process.poll() is None:
+            processes['main'] = self.main_process.pid
+        else:
+            # 모니터가 띄우지 않은 서버 (모니터보다 먼저 실행된 경우) - 포트 소유자로 찾음
+            pids = self.reaper.listening_pids() - {os.getpid()}
+            if pids:
+                processes['main'] = min(pids)
+        if self.standby.process is not None and self.standby.process.poll() is None:
+            processes['standby'] = self.standby.process.pid
+        return processes
+    
+    def spawn_worker(self, slot):
+        return self.workers.spawn(slot, self.app_command, self.server_dir, self.main_server_env(), **self.spawn_options())
+    
+    def replace_worker(self, slot, reason):
+        """Restart one worker while the others keep serving (caller holds worker_restart_lock)"""
+        serving = sum(1 for other in self.workers.slots if other is not slot and other.status == 'healthy')
+        logger.info(f"🔄 Restarting {slot.name} (:{slot.port}) - {reason} [{serving} other workers serving]")
+        slot.status = 'restarting'
+        if self.proxy.running:
+            # 새 요청은 다른 워커로, 진행 중인 요청은 끝까지 - 그 다음에 프로세스 종료
+            drained, seconds, left = self.proxy.drain(slot.name, self.drain_timeout)
+            self.drain_durations.observe(seconds)
+            if drained:
+                logger.info(f"💤 {slot.name} drained ({seconds:.2f}s)")
+            else:
+                logger.warning(f"⚠️ {slot.name} drain timed out with {left} requests in flight")
+        success, duration = self.workers.restart(
+            slot, self.spawn_worker, lambda url: self.local_health_ok(url, f'{slot.name}_ready'),
+            reason, timeout=self.startup_timeout
+        )
+        if success:
+            self.proxy.admit(slot.name)
+        else:
+            self.proxy.eject(slot.name, slot.status)
+        self.worker_restart_durations.observe(duration)
+        with self.stats_lock:
+            self.stats['worker_restarts'] += 1
+        if success:
+            logger.info(f"✅ {slot.name} healthy again - PID {slot.pid} ({duration:.1f}s)")
+        else:
+            logger.error(f"❌ {slot.name} restart failed - {slot.status} ({duration:.1f}s)")
+        return success
+    
+    def rolling_restart_workers(self, reason, include_healthy=True):
+        """Replace workers one at a time, unhealthy ones first
+        
+        정상 워커를 교체하다 실패하면 중단한다 - 남은 워커까지 내리지 않기 위해.
+        """
+        with self.worker_restart_lock:
+            unhealthy = [slot for slot in self.workers.slots if slot.status != 'healthy']
+            healthy = [slot for slot in self.workers.slots if slot.status == 'healthy'] if include_healthy else []
+            logger.info(f"🔄 Rolling restart of {len(unhealthy) + len(healthy)} workers - {reason}")
+            all_ok = True
+            for slot in unhealthy:
+                all_ok = self.replace_worker(slot, reason) and all_ok
+            for slot in healthy:
+                if not all_ok:
+                    logger.warning(f"⚠️ Rolling restart stopped before {slot.name} - keeping remaining workers up")
+                    break
+                all_ok = self.replace_worker(slot, reason)
+            return all_ok
+    
+    def supervisor_restart_main_server(self):
+        """External access down in supervisor mode: rolling restart, then external readiness"""
+        start = time.perf_counter()
+        self.rolling_restart_workers("external access down")
+        local_ready = time.perf_counter() - start
+        if not self.workers.healthy_count():
+            logger.error("❌ No healthy workers after rolling restart")
             self.stats['failed_restarts'] += 1
             return False
+        return self.wait_for_main_server(start, port_open=0.0, local_ready=local_ready)
+    
+    def start_front_proxy(self):
+        """Bind the front proxy on local_port with every worker as an (initially ejected) backend"""
+        if not self.proxy_certfile and self.proxy.port == 443:
+            # 🔧 수정: 인증서 없이 443 에서 평문 HTTP 를 조용히 서빙하지 않는다
+            raise ValueError(f"no proxy_certfile configured - refusing to serve plain HTTP on :{self.proxy.port}")
+        if self.proxy_certfile:
+            context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+            context.load_cert_chain(self.proxy_certfile, self.proxy_keyfile)
+            self.proxy.ssl_context = context
+        for slot in self.workers.slots:
+            self.proxy.add_backend(slot.name, self.workers.host, slot.port, state=front_proxy.EJECTED)
+        try:
+            self.proxy.start()
+        except OSError:
+            # 단일 프로세스 모드에서 남은 app_improved.py 가 포트를 잡고 있는 경우
+            logger.info(f"🔧 Port {self.proxy.port} busy - clearing old server processes for the proxy")
+            self.kill_all_server_processes()
+            self.proxy.start()
+        scheme = "HTTPS" if self.proxy.ssl_context else "plain HTTP"
+        logger.info(f"🔀 Front proxy listening on :{self.proxy.port} ({scheme}) → {len(self.workers.slots)} workers (least outstanding)")
+    
+    def start_workers(self):
+        """Start every worker in turn (worker-startup thread)"""
+        with self.worker_restart_lock:
+            for slot in self.workers.slots:
+                try:
+                    self.spawn_worker(slot)
+                except Exception as e:
+                    slot.status = 'failed'
+                    logger.error(f"❌ {slot.name} launch failed: {e}")
+                    continue
+                if self.workers.wait_healthy(slot, lambda url: self.local_health_ok(url, f'{slot.name}_ready'),
+                                             timeout=self.startup_timeout):
+                    self.proxy.admit(slot.name)
+                    logger.info(f"✅ {slot.name} up on :{slot.port} - PID {slot.pid}")
+                else:
+                    logger.error(f"❌ {slot.name} failed to start ({slot.status})")
+    
+    def record_worker_result(self, slot, result):
+        if result.healthy:
+            if slot.consecutive_failures >= self.max_consecutive_failures:
+                logger.info(f"✅ {slot.name} recovered ({result.response_time:.2f}s)")
+            slot.status = 'healthy'
+            slot.consecutive_failures = 0
+            slot.response_time = result.response_time
+            self.latency.record(slot.name, result.response_time)
+            self.proxy.admit(slot.name)
+        else:
+            # 한 번의 실패로 즉시 라우팅 제외 - 재시작 판정은 연속 실패 기준 그대로
+            self.proxy.eject(slot.name, result.status)
+            slot.status = result.status
+            slot.consecutive_failures += 1
+            slot.failures += 1
+            slot.response_time = None
+        slot.checks += 1
+    
+    async def worker_tick(self):
+        """Probe every worker concurrently, restart at most one unhealthy worker (engine loop)"""
+        # 재시작/기동 중인 워커가 있으면 관찰만 - 교체 판정은 다음 틱에서
+        busy = self.worker_restart_lock.locked()
+        
+        # 아직 한 번도 기동하지 않은 슬롯은 start_workers 담당
+        slots = [slot for slot in self.workers.slots
+                 if slot.status not in ('starting', 'restarting') and not (slot.process is None and slot.status == 'stopped')]
+        probes = []
+        for slot in slots:
+            if slot.alive():
+                probes.append((slot.name, self.probe_engine.http_get(
+                    slot.name, self.workers.health_url(slot), self.worker_probe_timeout,
+                    headers={'User-Agent': 'WoopangMonitor/Worker'}
+                ), self.worker_probe_timeout))
+            elif slot.process is not None and slot.status != 'exited':
+                slot.status = 'exited'
+                self.proxy.eject(slot.name, 'exited')
+                logger.error(f"🚨 {slot.name} exited with code {slot.process.returncode}")
+        results = await self.probe_engine.gather(probes) if probes else {}
+        for slot in slots:
+            if slot.name in results:
+                self.record_worker_result(slot, results[slot.name])
+        self.stats['workers'] = {slot.name: slot.as_dict() for slot in self.workers.slots}
+        
+        if busy:
+            return
+        for slot in slots:
+            if slot.status in ('starting', 'restarting', 'healthy'):
+                continue
+            if slot.alive() and slot.consecutive_failures < self.max_consecutive_failures:
+                continue
+            reason = slot.status if not slot.alive() else f"{slot.consecutive_failures} consecutive failures"
+            
+            def restart_one(slot=slot, reason=reason):
+                with self.worker_restart_lock:
+                    self.replace_worker(slot, reason)
+            
+            slot.status = 'restarting'
+            threading.Thread(target=restart_one, name=f'{slot.name}-restart', daemon=True).start()
+            break
+    
+    def wait_for_main_server(self, spawn_time, port_open=None, local_ready=None):
+        """Wait for the spawned server through the readiness stages and record timings
+
+        port_open/local_ready 를 넘기면 로컬 단계는 이미 판정된 것으로 보고 외부 단계만 기다린다.
+        """
+        skip_local = local_ready is not None
+        spawn_wall = time.time() - (time.perf_counter() - spawn_time)
+        report = self.probe_engine.submit(
+            self.readiness.wait_ready(self.main_process, spawn_time, timeout=self.startup_timeout,
+                                      skip_local=skip_local)
+        ).result()
+        if skip_local:
+            report.port_open = port_open
+            report.local_ready = local_ready
+        self.last_readiness = report
+        self.stats['last_readiness'] = report.as_dict()
+        for stage in READINESS_STAGES:
+            value = getattr(report, stage)
+            if value is not None:
+                self.readiness_durations[stage].observe(value)
+        if report.port_open is not None:
+            # 재시도 끝에 복구되면 마지막 세대의 포트 오픈이 MTTR 구간에 들어가야 함
+            self.incidents.mark('port_open', spawn_wall + report.port_open, overwrite=True)
+        
+        if report.ready:
+            # 🔧 수정: 연속 실패·SLO·사고 상태는 엔진 루프만 쓴다 - 재시작 스레드에서는 결과를 넘기기만
+            # (finish_restart 보다 먼저 큐에 들어가므로 사고 종료 → 재기준 순서가 유지된다)
+            self.probe_engine.loop.call_soon_threadsafe(self.apply_main_result, report.external_result)
+            logger.info(f"🎉 Main server restarted successfully - External access restored ({report.external_ready:.1f}s)")
+            logger.info(f"⏱️ Readiness: {report.describe()}")
+            logger.info(f"🌐 External access: https://woopang.com")
+            self.stats['successful_restarts'] += 1
+            self.restart_attempts = 0
+            self.last_restart_time = datetime.now()
+            return True
+        
+        logger.warning(f"⏱️ Readiness: {report.describe()}")
+        if report.reason and 'exited' in report.reason:
+            logger.error(f"❌ Main server process terminated during startup ({report.failed_stage})")
+        else:
+            logger.error(f"❌ Main server restart failed ({report.failed_stage}: {report.reason})")
+        self.stats['failed_restarts'] += 1
+        return False
     
     def perform_server_restart(self):
         """Server restart process"""
-        if self.restart_in_progress:
+        # 🔧 수정: 플래그 확인과 설정을 락 하나로 (누수 선제 재시작 스레드와 경쟁)
+        if not self.restart_lock.acquire(blocking=False):
             logger.warning("🔄 Restart already in progress, skipping...")
             return False
             
@@ -461,25 +1247,21 @@ class SmartMonitoringSystem:
         try:
             logger.info(f"🎯 Starting server restart (attempt {self.restart_attempts}/{self.max_restart_attempts})")
             
-            # 1. Re-check current status
-            health_data = self.comprehensive_server_check()
-            
-            if health_data['main_server']['healthy']:
-                logger.info("✅ External access is actually working, no restart needed")
-                self.restart_in_progress = False  # 🔧 수정: 플래그 즉시 해제
-                return True
-            
-            # 2. Attempt main server restart
+            # 🔧 수정: 재확인 생략 - 장애는 confirm_outage 가 엔진 루프에서 이미 확인했다. 이 스레드에서
+            # comprehensive_server_check() 를 돌리면 monitor_tick 과 동시에 연속 실패/SLO/사고 상태를 고친다
             logger.info("🚀 Starting main server restart...")
+            self.incidents.mark('restart_started')
             restart_success = self.restart_main_server()
             
+            end_time = datetime.now()
+            duration = (end_time - start_time).total_seconds()
+            self.restart_durations['success' if restart_success else 'failure'].observe(duration)
+            self.publish_metrics()
+            
             if restart_success:
                 logger.info("🎉 Main server restart successful!")
                 self.last_success_time = datetime.now()
                 
-                end_time = datetime.now()
-                duration = (end_time - start_time).total_seconds()
-                
                 logger.info(f"🎉 Server restart completed successfully! (Total time: {duration:.1f}s)")
                 logger.info("🌐 External service restored at: https://woopang.com")
                 
@@ -493,6 +1275,177 @@ class SmartMonitoringSystem:
             return False
         finally:
             self.restart_in_progress = False
+            self.restart_lock.release()
+    
+    # (stats key, metric family, help)
+    STAT_COUNTERS = (
+        ('total_checks', 'checks', 'Monitoring cycles'),
+        ('target_checks', 'target_checks', 'Scheduled target probes'),
+        ('main_server_failures', 'main_server_failures', 'Cycles with external access down'),
+        ('successful_restarts', 'successful_restarts', 'Successful main server restarts'),
+        ('failed_restarts', 'failed_restarts', 'Failed main server restarts'),
+        ('connection_errors', 'connection_errors', 'Probe connection errors'),
+        ('timeout_errors', 'timeout_errors', 'Probe timeouts'),
+        ('ssl_errors', 'ssl_errors', 'Probe SSL errors'),
+        ('failovers', 'failovers', 'Failovers to the warm standby'),
+        ('worker_restarts', 'worker_restarts', 'Individual worker restarts'),
+        ('leak_restarts', 'leak_restarts', 'Pre-emptive restarts for memory growth'),
+        ('slo_alerts', 'slo_alerts', 'SLO burn-rate rules that started firing')
+    )
+    
+    # (sample field, metric family, help)
+    PROCESS_GAUGES = (
+        ('rss', 'process_rss_bytes', 'Resident memory of the app process'),
+        ('cpu_percent', 'process_cpu_percent', 'CPU usage of the app process'),
+        ('threads', 'process_threads', 'Threads in the app process'),
+        ('fds', 'process_open_fds', 'Open file descriptors (handles on Windows)'),
+        ('connections', 'process_connections', 'TCP connections of the app process')
+    )
+    
+    def build_metrics(self):
+        """Render stats, latency histograms and system gauges as OpenMetrics text"""
+        w = MetricsWriter()
+        with self.stats_lock:
+            counters = [(metric, self.stats[key], help_text) for key, metric, help_text in self.STAT_COUNTERS]
+            targets = [(name, dict(status)) for name, status in self.target_status.items()]
+        for metric, value, help_text in counters:
+            w.counter(metric, value, help_text)
+        
+        w.gauge('uptime_seconds', (datetime.now() - self.stats['uptime_start']).total_seconds(), 'Monitor uptime')
+        w.gauge('main_up', self.main_server_status == "healthy", 'Main site reachable from outside')
+        w.gauge('consecutive_failures', self.main_consecutive_failures, 'Consecutive main probe failures')
+        w.gauge('restart_in_progress', self.restart_in_progress, 'Restart currently running')
+        # OpenMetrics: 같은 family 샘플은 연속해서 출력해야 함
+        for name, status in targets:
+            w.gauge('target_up', status['status'] == 'healthy', 'Scheduled target healthy', {'target': name})
+        for name, status in targets:
+            w.gauge('target_consecutive_failures', status['consecutive_failures'], 'Consecutive target failures', {'target': name})
+        
+        for name in monitor_state.STATES:
+            w.gauge('state', self.state.state == name, 'Current monitor state', {'state': name})
+        for name, seconds in self.state.durations().items():
+            w.counter('state_seconds', seconds, 'Time spent in each monitor state', {'state': name})
+        
+        if self.workers.enabled:
+            w.gauge('workers_healthy', self.workers.healthy_count(), 'Workers passing their /health probe')
+            for slot in self.workers.slots:
+                w.gauge('worker_up', slot.status == 'healthy', 'Worker healthy', {'worker': slot.name})
+            for slot in self.workers.slots:
+                w.counter('worker_restarts_by_worker', slot.restarts, 'Restarts per worker', {'worker': slot.name})
+            w.histogram('worker_restart_duration_seconds', self.worker_restart_durations.snapshot(),
+                        'Time to replace one worker until it passes /health')
+        if self.proxy.running:
+            proxy = self.proxy.snapshot()
+            w.counter('proxy_requests', proxy['requests'], 'Requests received by the front proxy')
+            w.counter('proxy_errors', proxy['errors'], 'Front proxy 5xx responses and aborted exchanges')
+            w.counter('proxy_retries', proxy['retries'], 'Requests retried on another worker')
+            w.gauge('proxy_client_connections', proxy['client_connections'], 'Open client connections')
+            for name, backend in proxy['backends'].items():
+                w.gauge('proxy_backend_active', backend['state'] == front_proxy.ACTIVE, 'Backend receiving new requests', {'backend': name})
+            for name, backend in proxy['backends'].items():
+                w.gauge('proxy_backend_outstanding', backend['outstanding'], 'Requests in flight per backend', {'backend': name})
+            for name, backend in proxy['backends'].items():
+                w.counter('proxy_backend_requests', backend['requests'], 'Requests routed per backend', {'backend': name})
+            w.histogram('proxy_drain_seconds', self.drain_durations.snapshot(), 'Time to drain a worker before restart')
+        
+        pool = self.probe_engine.http.stats
+        w.counter('http_connections_opened', pool['connections_opened'], 'New probe connections')
+        w.counter('http_connections_reused', pool['connections_reused'], 'Probe requests on reused connections')
+        probe = self.light_probe.snapshot()
+        for kind, count in probe['counts'].items():
+            w.counter('main_probe_requests', count, 'Main page probes by request kind (deep = full GET)', {'kind': kind})
+        w.counter('main_probe_bytes', probe['bytes_total'], 'Response bytes received by main page probes (headers + body)')
+        w.counter('main_probe_bytes_saved', probe['bytes_saved'], 'Bytes not downloaded thanks to light probes')
+        w.counter('main_probe_server_seconds_saved', probe['server_time_saved'],
+                  'Estimated server render time saved by 304 responses (full-page TTFB minus 304 TTFB)')
+        w.counter('main_probe_invalid_pages', probe['invalid'], 'Full pages that failed content validation')
+        payload = self.health_payload
+        w.counter('health_payloads', payload.payloads, '/health bodies parsed')
+        w.counter('health_payload_parse_errors', payload.parse_errors, '/health bodies with no usable fields')
+        series = list(payload.series.items())
+        for field, values in series:
+            if values.last is not None:
+                w.gauge('health_field', values.last, 'Latest /health numeric field (rates for *_total/*_count)', {'field': field})
+        for field, kind, _ in payload.anomalies():
+            w.gauge('health_field_anomaly', 1, '/health field currently flagged (spike, drift, status)', {'field': field, 'kind': kind})
+        synthetic = [(name, probe.snapshot()) for name, probe in list(self.synthetic.items())]
+        for name, snapshot in synthetic:
+            w.counter('locations_probe_bytes', snapshot['compressed_bytes'], '/locations response bytes on the wire (gzip)', {'target': name})
+        for name, snapshot in synthetic:
+            w.counter('locations_probe_uncompressed_bytes', snapshot['uncompressed_bytes'], '/locations response bytes after decompression', {'target': name})
+        for name, snapshot in synthetic:
+            for point, row in snapshot['points'].items():
+                for metric, value in row['last'].items():
+                    w.gauge('locations_probe', value, 'Latest /locations probe value per point (ttfb, size, records, parse time)',
+                            {'target': name, 'point': point, 'metric': metric})
+        for name, snapshot in synthetic:
+            for field, kind, _ in snapshot['anomalies']:
+                point, metric = field.rsplit('.', 1)
+                w.gauge('locations_probe_anomaly', 1, '/locations point value currently flagged (spike, drift)',
+                        {'target': name, 'point': point, 'metric': metric, 'kind': kind})
+        w.counter('history_records', self.history.records, 'Probe results appended to the check history')
+        w.counter('rollup_rows_written', self.rollups.rows_written, 'Rollup rows upserted into SQLite')
+        w.gauge('rollup_flush_seconds', self.rollups.flush_seconds, 'Duration of the last rollup flush')
+        w.counter('log_records_dropped', log_queue_handler.dropped, 'Log records dropped because the log queue was full')
+        
+        for endpoint, snapshot in self.latency.histograms().items():
+            w.histogram('probe_latency_seconds', snapshot, 'Successful probe latency', {'endpoint': endpoint})
+        for stage, histogram in self.readiness_durations.items():
+            w.histogram('restart_readiness_seconds', histogram.snapshot(), 'Time from spawn to readiness stage', {'stage': stage})
+        w.histogram('failover_switch_seconds', self.switch_durations.snapshot(), 'Time to move traffic to the warm standby')
+        w.gauge('standby_warm', self.standby.warm, 'Warm standby ready for failover')
+        slo = self.slo.snapshot()
+        self.stats['slo'] = slo
+        for name, objective in slo['objectives'].items():
+            for window, burn in objective['burn_rates'].items():
+                w.gauge('slo_burn_rate', burn, 'Error budget burn rate per window', {'objective': name, 'window': window})
+        for name, objective in slo['objectives'].items():
+            w.gauge('slo_error_budget_remaining', objective['budget_remaining'],
+                    'Error budget left over the compliance window', {'objective': name})
+        for name, rule in slo['rules'].items():
+            w.gauge('slo_alert_firing', rule['firing_since'] is not None, 'Burn-rate rule currently firing',
+                    {'rule': name, 'objective': rule['objective'], 'action': rule['action']})
+        w.counter('incidents', self.incidents.total, 'Confirmed outages closed')
+        w.counter('incidents_transient', self.incidents.transient, 'Failures that recovered before confirmation')
+        for name, row in self.incidents.percentiles().items():
+            for key in ('p50', 'p90', 'p99'):
+                w.gauge('incident_interval_seconds', row[key], 'Incident interval percentiles over recent outages',
+                        {'interval': name, 'quantile': f"0.{key[1:]}"})
+        w.histogram('outage_time_to_confirm_seconds', self.time_to_confirm.snapshot(),
+                    'Time from the first failed probe to confirmed down')
+        for verdict, histogram in self.confirm_durations.items():
+            w.histogram('confirm_duration_seconds', histogram.snapshot(), 'Hedged confirmation round duration',
+                        {'verdict': verdict})
+        w.histogram('reap_duration_seconds', self.reap_durations.snapshot(), 'Time to stop old server processes and free the port')
+        for result, histogram in self.restart_durations.items():
+            w.histogram('restart_duration_seconds', histogram.snapshot(), 'Main server restart duration', {'result': result})
+        
+        snapshot = self.sampler.latest()
+        if snapshot:
+            system = snapshot['system']
+            w.gauge('system_memory_percent', system['memory_percent'], 'Machine memory usage')
+            w.gauge('system_cpu_percent', system['cpu_percent'], 'Machine CPU usage')
+            w.gauge('system_swap_percent', system['swap_percent'], 'Machine swap usage')
+            if system['load1'] is not None:
+                w.gauge('system_load1', system['load1'], '1-minute load average')
+            processes = snapshot['processes']
+            for field, metric, help_text in self.PROCESS_GAUGES:
+                for name, values in processes.items():
+                    if values.get(field) is not None:
+                        w.gauge(metric, values[field], help_text, {'process': name})
+            for name, trend in list(self.leak_trends.items()):
+                w.gauge('process_rss_slope_bytes_per_second', trend.slope, 'Fitted RSS growth rate', {'process': name})
+            for name, trend in list(self.leak_trends.items()):
+                w.gauge('process_memory_exhaustion_seconds', trend.eta, 'Predicted time until RSS reaches its limit',
+                        {'process': name})
+            w.gauge('sampler_duration_seconds', self.sampler.sample_seconds, 'Time taken by the last resource sample')
+        return w.render()
+    
+    def publish_metrics(self):
+        try:
+            self.metrics_exporter.publish(self.build_metrics())
+        except Exception as e:
+            logger.warning(f"⚠️ Metrics snapshot failed: {e}")
     
     def print_comprehensive_status(self):
         """Comprehensive status report"""
@@ -502,6 +1455,7 @@ class SmartMonitoringSystem:
         print(f"{Fore.BLUE + Style.BRIGHT}🚀 WOOPANG SERVER MONITORING STATUS (EXTERNAL MODE){Style.RESET_ALL}")
         print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}")
         print(f"{Fore.WHITE}⏰ Monitor uptime: {Fore.CYAN}{uptime}{Style.RESET_ALL}")
+        print(f"{Fore.WHITE}♻️ Counting since: {Fore.CYAN}{self.stats['first_start'].strftime('%Y-%m-%d %H:%M:%S')}{Style.RESET_ALL}")
         print(f"{Fore.WHITE}🔍 Total checks: {Fore.CYAN}{self.stats['total_checks']}{Style.RESET_ALL}")
         
         # Process information
@@ -517,6 +1471,37 @@ class SmartMonitoringSystem:
         print(f"{Fore.WHITE}🕐 Last success: {Fore.GREEN}{self.last_success_time.strftime('%H:%M:%S')}{Style.RESET_ALL}")
         if self.last_restart_time:
             print(f"{Fore.WHITE}🔧 Last restart: {Fore.CYAN}{self.last_restart_time.strftime('%H:%M:%S')}{Style.RESET_ALL}")
+        if self.standby_enabled:
+            standby_color = Fore.GREEN if self.standby.warm else Fore.YELLOW
+            standby_pid = f" PID {self.standby.process.pid}" if self.standby.process else ""
+            print(f"{Fore.WHITE}🔀 Standby: {standby_color}{self.standby.state.upper()}{standby_pid} (port {self.standby.port}){Style.RESET_ALL}"
+                  f"{Fore.WHITE} · failovers {self.stats['failovers']}{Style.RESET_ALL}")
+        if self.last_switch:
+            print(f"{Fore.WHITE}🔀 Last switch: {Fore.CYAN}{self.last_switch['switch']*1000:.0f}ms "
+                  f"at {self.last_switch['time'].strftime('%H:%M:%S')}{Style.RESET_ALL}")
+        if self.last_confirm:
+            confirm_color = Fore.GREEN if self.last_confirm.healthy else Fore.RED
+            print(f"{Fore.WHITE}⚡ Last confirmation: {confirm_color}{self.last_confirm.describe()}{Style.RESET_ALL}")
+        if 'last_time_to_confirm' in self.stats:
+            print(f"{Fore.WHITE}⏱️ Last time to confirm: {Fore.CYAN}{self.stats['last_time_to_confirm']:.1f}s{Style.RESET_ALL}")
+        self.print_slo_status()
+        self.print_incident_summary()
+        if self.last_reap:
+            print(f"{Fore.WHITE}🔧 Last reap: {Fore.CYAN}{self.last_reap.elapsed:.2f}s "
+                  f"({len(self.last_reap.terminated)} terminated, {len(self.last_reap.killed)} killed){Style.RESET_ALL}")
+        if self.last_readiness:
+            print(f"{Fore.WHITE}⏱️ Last readiness: {Fore.CYAN}{self.last_readiness.describe()}{Style.RESET_ALL}")
+        
+        if self.workers.enabled:
+            self.print_worker_status()
+        
+        # Monitor state and time spent per state
+        durations = self.state.durations()
+        self.stats['state_durations'] = durations
+        print(f"{Fore.WHITE}{monitor_state.STATE_ICONS[self.state.state]} Monitor state: {Fore.CYAN}{self.state.state.upper()} "
+              f"({self.state.elapsed():.0f}s){Style.RESET_ALL}")
+        print(f"{Fore.WHITE}   Time in state: " + ", ".join(
+            f"{name} {Fore.CYAN}{seconds:.0f}s{Fore.WHITE}" for name, seconds in durations.items()) + Style.RESET_ALL)
         
         # 🔧 수정: 재시작 조건 표시 추가
         print(f"{Fore.WHITE}🚨 Consecutive failures: {Fore.RED if self.main_consecutive_failures >= self.max_consecutive_failures else Fore.YELLOW}{self.main_consecutive_failures}/{self.max_consecutive_failures}{Style.RESET_ALL}")
@@ -535,12 +1520,20 @@ class SmartMonitoringSystem:
             status_text = main_status['status'].upper().replace('_', ' ')
             
             print(f"  {status_icon} woopang.com: {status_color}{status_text}{Style.RESET_ALL}{response_time}{Fore.RED if main_status['consecutive_failures'] > 0 else ''}{failures}{Style.RESET_ALL}")
+            self.print_phase_timings(main_status.get('timings'))
             
             # Health endpoint status
             health_status = self.last_health_data['health_endpoint']
             health_icon = f"{Fore.GREEN}✅{Style.RESET_ALL}" if health_status['healthy'] else f"{Fore.YELLOW}⚠️{Style.RESET_ALL}"
             health_code = f" (HTTP {health_status['status_code']})" if health_status['status_code'] else ""
             print(f"  {health_icon} Health endpoint: {health_code}")
+            self.print_phase_timings(health_status.get('timings'))
+            self.print_health_payload()
+            
+            # Connection pool reuse
+            pool = self.probe_engine.http.stats
+            print(f"  {Fore.WHITE}🔗 Connections: {Fore.CYAN}{pool['connections_reused']} reused / {pool['connections_opened']} opened{Style.RESET_ALL}")
+            self.print_probe_savings()
             
             overall_status = self.last_health_data['overall_status']
             if overall_status == 'healthy':
@@ -548,6 +1541,18 @@ class SmartMonitoringSystem:
             else:
                 print(f"  {Fore.RED}🚨 Overall: UNHEALTHY (External access failed){Style.RESET_ALL}")
             
+            # Latency percentiles
+            self.print_latency_percentiles()
+            
+            # Scheduled targets
+            for name, status in self.target_status.items():
+                icon = f"{Fore.GREEN}✅{Style.RESET_ALL}" if status['status'] == 'healthy' else f"{Fore.YELLOW}⚠️{Style.RESET_ALL}" if status['status'] == 'unknown' else f"{Fore.RED}❌{Style.RESET_ALL}"
+                rt = f" ({status['response_time']:.2f}s)" if status['response_time'] else ""
+                print(f"  {icon} {name}: {status['status'].upper().replace('_', ' ')}{rt} "
+                      f"{Fore.WHITE}[{status['failures']}/{status['checks']} failed]{Style.RESET_ALL}")
+                if name in self.synthetic:
+                    self.print_locations_probe(name)
+            
             # System resources
             if 'system' in self.last_health_data:
                 system = self.last_health_data['system']
@@ -555,6 +1560,15 @@ class SmartMonitoringSystem:
                 cpu_color = Fore.RED if system['cpu_usage'] > 90 else Fore.YELLOW if system['cpu_usage'] > 75 else Fore.GREEN
                 print(f"  {Fore.WHITE}💾 Memory: {mem_color}{system['memory_usage']:.1f}%{Style.RESET_ALL}")
                 print(f"  {Fore.WHITE}⚡ CPU: {cpu_color}{system['cpu_usage']:.1f}%{Style.RESET_ALL}")
+                for name, proc in system.get('processes', {}).items():
+                    fds = proc['fds'] if proc['fds'] is not None else '-'
+                    conns = proc['connections'] if proc['connections'] is not None else '-'
+                    print(f"  {Fore.WHITE}🧵 {name} PID {proc['pid']}: {Fore.CYAN}rss {proc['rss'] / 1048576:.1f}MB · "
+                          f"cpu {proc['cpu_percent']:.1f}% · threads {proc['threads']} · fds {fds} · conns {conns}{Style.RESET_ALL}")
+                    trend = self.leak_trends.get(name)
+                    if trend is not None:
+                        trend_color = Fore.RED if trend.leaking else Fore.WHITE
+                        print(f"     {trend_color}📈 {trend.describe()}{Style.RESET_ALL}")
             
             # Issues
             if self.last_health_data['issues']:
@@ -572,73 +1586,348 @@ class SmartMonitoringSystem:
                 
         print(f"{Fore.CYAN}{'='*70}{Style.RESET_ALL}")
     
+    def print_slo_status(self):
+        """Burn rates, remaining error budget and firing rules per objective"""
+        slo = self.slo.snapshot()
+        for name, objective in slo['objectives'].items():
+            remaining = objective['budget_remaining']
+            color = Fore.GREEN if remaining > 0.5 else Fore.YELLOW if remaining > 0 else Fore.RED
+            burns = " · ".join(f"{window} {burn:.1f}×" for window, burn in objective['burn_rates'].items())
+            print(f"{Fore.WHITE}🎯 SLO {name} ({self.slo.objectives[name].describe()}): "
+                  f"{color}budget {remaining * 100:.0f}% left{Style.RESET_ALL}{Fore.WHITE} - burn {burns}{Style.RESET_ALL}")
+        firing = [name for name, rule in slo['rules'].items() if rule['firing_since'] is not None]
+        if firing:
+            print(f"{Fore.WHITE}🔥 Firing: {Fore.RED}{', '.join(firing)}{Style.RESET_ALL}")
+    
+    def print_incident_summary(self):
+        """MTTD/MTTR percentiles over recent incidents plus the last timeline"""
+        summary = self.incidents.percentiles()
+        self.stats['incidents'] = self.incidents.as_dict()
+        print(f"{Fore.WHITE}🧭 Incidents: {Fore.CYAN}{self.incidents.total} confirmed, "
+              f"{self.incidents.transient} transient{Style.RESET_ALL}")
+        
+        def sec(value):
+            return f"{value:.1f}s" if value is not None else "-"
+        
+        for name, label in (('mttd', 'MTTD'), ('mttr', 'MTTR')):
+            row = summary[name]
+            if not row['count']:
+                continue
+            print(f"{Fore.WHITE}   {label}: {Fore.CYAN}mean {sec(row['mean'])} · p50 {sec(row['p50'])} · "
+                  f"p90 {sec(row['p90'])} · max {sec(row['max'])} (n={row['count']}){Style.RESET_ALL}")
+        last = self.incidents.last()
+        if last is not None:
+            print(f"{Fore.WHITE}   Last: {Fore.CYAN}{last.describe()}{Style.RESET_ALL}")
+        if self.incidents.current is not None:
+            print(f"{Fore.WHITE}   Open: {Fore.YELLOW}{self.incidents.current.describe()}{Style.RESET_ALL}")
+    
+    def print_worker_status(self):
+        """Worker count, per-worker health and restart history"""
+        self.stats['workers'] = {slot.name: slot.as_dict() for slot in self.workers.slots}
+        healthy = self.workers.healthy_count()
+        total = len(self.workers.slots)
+        count_color = Fore.GREEN if healthy == total else Fore.YELLOW if healthy else Fore.RED
+        print(f"{Fore.WHITE}👷 Workers: {count_color}{healthy}/{total} healthy{Style.RESET_ALL}"
+              f"{Fore.WHITE} · restarts {self.stats['worker_restarts']}{Style.RESET_ALL}")
+        proxy = self.proxy.snapshot() if self.proxy.running else None
+        if proxy:
+            self.stats['proxy'] = proxy
+            print(f"{Fore.WHITE}🔀 Proxy :{self.proxy.port}: {Fore.CYAN}{proxy['requests']} requests{Fore.WHITE}, "
+                  f"{Fore.RED if proxy['errors'] else Fore.GREEN}{proxy['errors']} errors{Fore.WHITE}, "
+                  f"{proxy['retries']} retried, {proxy['client_connections']} clients{Style.RESET_ALL}")
+        for slot in self.workers.slots:
+            icon = f"{Fore.GREEN}✅{Style.RESET_ALL}" if slot.status == 'healthy' else f"{Fore.RED}❌{Style.RESET_ALL}"
+            rt = f" ({slot.response_time:.2f}s)" if slot.response_time else ""
+            pid = f" PID {slot.pid}" if slot.pid else ""
+            routing = ""
+            if proxy and slot.name in proxy['backends']:
+                backend = proxy['backends'][slot.name]
+                routing = f" · proxy {backend['state']} ({backend['outstanding']} in flight, {backend['requests']} routed)"
+            print(f"   {icon} {slot.name} :{slot.port}{pid} {slot.status.upper().replace('_', ' ')}{rt} "
+                  f"{Fore.WHITE}[{slot.failures}/{slot.checks} failed, {slot.restarts} restarts]{routing}{Style.RESET_ALL}")
+            for when, reason, duration, success in list(slot.history)[-3:]:
+                result = f"{Fore.GREEN}ok" if success else f"{Fore.RED}failed"
+                print(f"      {Fore.WHITE}{when.strftime('%H:%M:%S')} {reason} → {result}{Fore.WHITE} ({duration:.1f}s){Style.RESET_ALL}")
+    
+    def print_health_payload(self, limit=12):
+        """/health payload fields: last and p50/p90/p99 over the recent window, anomalies first"""
+        payload = self.health_payload.snapshot()
+        self.stats['health_payload'] = payload
+        if not payload['payloads'] and not payload['parse_errors']:
+            return
+        parse = f"{payload['parse_us']:.0f}µs/parse" if payload['parse_us'] is not None else ""
+        errors = f" · {Fore.RED}{payload['parse_errors']} unparsable{Fore.WHITE}" if payload['parse_errors'] else ""
+        print(f"     {Fore.WHITE}🩺 Payload: {len(payload['fields'])} fields · {parse}{errors}{Style.RESET_ALL}")
+        for field, kind, detail in payload['anomalies']:
+            print(f"       {Fore.RED}⚠️ {field}: {kind} ({detail}){Style.RESET_ALL}")
+        
+        def num(value):
+            return f"{value:.4g}" if value is not None else "-"
+        
+        fields = sorted(payload['fields'].items(), key=lambda item: (item[1]['anomaly'] is None, item[0]))
+        for field, row in fields[:limit]:
+            color = Fore.RED if row['anomaly'] else Fore.CYAN
+            rate = "/s" if row['rate'] else ""
+            print(f"       {Fore.WHITE}{field:<36} {color}{num(row['last'])}{rate}{Fore.WHITE} "
+                  f"(p50 {num(row['p50'])} · p90 {num(row['p90'])} · p99 {num(row['p99'])}, n={row['samples']})"
+                  f"{Style.RESET_ALL}")
+        if len(fields) > limit:
+            print(f"       {Fore.WHITE}... {len(fields) - limit} more fields{Style.RESET_ALL}")
+    
+    def print_locations_probe(self, name):
+        """/locations points: ttfb, gzip → raw size, records and parse time (p50 over the recent window)"""
+        snapshot = self.synthetic[name].snapshot()
+        self.stats.setdefault('locations_probe', {})[name] = snapshot
+        
+        def p50(row, metric, digits=0):
+            value = row['p50'][metric]
+            return f"{value:.{digits}f}" if value is not None else "-"
+        
+        for point, row in snapshot['points'].items():
+            if not row['last']:
+                error = f" {Fore.RED}{row['error']}" if row['error'] else ""
+                print(f"     {Fore.WHITE}📍 {point}: no data yet{error}{Style.RESET_ALL}")
+                continue
+            last = row['last']
+            ratio = f" ({(1 - last['compressed_bytes'] / last['uncompressed_bytes']) * 100:.0f}% gzip)" if last['uncompressed_bytes'] else ""
+            color = Fore.RED if row['status'] not in (None, 'healthy') else Fore.CYAN
+            print(f"     {Fore.WHITE}📍 {point}: {color}ttfb {last['ttfb_ms']:.0f}ms{Fore.WHITE} (p50 {p50(row, 'ttfb_ms')}) · "
+                  f"{Fore.CYAN}{last['compressed_bytes'] / 1024:.1f}KB → {last['uncompressed_bytes'] / 1024:.1f}KB{Fore.WHITE}{ratio} · "
+                  f"{Fore.CYAN}{last['records']:.0f}{Fore.WHITE} places (p50 {p50(row, 'records')}) · "
+                  f"parse {Fore.CYAN}{last['parse_ms']:.1f}ms{Fore.WHITE} (p50 {p50(row, 'parse_ms', digits=1)})"
+                  f"{Style.RESET_ALL}")
+        for field, kind, detail in snapshot['anomalies']:
+            print(f"       {Fore.RED}⚠️ {field}: {kind} ({detail}){Style.RESET_ALL}")
+    
+    def print_probe_savings(self):
+        """Light main probe mode, bytes per probe and estimated server time saved"""
+        probe = self.light_probe.snapshot()
+        self.stats['main_probe'] = probe
+        if probe['bytes_per_probe'] is None:
+            return
+        mode = probe['active_mode'] + (f" (configured {probe['mode']})" if probe['active_mode'] != probe['mode'] else "")
+        full = f"{probe['full_bytes'] / 1024:.1f}KB" if probe['full_bytes'] else "-"
+        counts = ", ".join(f"{kind} {count}" for kind, count in probe['counts'].items() if count)
+        print(f"  {Fore.WHITE}🪶 Main probe: {Fore.CYAN}{mode}{Fore.WHITE} · {Fore.CYAN}{probe['bytes_per_probe'] / 1024:.1f}KB"
+              f"{Fore.WHITE}/probe vs {full} full · {Fore.GREEN}{probe['saved_ratio'] * 100:.0f}% bytes saved "
+              f"({probe['bytes_saved'] / 1048576:.1f}MB){Fore.WHITE} · ~{probe['server_time_saved']:.1f}s server time saved "
+              f"[{counts}]{Style.RESET_ALL}")
+        if probe['invalid']:
+            print(f"     {Fore.RED}⚠️ Broken full pages: {probe['invalid']}{Style.RESET_ALL}")
+    
+    def print_phase_timings(self, timings):
+        """DNS / connect / TLS / TTFB / download breakdown line"""
+        if not timings:
+            return
+        reused = " [reused]" if timings['reused'] else ""
+        print(f"     {Fore.WHITE}dns {timings['dns']*1000:.0f}ms · connect {timings['connect']*1000:.0f}ms · "
+              f"tls {timings['tls']*1000:.0f}ms · ttfb {timings['ttfb']*1000:.0f}ms · "
+              f"download {timings['download']*1000:.0f}ms{Fore.CYAN}{reused}{Style.RESET_ALL}")
+    
+    def print_latency_percentiles(self):
+        """p50/p90/p99/max per endpoint over 1m / 1h / 24h"""
+        percentiles = self.latency.summary()
+        self.stats['latency_percentiles'] = percentiles
+        if not percentiles:
+            return
+        
+        def ms(value):
+            return f"{value*1000:.0f}" if value is not None else "-"
+        
+        print(f"\n{Fore.WHITE}⏱️ Latency percentiles (ms, p50/p90/p99/max):{Style.RESET_ALL}")
+        for name, windows in percentiles.items():
+            cells = []
+            for label, w in windows.items():
+                cells.append(f"{Fore.WHITE}{label} {Fore.CYAN}{ms(w['p50'])}/{ms(w['p90'])}/{ms(w['p99'])}/{ms(w['max'])}"
+                             f"{Fore.WHITE} (n={w['count']}){Style.RESET_ALL}")
+            print(f"  {name:<14} " + "  ".join(cells))
+    
+    async def monitor_tick(self):
+        """One monitoring cycle - probe, then advance the state machine (engine loop)"""
+        self.stats['total_checks'] += 1
+        
+        # Comprehensive server status check
+        health_data = await self.comprehensive_server_check_async()
+        
+        # Regular summary log
+        self.log_monitoring_summary()
+        
+        healthy = health_data['overall_status'] == 'healthy'
+        if healthy:
+            self.last_success_time = datetime.now()
+        else:
+            # External access down
+            self.stats['main_server_failures'] += 1
+        
+        self.evaluate_slo()
+        self.advance_state(healthy)
+        self.publish_metrics()
+        
+        # Periodic detailed report (every 5 minutes)
+        if self.stats['total_checks'] % 30 == 0:
+            # 🔧 수정: 보고서 출력(콘솔 I/O)은 엔진 루프 밖에서
+            asyncio.get_running_loop().run_in_executor(None, self.print_comprehensive_status)
+    
+    def advance_state(self, healthy):
+        """State transitions driven by the latest regular probe"""
+        state = self.state.state
+        
+        if state == monitor_state.HEALTHY:
+            if not healthy:
+                logger.warning("⚠️ External access down!")
+                self.state.transition(monitor_state.SUSPECT, f"{self.main_server_status}")
+            else:
+                return
+        
+        elif state == monitor_state.CONFIRMING:
+            # 확인 중 정규 프로브가 성공하면 확인 취소
+            if healthy:
+                if self.confirm_task:
+                    self.confirm_task.cancel()
+                logger.info("✅ External access recovered during fast check")
+                self.state.transition(monitor_state.HEALTHY, "regular probe recovered")
+            return
+        
+        elif state == monitor_state.RESTARTING:
+            # 재시작은 별도 스레드 - 여기서는 관찰만 계속
+            return
+        
+        elif state == monitor_state.COOLING_DOWN:
+            if not self.state.deadline_passed():
+                return
+            if self.restart_attempts >= self.max_restart_attempts:
+                self.restart_attempts = 0
+                logger.info("🔄 Restart counter reset completed")
+            self.state.transition(monitor_state.HEALTHY if healthy else monitor_state.SUSPECT, "cooldown finished")
+            if healthy:
+                return
+        
+        # SUSPECT
+        reason = None if healthy else self.restart_trigger_reason()
+        if healthy:
+            self.state.transition(monitor_state.HEALTHY, "probe recovered")
+        elif reason:
+            # 🔧 수정: 재시작 조건 체크 즉시 수행
+            logger.error(f"🚨 재시작 조건 충족! ({reason})")
+            self.state.transition(monitor_state.CONFIRMING, reason)
+            self.confirm_task = asyncio.get_running_loop().create_task(self.confirm_outage())
+        elif self.restart_trigger == "slo":
+            rule = next(rule for rule in self.slo.rules if rule.action == 'restart')
+            long_burn, short_burn = self.slo.rule_burn_rates(rule)
+            logger.warning(f"⚠️ 연속 실패 {self.main_consecutive_failures} - 재시작 대기 중 "
+                           f"(burn {long_burn:.1f}×/{short_burn:.1f}×, 기준 {rule.burn_rate:g}×)")
+        else:
+            logger.warning(f"⚠️ 연속 실패 {self.main_consecutive_failures}/{self.max_consecutive_failures} - 재시작 대기 중")
+    
+    async def confirm_outage(self):
+        """CONFIRMING: fast re-check runs alongside the regular ticks"""
+        try:
+            main_recovered = await self.fast_main_server_check_async()
+        except asyncio.CancelledError:
+            return
+        if self.state.state != monitor_state.CONFIRMING:
+            return
+        if main_recovered:
+            logger.info("✅ External access recovered during fast check")
+            self.state.transition(monitor_state.HEALTHY, "fast check recovered")
+            return
+        
+        logger.error("🚨 External access confirmed down! Starting restart...")
+        self.state.transition(monitor_state.RESTARTING, "outage confirmed")
+        loop = asyncio.get_running_loop()
+        
+        def restart_worker():
+            success = False
+            try:
+                success = self.perform_server_restart()
+            finally:
+                loop.call_soon_threadsafe(self.finish_restart, success)
+        
+        # 🔧 수정: join 없이 백그라운드 실행 - 모니터 루프는 계속 관찰
+        self.restart_thread = threading.Thread(target=restart_worker, name='server-restart', daemon=True)
+        self.restart_thread.start()
+    
+    def finish_restart(self, success):
+        """RESTARTING → COOLING_DOWN (called on the engine loop)"""
+        if self.restart_attempts >= self.max_restart_attempts and not success:
+            logger.error(f"🚨 Maximum restart attempts exceeded ({self.max_restart_attempts})")
+            logger.warning(f"⏳ Cooling down {self.restart_limit_cooldown}s before resetting restart counter (monitoring continues)")
+            cooldown = self.restart_limit_cooldown
+        else:
+            cooldown = self.restart_cooldown
+        if success:
+            # 🔧 수정: 장애·재시작 중의 실패는 재시작 규칙 창에서 제외 - 회복 직후 한 번의 실패로 재발동하지 않도록
+            self.slo.rebase('restart')
+        self.state.transition(monitor_state.COOLING_DOWN,
+                              "restart succeeded" if success else "restart failed",
+                              deadline=cooldown)
+    
     def run_monitoring(self):
         """Main monitoring loop"""
         logger.info(f"📊 Monitor initialized - External access check interval: {self.check_interval}s")
-        logger.info(f"⚡ Fast check configuration: {self.fast_check_interval}s × {self.fast_check_attempts} attempts")
+        if self.fast_check_mode == "hedged":
+            logger.info(f"⚡ Fast check configuration: hedged quorum {self.confirm_quorum}, "
+                        f"stagger {self.confirm_stagger}s, timeout {self.confirm_timeout}s")
+        else:
+            logger.info(f"⚡ Fast check configuration: {self.fast_check_interval}s × {self.fast_check_attempts} attempts")
         logger.info(f"🎯 Strategy: External domain access monitoring (woopang.com)")
         logger.info(f"🔧 HTTP timeout: {self.http_timeout}s")
+        logger.info(f"🪶 Main probe: {self.light_probe.mode}"
+                    + (f", full page every {self.light_probe.deep_every} checks" if self.light_probe.mode != "full" else ""))
         logger.info(f"🔒 SSL verification: ENABLED (production mode)")
-        logger.info(f"🚨 Restart trigger: {self.max_consecutive_failures} consecutive failures")  # 🔧 추가: 재시작 조건 표시
+        if self.workers.enabled:
+            ports = f"{self.workers.slots[0].port}-{self.workers.slots[-1].port}"
+            logger.info(f"🔁 Restart mode: SUPERVISOR ({len(self.workers.slots)} workers :{ports}, rolling restarts)")
+        else:
+            logger.info(f"🔁 Restart mode: {self.restart_mode.upper()}"
+                        f"{f' + warm standby :{self.standby.port}' if self.standby_enabled else ''}")
+        if self.restart_trigger == "slo":
+            for objective in self.slo.objectives.values():
+                logger.info(f"🎯 SLO {objective.name}: {objective.describe()}")
+            restart_rules = [rule for rule in self.slo.rules if rule.action == 'restart']
+            logger.info("🚨 Restart trigger: " + ", ".join(
+                f"{rule.objective} burn ≥{rule.burn_rate:g}× over "
+                f"{format_window(rule.long_window)}/{format_window(rule.short_window)}" for rule in restart_rules))
+        else:
+            logger.info(f"🚨 Restart trigger: {self.max_consecutive_failures} consecutive failures")  # 🔧 추가: 재시작 조건 표시
+        try:
+            self.metrics_exporter.start()
+            logger.info(f"📊 Metrics endpoint: http://{self.metrics_host}:{self.metrics_exporter.port}/metrics")
+        except OSError as e:
+            logger.warning(f"⚠️ Metrics endpoint disabled: {e}")
+        if self.targets:
+            logger.info(f"🌐 Scheduled targets: {', '.join(f'{t.name}({t.interval:g}s)' for t in self.targets)}")
+            for name, probe in self.synthetic.items():
+                logger.info(f"📍 {name}: {len(probe.points)} points ({', '.join(point.key for point in probe.points)})")
+            for target in self.targets:
+                self.scheduler.add_target(target)
         logger.info(f"🚀 Monitoring system started successfully")
         
+        self.restore_state()
+        self.sampler.start()
+        self.history.start()
+        self.rollups.start()
+        
+        # 🔧 수정: 메인 체크도 스케줄러 작업으로 실행 - 재시작 중에도 프로브/통계 계속
+        self.scheduler.start()
+        self.scheduler.add_job('monitor_tick', self.check_interval, self.monitor_tick)
+        self.scheduler.add_job('retention', self.retention_interval, self.retention_tick)
+        if LeakDetector.available():
+            self.scheduler.add_job('leak_check', self.leak_check_interval, self.leak_check)
+        else:
+            logger.warning("⚠️ NumPy not installed - memory leak trend detection disabled")
+        if self.workers.enabled:
+            if self.proxy_enabled:
+                try:
+                    self.start_front_proxy()
+                except (OSError, ssl.SSLError, ValueError) as e:
+                    logger.error(f"❌ Front proxy disabled: {e}")
+            threading.Thread(target=self.start_workers, name='worker-startup', daemon=True).start()
+            self.scheduler.add_job('worker_tick', self.worker_check_interval, self.worker_tick)
+        
         try:
             while self.monitoring_active:
-                self.stats['total_checks'] += 1
-                
-                # Comprehensive server status check
-                health_data = self.comprehensive_server_check()
-                
-                # Regular summary log
-                if self.stats['total_checks'] % 1 == 0:
-                    self.log_monitoring_summary()
-                
-                # Status-based processing
-                if health_data['overall_status'] == 'healthy':
-                    self.last_success_time = datetime.now()
-                    
-                elif health_data['overall_status'] == 'unhealthy':
-                    # External access down
-                    logger.warning("⚠️ External access down!")
-                    self.stats['main_server_failures'] += 1
-                    
-                    # 🔧 수정: 재시작 조건 체크 즉시 수행
-                    if self.main_consecutive_failures >= self.max_consecutive_failures:
-                        logger.error(f"🚨 재시작 조건 충족! (연속 {self.main_consecutive_failures}회 실패)")
-                        
-                        # Fast external access re-check
-                        main_recovered = self.fast_main_server_check()
-                        
-                        if not main_recovered:
-                            logger.error("🚨 External access confirmed down! Starting restart...")
-                            
-                            # Start restart thread
-                            restart_thread = threading.Thread(
-                                target=self.perform_server_restart,
-                                daemon=True
-                            )
-                            restart_thread.start()
-                            restart_thread.join(timeout=300)  # 5 minute timeout
-                            
-                        else:
-                            logger.info("✅ External access recovered during fast check")
-                    else:
-                        logger.warning(f"⚠️ 연속 실패 {self.main_consecutive_failures}/{self.max_consecutive_failures} - 재시작 대기 중")
-                
-                # Periodic detailed report (every 5 minutes)
-                if self.stats['total_checks'] % 30 == 0:
-                    self.print_comprehensive_status()
-                
-                # Restart attempt limit check
-                if self.restart_attempts >= self.max_restart_attempts:
-                    logger.error(f"🚨 Maximum restart attempts exceeded ({self.max_restart_attempts})")
-                    logger.warning("⏳ Waiting 5 minutes before resetting restart counter")
-                    time.sleep(300)
-                    self.restart_attempts = 0
-                    logger.info("🔄 Restart counter reset completed")
-                
-                # Wait
-                time.sleep(self.check_interval)
+                self.stop_event.wait(1)
                 
         except KeyboardInterrupt:
             logger.info("👋 Monitoring stopped by user")
@@ -646,6 +1935,17 @@ class SmartMonitoringSystem:
             logger.error(f"❌ Monitoring system crashed: {e}")
         finally:
             self.monitoring_active = False
+            self.stop_event.set()
+            self.scheduler.stop()
+            self.sampler.stop()
+            self.probe_engine.stop()
+            self.history.stop()
+            self.rollups.stop()
+            self.metrics_exporter.stop()
+            self.proxy.stop()
+            # 리스닝 소켓은 자식 프로세스가 계속 들고 있으므로 모니터 쪽 fd 만 닫는다
+            self.standby.discard()
+            self.handoff.close()
             logger.info("📝 Monitoring system terminated")
 
 if __name__ == "__main__":
@@ -0,0 +1,119 @@
+"""Zero-downtime restarts by sharing one listening socket across app generations
+
+모니터가 443 리스닝 소켓을 한 번만 bind 하고, 재시작할 때마다 새 app_improved.py 에
+fd 로 넘긴다. 소켓이 닫히는 순간이 없으므로 재시작 중 들어온 연결은 backlog 에서
+기다렸다가 이전/새 프로세스 중 accept 하는 쪽이 처리한다.
+
+Child contract (app_improved.py):
+    WOOPANG_LISTEN_FD  이미 bind+listen 된 소켓 fd - 직접 bind 하지 말고 이 fd 로 서빙
+                       (예: werkzeug.serving.make_server(..., fd=int(fd)))
+    WOOPANG_READY_FD   accept 준비가 끝나면 1바이트를 쓰고 닫는다
+    SIGTERM            새 연결 수락을 멈추고 처리 중인 요청을 끝낸 뒤 종료
+
+POSIX 전용 (subprocess pass_fds). Windows 에서는 기존 콜드 재시작을 사용한다.
+"""
+import os
+import select
+import socket
+import subprocess
+import time
+
+import psutil
+
+
+LISTEN_FD_ENV = 'WOOPANG_LISTEN_FD'
+READY_FD_ENV = 'WOOPANG_READY_FD'
+
+
+class SocketHandoff:
+    """Owns the app's listening socket and spawns children that inherit it"""
+
+    def __init__(self, host='0.0.0.0', port=443, backlog=1024):
+        self.host = host
+        self.port = port
+        self.backlog = backlog
+        self.sock = None
+
+    @staticmethod
+    def supported():
+        return os.name == 'posix'
+
+    @property
+    def bound(self):
+        return self.sock is not None
+
+    def bind(self):
+        family = socket.AF_INET6 if ':' in self.host else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        sock.listen(self.backlog)
+        sock.set_inheritable(True)
+        self.sock = sock
+        return sock
+
+    def spawn(self, args, cwd=None, env=None):
+        """Start a child sharing the socket; returns (Popen, ready_read_fd)"""
+        ready_read, ready_write = os.pipe()
+        child_env = dict(env if env is not None else os.environ)
+        child_env[LISTEN_FD_ENV] = str(self.sock.fileno())
+        child_env[READY_FD_ENV] = str(ready_write)
+        try:
+            process = subprocess.Popen(
+                args, cwd=cwd, env=child_env,
+                pass_fds=(self.sock.fileno(), ready_write),
+                start_new_session=True
+            )
+        except Exception:
+            os.close(ready_read)
+            raise
+        finally:
+            os.close(ready_write)
+        return process, ready_read
+
+    @staticmethod
+    def wait_ready(process, ready_fd, timeout):
+        """Block until the child writes its ready byte → (ready, reason)"""
+        deadline = time.perf_counter() + timeout
+        try:
+            while True:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    return False, f"no ready signal within {timeout}s"
+                readable, _, _ = select.select([ready_fd], [], [], min(remaining, 0.05))
+                if readable:
+                    if os.read(ready_fd, 1):
+                        return True, None
+                    # EOF without a byte: child closed the fd (exited or does not support the contract)
+                    process.poll()
+                    if process.returncode is not None:
+                        return False, f"process exited with code {process.returncode}"
+                    return False, "ready fd closed without signal"
+                if process.poll() is not None:
+                    return False, f"process exited with code {process.returncode}"
+        finally:
+            os.close(ready_fd)
+
+    @staticmethod
+    def retire(process, drain_timeout=30.0, kill_timeout=5.0):
+        """SIGTERM the previous generation, let it drain, kill if it overstays → seconds taken"""
+        start = time.perf_counter()
+        try:
+            proc = psutil.Process(process.pid)
+            proc.terminate()
+            _, alive = psutil.wait_procs([proc], timeout=drain_timeout)
+            for p in alive:
+                p.kill()
+            psutil.wait_procs(alive, timeout=kill_timeout)
+        except psutil.NoSuchProcess:
+            pass
+        try:
+            process.wait(timeout=0)
+        except (subprocess.TimeoutExpired, ChildProcessError):
+            pass
+        return time.perf_counter() - start
+
+    def close(self):
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
@@ -0,0 +1,100 @@
+import os
+import signal
+import time
+
+from socket_handoff import SocketHandoff
+
+
+class WarmStandby:
+    """Pre-warmed backup app_improved.py that can take over the shared listening socket
+
+    스탠바이는 모니터의 리스닝 소켓 fd 를 상속받은 채 BACKUP_MODE=1,
+    FORCE_HTTP_PORT=<대체 포트> 로 떠서 대체 포트에서만 /health 를 서빙한다.
+    장애가 확정되면 SIGUSR1 로 승격시키고, 스탠바이가 공유 소켓에서 accept 를
+    시작하면서 READY_FD 에 1바이트를 쓰는 순간까지를 전환 시간으로 잰다.
+
+    Child contract (socket_handoff 계약에 추가):
+        BACKUP_MODE=1 + FORCE_HTTP_PORT  대체 포트에서 워밍업/헬스 서빙, 공유 소켓은 아직 accept 하지 않음
+        SIGUSR1                          공유 소켓(WOOPANG_LISTEN_FD)에서 accept 시작 후 READY_FD 에 1바이트
+    """
+
+    def __init__(self, handoff, port=8443, host='127.0.0.1'):
+        self.handoff = handoff
+        self.port = port
+        self.host = host
+        self.process = None
+        self.ready_fd = None
+        self.state = 'none'
+        self.warm_after = None
+
+    @staticmethod
+    def supported():
+        return SocketHandoff.supported() and hasattr(signal, 'SIGUSR1')
+
+    @property
+    def health_url(self):
+        return f"http://{self.host}:{self.port}/health"
+
+    @property
+    def warm(self):
+        return self.state == 'warm' and self.process is not None and self.process.poll() is None
+
+    def launch(self, app_command, server_dir, env):
+        """Spawn the standby sharing the listening socket (not accepting on it yet)"""
+        env = dict(env)
+        env['BACKUP_MODE'] = '1'
+        env['FORCE_HTTP_PORT'] = str(self.port)
+        self.process, self.ready_fd = self.handoff.spawn(app_command, cwd=server_dir, env=env)
+        self.state = 'warming'
+        self.warm_after = None
+        return self.process
+
+    def wait_warm(self, check_health, timeout=90):
+        """Poll the standby's own /health until it answers - check_health(url) → bool"""
+        start = time.perf_counter()
+        delay = 0.05
+        while time.perf_counter() - start < timeout:
+            if self.process is None or self.process.poll() is not None:
+                self.state = 'failed'
+                return False
+            if check_health(self.health_url):
+                self.warm_after = time.perf_counter() - start
+                self.state = 'warm'
+                return True
+            time.sleep(delay)
+            delay = min(delay * 2, 1.0)
+        self.state = 'failed'
+        return False
+
+    def promote(self, timeout=5.0):
+        """SIGUSR1 → wait for the ready byte. Returns (ok, switch_seconds, reason)"""
+        start = time.perf_counter()
+        process, ready_fd = self.process, self.ready_fd
+        self.ready_fd = None
+        self.state = 'promoting'
+        try:
+            os.kill(process.pid, signal.SIGUSR1)
+        except OSError as e:
+            os.close(ready_fd)
+            self.state = 'failed'
+            return False, time.perf_counter() - start, str(e)
+        ok, reason = SocketHandoff.wait_ready(process, ready_fd, timeout)
+        elapsed = time.perf_counter() - start
+        self.state = 'promoted' if ok else 'failed'
+        return ok, elapsed, reason
+
+    def detach(self):
+        """Hand the promoted process over to the caller and reset"""
+        process = self.process
+        self.process = None
+        self.state = 'none'
+        return process
+
+    def discard(self):
+        if self.ready_fd is not None:
+            os.close(self.ready_fd)
+            self.ready_fd = None
+        if self.process is not None and self.process.poll() is None:
+            SocketHandoff.retire(self.process, drain_timeout=5)
+        self.process = None
+        self.state = 'none'
@@ -0,0 +1,719 @@
+"""Local woopang.com stand-in with scriptable fault injection
+
+    python standin_server.py --port 8080
+    python standin_server.py --port 8443 --certfile cert.pem --keyfile key.pem --faults faults.json
+    python standin_server.py --example-faults > faults.json
+
+app_improved.py 와 같은 경로(/, /health, /locations?lat&lon&radius, /proxy/<path>)를
+같은 모양의 응답으로 서빙하므로 모니터를 운영 서버 없이 돌릴 수 있다. 외부 의존성 없음.
+/__standin 은 이 프로세스의 요청/주입 카운터를 돌려준다.
+
+/ 는 운영 index.html 정도 크기(~38KB)이고 ETag/Last-Modified 를 붙인다. 조건부 요청이
+맞으면 렌더링 없이 304, Range 는 206 으로 답하고, 그 밖의 GET/HEAD 는 --render-time 만큼
+템플릿 렌더링 시간을 흉내 낸다 (renders 카운터 - 가벼운 프로브가 아낀 렌더링 확인용).
+
+장애는 --faults JSON 파일(또는 WOOPANG_FAULTS 환경 변수)로 스크립트한다. 파일이 바뀌면
+떠 있는 모든 세대(재시작된 프로세스, 스탠바이 포함)가 다시 읽으므로, 시나리오 러너는
+파일만 고쳐 쓰면 된다:
+
+    {"faults": [
+        {"kind": "latency", "start": <epoch>, "end": <epoch>, "paths": ["/"],
+         "distribution": "lognormal", "median": 2.0, "sigma": 0.5},
+        {"kind": "status", "status": 503, "every": 60, "length": 5},
+        {"kind": "reset", "probability": 0.2},
+        {"kind": "tls"},
+        {"kind": "slowloris", "interval": 1.0, "chunk": 1},
+        {"kind": "exit", "code": 1},
+        {"kind": "degrade", "field": "components.database.latency_ms", "factor": 8, "ramp": 300}
+    ]}
+
+    start/end    유효 구간 (epoch, 생략 시 무기한), every/length 는 그 안의 주기적 버스트
+    paths        경로 접두사 목록 (생략 시 전부), probability 요청마다 적용 확률
+    until_restart  start 이전에 뜬 세대에만 적용 - 재시작하면 사라지는 장애
+    latency      distribution: fixed(value) / uniform(low, high) / lognormal(median, sigma)
+                 / exponential(mean) / pareto(scale, alpha), max 로 상한
+    status       지정한 상태 코드로 응답 (5xx 버스트)
+    reset        요청을 읽은 뒤 RST 로 연결 끊기
+    tls          TLS 핸드셰이크 대신 handshake_failure alert (--certfile 리스너에서 의미 있음)
+    slowloris    헤더는 바로, 본문은 interval 마다 chunk 바이트씩
+    exit         서빙 중인 프로세스가 즉시 종료 (크래시, 항상 until_restart - 대기 중 스탠바이는 살아남음)
+    degrade      /health 본문의 field(점 경로) 값을 factor 배로 (ramp 초에 걸쳐 서서히) 또는 value 로 -
+                 메인 페이지는 멀쩡한 채 앱 내부 의존성이 나빠지는 상황
+
+Child contract 은 app_improved.py 와 같다 (socket_handoff / standby / worker_pool 참고):
+    WOOPANG_LISTEN_FD / WOOPANG_READY_FD, SIGTERM drain,
+    BACKUP_MODE=1 + FORCE_HTTP_PORT + SIGUSR1 승격, FORCE_HTTP_PORT 단독 = 워커 포트
+"""
+import argparse
+import asyncio
+import functools
+import gzip
+import hashlib
+import json
+import logging
+import math
+import os
+import random
+import signal
+import socket
+import ssl
+import struct
+import sys
+import time
+from datetime import datetime
+from email.utils import formatdate, parsedate_to_datetime
+from urllib.parse import parse_qs
+
+from socket_handoff import LISTEN_FD_ENV, READY_FD_ENV
+
+
+logger = logging.getLogger('woopang.standin')
+
+FAULTS_ENV = 'WOOPANG_FAULTS'
+FAULT_KINDS = ('latency', 'status', 'reset', 'tls', 'slowloris', 'exit', 'degrade')
+
+# 서버 → 클라이언트 fatal alert(handshake_failure) - 클라이언트 쪽 ssl.SSLError 로 보인다
+TLS_HANDSHAKE_FAILURE = b'\x15\x03\x03\x00\x02\x02\x28'
+
+REASONS = {200: 'OK', 206: 'Partial Content', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 416: 'Range Not Satisfiable', 429: 'Too Many Requests',
+           500: 'Internal Server Error', 502: 'Bad Gateway', 503: 'Service Unavailable', 504: 'Gateway Timeout'}
+
+# 운영 템플릿이 렌더링한 index.html 크기
+INDEX_PAGE_BYTES = 38 * 1024
+
+# 운영 기본 좌표 (monitor_targets.json 의 /locations 프로브와 같은 지점)
+DEFAULT_CENTER = (36.636, 126.828)
+
+
+class Fault:
+    """One scripted fault window"""
+
+    __slots__ = ('kind', 'start', 'end', 'paths', 'probability', 'every', 'length', 'until_restart', 'params')
+
+    def __init__(self, spec):
+        self.kind = spec['kind']
+        if self.kind not in FAULT_KINDS:
+            raise ValueError(f"unknown fault kind {self.kind!r}")
+        self.start = spec.get('start')
+        self.end = spec.get('end')
+        self.paths = tuple(spec.get('paths') or ())
+        self.probability = spec.get('probability', 1.0)
+        self.every = spec.get('every')
+        self.length = spec.get('length')
+        self.until_restart = spec.get('until_restart', False) or self.kind == 'exit'
+        self.params = spec
+
+    def active(self, now):
+        if self.start is not None and now < self.start:
+            return False
+        if self.end is not None and now >= self.end:
+            return False
+        if self.every:
+            return (now - (self.start or 0)) % self.every < self.length
+        return True
+
+    def matches(self, path):
+        return path is None or not self.paths or path.startswith(self.paths)
+
+    def applies_to(self, serving_since):
+        """until_restart 장애는 장애 시작 전부터 서빙하던 세대에만 - 재시작/승격하면 낫는 장애 (행, 누수 등)"""
+        return not self.until_restart or (serving_since is not None and serving_since < (self.start or 0))
+
+    def delay(self):
+        """Sample a latency from the configured distribution (s)"""
+        p = self.params
+        distribution = p.get('distribution', 'fixed')
+        if distribution == 'fixed':
+            value = p.get('value', 1.0)
+        elif distribution == 'uniform':
+            value = random.uniform(p.get('low', 0.0), p.get('high', 1.0))
+        elif distribution == 'lognormal':
+            value = random.lognormvariate(math.log(p.get('median', 1.0)), p.get('sigma', 0.5))
+        elif distribution == 'exponential':
+            value = random.expovariate(1.0 / p.get('mean', 1.0))
+        elif distribution == 'pareto':
+            value = p.get('scale', 0.1) * random.paretovariate(p.get('alpha', 1.5))
+        else:
+            raise ValueError(f"unknown latency distribution {distribution!r}")
+        return min(value, p['max']) if 'max' in p else value
+
+
+class FaultPlan:
+    """Faults from a JSON file, re-read when its mtime changes (checked at most every reload_interval)"""
+
+    def __init__(self, path=None, reload_interval=0.25):
+        self.path = path
+        self.reload_interval = reload_interval
+        self.faults = []
+        self._mtime = None
+        self._checked = 0.0
+
+    def refresh(self):
+        if not self.path:
+            return
+        now = time.monotonic()
+        if now - self._checked < self.reload_interval:
+            return
+        self._checked = now
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            if self.faults:
+                logger.info("🧪 Fault plan removed - serving normally")
+            self.faults, self._mtime = [], None
+            return
+        if mtime == self._mtime:
+            return
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                faults = [Fault(spec) for spec in json.load(f).get('faults', [])]
+        except (OSError, ValueError, KeyError) as e:
+            # 러너가 쓰는 도중이거나 잘못된 파일 - 이전 계획 유지
+            logger.warning(f"⚠️ Fault plan {self.path} not loaded: {e}")
+            return
+        self._mtime = mtime
+        self.faults = faults
+        logger.info(f"🧪 Fault plan loaded: {', '.join(f.kind for f in faults) or 'no faults'}")
+
+    def active(self, kind, path=None, serving_since=None, now=None):
+        """First fault of kind active now for path that wins its probability roll, else None"""
+        self.refresh()
+        now = now or time.time()
+        for fault in self.faults:
+            if fault.kind == kind and fault.active(now) and fault.matches(path) and fault.applies_to(serving_since):
+                if fault.probability >= 1.0 or random.random() < fault.probability:
+                    return fault
+        return None
+
+
+def generate_places(count=1500, seed=1, center=DEFAULT_CENTER, spread_km=8.0):
+    """Deterministic PlaceData rows (DataManager.cs 필드) scattered around center"""
+    rng = random.Random(seed)
+    colors = ('#FF6B6B', '#4ECDC4', '#FFD93D', '#6C5CE7', '#A8E6CF')
+    places = []
+    for place_id in range(1, count + 1):
+        distance = spread_km * 1000 * math.sqrt(rng.random())
+        bearing = rng.uniform(0, 2 * math.pi)
+        lat = center[0] + distance * math.cos(bearing) / 111320
+        lon = center[1] + distance * math.sin(bearing) / (111320 * math.cos(math.radians(center[0])))
+        glb = rng.random() < 0.2
+        places.append({
+            'id': place_id,
+            'name': f"장소 {place_id}",
+            'main_photo': f"/uploads/{place_id}/main.jpg",
+            'sub_photos': [[f"/uploads/{place_id}/sub{i}.jpg", f"사진 {i}"] for i in range(rng.randint(0, 4))],
+            'pet_friendly': rng.random() < 0.3,
+            'separate_restroom': rng.random() < 0.5,
+            'alcohol_available': rng.random() < 0.4,
+            'instagram_id': f"woopang_{place_id}" if rng.random() < 0.6 else '',
+            'latitude': round(lat, 6),
+            'longitude': round(lon, 6),
+            'altitude': round(rng.uniform(0, 60), 1),
+            'color': rng.choice(colors),
+            'username': f"user{rng.randint(1, 200)}",
+            'model_type': 'glb' if glb else 'cube',
+            'model_url': f"/models/{place_id}.glb" if glb else None,
+            'model_scale': round(rng.uniform(0.5, 2.0), 2) if glb else 1.0,
+            'status': 'approved' if rng.random() < 0.9 else 'pending'
+        })
+    return places
+
+
+def distance_m(lat1, lon1, lat2, lon2):
+    """Haversine distance in metres"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (math.sin((phi2 - phi1) / 2) ** 2 +
+         math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2)
+    return 2 * 6371000 * math.asin(math.sqrt(a))
+
+
+class StandinApp:
+    """Routes and response bodies - HTTP 와 장애 주입은 StandinServer 담당"""
+
+    def __init__(self, places, mode='main', render_time=0.0):
+        self.places = places
+        self.mode = mode
+        self.render_time = render_time
+        self.started = time.time()
+        self.index_page = self.render_index()
+        self.index_etag = '"' + hashlib.sha1(self.index_page).hexdigest()[:16] + '"'
+        self.index_modified = formatdate(int(self.started), usegmt=True)
+
+    def render_index(self, size=INDEX_PAGE_BYTES):
+        cards = []
+        length = 0
+        for place in self.places:
+            card = (f'      <li class="place" data-id="{place["id"]}" data-lat="{place["latitude"]}" '
+                    f'data-lon="{place["longitude"]}">{place["name"]} · {place["username"]}</li>')
+            cards.append(card)
+            length += len(card.encode()) + 1
+            if length >= size:
+                break
+        cards = "\n".join(cards)
+        return (f"<!doctype html>\n<html lang=\"ko\">\n<head><meta charset=\"utf-8\"><title>우팡 woopang</title></head>\n"
+                f"<body>\n  <h1>우팡</h1>\n  <ul>\n{cards}\n  </ul>\n</body>\n</html>\n").encode()
+
+    def not_modified(self, headers):
+        """Conditional request matches the index validators (If-None-Match 가 있으면 그것만 본다)"""
+        if 'if-none-match' in headers:
+            tags = [tag.strip() for tag in headers['if-none-match'].split(',')]
+            return '*' in tags or self.index_etag in tags or f"W/{self.index_etag}" in tags
+        if 'if-modified-since' in headers:
+            try:
+                return parsedate_to_datetime(headers['if-modified-since']).timestamp() >= int(self.started)
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def route(self, path, query):
+        """→ (status, content type, body bytes)"""
+        if path == '/':
+            return 200, 'text/html; charset=utf-8', self.index_page
+        if path == '/health':
+            return self.json(200, self.health())
+        if path == '/locations':
+            return self.locations(query)
+        if path.startswith('/proxy/'):
+            return self.proxy(path[len('/proxy/'):], query)
+        return self.json(404, {'error': 'not found'})
+
+    def health(self, inflight=0, requests=0, degrade=None):
+        """/health payload - 구성 요소별 지연·풀·캐시 수치는 운영 앱과 같은 모양"""
+        payload = {
+            'status': 'healthy',
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'uptime': round(time.time() - self.started, 1),
+            'pid': os.getpid(),
+            'mode': self.mode,
+            'database': 'ok',
+            'places': len(self.places),
+            'requests_total': requests,
+            'components': {
+                'database': {'status': 'ok', 'latency_ms': round(random.lognormvariate(math.log(2.0), 0.25), 3),
+                             'pool_size': 10, 'pool_in_use': min(10, inflight)},
+                'tourapi': {'status': 'ok', 'latency_ms': round(random.lognormvariate(math.log(80.0), 0.3), 1),
+                            'cache_entries': self.proxy.cache_info().currsize}
+            },
+            'caches': {'locations': self.locations.cache_info().currsize, 'gzip': gzip_body.cache_info().currsize}
+        }
+        if degrade is not None:
+            *parents, leaf = degrade.params['field'].split('.')
+            node = payload
+            for key in parents:
+                node = node.setdefault(key, {})
+            if 'value' in degrade.params:
+                node[leaf] = degrade.params['value']
+            elif isinstance(node.get(leaf), (int, float)):
+                factor = degrade.params.get('factor', 5.0)
+                ramp = degrade.params.get('ramp')
+                if ramp and degrade.start is not None:
+                    factor = 1 + (factor - 1) * min(1.0, max(0.0, time.time() - degrade.start) / ramp)
+                node[leaf] = round(node[leaf] * factor, 3)
+        return payload
+
+    @staticmethod
+    def json(status, payload):
+        return status, 'application/json', json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode()
+
+    @functools.lru_cache(maxsize=256)
+    def locations(self, query):
+        params = parse_qs(query)
+        try:
+            lat = float(params['lat'][0])
+            lon = float(params['lon'][0])
+            radius = float(params.get('radius', ['1000'])[0])
+        except (KeyError, ValueError):
+            return self.json(400, {'error': 'lat, lon required'})
+        status = params.get('status', [None])[0]
+        rows = []
+        for place in self.places:
+            if status and place['status'] != status:
+                continue
+            distance = distance_m(lat, lon, place['latitude'], place['longitude'])
+            if distance <= radius:
+                rows.append((distance, place))
+        rows.sort(key=lambda row: row[0])
+        return self.json(200, [place for _, place in rows])
+
+    @functools.lru_cache(maxsize=256)
+    def proxy(self, operation, query):
+        """TourAPI style envelope (locationBasedList 는 좌표/반경으로 거른다)"""
+        params = parse_qs(query)
+        items = []
+        if operation == 'locationBasedList':
+            try:
+                lon = float(params['mapX'][0])
+                lat = float(params['mapY'][0])
+                radius = float(params.get('radius', ['1000'])[0])
+            except (KeyError, ValueError):
+                return self.json(400, {'response': {'header': {'resultCode': '10', 'resultMsg': 'INVALID_REQUEST_PARAMETER_ERROR'}}})
+            for place in self.places:
+                distance = distance_m(lat, lon, place['latitude'], place['longitude'])
+                if distance <= radius:
+                    items.append({'contentid': str(100000 + place['id']), 'title': place['name'],
+                                  'mapx': str(place['longitude']), 'mapy': str(place['latitude']),
+                                  'dist': f"{distance:.1f}", 'firstimage': place['main_photo']})
+        return self.json(200, {'response': {
+            'header': {'resultCode': '0000', 'resultMsg': 'OK'},
+            'body': {'items': {'item': items} if items else '', 'numOfRows': len(items), 'pageNo': 1,
+                     'totalCount': len(items)}
+        }})
+
+
+class StandinServer:
+    """Keep-alive HTTP/1.1 (optionally TLS) server applying the fault plan per connection/request"""
+
+    def __init__(self, app, plan, host='127.0.0.1', port=8080, certfile=None, keyfile=None, drain_timeout=10.0):
+        self.app = app
+        self.plan = plan
+        self.host = host
+        self.port = port
+        self.tls = None
+        if certfile:
+            self.tls = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+            self.tls.load_cert_chain(certfile, keyfile)
+        self.drain_timeout = drain_timeout
+        self.started = time.time()
+        self.servers = []
+        self.standby_server = None
+        self.serving_since = None       # 메인 트래픽(공유 소켓/워커 포트)을 받기 시작한 시각
+        self.inflight = 0
+        self.connections = set()
+        self.requests = 0
+        self.renders = 0
+        self.not_modified = 0
+        self.partial = 0
+        self.injected = {kind: 0 for kind in FAULT_KINDS}
+        self.stopping = None
+
+    # --- listeners -------------------------------------------------------------------------
+
+    async def serve_main(self, sock=None):
+        """Main listener: inherited fd (handoff/standby promotion) or own bind"""
+        handler = functools.partial(self.handle, tls=self.tls)
+        if sock is not None:
+            server = await asyncio.start_server(handler, sock=sock, backlog=1024)
+        else:
+            server = await asyncio.start_server(handler, self.host, self.port, backlog=1024, reuse_address=True)
+        self.servers.append(server)
+        self.serving_since = time.time()
+        self.app.mode = 'main'
+        return server
+
+    async def serve_plain(self, port):
+        """Plain listener on FORCE_HTTP_PORT (워커 포트, 스탠바이 헬스 포트)"""
+        server = await asyncio.start_server(functools.partial(self.handle, tls=None), self.host, port,
+                                            backlog=1024, reuse_address=True)
+        self.servers.append(server)
+        return server
+
+    @staticmethod
+    def signal_ready():
+        ready_fd = os.environ.pop(READY_FD_ENV, None)
+        if ready_fd is not None:
+            os.write(int(ready_fd), b'1')
+            os.close(int(ready_fd))
+
+    @staticmethod
+    def inherited_socket():
+        listen_fd = os.environ.get(LISTEN_FD_ENV)
+        return socket.socket(fileno=int(listen_fd)) if listen_fd else None
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        self.stopping = loop.create_future()
+        loop.add_signal_handler(signal.SIGTERM, self.begin_drain)
+        loop.add_signal_handler(signal.SIGINT, self.begin_drain)
+
+        force_port = os.environ.get('FORCE_HTTP_PORT')
+        if os.environ.get('BACKUP_MODE') == '1':
+            # 스탠바이: 대체 포트에서만 서빙하다가 SIGUSR1 에 공유 소켓 accept 시작
+            self.app.mode = 'standby'
+            self.standby_server = await self.serve_plain(int(force_port))
+            loop.add_signal_handler(signal.SIGUSR1, lambda: loop.create_task(self.promote()))
+            logger.info(f"💤 Stand-in standby PID {os.getpid()} warm on :{force_port}")
+        elif os.environ.get(LISTEN_FD_ENV):
+            await self.serve_main(self.inherited_socket())
+            self.signal_ready()
+            logger.info(f"✅ Stand-in PID {os.getpid()} serving inherited socket")
+        elif force_port:
+            self.app.mode = 'worker'
+            await self.serve_plain(int(force_port))
+            self.serving_since = time.time()
+            logger.info(f"✅ Stand-in worker PID {os.getpid()} on :{force_port}")
+        else:
+            await self.serve_main()
+            logger.info(f"✅ Stand-in PID {os.getpid()} on {'https' if self.tls else 'http'}://{self.host}:{self.port}")
+
+        watchdog = loop.create_task(self.exit_watchdog())
+        await self.stopping
+        watchdog.cancel()
+
+    async def promote(self):
+        if self.serving_since is not None:
+            return
+        await self.serve_main(self.inherited_socket())
+        self.signal_ready()
+        # 대체 포트는 다음 스탠바이가 쓴다
+        self.standby_server.close()
+        self.servers.remove(self.standby_server)
+        logger.info(f"🔀 Stand-in PID {os.getpid()} promoted onto the shared socket")
+
+    def begin_drain(self):
+        """SIGTERM: stop accepting, finish in-flight requests, exit"""
+        if self.stopping.done():
+            return
+        for server in self.servers:
+            server.close()
+        asyncio.get_running_loop().create_task(self._drain())
+
+    async def _drain(self):
+        deadline = time.monotonic() + self.drain_timeout
+        while self.inflight and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        # 유휴 keep-alive 연결은 닫아서 핸들러가 EOF 로 끝나게 한다 (루프 종료 시 취소되지 않도록)
+        for writer in list(self.connections):
+            writer.close()
+        while self.connections and time.monotonic() < deadline + 1:
+            await asyncio.sleep(0.01)
+        logger.info(f"💤 Stand-in PID {os.getpid()} drained ({self.requests} requests served)")
+        if not self.stopping.done():
+            self.stopping.set_result(None)
+
+    async def exit_watchdog(self):
+        while True:
+            await asyncio.sleep(0.1)
+            if self.serving_since is None:
+                continue
+            now = time.time()
+            for fault in self.plan.faults:
+                # 장애 시작 전부터 서빙하던 세대만 죽는다 - 재시작/승격된 세대는 같은 계획에서 살아남음
+                if fault.kind == 'exit' and fault.active(now) and fault.applies_to(self.serving_since):
+                    logger.warning(f"💥 Stand-in PID {os.getpid()} exiting (scripted crash)")
+                    os._exit(fault.params.get('code', 1))
+            self.plan.refresh()
+
+    # --- connections -----------------------------------------------------------------------
+
+    async def handle(self, reader, writer, tls=None):
+        self.connections.add(writer)
+        try:
+            if tls is not None:
+                if self.plan.active('tls', serving_since=self.serving_since):
+                    self.injected['tls'] += 1
+                    writer.write(TLS_HANDSHAKE_FAILURE)
+                    await writer.drain()
+                    return
+                await writer.start_tls(tls)
+            while True:
+                request = await self.read_request(reader)
+                if request is None:
+                    return
+                self.inflight += 1
+                self.requests += 1
+                try:
+                    keep_alive = await self.respond(writer, *request)
+                finally:
+                    self.inflight -= 1
+                if not keep_alive or self.stopping.done():
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ssl.SSLError, ValueError):
+            pass
+        finally:
+            self.connections.discard(writer)
+            if not writer.is_closing():
+                writer.close()
+
+    @staticmethod
+    async def read_request(reader):
+        """→ (method, path, query, headers) or None at EOF"""
+        try:
+            head = await reader.readuntil(b'\r\n\r\n')
+        except asyncio.IncompleteReadError as e:
+            if not e.partial:
+                return None
+            raise
+        lines = head.decode('latin-1').split('\r\n')
+        method, target, _ = lines[0].split(' ', 2)
+        headers = {}
+        for line in lines[1:]:
+            if ':' in line:
+                name, value = line.split(':', 1)
+                headers[name.strip().lower()] = value.strip()
+        length = int(headers.get('content-length', 0))
+        if length:
+            await reader.readexactly(length)
+        path, _, query = target.partition('?')
+        return method, path, query, headers
+
+    async def respond(self, writer, method, path, query, headers):
+        """Apply request faults, then answer → keep the connection open?"""
+        fault = self.plan.active('latency', path, self.serving_since)
+        if fault is not None:
+            self.injected['latency'] += 1
+            await asyncio.sleep(fault.delay())
+        if self.plan.active('reset', path, self.serving_since):
+            self.injected['reset'] += 1
+            sock = writer.get_extra_info('socket')
+            if sock is not None:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack('ii', 1, 0))
+            writer.transport.abort()
+            return False
+
+        fault = self.plan.active('status', path, self.serving_since)
+        extra = []
+        if method not in ('GET', 'HEAD'):
+            status, content_type, body = self.app.json(405, {'error': 'method not allowed'})
+        elif fault is not None:
+            self.injected['status'] += 1
+            status, content_type, body = self.app.json(fault.params.get('status', 503), {'error': 'injected fault'})
+        elif path == '/__standin':
+            status, content_type, body = self.app.json(200, self.as_dict())
+        elif path == '/':
+            status, content_type, body, extra = await self.index(headers)
+        elif path == '/health':
+            degrade = self.plan.active('degrade', path, self.serving_since)
+            if degrade is not None:
+                self.injected['degrade'] += 1
+            status, content_type, body = self.app.json(200, self.app.health(self.inflight, self.requests, degrade))
+        else:
+            status, content_type, body = self.app.route(path, query)
+
+        if status == 200 and len(body) >= 1024 and 'gzip' in headers.get('accept-encoding', ''):
+            body = gzip_body(body)
+            extra.append('Content-Encoding: gzip')
+            extra.append('Vary: Accept-Encoding')
+        keep_alive = headers.get('connection', '').lower() != 'close'
+        head = '\r\n'.join([
+            f"HTTP/1.1 {status} {REASONS.get(status, 'Unknown')}",
+            'Server: woopang-standin',
+            f"Date: {formatdate(usegmt=True)}",
+            f"Content-Type: {content_type}",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+            *extra
+        ]).encode('latin-1') + b'\r\n\r\n'
+
+        fault = self.plan.active('slowloris', path, self.serving_since)
+        if fault is not None and method == 'GET':
+            self.injected['slowloris'] += 1
+            writer.write(head)
+            chunk = fault.params.get('chunk', 1)
+            interval = fault.params.get('interval', 1.0)
+            for offset in range(0, len(body), chunk):
+                await writer.drain()
+                await asyncio.sleep(interval)
+                writer.write(body[offset:offset + chunk])
+            await writer.drain()
+            return False
+
+        writer.write(head if method == 'HEAD' else head + body)
+        await writer.drain()
+        return keep_alive
+
+    async def index(self, headers):
+        """/ → (status, content type, body, extra headers) - 304 은 렌더링 없이"""
+        app = self.app
+        content_type = 'text/html; charset=utf-8'
+        extra = [f"ETag: {app.index_etag}", f"Last-Modified: {app.index_modified}", 'Accept-Ranges: bytes']
+        if app.not_modified(headers):
+            self.not_modified += 1
+            return 304, content_type, b'', extra
+        self.renders += 1
+        if app.render_time:
+            await asyncio.sleep(app.render_time)
+        body = app.index_page
+        if 'range' not in headers:
+            return 200, content_type, body, extra
+        span = byte_range(headers['range'], len(body))
+        if span is None:
+            return 200, content_type, body, extra
+        start, end = span
+        if start >= len(body):
+            return 416, content_type, b'', extra + [f"Content-Range: bytes */{len(body)}"]
+        self.partial += 1
+        return 206, content_type, body[start:end + 1], extra + [f"Content-Range: bytes {start}-{end}/{len(body)}"]
+
+    def as_dict(self):
+        now = time.time()
+        return {
+            'pid': os.getpid(),
+            'mode': self.app.mode,
+            'started': self.started,
+            'serving_since': self.serving_since,
+            'requests': self.requests,
+            'renders': self.renders,
+            'not_modified': self.not_modified,
+            'partial': self.partial,
+            'inflight': self.inflight,
+            'injected': self.injected,
+            'active_faults': [fault.kind for fault in self.plan.faults if fault.active(now)]
+        }
+
+
+def byte_range(header, length):
+    """Single 'bytes=' range → (start, end inclusive); None = 무시하고 전체 본문 (여러 범위, 형식 오류)"""
+    unit, _, spec = header.partition('=')
+    if unit.strip().lower() != 'bytes' or ',' in spec:
+        return None
+    first, _, last = spec.strip().partition('-')
+    try:
+        if not first:
+            suffix = int(last)
+            return max(0, length - suffix), length - 1
+        start = int(first)
+        end = int(last) if last else length - 1
+    except ValueError:
+        return None
+    if end < start:
+        return None
+    return start, min(end, length - 1)
+
+
+@functools.lru_cache(maxsize=256)
+def gzip_body(body):
+    return gzip.compress(body, compresslevel=6, mtime=0)
+
+
+def example_faults(now=None):
+    now = now or time.time()
+    return {'faults': [
+        {'kind': 'latency', 'start': now + 10, 'end': now + 70, 'paths': ['/'], 'distribution': 'lognormal',
+         'median': 0.8, 'sigma': 0.6, 'max': 20},
+        {'kind': 'status', 'status': 503, 'start': now + 70, 'end': now + 370, 'every': 60, 'length': 5},
+        {'kind': 'reset', 'start': now + 120, 'end': now + 180, 'probability': 0.2},
+        {'kind': 'exit', 'start': now + 400, 'end': now + 401}
+    ]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080, help='port when no socket is inherited')
+    parser.add_argument('--certfile', help='serve TLS on the main listener')
+    parser.add_argument('--keyfile')
+    parser.add_argument('--faults', default=os.environ.get(FAULTS_ENV), help='fault plan JSON (re-read on change)')
+    parser.add_argument('--places', type=int, default=1500, help='synthetic /locations rows')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--render-time', type=float, default=0.0, help='simulated template render seconds for /')
+    parser.add_argument('--startup-delay', type=float, default=0.0, help='seconds before listening (slow boot)')
+    parser.add_argument('--drain-timeout', type=float, default=10.0)
+    parser.add_argument('--log-level', default='info')
+    parser.add_argument('--example-faults', action='store_true', help='print an example fault plan and exit')
+    args = parser.parse_args()
+
+    if args.example_faults:
+        json.dump(example_faults(), sys.stdout, indent=2)
+        print()
+        return
+    logging.basicConfig(level=args.log_level.upper(), format='%(asctime)s - standin - %(message)s')
+    if args.startup_delay:
+        time.sleep(args.startup_delay)
+    app = StandinApp(generate_places(args.places, args.seed), render_time=args.render_time)
+    server = StandinServer(app, FaultPlan(args.faults), args.host, args.port, args.certfile, args.keyfile,
+                           args.drain_timeout)
+    asyncio.run(server.run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 모니터 모듈은 server/ 에서 이름으로 서로를 import 한다 (패키지 아님)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,90 @@
+import math
+
+import pytest
+
+import check_history
+from check_history import (FLAG_HEALTHY, FLAG_REUSED, RECORD, STATUS_IDS, CheckHistory, HistoryReader,
+                           columns, pack_result)
+from probe_engine import ProbeResult
+
+
+BASE = 1_760_000_000.0
+
+
+def result(name, offset, healthy=True, status='healthy', status_code=200, response_time=0.25, **kwargs):
+    return ProbeResult(name, healthy=healthy, status=status, status_code=status_code,
+                       response_time=response_time, started_at=BASE + offset, **kwargs)
+
+
+def test_pack_result_fields():
+    timings = {'dns': 0.001, 'connect': 0.002, 'tls': 0.003, 'ttfb': 0.1, 'download': 0.02, 'reused': True}
+    row = RECORD.unpack(pack_result(3, result('main', 0, timings=timings, bytes=1234)))
+    assert row[:6] == (BASE, 3, 200, STATUS_IDS['healthy'], FLAG_HEALTHY | FLAG_REUSED, 1234)
+    assert row[6:] == pytest.approx((0.25, 0.001, 0.002, 0.003, 0.1, 0.02))
+
+
+def test_pack_result_missing_values():
+    row = RECORD.unpack(pack_result(0, result('main', 0, healthy=False, status='timeout', status_code=None,
+                                              response_time=None)))
+    assert row[2:5] == (0, STATUS_IDS['timeout'], 0)
+    assert all(math.isnan(value) for value in row[6:])
+
+
+@pytest.fixture(params=['numpy', 'struct'])
+def history(request, tmp_path, monkeypatch):
+    if request.param == 'struct':
+        monkeypatch.setattr(check_history, 'np', None)
+    elif check_history.np is None:
+        pytest.skip('numpy not installed')
+    writer = CheckHistory(str(tmp_path))
+    writer.record('main', result('main', 0))
+    writer.record('health', result('health', 10, healthy=False, status='timeout', status_code=None,
+                                   response_time=None))
+    writer.record('main', result('main', 20, status_code=429, healthy=True, status='unhealthy'))
+    writer.flush()
+    writer.record('main', result('main', 86400 * 2, healthy=False, status='ssl_error', status_code=None))
+    writer.flush()
+    return HistoryReader(str(tmp_path))
+
+
+def times(rows):
+    return [t - BASE for t in columns(rows)['time']]
+
+
+def test_scan_returns_everything_oldest_first(history):
+    rows = history.scan()
+    assert times(rows) == [0, 10, 20, 86400 * 2]
+    assert len(history.segments()) == 2
+
+
+def test_scan_filters(history):
+    assert times(history.scan(target='main')) == [0, 20, 86400 * 2]
+    assert times(history.scan(status='timeout')) == [10]
+    assert times(history.scan(healthy=True)) == [0, 20]
+    assert times(history.scan(healthy=False, target='main')) == [86400 * 2]
+    assert times(history.scan(since=BASE + 10, until=BASE + 86400)) == [10, 20]
+
+
+def test_scan_columns_round_trip(history):
+    cols = columns(history.scan(target='health'))
+    assert list(cols['status_code']) == [0]
+    assert list(cols['status']) == [STATUS_IDS['timeout']]
+    assert math.isnan(cols['response_time'][0])
+    assert list(columns(history.scan(status='unhealthy'))['status_code']) == [429]
+
+
+def test_scan_ignores_a_truncated_last_record(history):
+    path = history.segments()[-1]
+    with open(path, 'ab') as f:
+        f.write(b'\x00' * (RECORD.size // 2))
+    assert times(history.scan()) == [0, 10, 20, 86400 * 2]
+
+
+def test_scan_unknown_target(history):
+    with pytest.raises(KeyError):
+        history.scan(target='nope')
+
+
+def test_target_ids_persist(tmp_path):
+    CheckHistory(str(tmp_path)).targets.get('main')
+    assert HistoryReader(str(tmp_path)).targets.get('main', create=False) == 0
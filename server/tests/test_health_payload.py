@@ -0,0 +1,115 @@
+import json
+
+import pytest
+
+from health_payload import HealthPayloadTracker, TrendTracker, parse_health
+
+
+def test_parse_health_flattens_nested_json():
+    body = json.dumps({
+        'status': 'ok',
+        'uptime': 12.5,
+        'cache': {'enabled': True, 'size': 40},
+        'components': [{'name': 'db', 'latency_ms': 3}, {'name': 'tourapi', 'status': 'degraded'}],
+        'queue': [7, 9],
+        'note': 'x' * 40,                       # 긴 문자열은 버림
+        'a': {'b': {'c': {'d': {'e': 1}}}},     # 깊이 4 까지만
+    }).encode()
+    numbers, strings, exact = parse_health(body)
+    assert exact
+    assert numbers == {'uptime': 12.5, 'cache.enabled': 1.0, 'cache.size': 40.0, 'components.db.latency_ms': 3.0,
+                       'queue.0': 7.0, 'queue.1': 9.0}
+    # 목록 항목의 name 은 경로가 되고 값도 남는다 (추적에서는 IGNORED_FIELDS 로 빠짐)
+    assert strings == {'status': 'ok', 'components.db.name': 'db', 'components.tourapi.name': 'tourapi',
+                       'components.tourapi.status': 'degraded'}
+
+
+def test_parse_health_strips_a_bom_and_caps_fields():
+    body = b'\xef\xbb\xbf' + json.dumps({f"f{i}": i for i in range(10)}).encode()
+    numbers, strings, exact = parse_health(body, max_fields=4)
+    assert exact and len(numbers) == 4
+
+
+@pytest.mark.parametrize('body', [
+    b'{"status": "ok", "db": {"latency_ms": 4.5, "up": true}, "requests_total": 1e3, "cut',     # 잘린 JSON
+    b'<html><pre>{"status": "ok", "db": {"latency_ms": 4.5, "up": true}, "requests_total": 1e3}</pre></html>',
+    b'{"status": "ok", "db": {"latency_ms": 4.5, "up": true}, "requests_total": 1e3} trailing garbage',
+])
+def test_parse_health_regex_fallback_keeps_leaf_fields(body):
+    numbers, strings, exact = parse_health(body)
+    assert not exact
+    assert numbers == {'latency_ms': 4.5, 'up': 1.0, 'requests_total': 1000.0}
+    assert strings == {'status': 'ok'}
+
+
+@pytest.mark.parametrize('body', [b'', b'<html>502 Bad Gateway</html>', b'[1, 2, 3]'])
+def test_parse_health_without_fields_raises(body):
+    with pytest.raises(ValueError):
+        parse_health(body)
+
+
+def tracker(cls=TrendTracker, **kwargs):
+    options = dict(capacity=50, min_samples=10, rebaseline=10, recent=3)
+    options.update(kwargs)
+    if cls is TrendTracker:
+        return TrendTracker('test', **options)
+    return cls(**options)
+
+
+def feed(t, field, values, start=1000.0):
+    for i, value in enumerate(values):
+        t.observe({field: value}, now=start + i)
+
+
+def test_spike_is_flagged_and_clears():
+    t = tracker()
+    feed(t, 'latency', [10, 11, 9, 10, 10, 11, 9, 10, 10, 11])
+    assert t.anomalies() == []
+    feed(t, 'latency', [100], start=2000)
+    assert [(field, kind) for field, kind, _ in t.anomalies()] == [('latency', 'spike')]
+    assert t.fields()['latency']['anomaly_since'] == 2000
+    feed(t, 'latency', [10], start=2001)
+    assert t.anomalies() == []
+
+
+def test_drift_is_flagged_from_the_recent_median():
+    t = tracker()
+    feed(t, 'rss', [100, 101, 99, 100, 100, 101, 99, 100, 100, 101])
+    feed(t, 'rss', [140, 141, 142], start=2000)
+    assert ('rss', 'drift') in [(field, kind) for field, kind, _ in t.anomalies()]
+    # 이상 징후 중에는 기준선이 따라가지 않는다
+    assert t.fields()['rss']['baseline'] == 100
+
+
+def test_counters_are_tracked_as_rates_and_reset_on_restart():
+    t = tracker()
+    for i, value in enumerate([0, 10, 20, 30, 5, 15]):
+        t.observe({'requests_total': value}, now=1000.0 + i * 2)
+    row = t.fields()['requests_total']
+    assert row['rate'] and row['samples'] == 4       # 첫 값과 리셋 (30 → 5) 은 건너뜀
+    assert row['last'] == 5.0
+
+
+def test_max_fields_bounds_the_series():
+    t = tracker(max_fields=2)
+    t.observe({'a': 1, 'b': 2, 'c': 3})
+    assert sorted(t.fields()) == ['a', 'b']
+
+
+def test_health_tracker_ignores_identifiers_and_tracks_bad_statuses():
+    t = tracker(HealthPayloadTracker)
+    assert t.record(b'{"pid": 42, "version": "1.2", "db": {"status": "ok", "latency_ms": 3}}', now=1000)
+    assert sorted(t.fields()) == ['db.latency_ms']
+    t.record(b'{"db": {"status": "Degraded", "latency_ms": 3}}', now=1001)
+    assert t.anomalies() == [('db.status', 'status', 'Degraded')]
+    t.record(b'{"db": {"status": "ok", "latency_ms": 3}}', now=1002)
+    assert t.anomalies() == []
+
+
+def test_health_tracker_counts_inexact_and_failed_parses():
+    t = tracker(HealthPayloadTracker)
+    assert t.record(b'{"status": "ok", "latency_ms": 3')
+    assert not t.record(b'<html>oops</html>')
+    snapshot = t.snapshot()
+    assert (snapshot['payloads'], snapshot['inexact'], snapshot['parse_errors']) == (1, 1, 1)
+    assert snapshot['last_error'].startswith('no fields')
@@ -0,0 +1,126 @@
+import asyncio
+import socket
+import struct
+
+import pytest
+
+import hedged_check
+from hedged_check import (QTYPE_A, QTYPE_AAAA, ConfirmPath, DnsError, HedgedConfirmer, _build_query,
+                          _parse_answer)
+from probe_engine import AsyncProbeEngine
+
+
+def answer(query, records, rcode=0):
+    """DNS response for query - records: [(type, rdata)], 이름은 질문을 가리키는 압축 포인터"""
+    query_id = struct.unpack('!H', query[:2])[0]
+    header = struct.pack('!HHHHHH', query_id, 0x8180 | rcode, 1, len(records), 0, 0)
+    body = b''.join(struct.pack('!HHHIH', 0xC00C, rtype, 1, 60, len(rdata)) + rdata for rtype, rdata in records)
+    return header + query[12:] + body
+
+
+def test_parse_answer_skips_cnames_and_other_types():
+    query = _build_query(0x1234, 'woopang.com', QTYPE_A)
+    cname = b'\x03cdn\x07example\x03net\x00'
+    records = [(5, cname), (QTYPE_A, socket.inet_aton('203.0.113.7')), (QTYPE_A, socket.inet_aton('203.0.113.8')),
+               (QTYPE_AAAA, socket.inet_pton(socket.AF_INET6, '2001:db8::1'))]
+    assert _parse_answer(answer(query, records), QTYPE_A) == [(socket.AF_INET, '203.0.113.7'),
+                                                             (socket.AF_INET, '203.0.113.8')]
+    assert _parse_answer(answer(query, records), QTYPE_AAAA) == [(socket.AF_INET6, '2001:db8::1')]
+
+
+def test_parse_answer_raises_on_error_rcodes():
+    query = _build_query(1, 'missing.woopang.com', QTYPE_A)
+    with pytest.raises(DnsError) as error:
+        _parse_answer(answer(query, [], rcode=3), QTYPE_A)
+    assert error.value.rcode == 3
+
+
+def resolve(monkeypatch, path, result, host='woopang.com'):
+    async def fake_query(server, host, qtype=QTYPE_A, timeout=1.0):
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    monkeypatch.setattr(hedged_check, 'query_dns', fake_query)
+    return asyncio.run(HedgedConfirmer(None, 'https://woopang.com/').resolve(path, host, 443))
+
+
+def test_resolve_picks_the_address_index(monkeypatch):
+    addresses = [(socket.AF_INET, '203.0.113.7'), (socket.AF_INET, '203.0.113.8')]
+    path = ConfirmPath('alt', resolver='1.1.1.1', address_index=1)
+    assert resolve(monkeypatch, path, addresses) == ([addresses[1]], '1.1.1.1')
+
+
+@pytest.mark.parametrize('failure', [DnsError('rcode 2', 2), DnsError('rcode 5', 5), OSError(), asyncio.TimeoutError()])
+def test_resolver_trouble_falls_back_to_the_system_resolver(monkeypatch, failure):
+    addresses, via = resolve(monkeypatch, ConfirmPath('cf', resolver='1.1.1.1'), failure)
+    assert addresses is None and via.endswith('→ system')
+
+
+@pytest.mark.parametrize('result', [DnsError('rcode 3', 3), []])
+def test_nxdomain_and_empty_answers_count_against_the_site(monkeypatch, result):
+    with pytest.raises(DnsError):
+        resolve(monkeypatch, ConfirmPath('cf', resolver='1.1.1.1'), result)
+
+
+def test_ip_literals_skip_dns(monkeypatch):
+    path = ConfirmPath('cf', resolver='1.1.1.1')
+    assert resolve(monkeypatch, path, OSError(), host='127.0.0.1') == ([(socket.AF_INET, '127.0.0.1')], 'literal')
+    assert resolve(monkeypatch, path, OSError(), host='::1') == ([(socket.AF_INET6, '::1')], 'literal')
+
+
+@pytest.fixture
+def engine():
+    engine = AsyncProbeEngine(max_workers=2)
+    yield engine
+    engine.stop()
+
+
+def confirm(engine, statuses, quorum=3):
+    """4 paths → the local server answers with statuses in arrival order (stagger 순서)"""
+    served = []
+
+    async def handle(reader, writer):
+        try:
+            await reader.readuntil(b'\r\n\r\n')
+        except asyncio.IncompleteReadError:
+            return
+        status = statuses[len(served)]
+        served.append(status)
+        writer.write(f"HTTP/1.1 {status} X\r\nContent-Length: 0\r\nConnection: close\r\n\r\n".encode())
+        await writer.drain()
+        writer.close()
+
+    async def scenario():
+        server = await asyncio.start_server(handle, '127.0.0.1', 0)
+        url = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}/"
+        paths = [ConfirmPath(f"p{i}", resolver='192.0.2.1') for i in range(4)]
+        try:
+            return await HedgedConfirmer(engine, url, paths=paths, quorum=quorum, stagger=0.05, timeout=2).confirm()
+        finally:
+            server.close()
+
+    return engine.submit(scenario()).result(timeout=10), served
+
+
+def test_quorum_of_failures_is_down(engine):
+    outcome, served = confirm(engine, [503, 503, 503, 503])
+    assert outcome.healthy is False
+    assert (outcome.failures, outcome.successes) == (3, 0)
+    assert [name for name, *_ in outcome.votes] == ['p0', 'p1', 'p2']
+    assert 'DOWN' in outcome.describe()
+
+
+def test_up_as_soon_as_the_quorum_is_unreachable(engine):
+    outcome, served = confirm(engine, [200, 503, 200, 503])
+    assert outcome.healthy is True
+    assert (outcome.failures, outcome.successes) == (1, 2)
+    # 네 번째 경로는 결론이 난 뒤 취소
+    assert len(served) == 3
+
+
+def test_split_votes_still_reach_a_failure_quorum(engine):
+    outcome, _ = confirm(engine, [503, 200, 503, 503])
+    assert outcome.healthy is False
+    assert (outcome.failures, outcome.successes) == (3, 1)
+    assert all(address == '127.0.0.1' for _, address, _, _ in outcome.votes)
@@ -0,0 +1,167 @@
+import asyncio
+import gzip
+import zlib
+
+import pytest
+
+from http_pool import HttpProtocolError, PooledHttpClient
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def feed(data):
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    return reader
+
+
+def test_read_headers_lowercases_names_and_counts_bytes():
+    raw = b'HTTP/1.1 200 OK\r\nContent-Type: text/html\r\nX-Thing:  a:b \r\n\r\nbody'
+
+    async def scenario():
+        return await PooledHttpClient()._read_headers(feed(raw))
+
+    version, status, headers, _, size = run(scenario())
+    assert (version, status) == ('HTTP/1.1', 200)
+    assert headers == {'content-type': 'text/html', 'x-thing': 'a:b'}
+    assert size == raw.index(b'body')
+
+
+@pytest.mark.parametrize('raw', [
+    b'',                                        # 응답 전에 닫힘
+    b'garbage\r\n\r\n',
+    b'HTTP/1.1 abc Bad\r\n\r\n',
+    b'HTTP/1.1 200 OK\r\nContent-Length: 3\r\n',  # 헤더 중간에 닫힘
+])
+def test_read_headers_rejects_malformed_responses(raw):
+    async def scenario():
+        return await PooledHttpClient()._read_headers(feed(raw))
+
+    with pytest.raises(HttpProtocolError):
+        run(scenario())
+
+
+def read_body(raw, method='GET', status=200, headers=None):
+    async def scenario():
+        return await PooledHttpClient()._read_body(feed(raw), method, status, headers or {})
+    return run(scenario())
+
+
+def test_read_body_content_length_leaves_the_rest_unread():
+    assert read_body(b'hello, next response', headers={'content-length': '5'}) == (b'hello', True)
+
+
+def test_read_body_chunked_with_extensions_and_trailers():
+    raw = b'5;ext=1\r\nhello\r\n7\r\n, world\r\n0\r\nX-Trailer: 1\r\n\r\n'
+    assert read_body(raw, headers={'transfer-encoding': 'chunked'}) == (b'hello, world', True)
+
+
+@pytest.mark.parametrize('raw', [b'5\r\nhel', b'zz\r\nhello\r\n0\r\n\r\n', b'5\r\nhello\r\n'])
+def test_read_body_chunked_truncated_or_malformed(raw):
+    with pytest.raises((HttpProtocolError, asyncio.IncompleteReadError)):
+        read_body(raw, headers={'transfer-encoding': 'chunked'})
+
+
+@pytest.mark.parametrize('method, status', [('HEAD', 200), ('GET', 204), ('GET', 304), ('GET', 101)])
+def test_read_body_without_body(method, status):
+    assert read_body(b'ignored', method, status, {'content-length': '7'}) == (b'', True)
+
+
+def test_read_body_until_eof_is_not_reusable():
+    assert read_body(b'all of it') == (b'all of it', False)
+
+
+@pytest.mark.parametrize('encoding, encode', [
+    ('gzip', gzip.compress),
+    ('deflate', zlib.compress),
+    ('deflate', lambda data: zlib.compress(data)[2:-4]),   # 헤더 없는 raw deflate
+    ('identity', lambda data: data),
+])
+def test_decode(encoding, encode):
+    body = b'{"places": []}' * 20
+    assert PooledHttpClient._decode(encode(body), {'content-encoding': encoding}) == body
+
+
+class Server:
+    """Tiny asyncio HTTP/1.1 server - routes: path → (status, headers, body)"""
+
+    def __init__(self, routes, requests_per_connection=None):
+        self.routes = routes
+        self.requests_per_connection = requests_per_connection
+        self.connections = 0
+        self.requests = []
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        served = 0
+        while True:
+            try:
+                head = await reader.readuntil(b'\r\n\r\n')
+            except asyncio.IncompleteReadError:
+                break
+            if self.requests_per_connection is not None and served >= self.requests_per_connection:
+                break       # 유휴 연결을 서버가 먼저 닫은 것처럼 - 요청을 읽고 응답 없이 끊음
+            method, path, _ = head.split(b'\r\n', 1)[0].decode().split(' ')
+            self.requests.append((method, path))
+            status, headers, body = self.routes[path]
+            lines = [f"HTTP/1.1 {status} X"] + [f"{k}: {v}" for k, v in headers.items()]
+            if 'Transfer-Encoding' not in headers:
+                lines.append(f"Content-Length: {len(body)}")
+            writer.write(("\r\n".join(lines) + "\r\n\r\n").encode() + (b'' if method == 'HEAD' else body))
+            await writer.drain()
+            served += 1
+        writer.close()
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self.handle, '127.0.0.1', 0)
+        self.base = f"http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}"
+        return self
+
+    async def __aexit__(self, *exc):
+        self.server.close()
+
+
+def test_request_follows_redirects_and_decodes_chunked_gzip():
+    payload = gzip.compress(b'[{"id": 1}]')
+    chunked = b'%x\r\n%s\r\n0\r\n\r\n' % (len(payload), payload)
+    routes = {
+        '/old': (302, {'Location': '/new'}, b''),
+        '/new': (200, {'Transfer-Encoding': 'chunked', 'Content-Encoding': 'gzip'}, chunked),
+    }
+
+    async def scenario():
+        async with Server(routes) as server:
+            client = PooledHttpClient()
+            response = await client.request('GET', server.base + '/old')
+            client.close()
+            return server, client, response
+
+    server, client, response = run(scenario())
+    assert response.status_code == 200
+    assert response.url.endswith('/new')
+    assert response.body == b'[{"id": 1}]'
+    assert response.wire_bytes == len(payload)
+    assert server.requests == [('GET', '/old'), ('GET', '/new')]
+    # 리다이렉트 두 번째 홉은 같은 keep-alive 연결
+    assert server.connections == 1
+    assert client.stats['connections_reused'] == 1
+
+
+def test_request_retries_once_on_a_stale_pooled_connection():
+    routes = {'/': (200, {}, b'ok')}
+
+    async def scenario():
+        async with Server(routes, requests_per_connection=1) as server:
+            client = PooledHttpClient()
+            first = await client.request('GET', server.base + '/')
+            second = await client.request('GET', server.base + '/')
+            client.close()
+            return server, first, second
+
+    server, first, second = run(scenario())
+    assert first.body == second.body == b'ok'
+    assert server.connections == 2
+    assert not second.timings.reused
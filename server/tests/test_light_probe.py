@@ -0,0 +1,134 @@
+import asyncio
+import types
+
+import pytest
+
+from http_pool import HttpResponse, PhaseTimings
+from light_probe import LightProbe
+
+
+URL = 'https://woopang.com/'
+PAGE = b'<html>' + b'x' * 2000 + b'</html>'
+
+
+class Site:
+    """engine.http stand-in - respond(method, headers) → (status, headers, body, ttfb)"""
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.requests = []
+
+    async def request(self, method, url, headers=None, verify=True):
+        self.requests.append((method, dict(headers or {})))
+        status, response_headers, body, ttfb = self.respond(method, headers or {})
+        timings = PhaseTimings()
+        timings.ttfb = timings.total = ttfb
+        return HttpResponse(url, status, response_headers, b'' if method == 'HEAD' else body,
+                            0 if method == 'HEAD' else len(body), timings, header_bytes=200)
+
+
+def run(probe, site, times=1, deep=False):
+    engine = types.SimpleNamespace(http=site)
+    return [asyncio.run(probe.probe(engine, 'main', URL, 5, deep=deep)) for _ in range(times)][-1]
+
+
+def validated(method, headers):
+    """ETag 를 지원하는 페이지 - 조건부 요청은 304, 렌더링을 건너뛰어 TTFB 가 짧다"""
+    if headers.get('If-None-Match') == '"v1"':
+        return 304, {'etag': '"v1"'}, b'', 0.01
+    return 200, {'etag': '"v1"'}, PAGE, 0.2
+
+
+def test_conditional_probes_get_304_after_one_full_get():
+    site = Site(validated)
+    probe = LightProbe('conditional', deep_every=0)
+    first = run(probe, site)
+    assert first.healthy and probe.last_kind == 'deep'
+    result = run(probe, site, times=3)
+    assert (result.healthy, result.status_code, probe.last_kind) == (True, 304, 'conditional')
+    assert site.requests[-1][1]['If-None-Match'] == '"v1"'
+    snapshot = probe.snapshot()
+    assert snapshot['not_modified'] == 3
+    assert snapshot['bytes_saved'] == 3 * len(PAGE)
+    assert snapshot['server_time_saved_per_probe'] == pytest.approx(0.19)
+
+
+def test_deep_every_forces_a_full_get():
+    site = Site(validated)
+    probe = LightProbe('conditional', deep_every=3)
+    run(probe, site, times=7)
+    assert [method for method, headers in site.requests].count('GET') == 7
+    assert probe.counts == {'deep': 3, 'conditional': 4, 'range': 0, 'head': 0}
+
+
+def test_page_without_validators_falls_back_to_range():
+    site = Site(lambda method, headers: (206, {}, PAGE[:512], 0.2) if 'Range' in headers else (200, {}, PAGE, 0.2))
+    probe = LightProbe('conditional', deep_every=0)
+    run(probe, site)
+    assert probe.active_mode == 'range'
+    result = run(probe, site)
+    assert (result.status_code, probe.last_kind) == (206, 'range')
+    assert site.requests[-1][1]['Range'] == 'bytes=0-511'
+    assert site.requests[-1][1]['Accept-Encoding'] == 'identity'
+    # HEAD / Range 는 서버가 렌더링하므로 서버 시간 절약 없음
+    assert probe.server_time_saved == 0.0
+
+
+def test_ignored_range_requests_fall_back_to_head_then_full():
+    site = Site(lambda method, headers: (200, {}, PAGE, 0.2))
+    probe = LightProbe('range', deep_every=0, fallback_after=2)
+    run(probe, site, times=3)
+    assert probe.active_mode == 'head'
+    result = run(probe, site)
+    assert result.healthy and site.requests[-1][0] == 'HEAD'
+    assert [(old, new) for old, new, _ in probe.fallbacks] == [('range', 'head')]
+
+
+def test_rejected_light_request_is_retried_as_a_full_get_in_the_same_probe():
+    site = Site(lambda method, headers: (405, {}, b'', 0.01) if method == 'HEAD' else (200, {}, PAGE, 0.2))
+    probe = LightProbe('head', deep_every=0)
+    run(probe, site)
+    result = run(probe, site)
+    assert result.healthy and probe.last_kind == 'deep'
+    assert [method for method, _ in site.requests[-2:]] == ['HEAD', 'GET']
+    assert probe.active_mode == 'full'
+    assert probe.fallbacks[-1][2] == 'head request answered 405'
+
+
+def test_changed_etag_is_a_deploy_not_an_ignored_request():
+    version = ['"v1"']
+
+    def respond(method, headers):
+        if headers.get('If-None-Match') == version[0]:
+            return 304, {'etag': version[0]}, b'', 0.01
+        return 200, {'etag': version[0]}, PAGE, 0.2
+
+    site = Site(respond)
+    probe = LightProbe('conditional', deep_every=0, fallback_after=1)
+    run(probe, site)
+    version[0] = '"v2"'
+    assert run(probe, site).healthy
+    assert probe.active_mode == 'conditional' and probe.validators[URL]['etag'] == '"v2"'
+    assert run(probe, site).status_code == 304
+
+
+@pytest.mark.parametrize('body, error', [(b'<html>tiny</html>', 'only'), (b'<html>' + b'x' * 2000, '</html>')])
+def test_full_get_validates_the_page(body, error):
+    probe = LightProbe('full')
+    result = run(probe, Site(lambda method, headers: (200, {}, body, 0.2)))
+    assert (result.healthy, result.status) == (False, 'invalid_content')
+    assert error in str(result.error)
+
+
+def test_light_error_status_is_unhealthy():
+    site = Site(validated)
+    probe = LightProbe('conditional', deep_every=0)
+    run(probe, site)
+    site.respond = lambda method, headers: (502, {}, b'bad gateway', 0.01)
+    result = run(probe, site)
+    assert (result.healthy, result.status, probe.last_kind) == (False, 'unhealthy', 'conditional')
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        LightProbe('sometimes')
@@ -0,0 +1,127 @@
+import asyncio
+import gzip
+import json
+import types
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from http_pool import HttpResponse, PhaseTimings
+from locations_probe import LocationsProbe, point_key
+from probe_scheduler import ProbeTarget
+
+
+BASE = 'https://woopang.com/locations'
+
+
+def target(points, url=BASE):
+    return ProbeTarget('locations', url, kind='locations', points=points)
+
+
+class Api:
+    """engine.http stand-in - body(url) → bytes, or an exception to raise"""
+
+    def __init__(self, body, status=200):
+        self.body = body
+        self.status = status
+        self.urls = []
+
+    async def request(self, method, url, headers=None, verify=True):
+        self.urls.append(url)
+        body = self.body(url)
+        if isinstance(body, Exception):
+            raise body
+        timings = PhaseTimings()
+        timings.ttfb, timings.download = 0.05, 0.01
+        timings.total = timings.ttfb + timings.download
+        return HttpResponse(url, self.status, {}, body, len(gzip.compress(body)), timings)
+
+
+def places(count):
+    return json.dumps([{'id': i, 'name': f"place {i}"} for i in range(count)]).encode()
+
+
+def run(probe, api, times=1):
+    engine = types.SimpleNamespace(http=api)
+    return [asyncio.run(probe.probe(engine, 'locations', BASE, 5)) for _ in range(times)]
+
+
+def test_points_build_urls_and_keys():
+    probe = LocationsProbe(target([
+        {'name': 'seoul', 'lat': 37.5665, 'lon': 126.978, 'radius': 2000, 'min_records': 5},
+        {'lat': '35.1796', 'lon': '129.0756'},
+    ]))
+    seoul, busan = probe.points
+    assert (seoul.key, seoul.min_records) == ('seoul', 5)
+    assert busan.key == '35.1796,129.0756@1000m'
+    assert parse_qs(urlsplit(seoul.url).query) == {'lat': ['37.5665'], 'lon': ['126.978'], 'radius': ['2000']}
+    with_query = LocationsProbe(target([{'lat': 1, 'lon': 2}], url=BASE + '?lang=ko'))
+    assert with_query.points[0].url.startswith(BASE + '?lang=ko&lat=1.0')
+
+
+def test_target_without_points_probes_its_url():
+    probe = LocationsProbe(target([], url=BASE + '?lat=37.5&lon=127&radius=500'))
+    [point] = probe.points
+    assert (point.key, point.url) == ('37.5000,127.0000@500m', BASE + '?lat=37.5&lon=127&radius=500')
+    assert LocationsProbe(target([])).points[0].key == 'default'
+
+
+@pytest.mark.parametrize('points', [
+    [{'name': 'a', 'lat': 1, 'lon': 2}, {'name': 'a', 'lat': 3, 'lon': 4}],
+    [{'name': 'a', 'lat': 'north', 'lon': 2}],
+    [{'name': 'a', 'lon': 2}],
+])
+def test_bad_points_raise(points):
+    with pytest.raises(ValueError):
+        LocationsProbe(target(points))
+
+
+def test_probes_rotate_through_points():
+    api = Api(lambda url: places(3))
+    probe = LocationsProbe(target([{'name': n, 'lat': i, 'lon': i} for i, n in enumerate('abc')]))
+    run(probe, api, times=5)
+    assert [parse_qs(urlsplit(url).query)['lat'][0] for url in api.urls] == ['0.0', '1.0', '2.0', '0.0', '1.0']
+    assert [point.probes for point in probe.points] == [2, 2, 1]
+
+
+def test_measures_payload_per_point():
+    body = places(40)
+    probe = LocationsProbe(target([{'name': 'seoul', 'lat': 37.5, 'lon': 127}]))
+    [result] = run(probe, Api(lambda url: body))
+    assert (result.healthy, result.status) == (True, 'healthy')
+    last = probe.points[0].last
+    assert (last['records'], last['uncompressed_bytes']) == (40, len(body))
+    assert last['compressed_bytes'] == result.bytes < len(body)
+    assert last['bytes_per_record'] == len(body) / 40
+    assert last['ttfb_ms'] == pytest.approx(50)
+    assert 'seoul.records' in probe.trends.fields()
+
+
+@pytest.mark.parametrize('body, error', [
+    (b'{"places": []}', 'expected a JSON array'),
+    (b'<html>maintenance</html>', 'invalid JSON'),
+    (places(2), 'only 2 places'),
+])
+def test_bad_payloads_are_invalid_content(body, error):
+    probe = LocationsProbe(target([{'name': 'seoul', 'lat': 37.5, 'lon': 127, 'min_records': 3}]))
+    [result] = run(probe, Api(lambda url: body))
+    assert (result.healthy, result.status) == (False, 'invalid_content')
+    assert error in str(result.error)
+    assert probe.points[0].failures == 1 and probe.invalid == 1
+
+
+def test_error_status_and_exceptions_count_per_point():
+    probe = LocationsProbe(target([{'name': 'a', 'lat': 1, 'lon': 1}, {'name': 'b', 'lat': 2, 'lon': 2}]))
+    [result] = run(probe, Api(lambda url: b'busy', status=503))
+    assert (result.healthy, result.status) == (False, 'unhealthy')
+    with pytest.raises(ConnectionResetError):
+        run(probe, Api(lambda url: ConnectionResetError('reset')))
+    a, b = probe.points
+    assert (a.failures, a.last_status, b.failures, b.last_status) == (1, 'unhealthy', 1, 'error')
+    snapshot = probe.snapshot()
+    assert snapshot['probes'] == 2 and snapshot['points']['b']['error'] == 'reset'
+
+
+def test_point_key():
+    assert point_key({'name': 'gangnam', 'lat': 1, 'lon': 2}) == 'gangnam'
+    assert point_key({'lat': 37.123456, 'lon': 127, 'radius': 1500.0}) == '37.1235,127.0000@1500m'
@@ -0,0 +1,48 @@
+import urllib.request
+
+from metrics_exporter import MetricsExporter, MetricsWriter
+
+
+def writer():
+    w = MetricsWriter(prefix='t')
+    w.counter('checks', 3, 'Cycles', {'kind': 'a'})
+    w.gauge('up', True, 'Up')
+    w.counter('checks', 4, 'Cycles', {'kind': 'b'})      # 같은 family 는 한 번만 선언, 샘플은 묶어서
+    w.histogram('latency', ([(0.5, 1), ('+Inf', 2)], 1.5, 2), 'Latency')
+    return w
+
+
+def test_openmetrics_declares_counter_families_and_ends_with_eof():
+    openmetrics, _ = writer().render()
+    lines = openmetrics.decode().splitlines()
+    assert lines[:5] == ['# TYPE t_checks counter', '# HELP t_checks Cycles',
+                         't_checks_total{kind="a"} 3', 't_checks_total{kind="b"} 4', '# TYPE t_up gauge']
+    assert 't_latency_bucket{le="0.5"} 1' in lines
+    assert lines[-1] == '# EOF'
+
+
+def test_prometheus_text_declares_counter_samples_without_eof():
+    _, text = writer().render()
+    lines = text.decode().splitlines()
+    assert lines[:2] == ['# TYPE t_checks_total counter', '# HELP t_checks_total Cycles']
+    assert '# TYPE t_latency histogram' in lines
+    assert '# EOF' not in lines
+    assert text.endswith(b'\n')
+
+
+def test_exporter_negotiates_the_format():
+    exporter = MetricsExporter(port=0)
+    exporter.start()
+    try:
+        exporter.publish(writer().render())
+        url = f"http://127.0.0.1:{exporter.port}/metrics"
+        scraped = {}
+        for accept in ('application/openmetrics-text; version=1.0.0', 'text/plain'):
+            with urllib.request.urlopen(urllib.request.Request(url, headers={'Accept': accept})) as response:
+                scraped[accept.split(';')[0]] = (response.headers['Content-Type'], response.read())
+    finally:
+        exporter.stop()
+    content_type, body = scraped['application/openmetrics-text']
+    assert content_type.startswith('application/openmetrics-text') and body.endswith(b'# EOF\n')
+    content_type, body = scraped['text/plain']
+    assert content_type.startswith('text/plain; version=0.0.4') and b'# EOF' not in body
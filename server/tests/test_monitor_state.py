@@ -0,0 +1,73 @@
+import time
+
+import pytest
+
+import monitor_state
+from monitor_state import (CONFIRMING, COOLING_DOWN, HEALTHY, RESTARTING, STATES, SUSPECT,
+                           MonitorStateMachine)
+
+
+def test_outage_cycle():
+    machine = MonitorStateMachine()
+    for state in (SUSPECT, CONFIRMING, RESTARTING, COOLING_DOWN, HEALTHY):
+        assert machine.transition(state, 'next')
+    assert machine.state == HEALTHY
+    assert machine.entries == {HEALTHY: 2, SUSPECT: 1, CONFIRMING: 1, RESTARTING: 1, COOLING_DOWN: 1}
+    assert [(old, new) for _, old, new, _, _ in machine.history][-1] == (COOLING_DOWN, HEALTHY)
+
+
+@pytest.mark.parametrize('path', [
+    (SUSPECT, HEALTHY),                      # 일시적 실패
+    (SUSPECT, CONFIRMING, HEALTHY),          # 빠른 재확인에서 회복
+    (SUSPECT, CONFIRMING, SUSPECT),
+    (RESTARTING, COOLING_DOWN, SUSPECT),     # 계획 재시작 (누수) 후 아직 실패
+])
+def test_allowed_paths(path):
+    machine = MonitorStateMachine()
+    for state in path:
+        machine.transition(state)
+    assert machine.state == path[-1]
+
+
+@pytest.mark.parametrize('start, target', [
+    (HEALTHY, CONFIRMING),
+    (HEALTHY, COOLING_DOWN),
+    (SUSPECT, RESTARTING),
+    (RESTARTING, HEALTHY),
+    (COOLING_DOWN, RESTARTING),
+])
+def test_invalid_transitions_raise(start, target):
+    machine = MonitorStateMachine(initial=start)
+    with pytest.raises(ValueError):
+        machine.transition(target)
+    assert machine.state == start
+
+
+def test_same_state_is_a_no_op():
+    machine = MonitorStateMachine()
+    assert machine.transition(HEALTHY) is False
+    assert not machine.history
+
+
+def test_every_state_has_transitions_and_an_icon():
+    assert set(monitor_state.ALLOWED_TRANSITIONS) == set(STATES) == set(monitor_state.STATE_ICONS)
+    for targets in monitor_state.ALLOWED_TRANSITIONS.values():
+        assert set(targets) <= set(STATES)
+
+
+def test_time_accounting_and_deadline():
+    machine = MonitorStateMachine()
+    time.sleep(0.05)
+    machine.transition(SUSPECT)
+    machine.transition(CONFIRMING)
+    machine.transition(RESTARTING)
+    machine.transition(COOLING_DOWN, 'restart succeeded', deadline=0.05)
+    assert not machine.deadline_passed()
+    time.sleep(0.06)
+    assert machine.deadline_passed()
+    totals = machine.durations()
+    assert totals[HEALTHY] >= 0.05
+    assert totals[COOLING_DOWN] >= 0.06
+    assert sum(totals.values()) == pytest.approx(sum(machine.time_in_state.values()) + machine.elapsed(), abs=0.01)
+    machine.transition(HEALTHY)
+    assert machine.deadline is None and not machine.deadline_passed()
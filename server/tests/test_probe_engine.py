@@ -0,0 +1,90 @@
+import asyncio
+import ssl
+import time
+
+import pytest
+
+from http_pool import HttpProtocolError
+from probe_engine import AsyncProbeEngine, ProbeResult, classify_error
+
+
+@pytest.fixture
+def engine():
+    engine = AsyncProbeEngine(max_workers=2)
+    yield engine
+    engine.stop()
+
+
+async def probe(name, delay, healthy=True):
+    await asyncio.sleep(delay)
+    return ProbeResult(name, healthy=healthy, status="healthy" if healthy else "unhealthy", status_code=200)
+
+
+async def fail(exc):
+    raise exc
+
+
+def test_run_cycle_runs_probes_concurrently(engine):
+    started = time.perf_counter()
+    results = engine.run_cycle([(f"p{i}", probe(f"p{i}", 0.3), 2) for i in range(4)])
+    elapsed = time.perf_counter() - started
+    assert sorted(results) == ['p0', 'p1', 'p2', 'p3']
+    assert all(r.healthy for r in results.values())
+    assert elapsed < 0.9        # 순차였다면 1.2s
+    # 응답 시간을 주지 않은 프로브는 엔진이 잰다
+    assert all(0.25 < r.response_time < 0.9 and r.started_at for r in results.values())
+
+
+def test_run_probe_turns_timeouts_and_errors_into_results(engine):
+    results = engine.run_cycle([
+        ('slow', probe('slow', 5), 0.2),
+        ('refused', fail(ConnectionRefusedError()), 1),
+        ('broken', fail(HttpProtocolError('bad status line')), 1),
+        ('ok', probe('ok', 0), 1),
+    ])
+    assert {name: r.status for name, r in results.items()} == {
+        'slow': 'timeout', 'refused': 'connection_error', 'broken': 'connection_error', 'ok': 'healthy'}
+    assert not results['slow'].healthy and results['slow'].response_time is None
+
+
+def test_result_hook_sees_every_result(engine):
+    seen = []
+    engine.result_hook = lambda result: seen.append(result.name)
+    engine.run_cycle([('a', probe('a', 0), 1), ('b', fail(OSError()), 1)])
+    assert sorted(seen) == ['a', 'b']
+
+
+def test_http_get_against_a_local_server(engine):
+    async def handle(reader, writer):
+        await reader.readuntil(b'\r\n\r\n')
+        writer.write(b'HTTP/1.1 503 Busy\r\nContent-Length: 4\r\n\r\nbusy')
+        await writer.drain()
+        writer.close()
+
+    async def serve():
+        return await asyncio.start_server(handle, '127.0.0.1', 0)
+
+    server = engine.submit(serve()).result(timeout=5)
+    url = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}/health"
+    try:
+        down = engine.run_one('health', engine.http_get('health', url, 2), 2)
+        allowed = engine.run_one('health', engine.http_get('health', url, 2, expected_status=(200, 503)), 2)
+    finally:
+        engine.loop.call_soon_threadsafe(server.close)
+    assert (down.healthy, down.status, down.status_code) == (False, 'unhealthy', 503)
+    assert down.bytes == 4 and set(down.timings) >= {'dns', 'connect', 'ttfb', 'download'}
+    assert allowed.healthy
+
+
+@pytest.mark.parametrize('exc, status', [
+    (ssl.SSLError(), 'ssl_error'),
+    (ssl.SSLCertVerificationError(), 'ssl_error'),
+    (asyncio.TimeoutError(), 'timeout'),
+    (TimeoutError(), 'timeout'),
+    (HttpProtocolError('x'), 'connection_error'),
+    (asyncio.IncompleteReadError(b'', 10), 'connection_error'),
+    (ConnectionResetError(), 'connection_error'),
+    (ValueError(), 'unknown_error'),
+])
+def test_classify_error(exc, status):
+    assert classify_error(exc) == status
@@ -0,0 +1,125 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from probe_engine import AsyncProbeEngine, ProbeResult
+from probe_scheduler import ProbeScheduler, ProbeTarget, load_targets
+
+
+async def cancel_pending():
+    tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+@pytest.fixture
+def engine():
+    engine = AsyncProbeEngine(max_workers=2)
+    yield engine
+    # 정지한 스케줄러의 진행 중 프로브를 정리한 뒤 루프를 멈춘다
+    engine.submit(cancel_pending()).result(timeout=5)
+    engine.stop()
+
+
+def target(name, interval, delay=0.0, tracker=None):
+    t = ProbeTarget(name, f"http://test/{name}", interval=interval, timeout=2, jitter=0)
+
+    async def probe(name, url, timeout, **kwargs):
+        if tracker is not None:
+            tracker['now'] += 1
+            tracker['max'] = max(tracker['max'], tracker['now'])
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            if tracker is not None:
+                tracker['now'] -= 1
+        return ProbeResult(name, healthy=True, status="healthy", status_code=200)
+
+    t.probe = probe
+    return t
+
+
+def run_for(scheduler, seconds, targets=()):
+    scheduler.start(targets)
+    time.sleep(seconds)
+    scheduler.stop()
+    time.sleep(0.05)
+
+
+def test_targets_fire_at_their_own_intervals(engine):
+    fired = []
+    scheduler = ProbeScheduler(engine, lambda t, result: fired.append(t.name))
+    run_for(scheduler, 0.55, [target('fast', 0.1), target('slow', 0.25)])
+    assert 5 <= fired.count('fast') <= 7
+    assert 2 <= fired.count('slow') <= 3
+
+
+def test_jobs_share_the_run_queue(engine):
+    ticks = []
+
+    async def tick():
+        ticks.append(time.monotonic())
+
+    scheduler = ProbeScheduler(engine, lambda t, result: None)
+    scheduler.add_job('tick', 0.1, tick)
+    run_for(scheduler, 0.35)
+    assert 3 <= len(ticks) <= 5
+
+
+def test_overlapping_runs_are_skipped(engine):
+    fired = []
+    scheduler = ProbeScheduler(engine, lambda t, result: fired.append(t.name))
+    run_for(scheduler, 0.5, [target('stuck', 0.1, delay=0.3)])
+    assert scheduler.stats['skipped_overlap'] >= 2
+    assert scheduler.stats['fired'] == 2
+
+
+def test_max_concurrency_limits_in_flight_probes(engine):
+    tracker = {'now': 0, 'max': 0}
+    scheduler = ProbeScheduler(engine, lambda t, result: None, max_concurrency=2)
+    run_for(scheduler, 0.3, [target(f"t{i}", 10, delay=0.1, tracker=tracker) for i in range(5)])
+    assert tracker['max'] == 2
+    assert scheduler.stats['fired'] == 5
+
+
+def test_removed_target_stops_firing(engine):
+    fired = []
+    scheduler = ProbeScheduler(engine, lambda t, result: fired.append(t.name))
+    scheduler.start([target('gone', 0.05)])
+    time.sleep(0.2)
+    scheduler.remove_target('gone')
+    time.sleep(0.05)
+    count = len(fired)
+    time.sleep(0.2)
+    scheduler.stop()
+    assert count and len(fired) == count
+
+
+def write(tmp_path, config):
+    path = tmp_path / 'targets.json'
+    path.write_text(json.dumps(config), encoding='utf-8')
+    return str(path)
+
+
+def test_load_targets(tmp_path):
+    path = write(tmp_path, {'base_url': 'https://example.com/', 'targets': [
+        {'name': 'main', 'url': '/', 'critical': True},
+        {'name': 'api', 'url': 'https://api.example.com/v1', 'expected_status': 204, 'interval': 30},
+        {'name': 'off', 'url': '/off', 'enabled': False},
+    ]})
+    main, api = load_targets(path)
+    assert (main.url, main.critical, main.jitter) == ('https://example.com/', True, 10.0)
+    assert (api.url, api.expected_status, api.interval) == ('https://api.example.com/v1', (204,), 30.0)
+    assert load_targets(str(tmp_path / 'missing.json')) == []
+
+
+@pytest.mark.parametrize('targets', [
+    [{'name': 'a', 'url': '/'}, {'name': 'a', 'url': '/x'}],
+    [{'name': 'a', 'url': '/', 'kind': 'ftp'}],
+])
+def test_load_targets_rejects_bad_configs(tmp_path, targets):
+    with pytest.raises(ValueError):
+        load_targets(write(tmp_path, {'targets': targets}))
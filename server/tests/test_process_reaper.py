@@ -0,0 +1,104 @@
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import psutil
+import pytest
+
+from process_reaper import ProcessReaper
+
+
+MARKER = 'reaper_test_app.py'
+
+APP = '''
+import signal, socket, sys, time
+if sys.argv[2] == 'stubborn':
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+sock = socket.socket()
+sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+sock.bind(('127.0.0.1', int(sys.argv[1])))
+sock.listen()
+while True:
+    time.sleep(1)
+'''
+
+pytestmark = pytest.mark.skipif(os.name == 'nt', reason='SIGTERM 무시 프로세스는 POSIX 전용')
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def spawn(tmp_path):
+    script = tmp_path / MARKER
+    script.write_text(APP, encoding='utf-8')
+    children = []
+
+    def spawn(port, mode='normal'):
+        child = subprocess.Popen([sys.executable, str(script), str(port), mode])
+        children.append(child)
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            try:
+                socket.create_connection(('127.0.0.1', port), timeout=0.2).close()
+                return child
+            except OSError:
+                time.sleep(0.02)
+        raise RuntimeError('test app did not start listening')
+
+    yield spawn
+    for child in children:
+        if child.poll() is None:
+            child.kill()
+        child.wait()
+
+
+def test_reap_terminates_the_socket_owner_and_returns_when_the_port_is_free(spawn):
+    port = free_port()
+    child = spawn(port)
+    reaper = ProcessReaper(port=port, cmdline_marker=MARKER, terminate_timeout=5.0)
+    assert child.pid in reaper.listening_pids() | reaper.app_pids()
+
+    report = reaper.reap()
+    assert report.targets == [child.pid]
+    assert report.terminated == [child.pid] and not report.killed and not report.survivors
+    assert report.port_free and report.port_free_after == report.elapsed
+    # 데드라인 대기 - 고정 sleep 없이 종료 즉시 반환
+    assert report.elapsed < 2.0
+    assert not psutil.pid_exists(child.pid)     # wait_procs 가 거둔다
+
+
+def test_reap_kills_a_process_that_ignores_sigterm_after_the_deadline(spawn):
+    port = free_port()
+    child = spawn(port, 'stubborn')
+    report = ProcessReaper(port=port, cmdline_marker=MARKER, terminate_timeout=0.3).reap()
+    assert report.terminated == [] and report.killed == [child.pid]
+    assert report.port_free
+    assert 0.3 <= report.elapsed < 3.0
+    assert not psutil.pid_exists(child.pid)
+
+
+def test_app_pids_matches_the_script_name_exactly():
+    port = free_port()
+    lookalike = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)', 'x' + MARKER, MARKER + '.bak'])
+    try:
+        assert lookalike.pid not in ProcessReaper(port=port, cmdline_marker=MARKER).app_pids()
+    finally:
+        lookalike.kill()
+        lookalike.wait()
+
+
+def test_wait_port_free_gives_up_at_the_deadline():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        sock.listen()
+        reaper = ProcessReaper(port=sock.getsockname()[1])
+        started = time.perf_counter()
+        assert not reaper.wait_port_free(0.2)
+        assert 0.2 <= time.perf_counter() - started < 1.0
+    assert reaper.port_is_free()
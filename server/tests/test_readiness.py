@@ -0,0 +1,102 @@
+import asyncio
+import socket
+
+import pytest
+
+from probe_engine import AsyncProbeEngine, ProbeResult
+from readiness import ReadinessDetector
+
+
+@pytest.fixture
+def engine():
+    engine = AsyncProbeEngine(max_workers=2)
+    yield engine
+    engine.stop()
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class Process:
+    """Popen stand-in - poll() 은 exit_code (None = 실행 중)"""
+
+    def __init__(self, exit_code=None):
+        self.returncode = exit_code
+
+    def poll(self):
+        return self.returncode
+
+
+def external(results):
+    """external_probe 함수 - 호출마다 results 의 다음 판정, 마지막 값은 반복"""
+    calls = []
+
+    def probe(timeout):
+        healthy = results[min(len(calls), len(results) - 1)]
+        calls.append(timeout)
+
+        async def run():
+            return ProbeResult('external', healthy=healthy, status="healthy" if healthy else "unhealthy")
+        return 'external', run(), timeout
+    probe.calls = calls
+    return probe
+
+
+def detector(engine, port, external_probe):
+    return ReadinessDetector(engine, '127.0.0.1', port, f"http://127.0.0.1:{port}/health", external_probe,
+                             connect_backoff=(0.01, 0.05), http_backoff=(0.01, 0.05), external_backoff=(0.01, 0.05))
+
+
+def test_stages_run_in_order_until_externally_ready(engine):
+    port = free_port()
+    health = []
+
+    async def handle(reader, writer):
+        await reader.readuntil(b'\r\n\r\n')
+        health.append(1)
+        status = b'200 OK' if len(health) > 2 else b'503 Starting'
+        writer.write(b'HTTP/1.1 ' + status + b'\r\nContent-Length: 0\r\nConnection: close\r\n\r\n')
+        await writer.drain()
+        writer.close()
+
+    async def scenario():
+        ready = asyncio.ensure_future(detector(engine, port, probe).wait_ready(Process(), timeout=10))
+        await asyncio.sleep(0.2)            # 포트가 늦게 열리는 앱
+        server = await asyncio.start_server(handle, '127.0.0.1', port)
+        try:
+            return await ready
+        finally:
+            server.close()
+
+    probe = external([False, True])
+    report = engine.submit(scenario()).result(timeout=15)
+    assert report.ready and report.failed_stage is None
+    assert 0.2 <= report.port_open <= report.local_ready <= report.external_ready
+    assert report.attempts['port_open'] > 1
+    assert report.attempts['local_ready'] == 3
+    assert report.attempts['external_ready'] == 2
+    assert report.external_result.healthy
+    assert 'externally ready' in report.describe()
+
+
+def test_process_exit_fails_the_current_stage(engine):
+    report = engine.submit(
+        detector(engine, free_port(), external([True])).wait_ready(Process(exit_code=3), timeout=5)
+    ).result(timeout=10)
+    assert not report.ready
+    assert (report.failed_stage, report.reason) == ('port_open', 'process exited with code 3')
+    assert report.attempts['port_open'] == 0
+
+
+def test_external_deadline(engine):
+    probe = external([False])
+    report = engine.submit(
+        detector(engine, free_port(), probe).wait_ready(None, timeout=0.3, skip_local=True)
+    ).result(timeout=10)
+    assert (report.failed_stage, report.reason) == ('external_ready', 'timeout after 0.3s')
+    assert report.port_open is None and report.attempts['port_open'] == 0
+    assert len(probe.calls) >= 2 and all(timeout <= 0.3 for timeout in probe.calls)
+    assert report.as_dict()['failed_stage'] == 'external_ready'
@@ -0,0 +1,75 @@
+import pytest
+
+from latency_stats import LogHistogram
+from rollup_store import DAY, HOUR, MINUTE, Rollup, RollupStore
+from probe_engine import ProbeResult
+
+
+def rollup(*samples):
+    result = Rollup()
+    for healthy, latency in samples:
+        result.add(healthy, latency)
+    return result
+
+
+def test_add_counts_errors_without_latency():
+    r = rollup((True, 0.2), (False, 5.0), (True, None))
+    assert (r.count, r.errors, r.latency_count) == (3, 1, 1)
+    assert r.latency_min == r.latency_max == 0.2
+
+
+def test_merge_combines_counts_extremes_and_buckets():
+    a = rollup((True, 0.1), (True, 0.3), (False, None))
+    b = rollup((True, 0.3), (True, 2.0))
+    a.merge(b)
+    assert (a.count, a.errors, a.latency_count) == (5, 1, 4)
+    assert a.latency_sum == pytest.approx(2.7)
+    assert (a.latency_min, a.latency_max) == (0.1, 2.0)
+    assert a.buckets[LogHistogram.bucket_of(0.3)] == 2
+    assert sum(a.buckets.values()) == 4
+
+
+def test_merge_with_an_empty_side_keeps_extremes():
+    empty, full = Rollup(), rollup((True, 0.4))
+    empty.merge(full)
+    full.merge(Rollup())
+    assert (empty.latency_min, empty.latency_max) == (full.latency_min, full.latency_max) == (0.4, 0.4)
+
+
+def test_row_round_trip():
+    original = rollup(*[(True, 0.05 * i) for i in range(1, 40)], (False, None))
+    row = original.to_row()
+    assert len(row) == 8
+    assert row[6] == pytest.approx(original.quantile(0.95))
+    restored = Rollup.from_row(row)
+    for attr in Rollup.__slots__:
+        assert getattr(restored, attr) == getattr(original, attr)
+
+
+def test_empty_row_round_trip():
+    restored = Rollup.from_row(Rollup().to_row())
+    assert restored.buckets == {} and restored.latency_min is None and restored.quantile(0.95) is None
+
+
+def test_quantile_is_clamped_to_observed_range():
+    r = rollup(*[(True, 0.1)] * 10)
+    assert r.quantile(0.5) == r.quantile(0.95) == 0.1
+    assert r.count_at_most(0.1) == 10
+    assert r.count_at_most(0.05) == 0
+
+
+def test_store_flush_merges_minutes_into_hours(tmp_path):
+    store = RollupStore(str(tmp_path / 'rollups.sqlite3'))
+    base = 1_700_000_000 // HOUR * HOUR
+    for offset, healthy in ((0, True), (30, False), (MINUTE, True)):
+        store.record('main', ProbeResult('main', healthy=healthy, response_time=0.2, started_at=base + offset))
+    store.flush()
+    store.record('main', ProbeResult('main', healthy=True, response_time=0.4, started_at=base + 2 * MINUTE))
+    store.flush()
+
+    minutes = store.query(MINUTE, target='main')
+    assert [(bucket - base, r.count) for _, bucket, r in minutes] == [(0, 2), (MINUTE, 1), (2 * MINUTE, 1)]
+    [(_, bucket, hour)] = store.query(HOUR, target='main')
+    assert bucket == base
+    assert (hour.count, hour.errors, hour.latency_max) == (4, 1, 0.4)
+    assert sum(r.count for _, _, r in store.query(DAY)) == 4
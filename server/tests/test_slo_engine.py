@@ -0,0 +1,106 @@
+import pytest
+
+from slo_engine import BurnRateRule, Objective, SLOEngine, WindowCounter
+
+
+def test_window_counter_sums_slots_inside_the_window():
+    counter = WindowCounter(60, slots=6)       # 10s 슬롯
+    counter.record(True, 100)
+    counter.record(False, 105)
+    counter.record(True, 125)
+    assert (counter.good, counter.total, counter.bad) == (2, 3, 1)
+
+
+def test_window_counter_expires_old_slots():
+    counter = WindowCounter(60, slots=6)
+    counter.record(False, 100)
+    counter.record(True, 130)
+    counter.advance(165)                        # 100 의 슬롯만 창 밖으로
+    assert (counter.good, counter.total) == (1, 1)
+    counter.advance(10_000)                     # 긴 공백 - 전부 만료
+    assert (counter.good, counter.total) == (0, 0)
+
+
+def test_window_counter_ignores_samples_older_than_the_window():
+    counter = WindowCounter(60, slots=6)
+    counter.record(True, 1000)
+    counter.record(False, 900)
+    assert (counter.good, counter.total) == (1, 1)
+
+
+def test_window_counter_records_batched_counts():
+    counter = WindowCounter(60)
+    counter.record(7, 100, total=10)
+    assert (counter.good, counter.bad) == (7, 3)
+
+
+def test_window_counter_since_skips_the_slot_containing_start():
+    counter = WindowCounter(60, slots=6)
+    counter.record(False, 100)
+    counter.record(False, 112)                 # start 와 같은 슬롯
+    counter.record(True, 121)
+    counter.record(False, 135)
+    assert counter.since(115, 140) == (1, 2)
+    assert (counter.good, counter.total) == (1, 4)
+
+
+def engine():
+    objective = Objective('availability', 0.99)
+    rules = [BurnRateRule('restart', 'availability', 300, 60, 14.4, action='restart', min_bad=2),
+             BurnRateRule('page', 'availability', 300, 60, 14.4, action='page')]
+    return SLOEngine([objective], rules, compliance_window=3600)
+
+
+def test_restart_rule_fires_on_burn_in_both_windows():
+    slo = engine()
+    slo.record(False, None, now=1000)
+    started, _ = slo.evaluate(now=1001)
+    assert [rule.name for rule, *_ in started] == ['page']     # min_bad=2 미만
+    slo.record(False, None, now=1010)
+    started, _ = slo.evaluate(now=1011)
+    assert [rule.name for rule, *_ in started] == ['restart']
+    assert slo.restart_reason().endswith('(restart)')
+
+
+def test_rebase_forgets_earlier_failures_for_that_action_only():
+    slo = engine()
+    for now in (1000, 1010, 1020):
+        slo.record(False, None, now=now)
+    slo.evaluate(now=1021)
+    slo.rebase('restart', now=1025)
+    assert slo.restart_reason() is None
+    assert 'page' in slo.firing
+
+    # 회복 직후 한 번의 실패로는 다시 발동하지 않는다
+    slo.record(True, 0.1, now=1040)
+    slo.record(False, None, now=1050)
+    slo.evaluate(now=1051)
+    assert 'restart' not in slo.firing
+    slo.record(False, None, now=1060)
+    slo.evaluate(now=1061)
+    assert 'restart' in slo.firing
+
+    # 공유 창은 지워지지 않는다
+    assert slo.counters['availability'][300].bad == 5
+
+
+def test_rebase_drops_the_slot_containing_the_restart():
+    slo = engine()
+    rule = slo.rules[0]
+    slo.rebase('restart', now=1001)
+    slo.record(False, None, now=1003)          # rebase 와 같은 5s 슬롯 - 재시작 중의 실패
+    assert slo.rule_counts(rule, 300, 1100) == (0, 0)
+    assert slo.counters['availability'][300].bad == 1
+    slo.record(False, None, now=1310)          # 창이 지나면 공유 창 그대로
+    assert slo.rule_counts(rule, 300, 1320) == (1, 1)
+
+
+@pytest.mark.parametrize('healthy, response_time, threshold, good', [
+    (True, 0.5, None, True),
+    (False, 0.5, None, False),
+    (True, 0.5, 1.0, True),
+    (True, 1.5, 1.0, False),
+    (True, None, 1.0, False),
+])
+def test_objective_is_good(healthy, response_time, threshold, good):
+    assert Objective('x', 0.99, threshold).is_good(healthy, response_time) is good
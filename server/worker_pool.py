@@ -0,0 +1,169 @@
+import os
+import subprocess
+import time
+from collections import deque
+from datetime import datetime
+
+import psutil
+
+from process_reaper import ProcessReaper
+
+
+class WorkerSlot:
+    """One app_improved.py worker on its own port"""
+
+    def __init__(self, index, port, history=20):
+        self.index = index
+        self.port = port
+        self.name = f"worker{index}"
+        self.process = None
+        self.status = 'stopped'
+        self.consecutive_failures = 0
+        self.checks = 0
+        self.failures = 0
+        self.response_time = None
+        self.started_at = None
+        self.restarts = 0
+        self.history = deque(maxlen=history)
+
+    @property
+    def pid(self):
+        return self.process.pid if self.process is not None else None
+
+    def alive(self):
+        return self.process is not None and self.process.poll() is None
+
+    def as_dict(self):
+        return {
+            'port': self.port,
+            'pid': self.pid,
+            'status': self.status,
+            'consecutive_failures': self.consecutive_failures,
+            'checks': self.checks,
+            'failures': self.failures,
+            'response_time': self.response_time,
+            'restarts': self.restarts,
+            'history': [
+                {'time': when.isoformat(timespec='seconds'), 'reason': reason, 'duration': duration, 'success': success}
+                for when, reason, duration, success in self.history
+            ]
+        }
+
+
+class WorkerPool:
+    """N app_improved.py workers on consecutive ports, restarted one at a time
+
+    각 워커는 FORCE_HTTP_PORT=<base_port+i> 로 떠서 자기 포트에서만 서빙하고,
+    앞단(리버스 프록시)이 워커 포트들로 분산한다. 재시작은 항상 한 워커씩 -
+    나머지 워커는 계속 트래픽을 받는다.
+    """
+
+    def __init__(self, count=0, base_port=5001, host='127.0.0.1', stop_timeout=10.0, kill_timeout=3.0):
+        self.host = host
+        self.base_port = base_port
+        self.stop_timeout = stop_timeout
+        self.kill_timeout = kill_timeout
+        self.slots = [WorkerSlot(i, base_port + i) for i in range(count)]
+
+    @property
+    def enabled(self):
+        return bool(self.slots)
+
+    def health_url(self, slot):
+        return f"http://{self.host}:{slot.port}/health"
+
+    def healthy_count(self):
+        return sum(1 for slot in self.slots if slot.status == 'healthy')
+
+    def worker_env(self, slot, env):
+        env = dict(env)
+        env['FORCE_HTTP_PORT'] = str(slot.port)
+        env['WOOPANG_WORKER_ID'] = str(slot.index)
+        return env
+
+    def spawn(self, slot, args, cwd, env, **popen_options):
+        """Start the worker after clearing anything still listening on its port"""
+        self.free_port(slot)
+        slot.process = subprocess.Popen(args, cwd=cwd, env=self.worker_env(slot, env), **popen_options)
+        slot.started_at = datetime.now()
+        slot.status = 'starting'
+        slot.consecutive_failures = 0
+        return slot.process
+
+    def free_port(self, slot):
+        """Stop stray listeners on this worker's port only (다른 워커는 건드리지 않음)"""
+        reaper = ProcessReaper(port=slot.port, host=self.host)
+        pids = reaper.listening_pids() - {os.getpid()}
+        processes = []
+        for pid in pids:
+            try:
+                processes.append(psutil.Process(pid))
+            except psutil.NoSuchProcess:
+                pass
+        self._stop_processes(processes)
+        return reaper.wait_port_free(self.kill_timeout)
+
+    def stop(self, slot):
+        """terminate → wait → kill the worker → seconds taken"""
+        start = time.perf_counter()
+        if slot.alive():
+            try:
+                self._stop_processes([psutil.Process(slot.process.pid)])
+            except psutil.NoSuchProcess:
+                pass
+            try:
+                slot.process.wait(timeout=0)
+            except subprocess.TimeoutExpired:
+                pass
+        slot.status = 'stopped'
+        return time.perf_counter() - start
+
+    def _stop_processes(self, processes):
+        for proc in processes:
+            try:
+                proc.terminate()
+            except psutil.NoSuchProcess:
+                pass
+        _, alive = psutil.wait_procs(processes, timeout=self.stop_timeout)
+        for proc in alive:
+            try:
+                proc.kill()
+            except psutil.NoSuchProcess:
+                pass
+        psutil.wait_procs(alive, timeout=self.kill_timeout)
+
+    def wait_healthy(self, slot, check_health, timeout=90):
+        """Poll the worker's /health until it answers - check_health(url) → bool"""
+        start = time.perf_counter()
+        delay = 0.05
+        url = self.health_url(slot)
+        while time.perf_counter() - start < timeout:
+            if not slot.alive():
+                slot.status = 'exited'
+                return False
+            if check_health(url):
+                slot.status = 'healthy'
+                return True
+            time.sleep(delay)
+            delay = min(delay * 2, 1.0)
+        slot.status = 'unhealthy'
+        return False
+
+    def restart(self, slot, spawn, check_health, reason, timeout=90):
+        """Replace one worker and wait for it → (success, seconds)
+
+        spawn(slot) 는 호출측이 명령/환경을 채워 self.spawn 을 부르는 함수.
+        """
+        start = time.perf_counter()
+        slot.status = 'restarting'
+        self.stop(slot)
+        try:
+            spawn(slot)
+            success = self.wait_healthy(slot, check_health, timeout)
+        except Exception:
+            slot.status = 'failed'
+            success = False
+        duration = time.perf_counter() - start
+        slot.restarts += 1
+        slot.history.append((datetime.now(), reason, duration, success))
+        return success, duration